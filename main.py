@@ -2,13 +2,28 @@
 API principal del Cotizador VidaCash
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.interfaces.api.routes import cotizacion_router
+from src.models.productos.plan_cotizacion import CompiladorPlanes
+from src.models.services.registro_motores import RegistroMotores
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Coberturas, handlers, supuestos, constantes derivadas y kernels de cada
+    # producto se resuelven una sola vez, antes de la primera cotización
+    CompiladorPlanes.compilar()
+    # Motor activo y modo sombra de las variables de entorno
+    print(f"Motores: {RegistroMotores.configurar_desde_entorno()}")
+    yield
+
 
 app = FastAPI(
     title="Cotizador VidaCash",
     version="1.0.0",
     description="API para cotización de seguros de vida",
+    lifespan=lifespan,
 )
 
 # Incluir routers
@@ -0,0 +1,12 @@
+import hashlib
+import json
+from typing import Any
+
+
+def clave_estable(*partes: Any) -> str:
+    """
+    Huella sha256 de las partes serializadas en JSON con las claves ordenadas: la
+    misma entrada da la misma clave en cualquier proceso, a diferencia de repr o hash
+    """
+    contenido = json.dumps(partes, sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import Sequence
+import numpy as np
+from src.helpers import kernels
+
+
+@lru_cache(maxsize=512)
+def factores_descuento(tasa: float, horizonte: int) -> np.ndarray:
+    """
+    Vector de factores de descuento estilo VNA de Excel: 1 / (1 + tasa) ** t, t = 1..horizonte.
+    Se cachea por (tasa, horizonte) y se devuelve en modo solo lectura porque se comparte.
+    """
+    factores = (1 + tasa) ** -np.arange(1, horizonte + 1, dtype=float)
+    factores.setflags(write=False)
+    return factores
+
+
+def factores_descuento_tasas(tasas: np.ndarray, horizonte: int) -> np.ndarray:
+    """
+    factores_descuento para un arreglo de tasas, sin caché. Si el último eje tiene
+    largo 1 es una tasa constante por fila (por ejemplo una por escenario con forma
+    (escenarios, 1)) y el horizonte se agrega como último eje; si no, es una
+    trayectoria con la tasa de cada mes y el factor se acumula mes a mes.
+    """
+    tasas = np.asarray(tasas, dtype=float)
+    if tasas.shape[-1] == 1:
+        return (1 + tasas) ** -np.arange(1, horizonte + 1, dtype=float)
+    return 1 / np.cumprod(1 + tasas[..., :horizonte], axis=-1)
+
+
+def vna(tasa: float, flujos: Sequence[float]) -> float:
+    """VNA de Excel como producto punto contra el vector de descuento cacheado"""
+    flujos = np.asarray(flujos, dtype=float)
+    if flujos.size == 0:
+        return 0.0
+    if flujos.ndim == 1:
+        return float(kernels.vna(flujos, factores_descuento(tasa, flujos.shape[-1])))
+    return float(flujos @ factores_descuento(tasa, flujos.shape[-1]))
+
+
+def vna_flujos_siguientes(tasa: float, flujos: Sequence[float]) -> np.ndarray:
+    """
+    Para cada mes i, VNA de Excel de los flujos i+1 en adelante (descontados desde i).
+    Equivale a vna(tasa, flujos[i + 1:]) para todo i, pero en una sola pasada.
+    La tasa puede ser un arreglo que se propaga sobre los ejes iniciales de flujos,
+    o una trayectoria con una tasa por mes (ver factores_descuento_tasas).
+    """
+    flujos = np.asarray(flujos, dtype=float)
+    n = flujos.shape[-1]
+    if n == 0:
+        return np.zeros_like(flujos)
+    if np.ndim(tasa) == 0:
+        factores = factores_descuento(tasa, n)
+    else:
+        factores = factores_descuento_tasas(tasa, n)
+    acumulado = np.cumsum((flujos * factores)[..., ::-1], axis=-1)[..., ::-1]
+    siguientes = np.zeros_like(acumulado)
+    siguientes[..., :-1] = acumulado[..., 1:]
+    return siguientes / factores
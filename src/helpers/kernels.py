@@ -0,0 +1,234 @@
+"""
+Kernels tipados de los bucles más intensos de la proyección: la recursión de
+supervivencia, el saldo de reserva y el MOCE (VNA de los flujos siguientes) y el
+VNA del flujo de resultado.
+
+Cada kernel tiene una versión en bucles sobre arreglos float64 que se compila con
+Numba cuando está instalado, y una versión de respaldo en Python/NumPy que es la
+que se usa sin Numba. Las versiones compiladas siguen el mismo orden de
+operaciones que las de respaldo, así que dan los mismos valores (salvo el VNA del
+resultado, que suma en orden y no por bloques como el producto punto).
+"""
+
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba es opcional: sin él se usan las versiones de respaldo
+    njit = None
+
+JIT_DISPONIBLE = njit is not None
+
+
+def _compilar(funcion: Callable) -> Optional[Callable]:
+    """Compila la función con Numba (caché en disco) o devuelve None sin Numba"""
+    if njit is None:
+        return None
+    return njit(cache=True, nogil=True)(funcion)
+
+
+# Supervivencia -----------------------------------------------------------------
+
+
+def _supervivencia_bucle(
+    mortalidad_ajustada, caducidad_mensual, vivos_inicio, vivos, fallecidos,
+    vivos_despues_fallecidos, caducados, vivos_final,
+):
+    """Recursión de vivos, fallecidos y caducados mes a mes (escribe en las salidas)"""
+    for mes in range(len(mortalidad_ajustada)):
+        vivos[mes] = vivos_inicio
+        fallecidos[mes] = vivos_inicio * mortalidad_ajustada[mes] / 1000
+        vivos_despues_fallecidos[mes] = vivos_inicio - fallecidos[mes]
+        caducados[mes] = caducidad_mensual[mes] * vivos_despues_fallecidos[mes]
+        vivos_final[mes] = vivos_despues_fallecidos[mes] - caducados[mes]
+        vivos_inicio = vivos_final[mes]
+
+
+_supervivencia_jit = _compilar(_supervivencia_bucle)
+
+
+def proyectar_supervivencia(
+    mortalidad_ajustada: Sequence[float],
+    caducidad_mensual: Sequence[float],
+    vivos_inicio: float,
+) -> Tuple[List[float], List[float], List[float], List[float], List[float]]:
+    """
+    Proyecta la cohorte mes a mes
+
+    Args:
+        mortalidad_ajustada: Mortalidad mensual ajustada de cada mes (por mil)
+        caducidad_mensual: Tasa de caducidad de cada mes
+        vivos_inicio: Vivos al inicio del primer mes
+
+    Returns:
+        Listas por mes de (vivos_inicio, fallecidos, vivos_despues_fallecidos,
+        caducados, vivos_final)
+    """
+    meses = len(mortalidad_ajustada)
+    if _supervivencia_jit is not None:
+        salidas = tuple(np.empty(meses) for _ in range(5))
+        _supervivencia_jit(
+            np.asarray(mortalidad_ajustada, dtype=float),
+            np.asarray(caducidad_mensual, dtype=float),
+            float(vivos_inicio),
+            *salidas,
+        )
+        return tuple(salida.tolist() for salida in salidas)
+
+    # Sin Numba el mismo bucle sobre listas es más rápido que sobre arreglos
+    salidas = tuple([0.0] * meses for _ in range(5))
+    _supervivencia_bucle(
+        mortalidad_ajustada, caducidad_mensual, vivos_inicio, *salidas
+    )
+    return salidas
+
+
+# Saldo de reserva y MOCE ---------------------------------------------------------
+
+
+def _saldo_reserva_numpy(
+    flujo_pasivo: np.ndarray, comparador: np.ndarray, factores: np.ndarray
+) -> np.ndarray:
+    """max(max(flujo + VNA de los siguientes, 0), comparador) con NumPy"""
+    acumulado = np.cumsum((flujo_pasivo * factores)[::-1])[::-1]
+    siguientes = np.zeros_like(acumulado)
+    siguientes[:-1] = acumulado[1:]
+    valor = flujo_pasivo + siguientes / factores
+    return np.maximum(np.maximum(valor, 0), comparador)
+
+
+def _saldo_reserva_bucle(flujo_pasivo, comparador, factores):
+    """Misma cuenta que _saldo_reserva_numpy en un solo recorrido hacia atrás"""
+    saldo = np.empty(flujo_pasivo.shape[0])
+    acumulado = 0.0
+    for mes in range(flujo_pasivo.shape[0] - 1, -1, -1):
+        valor = flujo_pasivo[mes] + acumulado / factores[mes]
+        if valor < 0:
+            valor = 0.0
+        saldo[mes] = valor if valor >= comparador[mes] else comparador[mes]
+        acumulado += flujo_pasivo[mes] * factores[mes]
+    return saldo
+
+
+_saldo_reserva_jit = _compilar(_saldo_reserva_bucle)
+
+
+def saldo_reserva(
+    flujo_pasivo: np.ndarray, comparador: np.ndarray, factores: np.ndarray
+) -> np.ndarray:
+    """
+    Saldo de reserva de cada mes
+
+    Args:
+        flujo_pasivo: Vector (mes) del flujo pasivo
+        comparador: Vector (mes) de rescate * vivos_inicio
+        factores: factores_descuento de la tasa de interés mensual
+
+    Returns:
+        Vector (mes) de max(max(flujo + VNA de los siguientes, 0), comparador)
+    """
+    if _saldo_reserva_jit is not None:
+        return _saldo_reserva_jit(flujo_pasivo, comparador, factores)
+    return _saldo_reserva_numpy(flujo_pasivo, comparador, factores)
+
+
+def _moce_numpy(
+    margen_reserva: np.ndarray, tir_mensual: float, factores: np.ndarray
+) -> np.ndarray:
+    """tir * (VNA de los márgenes siguientes + margen) con NumPy"""
+    acumulado = np.cumsum((margen_reserva * factores)[::-1])[::-1]
+    siguientes = np.zeros_like(acumulado)
+    siguientes[:-1] = acumulado[1:]
+    return tir_mensual * (siguientes / factores + margen_reserva)
+
+
+def _moce_bucle(margen_reserva, tir_mensual, factores):
+    """Misma cuenta que _moce_numpy en un solo recorrido hacia atrás"""
+    moce = np.empty(margen_reserva.shape[0])
+    acumulado = 0.0
+    for mes in range(margen_reserva.shape[0] - 1, -1, -1):
+        moce[mes] = tir_mensual * (acumulado / factores[mes] + margen_reserva[mes])
+        acumulado += margen_reserva[mes] * factores[mes]
+    return moce
+
+
+_moce_jit = _compilar(_moce_bucle)
+
+
+def moce(
+    margen_reserva: np.ndarray, tir_mensual: float, factores: np.ndarray
+) -> np.ndarray:
+    """
+    MOCE de cada mes
+
+    Args:
+        margen_reserva: Vector (mes) de saldo de reserva * margen de solvencia
+        tir_mensual: Tasa de costo de capital mensual
+        factores: factores_descuento de la tasa de interés mensual
+
+    Returns:
+        Vector (mes) de tir * (VNA de los márgenes siguientes + margen del mes)
+    """
+    if _moce_jit is not None:
+        return _moce_jit(margen_reserva, float(tir_mensual), factores)
+    return _moce_numpy(margen_reserva, tir_mensual, factores)
+
+
+# VNA -------------------------------------------------------------------------------
+
+
+def _vna_numpy(flujos: np.ndarray, factores: np.ndarray) -> float:
+    """Producto punto de los flujos contra los factores de descuento"""
+    return float(flujos @ factores)
+
+
+def _vna_bucle(flujos, factores):
+    """Suma descontada de los flujos en orden"""
+    total = 0.0
+    for mes in range(flujos.shape[0]):
+        total += flujos[mes] * factores[mes]
+    return total
+
+
+_vna_jit = _compilar(_vna_bucle)
+
+
+def vna(flujos: np.ndarray, factores: np.ndarray) -> float:
+    """
+    VNA de Excel de los flujos
+
+    Args:
+        flujos: Vector (mes) de flujos
+        factores: factores_descuento de la tasa con el largo de flujos
+
+    Returns:
+        Suma de flujos * factores
+    """
+    if _vna_jit is not None:
+        return _vna_jit(flujos, factores)
+    return _vna_numpy(flujos, factores)
+
+
+# Calentamiento -------------------------------------------------------------------
+
+
+def calentar_kernels() -> float:
+    """
+    Compila los kernels con Numba (o los carga de la caché en disco) llamándolos
+    con datos mínimos, para que la primera cotización no pague la compilación
+
+    Returns:
+        Segundos usados (0 si Numba no está instalado)
+    """
+    if not JIT_DISPONIBLE:
+        return 0.0
+    inicio = time.perf_counter()
+    flujos = np.array([1.0, -1.0])
+    factores = np.array([0.99, 0.98])
+    proyectar_supervivencia(flujos, flujos, 1.0)
+    saldo_reserva(flujos, flujos, factores)
+    moce(flujos, 0.01, factores)
+    vna(flujos, factores)
+    return time.perf_counter() - inicio
@@ -1,10 +1,15 @@
 from src.common.constans import FACTOR_RESERVA
 
 
-def tasa_interes_reserva(tasas_interes: dict) -> float:
-    """Se agregar el atributo tasa_reserva a cada periodo de la tabla de tasas de interés"""
-    tasa_reserva = 0
-    for key, value in tasas_interes.items():
-        tasa_reserva = float(value["tasa_inversion"]) - FACTOR_RESERVA
-        tasas_interes[key]["tasa_reserva"] = tasa_reserva
-    return tasas_interes
+def tasa_interes_reserva(tasas_interes: dict) -> dict:
+    """
+    Retorna una copia de la tabla de tasas de interés con el atributo tasa_reserva
+    en cada periodo. No modifica la tabla recibida (puede ser la caché de un repositorio).
+    """
+    return {
+        key: {
+            **value,
+            "tasa_reserva": float(value["tasa_inversion"]) - FACTOR_RESERVA,
+        }
+        for key, value in tasas_interes.items()
+    }
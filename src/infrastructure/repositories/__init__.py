@@ -11,6 +11,9 @@ from .tasa_interes_repository import TasaInteresRepository, JsonTasaInteresRepos
 from .tarifas_reaseguro import TarifasReaseguroRepository, JsonTarifasReaseguroRepository, tarifas_reaseguro_repository
 from .factores_pago_repository import FactoresPagoRepository, JsonFactoresPagoRepository, factores_pago_repository
 from .periodos_cotizacion_repository import PeriodosCotizacionRepository, JsonPeriodosCotizacionRepository, periodos_cotizacion_repository
+from .supuestos_repository import SupuestosRepository, JsonSupuestosRepository, SupuestosSnapshot, supuestos_repository
+from .cartera_repository import CarteraRepository, ArchivoCarteraRepository, cartera_repository
+from .rejilla_indicativa_repository import RejillaIndicativaRepository, JsonRejillaIndicativaRepository, rejilla_indicativa_repository
 
 # Acceso simple por producto/cobertura
 from .repos import get_repos, get_fallecimiento_repos, get_itp_repos, get_endosos_repos
@@ -41,6 +44,16 @@ __all__ = [
     "PeriodosCotizacionRepository",
     "JsonPeriodosCotizacionRepository",
     "periodos_cotizacion_repository",
+    "SupuestosRepository",
+    "JsonSupuestosRepository",
+    "SupuestosSnapshot",
+    "supuestos_repository",
+    "CarteraRepository",
+    "ArchivoCarteraRepository",
+    "cartera_repository",
+    "RejillaIndicativaRepository",
+    "JsonRejillaIndicativaRepository",
+    "rejilla_indicativa_repository",
     
     # Acceso simple
     "get_repos",
@@ -0,0 +1,191 @@
+from abc import ABC, abstractmethod
+import csv
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional: sin pyarrow solo se admite CSV
+    pa = None
+    pq = None
+
+# Tipos de columna de salida en Parquet
+TIPOS_PARQUET = (
+    {str: pa.string(), int: pa.int64(), float: pa.float64()} if pa is not None else {}
+)
+
+
+class CarteraRepository(ABC):
+    """Interfaz abstracta para leer pólizas en vigor y escribir su valoración"""
+
+    @abstractmethod
+    def leer_polizas(
+        self, ruta: str, tamano_bloque: int, columnas: Optional[List[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Lee las pólizas por bloques de a lo más tamano_bloque filas"""
+        pass
+
+    @abstractmethod
+    def escribir_filas(
+        self,
+        ruta: str,
+        columnas: Dict[str, type],
+        filas: Iterator[List[Dict[str, Any]]],
+    ) -> int:
+        """Escribe las filas (entregadas por bloques) y devuelve cuántas escribió"""
+        pass
+
+    @abstractmethod
+    def crear_matrices(
+        self, directorio: str, nombres: Sequence[str], filas: int, columnas: int
+    ) -> None:
+        """Crea matrices (filas, columnas) en cero que no se cargan en memoria"""
+        pass
+
+    @abstractmethod
+    def abrir_matrices(
+        self, directorio: str, nombres: Sequence[str], modo: str = "r"
+    ) -> Dict[str, np.ndarray]:
+        """Abre las matrices creadas con crear_matrices"""
+        pass
+
+
+class ArchivoCarteraRepository(CarteraRepository):
+    """
+    Implementación sobre archivos CSV o Parquet (según la extensión). Parquet
+    requiere pyarrow; los bloques se leen y escriben de forma incremental para no
+    cargar la cartera completa en memoria.
+    """
+
+    def leer_polizas(
+        self, ruta: str, tamano_bloque: int, columnas: Optional[List[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lee las pólizas por bloques
+
+        Args:
+            ruta: Archivo .csv o .parquet
+            tamano_bloque: Máximo de pólizas por bloque
+            columnas: Columnas a leer (por defecto todas)
+
+        Returns:
+            Iterador de listas de diccionarios columna -> valor (en CSV los
+            valores son texto)
+        """
+        if self._es_parquet(ruta):
+            archivo = pq.ParquetFile(ruta)
+            for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=columnas):
+                yield lote.to_pylist()
+            return
+
+        with open(ruta, newline="", encoding="utf-8") as f:
+            bloque = []
+            for fila in csv.DictReader(f):
+                if columnas is not None:
+                    fila = {columna: fila.get(columna) for columna in columnas}
+                bloque.append(fila)
+                if len(bloque) >= tamano_bloque:
+                    yield bloque
+                    bloque = []
+            if bloque:
+                yield bloque
+
+    def escribir_filas(
+        self,
+        ruta: str,
+        columnas: Dict[str, type],
+        filas: Iterator[List[Dict[str, Any]]],
+    ) -> int:
+        """
+        Escribe las filas en el archivo (se reemplaza si existe)
+
+        Args:
+            ruta: Archivo .csv o .parquet
+            columnas: Columnas en el orden de salida con su tipo (str, int o
+                float); las faltantes en una fila quedan vacías
+            filas: Iterador de bloques de filas
+
+        Returns:
+            Cantidad de filas escritas
+        """
+        Path(ruta).parent.mkdir(parents=True, exist_ok=True)
+        total = 0
+        if self._es_parquet(ruta):
+            esquema = pa.schema(
+                [(columna, TIPOS_PARQUET[tipo]) for columna, tipo in columnas.items()]
+            )
+            with pq.ParquetWriter(ruta, esquema) as escritor:
+                for bloque in filas:
+                    escritor.write_table(
+                        pa.Table.from_pylist(
+                            [{c: fila.get(c) for c in columnas} for fila in bloque],
+                            schema=esquema,
+                        )
+                    )
+                    total += len(bloque)
+            return total
+
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=list(columnas), extrasaction="ignore")
+            escritor.writeheader()
+            for bloque in filas:
+                escritor.writerows(bloque)
+                total += len(bloque)
+        return total
+
+    def crear_matrices(
+        self, directorio: str, nombres: Sequence[str], filas: int, columnas: int
+    ) -> None:
+        """
+        Crea un archivo .npy float64 en cero por matriz; los archivos se abren
+        como memmap, así que su tamaño solo está acotado por el disco
+
+        Args:
+            directorio: Directorio de las matrices (se crea si no existe)
+            nombres: Nombre de cada matriz (nombre.npy)
+            filas: Filas de cada matriz
+            columnas: Columnas de cada matriz
+        """
+        Path(directorio).mkdir(parents=True, exist_ok=True)
+        for nombre in nombres:
+            matriz = np.lib.format.open_memmap(
+                Path(directorio) / f"{nombre}.npy",
+                mode="w+",
+                dtype=np.float64,
+                shape=(filas, columnas),
+            )
+            matriz.flush()
+            del matriz
+
+    def abrir_matrices(
+        self, directorio: str, nombres: Sequence[str], modo: str = "r"
+    ) -> Dict[str, np.ndarray]:
+        """
+        Abre las matrices como memmap
+
+        Args:
+            directorio: Directorio de las matrices
+            nombres: Nombre de cada matriz
+            modo: "r" para leer o "r+" para escribir
+
+        Returns:
+            Diccionario nombre -> memmap (filas, columnas)
+        """
+        return {
+            nombre: np.load(Path(directorio) / f"{nombre}.npy", mmap_mode=modo)
+            for nombre in nombres
+        }
+
+    def _es_parquet(self, ruta: str) -> bool:
+        """Indica si la ruta es Parquet y valida que pyarrow esté disponible"""
+        if Path(ruta).suffix.lower() != ".parquet":
+            return False
+        if pq is None:
+            raise ValueError("Se requiere pyarrow para leer o escribir archivos Parquet")
+        return True
+
+
+# Instancia global del repositorio
+cartera_repository = ArchivoCarteraRepository()
@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+import json
+import os
+from typing import Dict, Any
+from pathlib import Path
+
+
+class RejillaIndicativaRepository(ABC):
+    """Interfaz abstracta para el repositorio de la rejilla de cotización indicativa"""
+
+    @abstractmethod
+    def get_rejilla(self, producto: str) -> Dict[str, Any]:
+        """Obtiene la rejilla precalculada de un producto (vacía si no existe)"""
+        pass
+
+    @abstractmethod
+    def guardar_rejilla(self, producto: str, rejilla: Dict[str, Any]) -> None:
+        """Guarda la rejilla precalculada de un producto"""
+        pass
+
+
+class JsonRejillaIndicativaRepository(RejillaIndicativaRepository):
+    """Implementación del repositorio de la rejilla indicativa usando archivos JSON"""
+
+    def __init__(self, base_path: str = None):
+        """
+        Inicializa el repositorio de la rejilla indicativa
+
+        Args:
+            base_path: Ruta base para los archivos JSON (optional)
+        """
+        if base_path:
+            self.base_path = Path(base_path)
+        else:
+            # Ruta por defecto: raíz del proyecto / assets
+            self.base_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))) / "assets"
+
+        # Cache para evitar múltiples lecturas de disco
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+    def _get_rejilla_path(self, producto: str) -> Path:
+        """Obtiene la ruta al archivo de la rejilla de un producto"""
+        return self.base_path / "productos" / producto.lower() / "rejilla_indicativa.json"
+
+    def get_rejilla(self, producto: str) -> Dict[str, Any]:
+        """
+        Carga la rejilla desde el archivo JSON
+
+        Args:
+            producto: Nombre del producto
+
+        Returns:
+            Contenido del archivo, o un diccionario vacío si no existe
+        """
+        producto = producto.lower()
+
+        # Si ya está en caché, devolver directamente
+        if producto in self._cache:
+            return self._cache[producto]
+
+        rejilla_path = self._get_rejilla_path(producto)
+
+        if not rejilla_path.exists():
+            print(f"Rejilla indicativa no encontrada: {rejilla_path}")
+            self._cache[producto] = {}
+            return {}
+
+        try:
+            with open(rejilla_path, "r", encoding="utf-8") as f:
+                rejilla = json.load(f)
+                self._cache[producto] = rejilla
+                return rejilla
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error al cargar la rejilla indicativa de {producto}: {e}")
+            self._cache[producto] = {}
+            return {}
+
+    def guardar_rejilla(self, producto: str, rejilla: Dict[str, Any]) -> None:
+        """
+        Escribe la rejilla en el archivo JSON del producto
+
+        Args:
+            producto: Nombre del producto
+            rejilla: Ejes, base y nodos de la rejilla
+        """
+        producto = producto.lower()
+        rejilla_path = self._get_rejilla_path(producto)
+        rejilla_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(rejilla_path, "w", encoding="utf-8") as f:
+            f.write(self._serializar(rejilla))
+        self._cache[producto] = rejilla
+
+    @staticmethod
+    def _serializar(rejilla: Dict[str, Any]) -> str:
+        """JSON legible: un campo de cabecera o un nodo por línea (diffs por nodo)"""
+        nodos = rejilla.get("nodos", [])
+        lineas = [
+            f"  {json.dumps(clave)}: {json.dumps(valor, ensure_ascii=False)},"
+            for clave, valor in rejilla.items()
+            if clave != "nodos"
+        ]
+        lineas.append('  "nodos": [')
+        lineas += [
+            f"    {json.dumps(nodo, ensure_ascii=False)}"
+            + ("," if i < len(nodos) - 1 else "")
+            for i, nodo in enumerate(nodos)
+        ]
+        lineas.append("  ]")
+        return "{\n" + "\n".join(lineas) + "\n}\n"
+
+    def limpiar_cache(self):
+        """Limpia la caché de rejillas"""
+        self._cache = {}
+
+
+# Instancia global del repositorio
+rejilla_indicativa_repository = JsonRejillaIndicativaRepository()
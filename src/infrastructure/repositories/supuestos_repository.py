@@ -0,0 +1,201 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import threading
+from typing import Any, Dict, Tuple
+from src.models.domain.curva_tasas_interes import CurvaTasasInteres
+from src.models.domain.tabla_conmutacion import TablasConmutacion
+from src.models.domain.tabla_devolucion import TablaDevolucion
+from .repos import get_repos
+
+
+@dataclass(frozen=True)
+class SupuestosSnapshot:
+    """Supuestos precalculados e inmutables de una cobertura para una versión dada"""
+
+    producto: str
+    cobertura: str
+    version: int
+    curva_tasas_interes: CurvaTasasInteres
+    tabla_devolucion: TablaDevolucion
+    tablas_conmutacion: TablasConmutacion
+
+
+class SupuestosRepository(ABC):
+    """Interfaz abstracta para el almacén de supuestos precalculados"""
+
+    @abstractmethod
+    def get_snapshot(self, producto: str, cobertura: str) -> SupuestosSnapshot:
+        """Obtiene el snapshot de supuestos de un producto y cobertura"""
+        pass
+
+    @abstractmethod
+    def get_version(self) -> int:
+        """Obtiene la versión vigente de los supuestos"""
+        pass
+
+    @abstractmethod
+    def get_huella(self, producto: str) -> str:
+        """Obtiene la huella del contenido de los supuestos de un producto"""
+        pass
+
+
+class JsonSupuestosRepository(SupuestosRepository):
+    """
+    Almacén de supuestos construido a partir de los repositorios JSON.
+
+    Cada snapshot se construye una sola vez por (producto, cobertura) y versión,
+    y se comparte entre peticiones porque no se modifica después de creado.
+    """
+
+    # Archivos derivados de los supuestos que no forman parte de la huella
+    ARCHIVOS_DERIVADOS = ("rejilla_indicativa.json",)
+
+    def __init__(self, base_path: str = None):
+        """
+        Args:
+            base_path: Ruta de assets para la huella de los supuestos (optional)
+        """
+        if base_path:
+            self.base_path = Path(base_path)
+        else:
+            # Ruta por defecto: raíz del proyecto / assets
+            self.base_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))) / "assets"
+        self._cache: Dict[Tuple[str, str], SupuestosSnapshot] = {}
+        self._huellas: Dict[str, str] = {}
+        self._version = 1
+        self._lock = threading.Lock()
+
+    def get_snapshot(self, producto: str, cobertura: str) -> SupuestosSnapshot:
+        """
+        Obtiene (construyendo si es necesario) el snapshot de supuestos
+
+        Args:
+            producto: Nombre del producto (ej: "endosos")
+            cobertura: Nombre de la cobertura (ej: "fallecimiento", "itp")
+
+        Returns:
+            Snapshot inmutable de supuestos
+        """
+        cache_key = (producto.lower(), cobertura.lower())
+
+        snapshot = self._cache.get(cache_key)
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._cache.get(cache_key)
+            if snapshot is None:
+                snapshot = self._construir_snapshot(*cache_key)
+                self._cache[cache_key] = snapshot
+            return snapshot
+
+    def _construir_snapshot(self, producto: str, cobertura: str) -> SupuestosSnapshot:
+        """Carga las tablas crudas y precalcula los supuestos de la cobertura"""
+        repos = get_repos(producto, cobertura)
+        tasas_interes = repos["tasa_interes"].get_tasas_interes()
+        devolucion = repos["devolucion"].get_devolucion_by_producto_and_cobertura(
+            producto, cobertura
+        )
+        curva_tasas_interes = CurvaTasasInteres.desde_tabla(tasas_interes)
+        tablas_conmutacion = self._construir_tablas_conmutacion(
+            repos, producto, cobertura, curva_tasas_interes
+        )
+
+        return SupuestosSnapshot(
+            producto=producto,
+            cobertura=cobertura,
+            version=self._version,
+            curva_tasas_interes=curva_tasas_interes,
+            tabla_devolucion=TablaDevolucion.desde_tabla(devolucion),
+            tablas_conmutacion=tablas_conmutacion,
+        )
+
+    def _construir_tablas_conmutacion(
+        self,
+        repos: Dict[str, Any],
+        producto: str,
+        cobertura: str,
+        curva_tasas_interes: CurvaTasasInteres,
+    ) -> TablasConmutacion:
+        """
+        Tablas de conmutación hasta la vigencia máxima de la curva, precalculadas
+        para cada sexo y condición de fumador con el ajuste de mortalidad de la
+        cobertura y cada tasa de reserva de la curva (otros perfiles, como los
+        choques de sensibilidad, se construyen al pedirlos)
+        """
+        ajuste_mortalidad = (
+            repos["parametros"]
+            .get_parametros_by_producto_and_cobertura(producto, cobertura)
+            .get("ajuste_mortalidad", 0)
+        )
+        tablas = TablasConmutacion(
+            cobertura=cobertura,
+            tabla_mortalidad=repos["tabla_mortalidad"].get_tabla_mortalidad(),
+            caducidad_mensual_data=repos["caducidad"].get_caducidad_mensual_data(),
+            caducidad_anual=repos["caducidad"].get_caducidad_data(),
+            tarifas_reaseguro=(
+                repos["tarifas_reaseguro"].get_tarifas_reaseguro()
+                if cobertura == "itp"
+                else None
+            ),
+            ajuste_mortalidad=ajuste_mortalidad,
+            anios_horizonte=max(curva_tasas_interes.get_plazos(), default=0),
+        )
+        tasas = {tasas.tasa_reserva_mensual for tasas in curva_tasas_interes.tasas.values()}
+        for sexo in ("M", "F"):
+            for fumador in (False, True):
+                for tasa in tasas:
+                    tablas.get_tabla(sexo, fumador, tasa)
+        return tablas
+
+    def get_version(self) -> int:
+        """Obtiene la versión vigente de los supuestos"""
+        return self._version
+
+    def get_huella(self, producto: str) -> str:
+        """
+        Huella del contenido de los supuestos de un producto: sha256 de los
+        archivos JSON del producto y de los compartidos (cross), sin los
+        archivos derivados como la rejilla indicativa. Cambia con cualquier
+        cambio de supuestos, no con la versión en memoria.
+
+        Args:
+            producto: Nombre del producto (ej: "endosos")
+
+        Returns:
+            Huella hexadecimal de 16 caracteres
+        """
+        producto = producto.lower()
+        huella = self._huellas.get(producto)
+        if huella is not None:
+            return huella
+
+        productos_path = self.base_path / "productos"
+        archivos = sorted(
+            archivo
+            for carpeta in (productos_path / producto, productos_path / "cross")
+            for archivo in carpeta.rglob("*.json")
+            if archivo.name not in self.ARCHIVOS_DERIVADOS
+        )
+        contenido = hashlib.sha256()
+        for archivo in archivos:
+            contenido.update(archivo.relative_to(productos_path).as_posix().encode("utf-8"))
+            contenido.update(archivo.read_bytes())
+        huella = contenido.hexdigest()[:16]
+        with self._lock:
+            self._huellas[producto] = huella
+        return huella
+
+    def limpiar_cache(self):
+        """Descarta los snapshots y avanza la versión de los supuestos"""
+        with self._lock:
+            self._cache = {}
+            self._huellas = {}
+            self._version += 1
+
+
+# Instancia global del repositorio
+supuestos_repository = JsonSupuestosRepository()
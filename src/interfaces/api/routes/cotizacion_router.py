@@ -2,14 +2,29 @@
 Router para cotizaciones de seguros
 """
 
-from fastapi import APIRouter, HTTPException
+import hmac
+import os
+from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel
+from typing import List, Optional
 from src.infrastructure.repositories import (
     get_fallecimiento_repos,
     get_itp_repos,
     get_repos,
 )
-from src.models.productos.endosos import cotizar_endosos, get_endosos_info
+from src.models.productos.endosos import (
+    cotizar_endosos,
+    cotizar_indicativa_endosos,
+    get_cotizacion_exacta_endosos,
+    cotizar_suma_asegurada_endosos,
+    cotizar_variantes_endosos,
+    cotizar_matriz_endosos,
+    cotizar_sensibilidad_endosos,
+    cotizar_estocastico_endosos,
+    get_endosos_info,
+    get_motores_info,
+    configurar_motores,
+)
 
 router = APIRouter(prefix="/api/v1/productos", tags=["cotizaciones"])
 
@@ -28,6 +43,94 @@ class RequestCotizacion(BaseModel):
     parametros: ParametrosCotizacion
 
 
+class ParametrosSumaAsegurada(BaseModel):
+    edad_actuarial: int
+    periodo_vigencia: int
+    periodo_pago_primas: int
+    sexo: str
+    porcentaje_devolucion: float
+    prima_mensual_objetivo: float
+    suma_asegurada: Optional[float] = None
+
+
+class RequestSumaAsegurada(BaseModel):
+    producto: str
+    parametros: ParametrosSumaAsegurada
+
+
+class ParametrosVariantes(BaseModel):
+    edad_actuarial: int
+    periodo_vigencia: int
+    periodo_pago_primas: int
+    suma_asegurada: float
+    sexo: str
+    porcentaje_devolucion: float
+    frecuencias_pago_primas: Optional[List[str]] = None
+    fumadores: Optional[List[bool]] = None
+    asistencias: Optional[List[bool]] = None
+
+
+class RequestVariantes(BaseModel):
+    producto: str
+    parametros: ParametrosVariantes
+
+
+class ChoqueRequest(BaseModel):
+    tipo: str
+    valor: float
+
+
+class ParametrosSensibilidad(BaseModel):
+    edad_actuarial: int
+    periodo_vigencia: int
+    periodo_pago_primas: int
+    suma_asegurada: float
+    sexo: str
+    porcentaje_devolucion: float
+    choques: Optional[List[ChoqueRequest]] = None
+
+
+class RequestSensibilidad(BaseModel):
+    producto: str
+    parametros: ParametrosSensibilidad
+
+
+class ParametrosEstocastico(BaseModel):
+    edad_actuarial: int
+    periodo_vigencia: int
+    periodo_pago_primas: int
+    suma_asegurada: float
+    sexo: str
+    porcentaje_devolucion: float
+    escenarios: Optional[int] = None
+    modelo: Optional[str] = None
+    velocidad_reversion: float = 0.1
+    volatilidad: float = 0.01
+    tasa_largo_plazo: Optional[float] = None
+    semilla: Optional[int] = None
+    percentiles: Optional[List[float]] = None
+    calcular_prima_equilibrio: bool = True
+
+
+class RequestEstocastico(BaseModel):
+    producto: str
+    parametros: ParametrosEstocastico
+
+
+class ParametrosMatriz(BaseModel):
+    edad_actuarial: List[int]
+    periodo_vigencia: List[int]
+    periodo_pago_primas: Optional[List[int]] = None
+    porcentaje_devolucion: List[float]
+    suma_asegurada: float
+    sexo: str
+
+
+class RequestMatriz(BaseModel):
+    producto: str
+    parametros: ParametrosMatriz
+
+
 @router.get("/endosos/info")
 def get_info():
     """
@@ -42,15 +145,83 @@ def get_info():
         )
 
 
+class RequestMotores(BaseModel):
+    motor: Optional[str] = None
+    candidato: Optional[str] = None
+    muestra_sombra: Optional[float] = None
+    tolerancia_prima: Optional[float] = None
+    tolerancia_vna: Optional[float] = None
+
+
+@router.get("/motores")
+def get_motores():
+    """
+    Endpoint para consultar los motores de VNA, la configuración y el modo sombra
+    """
+    return {"success": True, "data": get_motores_info()}
+
+
+# Variable de entorno con el token de administración; sin ella los endpoints de
+# administración quedan deshabilitados
+VARIABLE_TOKEN_ADMIN = "COTIZADOR_TOKEN_ADMIN"
+
+
+def verificar_token_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Exige la cabecera X-Admin-Token con el token de administración configurado
+    """
+    token = os.environ.get(VARIABLE_TOKEN_ADMIN)
+    if not token:
+        raise HTTPException(
+            status_code=403, detail="Endpoint de administración deshabilitado"
+        )
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), token.encode("utf-8")
+    ):
+        raise HTTPException(status_code=401, detail="Token de administración inválido")
+
+
+@router.put("/motores", dependencies=[Depends(verificar_token_admin)])
+def put_motores(request: RequestMotores):
+    """
+    Endpoint de administración (cabecera X-Admin-Token) para cambiar el motor
+    activo o el modo sombra; solo se cambian los campos enviados (candidato en
+    null desactiva el modo sombra). La configuración inicial se lee de las
+    variables de entorno al arrancar
+    """
+    try:
+        data = configurar_motores(request.model_dump(exclude_unset=True))
+        return {"success": True, "message": "Motores configurados", "data": data}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+# Modos de /cotizar
+MODOS_COTIZACION = ("exacto", "indicativo")
+
+
 @router.post("/cotizar")
-def cotizar(request: RequestCotizacion):
+def cotizar(request: RequestCotizacion, mode: str = "exacto"):
     """
     Endpoint principal para cotizar productos de seguros
+
+    Con mode=indicativo responde al instante con primas interpoladas de la rejilla
+    precalculada y su error estimado; la cotización exacta se resuelve en segundo
+    plano y se consulta en GET /cotizar/exacta/{clave}
     """
     try:
         producto = request.producto.upper()
         params = request.parametros
 
+        # Validar modo
+        if mode not in MODOS_COTIZACION:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Modo no soportado: {mode}. Modos: {list(MODOS_COTIZACION)}",
+            )
+
         # Validar producto
         if producto != "ENDOSOS":
             raise HTTPException(
@@ -71,6 +242,13 @@ def cotizar(request: RequestCotizacion):
             "porcentaje_devolucion": params.porcentaje_devolucion,
         }
 
+        if mode == "indicativo":
+            return {
+                "success": True,
+                "message": "Cotización indicativa realizada exitosamente",
+                "data": cotizar_indicativa_endosos(request_data),
+            }
+
         # Usar el orquestador de endosos para generar la respuesta completa
         response_data = cotizar_endosos(request_data)
 
@@ -82,5 +260,267 @@ def cotizar(request: RequestCotizacion):
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+@router.get("/cotizar/exacta/{clave}")
+def get_cotizacion_exacta(clave: str):
+    """
+    Endpoint para consultar la cotización exacta de una cotización indicativa;
+    mientras el estado sea pendiente se puede volver a consultar
+    """
+    try:
+        return {"success": True, "data": get_cotizacion_exacta_endosos(clave)}
+    except KeyError:
+        raise HTTPException(
+            status_code=404, detail=f"No hay cotización para la clave {clave}"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+@router.post("/cotizar/suma-asegurada")
+def cotizar_suma_asegurada(request: RequestSumaAsegurada):
+    """
+    Endpoint para obtener la suma asegurada que corresponde a una prima mensual objetivo
+    """
+    try:
+        producto = request.producto.upper()
+        params = request.parametros
+
+        # Validar producto
+        if producto != "ENDOSOS":
+            raise HTTPException(
+                status_code=400, detail="Solo se soporta el producto ENDOSOS"
+            )
+
+        # Validar sexo
+        if params.sexo.upper() not in ["M", "F"]:
+            raise HTTPException(status_code=400, detail="El sexo debe ser 'M' o 'F'")
+
+        request_data = {
+            "edad_actuarial": params.edad_actuarial,
+            "periodo_vigencia": params.periodo_vigencia,
+            "periodo_pago_primas": params.periodo_pago_primas,
+            "suma_asegurada": params.suma_asegurada,
+            "sexo": params.sexo,
+            "porcentaje_devolucion": params.porcentaje_devolucion,
+            "prima_mensual_objetivo": params.prima_mensual_objetivo,
+        }
+
+        response_data = cotizar_suma_asegurada_endosos(request_data)
+
+        return {
+            "success": True,
+            "message": "Suma asegurada calculada exitosamente",
+            "data": response_data,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+@router.post("/cotizar/matriz")
+def cotizar_matriz(request: RequestMatriz):
+    """
+    Endpoint para cotizar una grilla de edades, plazos y porcentajes de devolución
+    """
+    try:
+        producto = request.producto.upper()
+        params = request.parametros
+
+        # Validar producto
+        if producto != "ENDOSOS":
+            raise HTTPException(
+                status_code=400, detail="Solo se soporta el producto ENDOSOS"
+            )
+
+        # Validar sexo
+        if params.sexo.upper() not in ["M", "F"]:
+            raise HTTPException(status_code=400, detail="El sexo debe ser 'M' o 'F'")
+
+        request_data = {
+            "edad_actuarial": params.edad_actuarial,
+            "periodo_vigencia": params.periodo_vigencia,
+            "periodo_pago_primas": params.periodo_pago_primas,
+            "suma_asegurada": params.suma_asegurada,
+            "sexo": params.sexo,
+            "porcentaje_devolucion": params.porcentaje_devolucion,
+        }
+
+        response_data = cotizar_matriz_endosos(request_data)
+
+        return {
+            "success": True,
+            "message": "Matriz de cotización realizada exitosamente",
+            "data": response_data,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+@router.post("/cotizar/variantes")
+def cotizar_variantes(request: RequestVariantes):
+    """
+    Endpoint para cotizar todas las frecuencias de pago, estados de fumador y
+    opciones de asistencia de un perfil en una sola llamada
+    """
+    try:
+        producto = request.producto.upper()
+        params = request.parametros
+
+        # Validar producto
+        if producto != "ENDOSOS":
+            raise HTTPException(
+                status_code=400, detail="Solo se soporta el producto ENDOSOS"
+            )
+
+        # Validar sexo
+        if params.sexo.upper() not in ["M", "F"]:
+            raise HTTPException(status_code=400, detail="El sexo debe ser 'M' o 'F'")
+
+        request_data = {
+            "edad_actuarial": params.edad_actuarial,
+            "periodo_vigencia": params.periodo_vigencia,
+            "periodo_pago_primas": params.periodo_pago_primas,
+            "suma_asegurada": params.suma_asegurada,
+            "sexo": params.sexo,
+            "porcentaje_devolucion": params.porcentaje_devolucion,
+            "frecuencias_pago_primas": (
+                [f.upper() for f in params.frecuencias_pago_primas]
+                if params.frecuencias_pago_primas
+                else None
+            ),
+            "fumadores": params.fumadores,
+            "asistencias": params.asistencias,
+        }
+
+        response_data = cotizar_variantes_endosos(request_data)
+
+        return {
+            "success": True,
+            "message": "Cotización por variantes realizada exitosamente",
+            "data": response_data,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+@router.post("/cotizar/sensibilidad")
+def cotizar_sensibilidad(request: RequestSensibilidad):
+    """
+    Endpoint para el análisis de sensibilidad de la prima ante choques de
+    mortalidad, caducidad, tasa de interés y gastos (tabla tornado)
+    """
+    try:
+        producto = request.producto.upper()
+        params = request.parametros
+
+        # Validar producto
+        if producto != "ENDOSOS":
+            raise HTTPException(
+                status_code=400, detail="Solo se soporta el producto ENDOSOS"
+            )
+
+        # Validar sexo
+        if params.sexo.upper() not in ["M", "F"]:
+            raise HTTPException(status_code=400, detail="El sexo debe ser 'M' o 'F'")
+
+        request_data = {
+            "edad_actuarial": params.edad_actuarial,
+            "periodo_vigencia": params.periodo_vigencia,
+            "periodo_pago_primas": params.periodo_pago_primas,
+            "suma_asegurada": params.suma_asegurada,
+            "sexo": params.sexo,
+            "porcentaje_devolucion": params.porcentaje_devolucion,
+            "choques": (
+                [{"tipo": c.tipo, "valor": c.valor} for c in params.choques]
+                if params.choques
+                else None
+            ),
+        }
+
+        response_data = cotizar_sensibilidad_endosos(request_data)
+
+        return {
+            "success": True,
+            "message": "Análisis de sensibilidad realizado exitosamente",
+            "data": response_data,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+@router.post("/cotizar/estocastico")
+def cotizar_estocastico(request: RequestEstocastico):
+    """
+    Endpoint para la distribución del VNA y de la prima de equilibrio bajo
+    trayectorias estocásticas de tasa de interés
+    """
+    try:
+        producto = request.producto.upper()
+        params = request.parametros
+
+        # Validar producto
+        if producto != "ENDOSOS":
+            raise HTTPException(
+                status_code=400, detail="Solo se soporta el producto ENDOSOS"
+            )
+
+        # Validar sexo
+        if params.sexo.upper() not in ["M", "F"]:
+            raise HTTPException(status_code=400, detail="El sexo debe ser 'M' o 'F'")
+
+        request_data = {
+            "edad_actuarial": params.edad_actuarial,
+            "periodo_vigencia": params.periodo_vigencia,
+            "periodo_pago_primas": params.periodo_pago_primas,
+            "suma_asegurada": params.suma_asegurada,
+            "sexo": params.sexo,
+            "porcentaje_devolucion": params.porcentaje_devolucion,
+            "escenarios": params.escenarios,
+            "modelo": params.modelo,
+            "velocidad_reversion": params.velocidad_reversion,
+            "volatilidad": params.volatilidad,
+            "tasa_largo_plazo": params.tasa_largo_plazo,
+            "semilla": params.semilla,
+            "percentiles": params.percentiles,
+            "calcular_prima_equilibrio": params.calcular_prima_equilibrio,
+        }
+
+        response_data = cotizar_estocastico_endosos(request_data)
+
+        return {
+            "success": True,
+            "message": "Valoración estocástica realizada exitosamente",
+            "data": response_data,
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
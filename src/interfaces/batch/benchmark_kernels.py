@@ -0,0 +1,146 @@
+"""
+Benchmark de los kernels de la proyección por horizonte: versión de respaldo
+(Python/NumPy, la que se usa sin Numba) contra la versión compilada con Numba
+
+Uso:
+    python -m src.interfaces.batch.benchmark_kernels --horizontes 120 240 480 --repeticiones 2000
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from src.helpers import kernels
+from src.helpers.factores_descuento import factores_descuento
+
+
+def _medir(funcion: Callable, argumentos: Sequence, repeticiones: int) -> float:
+    """Microsegundos por llamada (mejor de tres tandas)"""
+    mejor = float("inf")
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion(*argumentos)
+        mejor = min(mejor, (time.perf_counter() - inicio) / repeticiones)
+    return mejor * 1e6
+
+
+def _casos(meses: int) -> Dict[str, Dict[str, object]]:
+    """Argumentos sintéticos de cada kernel para un horizonte"""
+    generador = np.random.default_rng(meses)
+    flujo_pasivo = generador.normal(0.0, 1.0, meses)
+    comparador = np.abs(generador.normal(0.0, 0.5, meses))
+    factores = np.array(factores_descuento(0.004, meses))
+    mortalidad = generador.uniform(0.01, 1.0, meses)
+    caducidad = generador.uniform(0.0, 0.02, meses)
+    return {
+        "supervivencia": {
+            # Sin Numba el servicio le pasa listas
+            "respaldo": lambda m, c: kernels.proyectar_supervivencia(
+                m.tolist(), c.tolist(), 1.0
+            ),
+            "jit": (
+                (lambda m, c: kernels.proyectar_supervivencia(m, c, 1.0))
+                if kernels.JIT_DISPONIBLE
+                else None
+            ),
+            "argumentos": (mortalidad, caducidad),
+        },
+        "saldo_reserva": {
+            "respaldo": kernels._saldo_reserva_numpy,
+            "jit": kernels._saldo_reserva_jit,
+            "argumentos": (flujo_pasivo, comparador, factores),
+        },
+        "moce": {
+            "respaldo": kernels._moce_numpy,
+            "jit": kernels._moce_jit,
+            "argumentos": (comparador * 0.05, 0.01, factores),
+        },
+        "vna": {
+            "respaldo": kernels._vna_numpy,
+            "jit": kernels._vna_jit,
+            "argumentos": (flujo_pasivo, factores),
+        },
+    }
+
+
+def ejecutar_benchmark(
+    horizontes: Sequence[int], repeticiones: int
+) -> List[Dict[str, Optional[float]]]:
+    """
+    Mide cada kernel en cada horizonte
+
+    Returns:
+        Filas con kernel, meses, microsegundos de respaldo y JIT (None sin Numba),
+        aceleración y diferencia máxima entre ambas versiones
+    """
+    calentamiento = kernels.calentar_kernels()
+    if kernels.JIT_DISPONIBLE:
+        print(f"Kernels compilados en {calentamiento:.2f} s")
+    else:
+        print("Numba no está instalado: solo se mide la versión de respaldo")
+
+    filas = []
+    for meses in horizontes:
+        for nombre, caso in _casos(meses).items():
+            respaldo = _medir(caso["respaldo"], caso["argumentos"], repeticiones)
+            jit = diferencia = None
+            if caso["jit"] is not None:
+                jit = _medir(caso["jit"], caso["argumentos"], repeticiones)
+                diferencia = float(
+                    np.max(
+                        np.abs(
+                            np.asarray(caso["respaldo"](*caso["argumentos"]))
+                            - np.asarray(caso["jit"](*caso["argumentos"]))
+                        )
+                    )
+                )
+            filas.append(
+                {
+                    "kernel": nombre,
+                    "meses": meses,
+                    "respaldo_us": respaldo,
+                    "jit_us": jit,
+                    "aceleracion": respaldo / jit if jit else None,
+                    "diferencia_maxima": diferencia,
+                }
+            )
+    return filas
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Tiempo por llamada de los kernels de la proyección por horizonte"
+    )
+    parser.add_argument(
+        "--horizontes",
+        type=int,
+        nargs="+",
+        default=[60, 120, 240, 480],
+        help="Meses de proyección a medir",
+    )
+    parser.add_argument(
+        "--repeticiones", type=int, default=1000, help="Llamadas por medición"
+    )
+    args = parser.parse_args(argumentos)
+
+    filas = ejecutar_benchmark(args.horizontes, args.repeticiones)
+    print(f"{'kernel':<15}{'meses':>7}{'respaldo us':>14}{'jit us':>10}{'x':>8}{'dif':>11}")
+    for fila in filas:
+        jit = f"{fila['jit_us']:.2f}" if fila["jit_us"] is not None else "-"
+        aceleracion = (
+            f"{fila['aceleracion']:.1f}" if fila["aceleracion"] is not None else "-"
+        )
+        diferencia = (
+            f"{fila['diferencia_maxima']:.1e}"
+            if fila["diferencia_maxima"] is not None
+            else "-"
+        )
+        print(
+            f"{fila['kernel']:<15}{fila['meses']:>7}{fila['respaldo_us']:>14.2f}"
+            f"{jit:>10}{aceleracion:>8}{diferencia:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
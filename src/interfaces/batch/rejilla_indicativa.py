@@ -0,0 +1,439 @@
+"""
+Genera la rejilla de primas exactas de la cotización indicativa (mode=indicativo
+en /cotizar): cotiza cada nodo edad × vigencia × pago × devolución con dos sumas
+aseguradas y ambos sexos y calibra el error estimado con perfiles al azar: el
+factor de la dispersión entre esquinas es el menor con que el error real de una
+fracción --nivel-confianza de las primas queda dentro del estimado. Un segundo
+grupo de perfiles, distinto del de calibración, mide qué fracción de las primas
+se entrega (error estimado dentro del máximo admitido) y cuántas de ellas
+quedan dentro de su error estimado; el resultado se guarda en "validacion" y el
+nivel_confianza de la rejilla es el menor entre el de calibración y este.
+
+La rejilla guarda la huella de los supuestos con que se generó y el servicio la
+rechaza si no coincide con la de los supuestos vigentes: hay que volver a
+generarla cuando cambian los supuestos del producto (o la proyección), y
+tests/integration/test_cotizacion/test_rejilla_indicativa.py falla mientras la
+rejilla del repositorio no esté al día.
+
+Uso:
+    python -m src.interfaces.batch.rejilla_indicativa --calibracion 500 --validacion 500
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.common.producto import Producto
+from src.infrastructure.repositories import (
+    rejilla_indicativa_repository,
+    supuestos_repository,
+)
+from src.models.productos.endosos.endosos import endosos_orchestrator
+from src.models.productos.endosos.core.response_building_step import (
+    _get_default_endosos_values,
+)
+from src.models.services.cotizacion_indicativa_service import (
+    ERROR_RELATIVO_MAXIMO,
+    CotizacionIndicativaService,
+)
+
+EDADES = list(range(18, 69, 5))
+# Cada vigencia tiene su propia tabla de devolución, que no siempre sigue a las
+# vecinas: nodos anuales
+VIGENCIAS = list(range(10, 26))
+# Con pago bajo 15 años la prima cambia rápido con el plazo: nodos anuales
+PAGOS = [10, 11, 12, 13, 14, 15, 20, 25]
+# Sobre el 100% la prima crece muy rápido con la devolución: nodos cada 5 puntos
+DEVOLUCIONES = [0, 25, 50, 75, 100, 105, 110, 115, 120, 125, 130, 135, 140, 145, 150]
+SUMAS_ASEGURADAS = [20000, 200000]
+SEXOS = ["M", "F"]
+
+# Error estimado mínimo de la prima indicativa (fracción de la prima): cubre la
+# falta de linealidad de la prima en la suma asegurada
+ERROR_RELATIVO_MINIMO = 0.01
+
+# Fracción de las primas de calibración que el error estimado debe cubrir
+NIVEL_CONFIANZA = 0.95
+
+
+def _base() -> Dict[str, Any]:
+    """Parámetros fijos de la rejilla: los valores por defecto de la cotización"""
+    return {
+        k: v for k, v in _get_default_endosos_values().items() if k != "coberturas"
+    }
+
+
+def _cotizar_celdas(request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Celdas de la matriz de cotización exacta (sin la salida de los cálculos)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return endosos_orchestrator.cotizar_matriz(request_data)["celdas"]
+
+
+def _primas_convergidas(celda: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Prima mensual de cada cobertura de la celda, None si no convergió"""
+    if "error" in celda:
+        return {}
+    return {
+        cobertura: (
+            primas["primas_frecuencializadas"]["mensual"]
+            if celda["convergencia"].get(cobertura, False)
+            else None
+        )
+        for cobertura, primas in celda["coberturas"].items()
+    }
+
+
+def generar_nodos(
+    edades: Sequence[int],
+    vigencias: Sequence[int],
+    pagos: Sequence[int],
+    devoluciones: Sequence[float],
+    sumas_aseguradas: Sequence[float],
+    sexos: Sequence[str],
+) -> List[Dict[str, Any]]:
+    """
+    Cotiza todos los nodos con el Goal Seek (una matriz por edad, sexo, suma
+    asegurada y vigencia, dentro del máximo de celdas de la matriz)
+
+    Returns:
+        Nodos con sexo, ejes y primas por cobertura ([prima con cada suma
+        asegurada], o None si alguna no convergió), ordenados por sexo y ejes
+    """
+    nodos = {}
+    for sexo in sexos:
+        for edad in edades:
+            inicio = time.perf_counter()
+            for (indice, suma_asegurada), vigencia in itertools.product(
+                enumerate(sumas_aseguradas), vigencias
+            ):
+                celdas = _cotizar_celdas(
+                    {
+                        "edad_actuarial": [edad],
+                        "periodo_vigencia": [vigencia],
+                        # La rejilla lleva a la vigencia los pagos que la superan
+                        "periodo_pago_primas": sorted(
+                            {min(pago, vigencia) for pago in pagos}
+                        ),
+                        "porcentaje_devolucion": list(devoluciones),
+                        "suma_asegurada": suma_asegurada,
+                        "sexo": sexo,
+                    }
+                )
+                for celda in celdas:
+                    clave = (
+                        sexo,
+                        celda["edad_actuarial"],
+                        celda["periodo_vigencia"],
+                        celda["periodo_pago_primas"],
+                        celda["porcentaje_devolucion"],
+                    )
+                    nodo = nodos.setdefault(
+                        clave,
+                        {
+                            "sexo": sexo,
+                            "edad_actuarial": clave[1],
+                            "periodo_vigencia": clave[2],
+                            "periodo_pago_primas": clave[3],
+                            "porcentaje_devolucion": clave[4],
+                            "primas": {},
+                        },
+                    )
+                    for cobertura, prima in _primas_convergidas(celda).items():
+                        primas = nodo["primas"].setdefault(
+                            cobertura, [None] * len(sumas_aseguradas)
+                        )
+                        if primas is not None:
+                            primas[indice] = prima
+            print(
+                f"Sexo {sexo}, edad {edad}: {time.perf_counter() - inicio:.1f} s"
+            )
+
+    for nodo in nodos.values():
+        for cobertura, primas in nodo["primas"].items():
+            if primas is None or any(prima is None for prima in primas):
+                nodo["primas"][cobertura] = None
+    # En el orden de los ejes: el archivo no depende del orden de las celdas
+    return sorted(
+        nodos.values(),
+        key=lambda nodo: (
+            list(sexos).index(nodo["sexo"]),
+            nodo["edad_actuarial"],
+            nodo["periodo_vigencia"],
+            nodo["periodo_pago_primas"],
+            nodo["porcentaje_devolucion"],
+        ),
+    )
+
+
+def comparar_perfiles(
+    perfiles: int,
+    edades: Sequence[int],
+    vigencias: Sequence[int],
+    devoluciones: Sequence[float],
+    sexos: Sequence[str],
+    semilla: int,
+) -> List[Tuple[float, float, float]]:
+    """
+    Compara la prima indicativa con la exacta en perfiles al azar dentro de la
+    rejilla (todas las primas estimables, sin tope de error relativo)
+
+    Returns:
+        (error absoluto, error estimado, prima indicativa) de cada prima
+    """
+    aleatorio = random.Random(semilla)
+    indicativa_service = CotizacionIndicativaService(
+        Producto.ENDOSOS, error_relativo_maximo=math.inf
+    )
+    comparaciones = []
+    for _ in range(perfiles):
+        vigencia = aleatorio.randint(min(vigencias), max(vigencias))
+        perfil = {
+            "edad_actuarial": aleatorio.randint(min(edades), max(edades)),
+            "periodo_vigencia": vigencia,
+            "periodo_pago_primas": aleatorio.randint(min(vigencias), vigencia),
+            "porcentaje_devolucion": aleatorio.choice(
+                range(int(min(devoluciones)), int(max(devoluciones)) + 1, 5)
+            ),
+            # Suma asegurada log-uniforme entre los extremos de la cotización
+            "suma_asegurada": float(
+                round(math.exp(aleatorio.uniform(math.log(10000), math.log(300000))), -3)
+            ),
+            "sexo": aleatorio.choice(list(sexos)),
+        }
+        celda = _cotizar_celdas(
+            {
+                **perfil,
+                "edad_actuarial": [perfil["edad_actuarial"]],
+                "periodo_vigencia": [vigencia],
+                "periodo_pago_primas": [perfil["periodo_pago_primas"]],
+                "porcentaje_devolucion": [perfil["porcentaje_devolucion"]],
+            }
+        )[0]
+        parametros_entrada = {**_base(), **perfil}
+        for cobertura, exacta in _primas_convergidas(celda).items():
+            if exacta is None:
+                continue
+            try:
+                estimacion = indicativa_service.estimar(parametros_entrada, cobertura)
+            except ValueError:
+                continue
+            comparaciones.append(
+                (
+                    abs(estimacion["prima"] - exacta),
+                    estimacion["error_estimado"],
+                    abs(estimacion["prima"]),
+                )
+            )
+    return comparaciones
+
+
+def calibrar_error(
+    comparaciones: Sequence[Tuple[float, float, float]],
+    nivel_confianza: float,
+    error_relativo_minimo: float,
+) -> Tuple[float, float]:
+    """
+    Factor de la dispersión entre esquinas con el que el error de al menos una
+    fracción nivel_confianza de las primas queda dentro del estimado
+
+    Args:
+        comparaciones: (error, dispersión, prima) de comparar_perfiles con la
+            rejilla sin calibrar (factor_error 1 y error mínimo 0, así el error
+            estimado es la dispersión entre esquinas)
+        nivel_confianza: Fracción de las primas que el error estimado debe cubrir
+        error_relativo_minimo: Error estimado mínimo como fracción de la prima
+
+    Returns:
+        (factor_error, fracción de las primas cubierta con ese factor)
+    """
+    requeridas = math.ceil(nivel_confianza * len(comparaciones))
+    cubiertas = sum(
+        1 for error, _, prima in comparaciones if error <= error_relativo_minimo * prima
+    )
+    # Factor con que se cubre cada prima que el error mínimo no cubre
+    factores = sorted(
+        error / dispersion
+        for error, dispersion, prima in comparaciones
+        if error > error_relativo_minimo * prima and dispersion > 0
+    )
+    faltantes = requeridas - cubiertas
+    if faltantes <= 0:
+        factor_error = 0.0
+    elif faltantes <= len(factores):
+        factor_error = factores[faltantes - 1]
+    else:
+        # Ni el mayor factor alcanza: las primas sin dispersión quedan fuera
+        factor_error = factores[-1] if factores else 0.0
+    factor_error = math.ceil(factor_error * 100) / 100
+    return factor_error, _fraccion_cubierta(
+        comparaciones, factor_error, error_relativo_minimo
+    )
+
+
+def _fraccion_cubierta(
+    comparaciones: Sequence[Tuple[float, float, float]],
+    factor_error: float,
+    error_relativo_minimo: float,
+) -> float:
+    """Fracción de las primas (sin calibrar) cuyo error queda dentro del estimado"""
+    return sum(
+        1
+        for error, dispersion, prima in comparaciones
+        if error <= max(factor_error * dispersion, error_relativo_minimo * prima)
+    ) / len(comparaciones)
+
+
+def validar_error(
+    comparaciones: Sequence[Tuple[float, float, float]],
+    error_relativo_maximo: float = ERROR_RELATIVO_MAXIMO,
+) -> Dict[str, Any]:
+    """
+    Resultado de la rejilla calibrada en perfiles distintos de los de calibración
+
+    Args:
+        comparaciones: (error, error estimado, prima) de comparar_perfiles
+        error_relativo_maximo: Error relativo con el que el servicio entrega la
+            prima indicativa
+
+    Returns:
+        Primas comparadas, fracción entregada (error estimado dentro del máximo),
+        fracción de las entregadas con el error dentro del estimado y error
+        relativo máximo de las entregadas
+    """
+    entregadas = [
+        (error, estimado, prima)
+        for error, estimado, prima in comparaciones
+        if prima > 0 and estimado <= error_relativo_maximo * prima
+    ]
+    return {
+        "primas": len(comparaciones),
+        "entregadas": len(entregadas) / len(comparaciones) if comparaciones else None,
+        "dentro_del_error_estimado": (
+            sum(1 for error, estimado, _ in entregadas if error <= estimado)
+            / len(entregadas)
+            if entregadas
+            else None
+        ),
+        "error_relativo_maximo": max(
+            (error / prima for error, _, prima in entregadas), default=None
+        ),
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Rejilla de primas exactas de la cotización indicativa"
+    )
+    parser.add_argument("--edades", type=int, nargs="+", default=EDADES)
+    parser.add_argument("--vigencias", type=int, nargs="+", default=VIGENCIAS)
+    parser.add_argument("--pagos", type=int, nargs="+", default=PAGOS)
+    parser.add_argument(
+        "--devoluciones", type=float, nargs="+", default=DEVOLUCIONES
+    )
+    parser.add_argument(
+        "--sumas-aseguradas", type=float, nargs=2, default=SUMAS_ASEGURADAS
+    )
+    parser.add_argument("--sexos", nargs="+", default=SEXOS)
+    parser.add_argument(
+        "--calibracion",
+        type=int,
+        default=500,
+        help="Perfiles al azar para calibrar el error estimado (0 para no calibrar)",
+    )
+    parser.add_argument(
+        "--validacion",
+        type=int,
+        default=500,
+        help="Perfiles al azar, distintos de los de calibración, para validarlo",
+    )
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument(
+        "--nivel-confianza",
+        type=float,
+        default=NIVEL_CONFIANZA,
+        help="Fracción de las primas de calibración que el error estimado cubre",
+    )
+    parser.add_argument(
+        "--error-relativo-minimo",
+        type=float,
+        default=ERROR_RELATIVO_MINIMO,
+        help="Error estimado mínimo como fracción de la prima",
+    )
+    args = parser.parse_args(argumentos)
+    ejes_perfiles = (args.edades, args.vigencias, args.devoluciones, args.sexos)
+
+    inicio = time.perf_counter()
+    rejilla = {
+        "huella_supuestos": supuestos_repository.get_huella(Producto.ENDOSOS.value),
+        "base": _base(),
+        "sumas_aseguradas": args.sumas_aseguradas,
+        "ejes": {
+            "edad_actuarial": args.edades,
+            "periodo_vigencia": args.vigencias,
+            "periodo_pago_primas": args.pagos,
+            "porcentaje_devolucion": args.devoluciones,
+        },
+        "factor_error": 1.0,
+        "error_relativo_minimo": 0.0,
+        "nivel_confianza": None,
+        "validacion": None,
+        "nodos": generar_nodos(
+            args.edades,
+            args.vigencias,
+            args.pagos,
+            args.devoluciones,
+            args.sumas_aseguradas,
+            args.sexos,
+        ),
+    }
+    _guardar(rejilla)
+    print(
+        f"Rejilla con {len(rejilla['nodos'])} nodos en "
+        f"{time.perf_counter() - inicio:.0f} s"
+    )
+    if args.calibracion <= 0:
+        return
+
+    comparaciones = comparar_perfiles(args.calibracion, *ejes_perfiles, args.semilla)
+    if not comparaciones:
+        print("Calibración: ningún perfil comparable, el error queda sin calibrar")
+        return
+    factor_error, nivel_confianza = calibrar_error(
+        comparaciones, args.nivel_confianza, args.error_relativo_minimo
+    )
+    rejilla["factor_error"] = factor_error
+    rejilla["error_relativo_minimo"] = args.error_relativo_minimo
+    rejilla["nivel_confianza"] = round(nivel_confianza, 4)
+    _guardar(rejilla)
+    print(
+        f"Calibración: {len(comparaciones)} primas, factor de error {factor_error}, "
+        f"error mínimo {args.error_relativo_minimo:.2%}, nivel de confianza "
+        f"{nivel_confianza:.2%}"
+    )
+
+    if args.validacion > 0:
+        validacion = validar_error(
+            comparar_perfiles(args.validacion, *ejes_perfiles, args.semilla + 1)
+        )
+        rejilla["validacion"] = validacion
+        # El nivel informado es el menor entre calibración y validación
+        if validacion["dentro_del_error_estimado"] is not None:
+            rejilla["nivel_confianza"] = round(
+                min(nivel_confianza, validacion["dentro_del_error_estimado"]), 4
+            )
+        _guardar(rejilla)
+        print(f"Validación: {validacion}")
+
+
+def _guardar(rejilla: Dict[str, Any]) -> None:
+    """Guarda la rejilla y descarta la construida por el servicio"""
+    rejilla_indicativa_repository.guardar_rejilla(Producto.ENDOSOS.value, rejilla)
+    CotizacionIndicativaService.limpiar_cache()
+
+
+if __name__ == "__main__":
+    main()
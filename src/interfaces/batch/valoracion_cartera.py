@@ -0,0 +1,96 @@
+"""
+Valoración batch de la cartera en vigor de ENDOSOS
+
+Uso:
+    python -m src.interfaces.batch.valoracion_cartera polizas.csv \
+        --reservas reservas.csv --flujos flujos.csv \
+        --presupuesto-memoria-mb 12000 --directorio-matrices /scratch/flujos
+"""
+
+import argparse
+import json
+import time
+from src.models.productos.endosos import valorar_cartera_endosos
+from src.models.productos.endosos.valoracion_cartera import (
+    PRESUPUESTO_MEMORIA_CARTERA_MB,
+)
+from src.models.domain.puntos_modelo_domain import PuntosModeloDomain
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Reservas por póliza y flujos de pasivo agregados de la cartera en vigor"
+    )
+    parser.add_argument("polizas", help="Archivo de pólizas (.csv o .parquet)")
+    parser.add_argument(
+        "--reservas", required=True, help="Archivo de salida de reservas por póliza"
+    )
+    parser.add_argument(
+        "--flujos", required=True, help="Archivo de salida de flujos agregados por mes"
+    )
+    parser.add_argument(
+        "--tamano-bloque",
+        type=int,
+        default=None,
+        help="Pólizas por bloque (por defecto según el presupuesto de memoria)",
+    )
+    parser.add_argument(
+        "--procesos",
+        type=int,
+        default=None,
+        help="Procesos de valoración (1 para valorar en el proceso actual)",
+    )
+    parser.add_argument(
+        "--presupuesto-memoria-mb",
+        type=float,
+        default=PRESUPUESTO_MEMORIA_CARTERA_MB,
+        help="Memoria total para la valoración, repartida entre los procesos",
+    )
+    parser.add_argument(
+        "--directorio-matrices",
+        default=None,
+        help="Directorio de las matrices (póliza, mes) de flujos por póliza en disco",
+    )
+    parser.add_argument(
+        "--puntos-modelo",
+        type=int,
+        default=None,
+        metavar="AMPLITUD_MESES",
+        help="Comprime las pólizas en puntos modelo con bandas de meses de póliza",
+    )
+    parser.add_argument(
+        "--banda-suma-asegurada",
+        type=float,
+        default=None,
+        help="Ancho relativo de las bandas de suma asegurada de los puntos modelo",
+    )
+    parser.add_argument(
+        "--conciliar",
+        action="store_true",
+        help="Mide el error de los puntos modelo contra la valoración póliza a póliza",
+    )
+    args = parser.parse_args(argumentos)
+    puntos_modelo = None
+    if args.puntos_modelo is not None or args.banda_suma_asegurada is not None:
+        puntos_modelo = PuntosModeloDomain(
+            args.puntos_modelo or 1, args.banda_suma_asegurada
+        )
+
+    inicio = time.perf_counter()
+    resumen = valorar_cartera_endosos(
+        args.polizas,
+        args.reservas,
+        args.flujos,
+        args.tamano_bloque,
+        args.procesos,
+        args.presupuesto_memoria_mb,
+        args.directorio_matrices,
+        puntos_modelo,
+        args.conciliar,
+    )
+    resumen["segundos"] = round(time.perf_counter() - inicio, 2)
+    print(json.dumps(resumen, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
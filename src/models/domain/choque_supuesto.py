@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+# Supuestos que se pueden chocar en el análisis de sensibilidad
+TIPOS_CHOQUE = ("mortalidad", "caducidad", "tasa_interes", "gastos")
+
+
+@dataclass(frozen=True)
+class ChoqueSupuesto:
+    """
+    Choque sobre un supuesto de la proyección.
+
+    Para mortalidad (ajuste_mortalidad), caducidad y gastos el valor es una
+    variación relativa (0.10 = +10%); para tasa_interes es un desplazamiento
+    paralelo de la curva en puntos básicos (50 = +0.50%).
+    """
+
+    tipo: str
+    valor: float
+
+    def __post_init__(self):
+        if self.tipo not in TIPOS_CHOQUE:
+            raise ValueError(
+                f"Tipo de choque no válido: {self.tipo}. Válidos: {list(TIPOS_CHOQUE)}"
+            )
+        if self.tipo != "tasa_interes" and self.valor <= -1:
+            raise ValueError(
+                f"El choque de {self.tipo} debe ser mayor a -100%: {self.valor}"
+            )
+
+    @classmethod
+    def desde_dict(cls, datos: Dict[str, Any]) -> "ChoqueSupuesto":
+        """Construye el choque desde {"tipo": ..., "valor": ...}"""
+        return cls(tipo=str(datos["tipo"]).lower(), valor=float(datos["valor"]))
+
+    @property
+    def etiqueta(self) -> str:
+        """Descripción corta del choque (ej: "mortalidad +10%", "tasa_interes -50pb")"""
+        if self.tipo == "tasa_interes":
+            return f"{self.tipo} {self.valor:+g}pb"
+        return f"{self.tipo} {self.valor * 100:+g}%"
+
+    @property
+    def factor_mortalidad(self) -> float:
+        return 1 + self.valor if self.tipo == "mortalidad" else 1.0
+
+    @property
+    def factor_caducidad(self) -> float:
+        return 1 + self.valor if self.tipo == "caducidad" else 1.0
+
+    @property
+    def factor_gastos(self) -> float:
+        return 1 + self.valor if self.tipo == "gastos" else 1.0
+
+    @property
+    def puntos_basicos(self) -> float:
+        return self.valor if self.tipo == "tasa_interes" else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"tipo": self.tipo, "valor": self.valor, "etiqueta": self.etiqueta}
+
+
+# Choques usados cuando la petición no indica ninguno
+CHOQUES_POR_DEFECTO = (
+    ChoqueSupuesto("mortalidad", -0.10),
+    ChoqueSupuesto("mortalidad", 0.10),
+    ChoqueSupuesto("caducidad", -0.10),
+    ChoqueSupuesto("caducidad", 0.10),
+    ChoqueSupuesto("tasa_interes", -50),
+    ChoqueSupuesto("tasa_interes", 50),
+    ChoqueSupuesto("gastos", -0.10),
+    ChoqueSupuesto("gastos", 0.10),
+)
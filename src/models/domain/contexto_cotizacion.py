@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class ContextoCotizacion:
+    """
+    Estado de una petición de cotización: los parámetros de entrada preparados,
+    los almacenados (copia propia del snapshot del plan) y los calculados.
+
+    El orquestador es una instancia compartida entre peticiones concurrentes, así
+    que todo lo que depende de la petición viaja en este objeto y nunca en
+    atributos del orquestador, de los handlers de cobertura o de los servicios
+    compartidos. Ninguna otra petición tiene referencias a estos diccionarios.
+    """
+
+    parametros_entrada: Dict[str, Any]
+    parametros_almacenados: Dict[str, Any]
+    parametros_calculados: Dict[str, Any]
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# Cotizaciones guardadas (las más recientes)
+MAX_COTIZACIONES_ASINCRONAS = 500
+
+# Cotizaciones en cola o en curso admitidas a la vez
+MAX_COTIZACIONES_PENDIENTES = 100
+
+PENDIENTE = "pendiente"
+COMPLETADA = "completada"
+ERROR = "error"
+DESCARTADA = "descartada"
+
+
+def clave_cotizacion(parametros_entrada: Mapping[str, Any]) -> str:
+    """
+    Clave determinista de una petición: la misma petición (con los valores por
+    defecto ya aplicados) da siempre la misma clave
+
+    Args:
+        parametros_entrada: Parámetros de entrada preparados
+
+    Returns:
+        Clave hexadecimal de 16 caracteres
+    """
+    contenido = json.dumps(parametros_entrada, sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:16]
+
+
+class CotizacionesAsincronas:
+    """
+    Cotizaciones exactas resueltas en segundo plano, consultables por la clave de
+    la petición.
+
+    Enviar dos veces la misma clave no repite el cálculo mientras esté pendiente o
+    completada. Se guardan las MAX_COTIZACIONES_ASINCRONAS más recientes y, si ya
+    hay MAX_COTIZACIONES_PENDIENTES en cola, la nueva queda descartada (la
+    cotización exacta se puede pedir de forma síncrona).
+    """
+
+    def __init__(
+        self,
+        max_cotizaciones: int = MAX_COTIZACIONES_ASINCRONAS,
+        max_pendientes: int = MAX_COTIZACIONES_PENDIENTES,
+        max_workers: int = 1,
+    ):
+        self.max_cotizaciones = max_cotizaciones
+        self.max_pendientes = max_pendientes
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._cotizaciones: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pendientes = 0
+        self._ejecutor: Optional[ThreadPoolExecutor] = None
+
+    def enviar(self, clave: str, tarea: Callable[[], Dict[str, Any]]) -> str:
+        """
+        Ejecuta la cotización en segundo plano
+
+        Args:
+            clave: Clave de la petición
+            tarea: Cálculo de la cotización exacta
+
+        Returns:
+            Estado de la cotización de la clave
+        """
+        with self._lock:
+            registro = self._cotizaciones.get(clave)
+            if registro is not None and registro["estado"] in (PENDIENTE, COMPLETADA):
+                return registro["estado"]
+            if self._pendientes >= self.max_pendientes:
+                self._guardar(clave, {"estado": DESCARTADA})
+                return DESCARTADA
+
+            self._guardar(clave, {"estado": PENDIENTE})
+            self._pendientes += 1
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="cotizacion-exacta",
+                )
+            ejecutor = self._ejecutor
+        ejecutor.submit(self._ejecutar, clave, tarea)
+        return PENDIENTE
+
+    def _guardar(self, clave: str, registro: Dict[str, Any]) -> None:
+        """Guarda el registro como el más reciente y descarta los más antiguos"""
+        self._cotizaciones[clave] = registro
+        self._cotizaciones.move_to_end(clave)
+        while len(self._cotizaciones) > self.max_cotizaciones:
+            self._cotizaciones.popitem(last=False)
+
+    def _ejecutar(self, clave: str, tarea: Callable[[], Dict[str, Any]]) -> None:
+        """Un fallo queda registrado en la clave, nunca se propaga"""
+        try:
+            registro = {"estado": COMPLETADA, "data": tarea()}
+        except Exception as e:
+            print(f"Error en la cotización exacta {clave}: {e}")
+            registro = {"estado": ERROR, "error": str(e)}
+        with self._lock:
+            self._pendientes -= 1
+            self._guardar(clave, registro)
+
+    def get(self, clave: str) -> Optional[Dict[str, Any]]:
+        """
+        Estado (y resultado si ya está) de una cotización
+
+        Returns:
+            Diccionario con clave, estado y data o error; None si la clave no se
+            envió o ya se descartó
+        """
+        with self._lock:
+            registro = self._cotizaciones.get(clave)
+            return {"clave": clave, **registro} if registro is not None else None
+
+    def esperar(self) -> None:
+        """Espera las cotizaciones pendientes"""
+        with self._lock:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=True)
+
+    def limpiar(self) -> None:
+        """Descarta las cotizaciones terminadas"""
+        with self._lock:
+            for clave in [
+                clave
+                for clave, registro in self._cotizaciones.items()
+                if registro["estado"] != PENDIENTE
+            ]:
+                del self._cotizaciones[clave]
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+from src.common.constans import FACTOR_RESERVA, TASA_MENSUALIZACION
+
+
+@dataclass(frozen=True)
+class TasasPlazo:
+    """Tasas anuales (en porcentaje) y mensuales (en decimal) de un plazo"""
+
+    plazo: int
+    duracion_tipo: float
+    tasa_inversion_anual: float
+    tasa_reserva_anual: float
+    tasa_inversion: float
+    tasa_inversion_mensual: float
+    tasa_reserva_mensual: float
+    tasa_reserva_mensualizada: float
+
+
+@dataclass(frozen=True)
+class CurvaTasasInteres:
+    """
+    Curva inmutable de tasas de interés por plazo.
+
+    Se construye una sola vez por snapshot de supuestos a partir de la tabla
+    tasa_interes.json y reemplaza la mutación de la tabla con tasa_interes_reserva.
+    """
+
+    tasas: Mapping[int, TasasPlazo]
+
+    @classmethod
+    def desde_tabla(cls, tasas_interes: Mapping[str, Any]) -> "CurvaTasasInteres":
+        """
+        Construye la curva precalculando todas las tasas por plazo
+
+        Args:
+            tasas_interes: Tabla cruda {plazo: {"duracion_tipo", "tasa_inversion"}}
+
+        Returns:
+            Curva de tasas de interés inmutable
+        """
+        tasas: Dict[int, TasasPlazo] = {}
+        for plazo, valores in tasas_interes.items():
+            tasa_inversion_anual = float(valores["tasa_inversion"])
+            tasa_reserva_anual = tasa_inversion_anual - FACTOR_RESERVA
+            tasa_inversion = tasa_inversion_anual / 100
+            tasa_reserva = tasa_reserva_anual / 100
+            tasas[int(plazo)] = TasasPlazo(
+                plazo=int(plazo),
+                duracion_tipo=float(valores.get("duracion_tipo", 0)),
+                tasa_inversion_anual=tasa_inversion_anual,
+                tasa_reserva_anual=tasa_reserva_anual,
+                tasa_inversion=tasa_inversion,
+                tasa_inversion_mensual=(1 + tasa_inversion) ** (1 / 12) - 1,
+                tasa_reserva_mensual=(1 + tasa_reserva) ** (1 / 12) - 1,
+                tasa_reserva_mensualizada=(1 + tasa_reserva) ** TASA_MENSUALIZACION
+                - 1,
+            )
+        return cls(tasas=MappingProxyType(tasas))
+
+    @cached_property
+    def clave(self) -> tuple:
+        """Clave hashable basada en el contenido de la curva (para cachés)"""
+        return tuple(
+            (plazo, tasas.duracion_tipo, tasas.tasa_inversion_anual)
+            for plazo, tasas in sorted(self.tasas.items())
+        )
+
+    def get_tasas_plazo(self, plazo: int) -> TasasPlazo:
+        """
+        Obtiene las tasas precalculadas para un plazo
+
+        Raises:
+            ValueError: Si el plazo no existe en la curva
+        """
+        try:
+            return self.tasas[int(plazo)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"No se encontró una tasa para el periodo {plazo}")
+
+    def get_plazos(self) -> list:
+        """Obtiene los plazos disponibles en la curva, ordenados"""
+        return sorted(self.tasas.keys())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación equivalente a la tabla con el atributo tasa_reserva"""
+        return {
+            str(plazo): {
+                "duracion_tipo": tasas.duracion_tipo,
+                "tasa_inversion": tasas.tasa_inversion_anual,
+                "tasa_reserva": tasas.tasa_reserva_anual,
+            }
+            for plazo, tasas in self.tasas.items()
+        }
+
+    def desplazar(self, puntos_basicos: float) -> "CurvaTasasInteres":
+        """
+        Curva nueva con todas las tasas de inversión desplazadas en paralelo (la
+        tasa de reserva se mueve igual); la curva original no se modifica
+
+        Args:
+            puntos_basicos: Desplazamiento en puntos básicos (50 = +0.50%)
+        """
+        return CurvaTasasInteres.desde_tabla(
+            {
+                plazo: {
+                    "duracion_tipo": tasas.duracion_tipo,
+                    "tasa_inversion": tasas.tasa_inversion_anual + puntos_basicos / 100,
+                }
+                for plazo, tasas in self.tasas.items()
+            }
+        )
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DescomposicionSumaAsegurada:
+    """
+    Recta de primas de equilibrio prima(SA) = a + b * SA de una cobertura y perfil.
+
+    Solo es exacta mientras las ramas de la proyección (pisos del saldo de reserva y
+    valores absolutos del último mes) son las mismas que en la suma asegurada de
+    referencia; ese tramo es [suma_asegurada_min, suma_asegurada_max].
+    """
+
+    a: float
+    b: float
+    suma_asegurada_referencia: float
+    suma_asegurada_min: float
+    suma_asegurada_max: float
+
+    def contiene(self, suma_asegurada: float) -> bool:
+        """Indica si la suma asegurada está dentro del tramo de validez"""
+        return self.suma_asegurada_min <= suma_asegurada <= self.suma_asegurada_max
+
+    def prima(self, suma_asegurada: float) -> float:
+        """Prima de equilibrio para una suma asegurada del tramo"""
+        return self.a + self.b * suma_asegurada
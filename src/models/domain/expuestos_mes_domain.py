@@ -1,5 +1,7 @@
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import math
+import numpy as np
+from src.common.constans import VIVOS_INICIO
 
 
 class ExpuestosMesDomain:
@@ -66,58 +68,6 @@ class ExpuestosMesDomain:
         """
         return mortalidad_mensual * ajuste_mortalidad
     
-    def calcular_fallecidos(self, vivos_inicio: float, mortalidad_ajustada: float) -> float:
-        """
-        Calcula el número de fallecidos en el mes
-        
-        Args:
-            vivos_inicio: Número de vivos al inicio del mes
-            mortalidad_ajustada: Tasa de mortalidad ajustada
-            
-        Returns:
-            Número de fallecidos
-        """
-        return vivos_inicio * mortalidad_ajustada / 1000
-    
-    def calcular_vivos_despues_fallecidos(self, vivos_inicio: float, fallecidos: float) -> float:
-        """
-        Calcula los vivos después de restar los fallecidos
-        
-        Args:
-            vivos_inicio: Número de vivos al inicio del mes
-            fallecidos: Número de fallecidos en el mes
-            
-        Returns:
-            Número de vivos después de fallecidos
-        """
-        return vivos_inicio - fallecidos
-    
-    def calcular_caducados(self, vivos_despues_fallecidos: float, caducidad_mensual: float) -> float:
-        """
-        Calcula el número de caducados en el mes
-        
-        Args:
-            vivos_despues_fallecidos: Número de vivos después de fallecidos
-            caducidad_mensual: Tasa de caducidad mensual
-            
-        Returns:
-            Número de caducados
-        """
-        return caducidad_mensual * vivos_despues_fallecidos
-    
-    def calcular_vivos_finales(self, vivos_despues_fallecidos: float, caducados: float) -> float:
-        """
-        Calcula los vivos finales después de restar los caducados
-        
-        Args:
-            vivos_despues_fallecidos: Número de vivos después de fallecidos
-            caducados: Número de caducados en el mes
-            
-        Returns:
-            Número de vivos finales
-        """
-        return vivos_despues_fallecidos - caducados
-    
     def calcular_edad_actuarial(self, edad_inicial: int, mes: int) -> int:
         """
         Calcula la edad actuarial para un mes específico
@@ -145,4 +95,34 @@ class ExpuestosMesDomain:
             Diccionario con las tasas de caducidad por mes
         """
         from src.helpers.caducidad_mensual import caducidad_mensual
-        return caducidad_mensual(periodo_vigencia, caducidad_parametrizado_mensual, caducidad_por_año)
\ No newline at end of file
+        return caducidad_mensual(periodo_vigencia, caducidad_parametrizado_mensual, caducidad_por_año)
+    
+    def calcular_decrementos_escenarios(
+        self, mortalidad_ajustada: np.ndarray, caducidad_mensual: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Recorre la misma recursión de vivos, fallecidos y caducados para varios
+        escenarios de supuestos a la vez (un escenario por fila)
+        
+        Args:
+            mortalidad_ajustada: Matriz (escenario, mes) de mortalidad ajustada (por mil)
+            caducidad_mensual: Matriz (escenario, mes) de tasas de caducidad
+            
+        Returns:
+            Tupla de matrices (vivos_inicio, fallecidos, caducados)
+        """
+        mortalidad_ajustada = np.asarray(mortalidad_ajustada, dtype=float)
+        caducidad_mensual = np.asarray(caducidad_mensual, dtype=float)
+        vivos_inicio = np.empty_like(mortalidad_ajustada)
+        fallecidos = np.empty_like(mortalidad_ajustada)
+        caducados = np.empty_like(mortalidad_ajustada)
+        
+        vivos = np.full(mortalidad_ajustada.shape[:-1], float(VIVOS_INICIO))
+        for mes in range(mortalidad_ajustada.shape[-1]):
+            vivos_inicio[..., mes] = vivos
+            fallecidos[..., mes] = vivos * mortalidad_ajustada[..., mes] / 1000
+            vivos_despues_fallecidos = vivos - fallecidos[..., mes]
+            caducados[..., mes] = caducidad_mensual[..., mes] * vivos_despues_fallecidos
+            vivos = vivos_despues_fallecidos - caducados[..., mes]
+        
+        return vivos_inicio, fallecidos, caducados
@@ -1,10 +1,40 @@
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
+import numpy as np
 from src.utils.frecuencia_meses import frecuencia_meses
+from src.helpers.factores_descuento import vna
 from typing import List
 
 
 class FlujoResultado:
 
+    def calcular_validador_pago_primas(
+        self, meses: int, frecuencias_pago_primas: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Máscara (frecuencia, mes) con 1 en los meses en que se cobra la prima de
+        cada frecuencia: (mes_poliza - 1) % frecuencia_meses == 0
+        """
+        frecuencias = np.array(
+            [frecuencia_meses(frecuencia) for frecuencia in frecuencias_pago_primas]
+        ).reshape(-1, 1)
+        meses_poliza = np.arange(1, meses + 1)
+        return ((meses_poliza - 1) % frecuencias == 0).astype(float)
+
+    def calcular_factor_cuotas_rescate(
+        self, meses: int, frecuencias_pago_primas: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Matriz (frecuencia, mes) que lleva el rescate por meses transcurridos
+        (prima * mes_poliza) a cuotas cobradas (prima * ceil(mes_poliza /
+        frecuencia_meses)): la prima de cada frecuencia es por cuota. Vale 1 en
+        la frecuencia mensual.
+        """
+        frecuencias = np.array(
+            [frecuencia_meses(frecuencia) for frecuencia in frecuencias_pago_primas]
+        ).reshape(-1, 1)
+        meses_poliza = np.arange(1, meses + 1)
+        return np.ceil(meses_poliza / frecuencias) / meses_poliza
+
     def calcular_primas_recurrentes(
         self,
         vivos_inicio: float,
@@ -13,7 +43,9 @@ class FlujoResultado:
         prima: float,
         fraccionamiento_primas: float,
     ):
-        frecuencia_meses_valor = frecuencia_meses(frecuencia_pago_primas)
+        validadores_pago = self.calcular_validador_pago_primas(
+            len(vivos_inicio), [frecuencia_pago_primas]
+        )[0].tolist()
 
         primas_recurrentes = []
         for i, vivo_inicio in enumerate(vivos_inicio):
@@ -21,9 +53,7 @@ class FlujoResultado:
             if mes_poliza / 12 > periodo_pago_primas:
                 prima_mes = 0
             else:
-                validador_pago = (
-                    1 if ((mes_poliza - 1) % frecuencia_meses_valor == 0) else 0
-                )
+                validador_pago = validadores_pago[i]
                 prima_mes = (
                     validador_pago * prima * vivo_inicio * fraccionamiento_primas
                 )
@@ -82,19 +112,18 @@ class FlujoResultado:
     ):
         comisiones = []
 
+        frecuencia_meses_valor = frecuencia_meses(frecuencia_pago_primas)
+        # validador pago primas mes a mes
+        validadores_pago = self.calcular_validador_pago_primas(
+            len(primas_recurrentes), [frecuencia_pago_primas]
+        )[0].tolist()
+
         for idx, prima in enumerate(primas_recurrentes):
             vivo_inicio = 0
             if idx < len(vivos_inicio):
                 vivo_inicio = vivos_inicio[idx]
 
-            mes_poliza = idx + 1
-
-            frecuencia_meses_valor = frecuencia_meses(frecuencia_pago_primas)
-            # calcular validador pago primas mes a mes
-            if ((mes_poliza - 1) % frecuencia_meses_valor) == 0:
-                validador_pago_primas = 1
-            else:
-                validador_pago_primas = 0
+            validador_pago_primas = validadores_pago[idx]
 
             ajuste_asistencia = 0
             if tiene_asistencia:
@@ -110,6 +139,77 @@ class FlujoResultado:
 
         return comisiones
 
+    def calcular_primas_recurrentes_variantes(
+        self,
+        vivos_inicio: np.ndarray,
+        periodo_pago_primas: float,
+        frecuencias_pago_primas: Sequence[str],
+        prima: float,
+        fraccionamiento_primas: float,
+    ) -> np.ndarray:
+        """
+        calcular_primas_recurrentes para varias frecuencias y tablas de vivos a la vez
+
+        Args:
+            vivos_inicio: Matriz (perfil, mes) de vivos al inicio, uno por estado de fumador
+
+        Returns:
+            Matriz (frecuencia, perfil, mes) de primas recurrentes
+        """
+        vivos_inicio = np.asarray(vivos_inicio, dtype=float)
+        meses = vivos_inicio.shape[-1]
+        validadores_pago = self.calcular_validador_pago_primas(
+            meses, frecuencias_pago_primas
+        )
+        en_periodo_pago = np.arange(1, meses + 1) / 12 <= periodo_pago_primas
+        return (
+            (validadores_pago * en_periodo_pago)[:, None, :]
+            * prima
+            * vivos_inicio
+            * fraccionamiento_primas
+        )
+
+    def calcular_comision_variantes(
+        self,
+        primas_recurrentes: np.ndarray,
+        vivos_inicio: np.ndarray,
+        frecuencias_pago_primas: Sequence[str],
+        asistencias: Sequence[bool],
+        costo_mensual_asistencia_funeraria: float,
+        comision: float,
+    ) -> np.ndarray:
+        """
+        calcular_comision para varias frecuencias, tablas de vivos y opciones de
+        asistencia a la vez
+
+        Args:
+            primas_recurrentes: Matriz (frecuencia, perfil, mes)
+            vivos_inicio: Matriz (perfil, mes)
+            asistencias: Valores de tiene_asistencia a evaluar
+
+        Returns:
+            Matriz (frecuencia, perfil, asistencia, mes) de comisiones
+        """
+        primas_recurrentes = np.asarray(primas_recurrentes, dtype=float)
+        meses = primas_recurrentes.shape[-1]
+        validadores_pago = self.calcular_validador_pago_primas(
+            meses, frecuencias_pago_primas
+        )
+        frecuencias = np.array(
+            [frecuencia_meses(frecuencia) for frecuencia in frecuencias_pago_primas]
+        ).reshape(-1, 1)
+        tiene_asistencia = np.array(asistencias, dtype=float).reshape(-1, 1)
+
+        # (frecuencia, 1, 1, mes) * (perfil, 1, mes) * (asistencia, 1)
+        ajuste_asistencia = (
+            (validadores_pago * frecuencias * costo_mensual_asistencia_funeraria)[
+                :, None, None, :
+            ]
+            * np.asarray(vivos_inicio, dtype=float)[:, None, :]
+            * tiene_asistencia
+        )
+        return -(primas_recurrentes[:, :, None, :] - ajuste_asistencia) * comision
+
     def calcular_variacion_reserva(
         self, varianza_reserva: List[float], varianza_moce: List[float]
     ):
@@ -187,13 +287,6 @@ class FlujoResultado:
     def calcular_vna_resultado(
         self, flujo_resultado: List[float], tasa_costo_capital_mes: float
     ):
-        def calcular_vna_estilo_excel(flujo: list[float], tasa: float) -> float:
-            # Replica EXACTO la función VNA de Excel:
-            # Descuenta todos los flujos, incluyendo el primero
-            return sum(cf / (1 + tasa) ** (t + 1) for t, cf in enumerate(flujo))
-
-        vna_resultado = calcular_vna_estilo_excel(
-            flujo_resultado, tasa_costo_capital_mes
-        )
-
-        return vna_resultado
+        # Replica EXACTO la función VNA de Excel (descuenta todos los flujos,
+        # incluyendo el primero) contra el vector de descuento cacheado
+        return vna(tasa_costo_capital_mes, flujo_resultado)
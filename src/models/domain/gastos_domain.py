@@ -1,4 +1,5 @@
 from typing import List
+import numpy as np
 
 
 class GastosDomain:
@@ -88,3 +89,23 @@ class GastosDomain:
             gasto_mantenimiento_total.append(gasto)
 
         return gasto_mantenimiento_total
+
+    def calcular_gastos_mantenimiento_total_variantes(
+        self,
+        gastos_mantenimiento_prima_co: np.ndarray,
+        gastos_mantenimiento_fijo_poliza_anual: np.ndarray,
+        inflacion_mensual: float,
+        periodo_vigencia: float,
+    ) -> np.ndarray:
+        """
+        calcular_factor_inflacion y calcular_gastos_mantenimiento_total sobre
+        matrices con el mes en el último eje (el factor nulo de los meses sin gasto
+        no cambia el total)
+        """
+        gasto = np.asarray(gastos_mantenimiento_prima_co, dtype=float) + np.asarray(
+            gastos_mantenimiento_fijo_poliza_anual, dtype=float
+        )
+        meses = gasto.shape[-1]
+        factor_inflacion = (1 + inflacion_mensual) ** np.arange(meses)
+        en_vigencia = np.arange(meses) // 12 + 1 <= periodo_vigencia
+        return gasto * factor_inflacion * en_vigencia
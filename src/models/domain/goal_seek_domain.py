@@ -1,5 +1,20 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple
+import itertools
+import math
+import time
+import numpy as np
 from src.models.services.calculo_actuarial_service import CalculoActuarialService
+from src.models.services.conmutacion_service import ConmutacionService
+from src.models.services.suma_asegurada_service import SumaAseguradaService
+from src.models.services.proyeccion_variantes_service import (
+    ProyeccionVariantesService,
+)
+from src.models.services.registro_motores import (
+    ConfiguracionMotores,
+    RegistroMotores,
+)
+from src.models.domain.indice_soluciones import IndiceSoluciones
+from src.models.domain.registro_sombra import ComparacionSombra, RegistroSombra
 from src.common.producto import Producto
 
 
@@ -8,13 +23,40 @@ class GoalSeekDomain:
     Dominio que implementa la lógica de Goal Seek para encontrar el valor de prima_asignada
     que hace que el VNA se acerque más a cero.
     """
+
+    # Soluciones compartidas entre instancias para sembrar perfiles vecinos
+    _indice_soluciones = IndiceSoluciones()
+    # Comparaciones del modo sombra entre el motor activo y el candidato
+    _registro_sombra = RegistroSombra()
     
-    def __init__(self):
+    def __init__(self, modo: str = "biseccion", motor: Optional[str] = None):
+        """
+        Args:
+            modo: "biseccion" (evaluaciones escalares secuenciales) o "vectorizado"
+                (barridos densos con el motor vectorizado y bisección como respaldo)
+            motor: Motor de VNA del RegistroMotores (por defecto el configurado)
+        """
+        self.modo = modo
+        self.motor = motor
         self.tolerance = 1e-6  # Tolerancia para convergencia (máxima precisión)
         self.max_iterations = 100  # Máximo número de iteraciones
         self.min_prima = 0.01  # Prima mínima
         self.max_prima = 10000.0  # Prima máxima (ajustar según necesidad)
+        self.usar_descomposicion = True  # Reusar prima(SA) = a + b * SA por perfil
+        self.usar_semilla_vecinos = True  # Intervalo inicial desde perfiles vecinos
+        self.max_expansiones_semilla = 3  # Ampliaciones del intervalo sembrado
+        self.profundidad_canonica = 24  # Malla de la prima canónica: max_prima / 2**24
+        self.usar_semilla_conmutacion = True  # Intervalo inicial desde la prima estimada
+        self.ancho_semilla_conmutacion = 1.0  # Ancho del intervalo sobre la estimación
+        self.puntos_barrido = 64  # Primas por llamada al motor vectorizado
+        self.max_barridos = 6  # Llamadas máximas al motor vectorizado
+        self.max_iteraciones_secante = 20  # Llamadas máximas de la secante por filas
         self._iterations = 0
+        self._motor = None  # (clave, CalculoActuarialService) reutilizado entre evaluaciones
+        self._motor_vna = None  # (CalculoActuarialService, nombre, motor de VNA)
+        self._ultima_evaluacion = None  # (prima, proyeccion) de la última evaluación escalar
+        self._suma_asegurada_service = SumaAseguradaService()
+        self._conmutacion_service = ConmutacionService()
     
     def execute_goal_seek(
         self, 
@@ -24,7 +66,14 @@ class GoalSeekDomain:
     ) -> Dict[str, Any]:
         """
         Ejecuta el Goal Seek para encontrar la prima_asignada óptima.
-        
+
+        Si el perfil tiene una descomposición prima(SA) válida para la suma
+        asegurada, la prima sale de la recta sin ninguna proyección: ni Goal Seek,
+        ni prima canónica, ni proyección final (esa cobertura queda con
+        proyeccion None y el VNA de equilibrio de la recta). Si no, la prima
+        se resuelve con el Goal Seek y la proyección devuelta es la de su
+        evaluación en la prima óptima.
+
         Args:
             parametros_entrada: Parámetros de entrada del usuario
             parametros_almacenados: Parámetros almacenados
@@ -55,22 +104,101 @@ class GoalSeekDomain:
                 print(f"\n🎯 Optimizando cobertura: {cobertura.upper()}")
                 print("=" * 50)
                 
-                # Realizar Goal Seek para esta cobertura
-                prima_optima, vna_resultado = self._goal_seek_bisection(
-                    parametros_entrada,
-                    parametros_almacenados,
-                    parametros_calculados,
-                    cobertura,
-                    sexo,
-                    fumador
-                )
+                # Si el perfil ya tiene una descomposición válida para esta SA, la
+                # prima de equilibrio es exacta sin proyectar
+                prima_descomposicion = None
+                if self.usar_descomposicion:
+                    prima_descomposicion = (
+                        self._suma_asegurada_service.get_prima_descomposicion(
+                            parametros_entrada, parametros_almacenados, cobertura
+                        )
+                    )
+
+                self._ultima_evaluacion = None
+                proyeccion = None
+                if prima_descomposicion is not None:
+                    # La recta ya es la raíz del tramo: sin canonicalizar ni proyectar
+                    print(f"Prima desde descomposición por suma asegurada: {prima_descomposicion}")
+                    prima_optima = prima_descomposicion
+                    vna_resultado = 0.0
+                    self._iterations = 0
+                    origen = "descomposicion_suma_asegurada"
+                else:
+                    # Realizar Goal Seek para esta cobertura
+                    sombra = (
+                        RegistroMotores.muestrear_sombra() if self.motor is None else None
+                    )
+                    if sombra is not None:
+                        # Copias tomadas antes de que el Goal Seek registre su solución
+                        copias_sombra = self._copias_sombra(
+                            parametros_entrada, parametros_almacenados, parametros_calculados
+                        )
+                    prima_optima, vna_resultado = self._goal_seek_bisection(
+                        parametros_entrada,
+                        parametros_almacenados,
+                        parametros_calculados,
+                        cobertura,
+                        sexo,
+                        fumador
+                    )
+                    origen = "goal_seek"
+                    # Estado de la proyección en la prima del solver
+                    evaluacion_solver = self._ultima_evaluacion
+
+                    if sombra is not None:
+                        self._comparar_en_sombra(
+                            sombra, *copias_sombra, cobertura, sexo, fumador,
+                            prima_optima, vna_resultado
+                        )
+
+                    # La prima no depende de las semillas que dejaron otras peticiones
+                    prima_optima = self._prima_canonica(
+                        parametros_entrada,
+                        parametros_almacenados,
+                        parametros_calculados,
+                        cobertura,
+                        sexo,
+                        fumador,
+                        prima_optima
+                    )
+
+                    # La linealización corrige el residuo del Goal Seek, basta un VNA finito
+                    if self.usar_descomposicion and math.isfinite(vna_resultado):
+                        self._registrar_descomposicion(
+                            parametros_entrada,
+                            parametros_almacenados,
+                            parametros_calculados,
+                            cobertura,
+                            prima_optima,
+                        )
+
+                    # Estado de la proyección en la prima óptima: el de la evaluación
+                    # del solver o de la canonicalización en esa prima, si la hubo
+                    proyeccion = self._proyeccion_final(
+                        parametros_entrada,
+                        parametros_almacenados,
+                        parametros_calculados,
+                        cobertura,
+                        sexo,
+                        fumador,
+                        prima_optima,
+                        (self._ultima_evaluacion, evaluacion_solver)
+                    )
+                    vna_resultado = proyeccion["vna_resultado"]
+
+                if self.usar_semilla_vecinos and math.isfinite(vna_resultado):
+                    self._indice_soluciones.registrar(
+                        parametros_entrada, parametros_almacenados, cobertura, prima_optima
+                    )
                 
                 # Guardar resultado para esta cobertura
                 resultados_por_cobertura[cobertura] = {
                     "prima_asignada_optima": prima_optima,
                     "vna_resultado": vna_resultado,
                     "iteraciones": self._iterations,
-                    "convergio": abs(vna_resultado) < self.tolerance
+                    "convergio": abs(vna_resultado) < self.tolerance,
+                    "origen": origen,
+                    "proyeccion": proyeccion
                 }
                 
                 print(f"✅ {cobertura.upper()} optimizada:")
@@ -91,7 +219,345 @@ class GoalSeekDomain:
                 "prima_asignada_optima": None,
                 "vna_resultado": None
             }
+
+    def execute_goal_seek_variantes(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        frecuencias_pago_primas: Sequence[str],
+        fumadores: Sequence[bool],
+        asistencias: Sequence[Optional[bool]]
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta el Goal Seek de todas las variantes (frecuencia × fumador × asistencia)
+        de cada cobertura a la vez con el motor de variantes. Las variantes que los
+        barridos no resuelven se refinan con regula falsi sobre su fila; las que aun
+        así no alcanzan la tolerancia (sin cambio de signo en [0, max_prima])
+        quedan con prima None y convergio False.
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            parametros_almacenados: Parámetros almacenados
+            parametros_calculados: Parámetros calculados
+            frecuencias_pago_primas: Frecuencias de pago a cotizar
+            fumadores: Estados de fumador a cotizar
+            asistencias: Valores de tiene_asistencia a cotizar (None usa el almacenado)
+
+        Returns:
+            Diccionario con las variantes y, por cobertura, una solución por variante
+        """
+        try:
+            coberturas_obj = parametros_entrada.get("coberturas", {})
+            if isinstance(coberturas_obj, dict):
+                coberturas = [k for k, v in coberturas_obj.items() if v]
+            else:
+                coberturas = coberturas_obj if isinstance(coberturas_obj, list) else []
+
+            if not coberturas:
+                return {"error": "No hay coberturas activas"}
+
+            sexo = parametros_entrada.get("sexo", "M")
+            variantes = list(
+                itertools.product(frecuencias_pago_primas, fumadores, asistencias)
+            )
+
+            resultados_por_cobertura = {}
+            for cobertura in coberturas:
+                print(f"\n🎯 Optimizando {len(variantes)} variantes de: {cobertura.upper()}")
+                print("=" * 50)
+
+                motor = ProyeccionVariantesService(
+                    parametros_entrada,
+                    parametros_almacenados,
+                    parametros_calculados,
+                    Producto.ENDOSOS,
+                    sexo,
+                    cobertura,
+                    frecuencias_pago_primas=frecuencias_pago_primas,
+                    fumadores=fumadores,
+                    asistencias=asistencias
+                )
+                primas, vnas = self._barridos(motor.calcular_vna, len(variantes))
+                iteraciones = self._iterations
+
+                soluciones = []
+                for fila, (frecuencia, fumador, asistencia) in enumerate(variantes):
+                    prima_optima, vna_resultado = float(primas[fila]), float(vnas[fila])
+                    origen = "barrido_variantes"
+                    if math.isnan(prima_optima):
+                        # Regula falsi sobre la fila del mismo motor: el Goal Seek
+                        # escalar proyecta el rescate por meses, no por cuotas
+                        print(
+                            f"Variante {frecuencia}/{fumador}/{asistencia} sin raíz en "
+                            f"los barridos, refinando su fila"
+                        )
+                        prima_optima, vna_resultado = self._goal_seek_fila(
+                            motor.calcular_vna, len(variantes), fila
+                        )
+                        origen = "regula_falsi_variante"
+
+                    convergio = abs(vna_resultado) < self.tolerance
+                    soluciones.append({
+                        # Sin raíz la prima no existe: None en lugar del último intento
+                        "prima_asignada_optima": prima_optima if convergio else None,
+                        "vna_resultado": vna_resultado,
+                        "convergio": convergio,
+                        "origen": origen
+                    })
+
+                resultados_por_cobertura[cobertura] = {
+                    "iteraciones": iteraciones,
+                    "variantes": soluciones
+                }
+                print(f"✅ {cobertura.upper()}: {len(variantes)} variantes en {iteraciones} barridos")
+
+            return {
+                "variantes": [
+                    {
+                        "frecuencia_pago_primas": frecuencia,
+                        "fumador": fumador,
+                        "asistencia": asistencia
+                    }
+                    for frecuencia, fumador, asistencia in variantes
+                ],
+                "coberturas_optimizadas": resultados_por_cobertura,
+                "total_coberturas": len(coberturas),
+                "coberturas_procesadas": list(coberturas)
+            }
+
+        except Exception as e:
+            return {"error": f"Error en Goal Seek de variantes: {str(e)}"}
+
+    def _goal_seek_fila(
+        self,
+        calcular_vna: Callable[[np.ndarray], np.ndarray],
+        filas: int,
+        fila: int
+    ) -> Tuple[float, float]:
+        """
+        Regula falsi (Illinois) sobre una fila de un motor de filas en
+        [0, max_prima], para las filas que los barridos no resolvieron (quiebres
+        cerca de la raíz)
+
+        Args:
+            calcular_vna: Recibe una matriz (filas, k) de primas y devuelve sus VNAs
+            filas: Cantidad de filas del motor
+            fila: Fila a resolver
+
+        Returns:
+            Tupla (prima, vna) de la última evaluación; NaN en la prima si no hay
+            cambio de signo en el rango
+        """
+        def vna_fila(prima: float) -> float:
+            return float(calcular_vna(np.full((filas, 1), prima))[fila, 0])
+
+        prima_low, prima_high = 0.0, self.max_prima
+        vna_low, vna_high = vna_fila(prima_low), vna_fila(prima_high)
+        if not (math.isfinite(vna_low) and math.isfinite(vna_high)) or (
+            vna_low * vna_high > 0
+        ):
+            return float("nan"), float("nan")
+
+        prima, vna = (prima_low, vna_low) if abs(vna_low) < abs(vna_high) else (
+            prima_high, vna_high
+        )
+        lado = 0
+        self._iterations = 0
+        for i in range(self.max_iterations):
+            if abs(vna) < self.tolerance or vna_high == vna_low:
+                break
+            self._iterations = i + 1
+            prima = (prima_low * vna_high - prima_high * vna_low) / (vna_high - vna_low)
+            vna = vna_fila(prima)
+            if vna * vna_low < 0:
+                prima_high, vna_high = prima, vna
+                if lado == -1:
+                    vna_low /= 2
+                lado = -1
+            else:
+                prima_low, vna_low = prima, vna
+                if lado == 1:
+                    vna_high /= 2
+                lado = 1
+            # La tolerancia es de VNA: se sigue hasta agotar la precisión de la prima
+            if prima_high - prima_low <= 0:
+                break
+        return prima, vna
+
+    def _proyeccion_final(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        prima_optima: float,
+        evaluaciones: Sequence[Optional[Tuple[float, Dict[str, Any]]]] = ()
+    ) -> Dict[str, Any]:
+        """
+        Devuelve la proyección completa en la prima óptima. Si alguna de las
+        evaluaciones (prima, proyeccion) capturadas fue en esa misma prima se
+        devuelve su estado; si no (motores que solo calculan VNAs, o una prima
+        canónica que no se evaluó) se proyecta una vez más.
+        """
+        for evaluacion in evaluaciones:
+            if evaluacion is not None and evaluacion[0] == prima_optima:
+                return {**evaluacion[1], "prima_asignada": prima_optima}
+        try:
+            parametros_almacenados = self._deep_copy_params(parametros_almacenados)
+            parametros_almacenados["coberturas"][cobertura]["prima_asignada"] = prima_optima
+            calculo_service = self._get_motor(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                cobertura,
+                sexo,
+                fumador
+            )
+            calculo_service.vna(prima_optima)
+            return {**calculo_service.proyeccion, "prima_asignada": prima_optima}
+        except Exception as e:
+            # Mismo criterio que _calcular_vna_con_prima
+            print(f"Error calculando la proyección con prima {prima_optima}: {e}")
+            return {"prima_asignada": prima_optima, "vna_resultado": float('inf')}
+
+    def _registrar_descomposicion(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        prima_optima: float
+    ) -> None:
+        """
+        Guarda la descomposición prima(SA) del perfil para que los cambios de suma
+        asegurada dentro del tramo no requieran otro Goal Seek. Solo se construye
+        desde la segunda cotización del perfil. Un fallo aquí no afecta la
+        cotización.
+        """
+        try:
+            descomposicion = self._suma_asegurada_service.registrar_descomposicion(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                cobertura,
+                prima_optima
+            )
+            if descomposicion is not None:
+                print(
+                    f"Descomposición guardada: prima = {descomposicion.a:.6f} + "
+                    f"{descomposicion.b:.9f} * SA, válida en "
+                    f"[{descomposicion.suma_asegurada_min:.2f}, "
+                    f"{descomposicion.suma_asegurada_max:.2f}]"
+                )
+        except Exception as e:
+            print(f"No se pudo guardar la descomposición de {cobertura}: {e}")
     
+    def _prima_canonica(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        prima: float
+    ) -> float:
+        """
+        Lleva la prima resuelta a un valor que no depende del camino del solver
+        (semilla de vecinos, de conmutación, descomposición o bisección completa).
+
+        Busca la celda de la malla fija k * max_prima / 2**profundidad_canonica que
+        encierra la raíz y devuelve la raíz de la secante en esa celda. El VNA es
+        monótono en la prima, así que la celda es única y la misma petición da la
+        misma prima sin importar qué se cotizó antes. Si el VNA tiene un quiebre
+        dentro de la celda (primas pequeñas), la secante se refina con regula falsi
+        desde la celda, que tampoco depende del camino. Cuesta tres evaluaciones
+        (más si la prima cae en el borde de la celda o hay un quiebre).
+
+        Returns:
+            La prima canónica, o la prima recibida si no hay cambio de signo cerca
+        """
+        if not (math.isfinite(prima) and 0 < prima < self.max_prima):
+            return prima
+
+        paso = self.max_prima / 2 ** self.profundidad_canonica
+        parametros_almacenados_copy = self._deep_copy_params(parametros_almacenados)
+        vnas = {}
+
+        def vna_nodo(k: int) -> float:
+            if k not in vnas:
+                vnas[k] = self._calcular_vna_con_prima(
+                    parametros_entrada, parametros_almacenados_copy, parametros_calculados,
+                    cobertura, sexo, fumador, k * paso
+                )
+            return vnas[k]
+
+        k = int(prima // paso)
+        for _ in range(3):
+            vna_low, vna_high = vna_nodo(k), vna_nodo(k + 1)
+            if not (math.isfinite(vna_low) and math.isfinite(vna_high)):
+                return prima
+            if vna_low * vna_high <= 0:
+                if vna_low == vna_high:
+                    return k * paso
+                return self._refinar_celda(
+                    parametros_entrada, parametros_almacenados_copy, parametros_calculados,
+                    cobertura, sexo, fumador,
+                    k * paso, vna_low, (k + 1) * paso, vna_high
+                )
+            # Celda vecina del lado donde el VNA se acerca a cero
+            k += 1 if abs(vna_high) < abs(vna_low) else -1
+            if k < 0:
+                return prima
+        return prima
+
+    def _refinar_celda(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        prima_low: float,
+        vna_low: float,
+        prima_high: float,
+        vna_high: float
+    ) -> float:
+        """
+        Raíz de la secante en la celda canónica, refinada con regula falsi
+        (Illinois) mientras su VNA no alcance la tolerancia
+
+        Returns:
+            Prima de la celda con VNA dentro de la tolerancia (o la última secante)
+        """
+        lado = 0
+        prima = prima_low
+        for _ in range(self.max_iterations):
+            prima = (prima_low * vna_high - prima_high * vna_low) / (vna_high - vna_low)
+            vna = self._calcular_vna_con_prima(
+                parametros_entrada, parametros_almacenados, parametros_calculados,
+                cobertura, sexo, fumador, prima
+            )
+            if not math.isfinite(vna) or abs(vna) < self.tolerance:
+                return prima
+            if vna * vna_low < 0:
+                prima_high, vna_high = prima, vna
+                if lado == -1:
+                    vna_low /= 2
+                lado = -1
+            else:
+                prima_low, vna_low = prima, vna
+                if lado == 1:
+                    vna_high /= 2
+                lado = 1
+            if prima_high - prima_low <= 0 or vna_high == vna_low:
+                break
+        return prima
+
     def _goal_seek_bisection(
         self,
         parametros_entrada: Dict[str, Any],
@@ -109,6 +575,43 @@ class GoalSeekDomain:
         """
         # Crear copias de los parámetros para no modificar los originales
         parametros_almacenados_copy = self._deep_copy_params(parametros_almacenados)
+
+        # Arranque en caliente con un intervalo interpolado desde perfiles vecinos
+        if self.usar_semilla_vecinos:
+            semilla = self._indice_soluciones.get_intervalo(
+                parametros_entrada, parametros_almacenados, cobertura
+            )
+            if semilla is not None:
+                resultado = self._goal_seek_semilla(
+                    parametros_entrada, parametros_almacenados_copy, parametros_calculados,
+                    cobertura, sexo, fumador, semilla
+                )
+                if resultado is not None:
+                    return resultado
+                print("La semilla de vecinos no encierra la raíz, usando el rango completo")
+
+        # Sin vecinos, arranque desde la prima estimada con tablas de conmutación
+        if self.usar_semilla_conmutacion:
+            semilla = self._semilla_conmutacion(
+                parametros_entrada, parametros_almacenados, cobertura, sexo, fumador
+            )
+            if semilla is not None:
+                resultado = self._goal_seek_semilla(
+                    parametros_entrada, parametros_almacenados_copy, parametros_calculados,
+                    cobertura, sexo, fumador, semilla
+                )
+                if resultado is not None:
+                    return resultado
+                print("La semilla de conmutación no encierra la raíz, usando el rango completo")
+
+        if self.modo == "vectorizado":
+            resultado = self._goal_seek_vectorizado(
+                parametros_entrada, parametros_almacenados_copy, parametros_calculados,
+                cobertura, sexo, fumador
+            )
+            if resultado is not None:
+                return resultado
+            print("El barrido vectorizado no encontró la raíz, usando bisección")
         
         # Empezar siempre desde 0 para encontrar la prima óptima real
         prima_inicial = 0.0
@@ -157,7 +660,8 @@ class GoalSeekDomain:
             if vna_low > 0:
                 # VNA positivo, buscar hacia abajo
                 print("Buscando cambio de signo hacia primas menores...")
-                prima_high = prima_low * 2
+                # Desde min_prima: con prima_low = 0 el doble nunca avanza
+                prima_high = max(prima_low * 2, self.min_prima)
                 while prima_high < self.max_prima:
                     vna_high = self._calcular_vna_con_prima(
                         parametros_entrada, parametros_almacenados_copy, parametros_calculados,
@@ -170,7 +674,7 @@ class GoalSeekDomain:
             else:
                 # VNA negativo, buscar hacia arriba
                 print("Buscando cambio de signo hacia primas mayores...")
-                prima_high = prima_low * 2
+                prima_high = max(prima_low * 2, self.min_prima)
                 while prima_high < self.max_prima:
                     vna_high = self._calcular_vna_con_prima(
                         parametros_entrada, parametros_almacenados_copy, parametros_calculados,
@@ -224,6 +728,351 @@ class GoalSeekDomain:
         
         return prima_final, vna_final
     
+    def _semilla_conmutacion(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Intervalo inicial a partir de la prima estimada con las tablas de
+        conmutación. La estimación no carga gastos ni costo de capital, así que
+        suele quedar por debajo de la prima (a veces muy por debajo, con
+        devolución alta y suma asegurada baja); el intervalo se abre hacia arriba
+        y _goal_seek_semilla lo amplía por la secante si no encierra la raíz.
+
+        Returns:
+            Tupla (prima_low, prima_high) o None si no hay estimación
+        """
+        prima_estimada = self._conmutacion_service.estimar_prima(
+            parametros_entrada,
+            cobertura,
+            sexo,
+            fumador,
+            parametros_almacenados["coberturas"][cobertura].get(
+                "fraccionamiento_primas"
+            ) or 1,
+        )
+        if prima_estimada is None or not (0 < prima_estimada < self.max_prima):
+            return None
+        return prima_estimada, prima_estimada * (1 + self.ancho_semilla_conmutacion)
+
+    def _goal_seek_semilla(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        semilla: Tuple[float, float]
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Busca la raíz dentro del intervalo sembrado usando regula falsi (Illinois).
+        El VNA es lineal por tramos en la prima, así que converge en pocas
+        evaluaciones cuando el intervalo es estrecho.
+
+        Returns:
+            Tupla con (prima_optima, vna_resultado) o None si el intervalo, aun
+            ampliado, no encierra un cambio de signo
+        """
+        prima_low, prima_high = semilla
+        vna_low = self._calcular_vna_con_prima(
+            parametros_entrada, parametros_almacenados, parametros_calculados,
+            cobertura, sexo, fumador, prima_low
+        )
+        vna_high = self._calcular_vna_con_prima(
+            parametros_entrada, parametros_almacenados, parametros_calculados,
+            cobertura, sexo, fumador, prima_high
+        )
+        print(f"Semilla: [{prima_low}, {prima_high}], VNA=[{vna_low}, {vna_high}]")
+
+        # Ampliar hacia el lado donde debe estar la raíz
+        for _ in range(self.max_expansiones_semilla):
+            if not (math.isfinite(vna_low) and math.isfinite(vna_high)):
+                return None
+            if vna_low * vna_high <= 0:
+                break
+            ancho = prima_high - prima_low
+            if abs(vna_low) < abs(vna_high):
+                paso = self._paso_expansion(ancho, vna_low, vna_high)
+                prima_high, vna_high = prima_low, vna_low
+                prima_low = max(prima_low - paso, 0.0)
+                vna_low = self._calcular_vna_con_prima(
+                    parametros_entrada, parametros_almacenados, parametros_calculados,
+                    cobertura, sexo, fumador, prima_low
+                )
+            else:
+                paso = self._paso_expansion(ancho, vna_high, vna_low)
+                prima_low, vna_low = prima_high, vna_high
+                prima_high = min(prima_high + paso, self.max_prima)
+                vna_high = self._calcular_vna_con_prima(
+                    parametros_entrada, parametros_almacenados, parametros_calculados,
+                    cobertura, sexo, fumador, prima_high
+                )
+        if not (math.isfinite(vna_low) and math.isfinite(vna_high)) or vna_low * vna_high > 0:
+            return None
+
+        if abs(vna_low) < self.tolerance:
+            return prima_low, vna_low
+        if abs(vna_high) < self.tolerance:
+            return prima_high, vna_high
+
+        self._iterations = 0
+        lado = 0
+        for i in range(self.max_iterations):
+            self._iterations = i + 1
+
+            prima_media = (prima_low * vna_high - prima_high * vna_low) / (vna_high - vna_low)
+            vna_media = self._calcular_vna_con_prima(
+                parametros_entrada, parametros_almacenados, parametros_calculados,
+                cobertura, sexo, fumador, prima_media
+            )
+
+            print(f"Iteración {i+1}: prima={prima_media:.6f}, VNA={vna_media:.12f}")
+
+            if abs(vna_media) < self.tolerance:
+                return prima_media, vna_media
+
+            if vna_media * vna_low < 0:
+                prima_high, vna_high = prima_media, vna_media
+                if lado == -1:
+                    vna_low /= 2
+                lado = -1
+            else:
+                prima_low, vna_low = prima_media, vna_media
+                if lado == 1:
+                    vna_high /= 2
+                lado = 1
+
+            if abs(prima_high - prima_low) < self.tolerance:
+                break
+
+        prima_final = (prima_low + prima_high) / 2
+        vna_final = self._calcular_vna_con_prima(
+            parametros_entrada, parametros_almacenados, parametros_calculados,
+            cobertura, sexo, fumador, prima_final
+        )
+        return prima_final, vna_final
+
+    def _paso_expansion(
+        self, ancho: float, vna_cercano: float, vna_lejano: float
+    ) -> float:
+        """
+        Distancia a la que se amplía el intervalo sembrado desde su extremo más
+        cercano a la raíz. El VNA es lineal por tramos en la prima, así que la
+        secante de los dos extremos extrapola la raíz aunque la semilla quede
+        lejos; el paso la sobrepasa un 25% para encerrarla, y nunca es menor que
+        el doble del ancho (el paso fijo si la secante no apunta a la raíz).
+
+        Args:
+            ancho: Ancho del intervalo actual
+            vna_cercano: VNA del extremo desde el que se amplía
+            vna_lejano: VNA del otro extremo
+
+        Returns:
+            Distancia desde el extremo cercano hasta el nuevo extremo
+        """
+        paso = 2 * ancho
+        if abs(vna_lejano) > abs(vna_cercano):
+            extrapolado = ancho * abs(vna_cercano) / (abs(vna_lejano) - abs(vna_cercano))
+            paso = max(paso, 1.25 * extrapolado)
+        return paso
+
+    def _goal_seek_vectorizado(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Busca la raíz con barridos densos del motor vectorizado (ver _barridos).
+
+        Returns:
+            Tupla con (prima_optima, vna_resultado) o None si no hay cambio de signo
+        """
+        # El motor escalar se construye con prima 0; los barridos la reemplazan
+        parametros_almacenados["coberturas"][cobertura]["prima_asignada"] = 0.0
+        motor = self._get_motor_vna(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            cobertura,
+            sexo,
+            fumador
+        )
+
+        primas, vnas = self._barridos(
+            lambda primas: motor.calcular_vna(primas[0])[None, :], 1
+        )
+        if np.isnan(primas[0]):
+            return None
+        return float(primas[0]), float(vnas[0])
+
+    def execute_goal_seek_filas(
+        self,
+        calcular_vna: Callable[[np.ndarray], np.ndarray],
+        filas: int,
+        primas_iniciales: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """
+        Resuelve varias funciones VNA(prima) independientes con los mismos barridos
+        (por ejemplo, un escenario de supuestos por fila del motor vectorizado).
+
+        Args:
+            calcular_vna: Recibe una matriz (filas, k) de primas y devuelve sus VNAs
+            filas: Cantidad de funciones a resolver
+            primas_iniciales: Primas cercanas a la raíz por fila (opcional); con
+                ellas se itera primero con la secante y solo las filas que no
+                convergen pasan a los barridos
+
+        Returns:
+            Diccionario con los vectores primas y vnas (NaN en las filas sin raíz) y
+            los barridos usados
+        """
+        if primas_iniciales is None:
+            primas, vnas = self._barridos(calcular_vna, filas)
+            return {"primas": primas, "vnas": vnas, "iteraciones": self._iterations}
+
+        primas, vnas = self._secante_filas(calcular_vna, primas_iniciales)
+        iteraciones = self._iterations
+        pendientes = np.isnan(primas)
+        if pendientes.any():
+            print(f"{int(pendientes.sum())} de {filas} filas sin convergencia, usando barridos")
+            primas_barrido, vnas_barrido = self._barridos(calcular_vna, filas)
+            primas[pendientes] = primas_barrido[pendientes]
+            vnas[pendientes] = vnas_barrido[pendientes]
+            iteraciones += self._iterations
+        return {"primas": primas, "vnas": vnas, "iteraciones": iteraciones}
+
+    def _secante_filas(
+        self,
+        calcular_vna: Callable[[np.ndarray], np.ndarray],
+        primas_iniciales: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Método de la secante simultáneo desde una prima inicial por fila: la primera
+        llamada al motor evalúa la prima inicial y una levemente mayor, y cada
+        llamada siguiente solo la nueva prima de cada fila (el paso es exacto si el
+        VNA es lineal entre las dos últimas primas y la raíz).
+
+        Returns:
+            Vectores (primas, vnas) por fila; NaN en las filas que no convergen
+        """
+        primas = np.array(primas_iniciales, dtype=float)
+        paso = np.maximum(np.abs(primas) * 1e-6, 1e-6)
+        vnas = calcular_vna(np.stack([primas, primas + paso], axis=-1))
+        primas_previas, vnas_previas = primas + paso, vnas[:, 1]
+        vnas = vnas[:, 0]
+
+        primas_optimas = np.full(primas.shape, np.nan)
+        vnas_optimas = np.full(primas.shape, np.nan)
+        activas = np.ones(primas.shape, dtype=bool)
+        self._iterations = 1
+        while True:
+            convergidas = activas & (np.abs(vnas) < self.tolerance)
+            primas_optimas[convergidas] = primas[convergidas]
+            vnas_optimas[convergidas] = vnas[convergidas]
+            activas &= ~convergidas
+
+            # Las filas ya resueltas no se mueven y dan 0 / 0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                pendiente = (vnas - vnas_previas) / (primas - primas_previas)
+            activas &= pendiente > 0
+            if not activas.any() or self._iterations >= self.max_iteraciones_secante:
+                break
+
+            pendiente = np.where(activas, pendiente, 1.0)
+            primas_previas, vnas_previas = primas, vnas
+            primas = np.where(activas, np.maximum(primas - vnas / pendiente, 0.0), primas)
+            vnas = calcular_vna(primas[:, None])[:, 0]
+            self._iterations += 1
+
+        print(
+            f"Secante: {int((~np.isnan(primas_optimas)).sum())} de {primas.size} filas "
+            f"en {self._iterations} llamadas"
+        )
+        return primas_optimas, vnas_optimas
+
+    def _barridos(
+        self,
+        calcular_vna: Callable[[np.ndarray], np.ndarray],
+        filas: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Barridos densos simultáneos para varias funciones VNA(prima) independientes:
+        el primer barrido cubre [0, max_prima] y cada uno siguiente el subintervalo
+        con cambio de signo de cada fila, junto con la interpolación lineal del
+        anterior (exacta si el VNA no tiene quiebres en ese subintervalo).
+
+        Args:
+            calcular_vna: Recibe una matriz (filas, k) de primas y devuelve sus VNAs
+            filas: Cantidad de funciones a resolver
+
+        Returns:
+            Vectores (primas, vnas) por fila; NaN en las filas sin raíz encontrada
+        """
+        prima_low = np.zeros(filas)
+        prima_high = np.full(filas, self.max_prima)
+        candidatas = None
+        primas_optimas = np.full(filas, np.nan)
+        vnas_optimas = np.full(filas, np.nan)
+        activas = np.ones(filas, dtype=bool)
+        self._iterations = 0
+        for i in range(self.max_barridos):
+            if not activas.any():
+                break
+            self._iterations = i + 1
+
+            primas = np.linspace(prima_low, prima_high, self.puntos_barrido, axis=-1)
+            if candidatas is not None:
+                primas = np.concatenate([primas, candidatas[:, None]], axis=1)
+            vnas = calcular_vna(primas)
+
+            print(
+                f"Barrido {i+1}: {int(activas.sum())} de {filas} filas "
+                f"con {primas.shape[1]} primas"
+            )
+
+            for fila in np.nonzero(activas)[0]:
+                convergidas = np.nonzero(np.abs(vnas[fila]) < self.tolerance)[0]
+                if convergidas.size:
+                    j = convergidas[np.argmin(np.abs(vnas[fila, convergidas]))]
+                    primas_optimas[fila] = primas[fila, j]
+                    vnas_optimas[fila] = vnas[fila, j]
+                    activas[fila] = False
+                    continue
+
+                malla = vnas[fila, : self.puntos_barrido]
+                cambios = np.nonzero(malla[:-1] * malla[1:] < 0)[0]
+                if not cambios.size:
+                    activas[fila] = False
+                    continue
+
+                k = cambios[0]
+                prima_low[fila], prima_high[fila] = primas[fila, k], primas[fila, k + 1]
+                vna_low, vna_high = malla[k], malla[k + 1]
+                if candidatas is None:
+                    candidatas = np.zeros(filas)
+                candidatas[fila] = prima_low[fila] - vna_low * (
+                    prima_high[fila] - prima_low[fila]
+                ) / (vna_high - vna_low)
+
+                if abs(prima_high[fila] - prima_low[fila]) < self.tolerance:
+                    activas[fila] = False
+
+        return primas_optimas, vnas_optimas
+
+    @classmethod
+    def limpiar_indice_soluciones(cls):
+        """Limpia las soluciones usadas para sembrar el Goal Seek"""
+        cls._indice_soluciones.limpiar()
+    
     def _calcular_vna_con_prima(
         self,
         parametros_entrada: Dict[str, Any],
@@ -247,26 +1096,195 @@ class GoalSeekDomain:
             # Actualizar la prima en los parámetros almacenados
             parametros_almacenados["coberturas"][cobertura]["prima_asignada"] = prima_asignada
             
-            # Crear instancia del servicio de cálculo actuarial
-            calculo_service = CalculoActuarialService(
-                parametros_entrada=parametros_entrada,
-                parametros_almacenados=parametros_almacenados,
-                parametros_calculados=parametros_calculados,
-                producto=Producto.ENDOSOS,
-                sexo=sexo,
-                fumador=fumador,
-                cobertura=cobertura
+            # Motor de la cobertura construido una vez por Goal Seek: solo cambia la
+            # prima, y una sola prima se evalúa con el kernel escalar fusionado
+            motor_vna = self._get_motor_vna(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                cobertura,
+                sexo,
+                fumador
             )
-            
-            # Ejecutar el cálculo y obtener el VNA
-            vna = calculo_service.execute()
-            
+            calculo_service = self._motor_vna[0]
+            calculo_service.proyeccion = None
+            vna = float(motor_vna.calcular_vna([prima_asignada])[0])
+            # El motor de referencia deja el estado de la proyección en esta prima
+            if calculo_service.proyeccion is not None:
+                self._ultima_evaluacion = (prima_asignada, calculo_service.proyeccion)
             return vna
             
         except Exception as e:
             print(f"Error calculando VNA con prima {prima_asignada}: {e}")
             return float('inf')  # Retornar un valor muy grande para indicar error
     
+    def _get_motor(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool
+    ) -> CalculoActuarialService:
+        """
+        Devuelve el CalculoActuarialService de la última evaluación si corresponde a
+        los mismos parámetros (salvo la prima); si no, construye uno nuevo.
+        """
+        parametros_cobertura = {
+            nombre: valor
+            for nombre, valor in parametros_almacenados["coberturas"][cobertura].items()
+            if nombre != "prima_asignada"
+        }
+        if self._motor is not None:
+            entrada, calculados, clave, parametros, motor = self._motor
+            if (
+                entrada is parametros_entrada
+                and calculados is parametros_calculados
+                and clave == (cobertura, sexo, fumador)
+                and parametros == parametros_cobertura
+            ):
+                return motor
+
+        motor = CalculoActuarialService(
+            parametros_entrada=parametros_entrada,
+            parametros_almacenados=parametros_almacenados,
+            parametros_calculados=parametros_calculados,
+            producto=Producto.ENDOSOS,
+            sexo=sexo,
+            fumador=fumador,
+            cobertura=cobertura
+        )
+        self._motor = (
+            parametros_entrada,
+            parametros_calculados,
+            (cobertura, sexo, fumador),
+            parametros_cobertura,
+            motor,
+        )
+        return motor
+
+    def _get_motor_vna(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool
+    ) -> Any:
+        """
+        Devuelve el motor de VNAs del RegistroMotores (el de esta instancia o el
+        configurado) construido sobre el CalculoActuarialService de _get_motor.
+        """
+        calculo_service = self._get_motor(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            cobertura,
+            sexo,
+            fumador
+        )
+        nombre = self.motor or RegistroMotores.get_configuracion().motor
+        if (
+            self._motor_vna is None
+            or self._motor_vna[0] is not calculo_service
+            or self._motor_vna[1] != nombre
+        ):
+            self._motor_vna = (
+                calculo_service,
+                nombre,
+                RegistroMotores.crear(nombre, calculo_service),
+            )
+        return self._motor_vna[2]
+
+    def _copias_sombra(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """Copias de los parámetros para la comparación en segundo plano"""
+        return (
+            self._deep_copy_params(parametros_entrada),
+            self._deep_copy_params(parametros_almacenados),
+            self._deep_copy_params(parametros_calculados),
+        )
+
+    def _comparar_en_sombra(
+        self,
+        configuracion: ConfiguracionMotores,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        prima_optima: float,
+        vna_resultado: float
+    ) -> None:
+        """
+        Encola la comparación en sombra de una cotización: resuelve el mismo Goal
+        Seek con el motor activo y con el candidato (sin semilla de vecinos, para
+        medir ambos en las mismas condiciones), compara la prima del candidato y
+        su VNA en la prima óptima contra la respuesta y registra la diferencia de
+        tiempo. No modifica la respuesta ni la demora.
+        """
+
+        def resolver(nombre: str) -> Tuple["GoalSeekDomain", float, float, float]:
+            dominio = GoalSeekDomain(modo=self.modo, motor=nombre)
+            dominio.usar_semilla_vecinos = False
+            inicio = time.perf_counter()
+            prima, vna = dominio._goal_seek_bisection(
+                parametros_entrada, parametros_almacenados, parametros_calculados,
+                cobertura, sexo, fumador
+            )
+            return dominio, prima, vna, time.perf_counter() - inicio
+
+        def comparar() -> ComparacionSombra:
+            _, _, _, segundos_motor = resolver(configuracion.motor)
+            dominio, prima_candidato, _, segundos_candidato = resolver(
+                configuracion.candidato
+            )
+            vna_candidato = dominio._calcular_vna_con_prima(
+                parametros_entrada,
+                self._deep_copy_params(parametros_almacenados),
+                parametros_calculados,
+                cobertura,
+                sexo,
+                fumador,
+                prima_optima
+            )
+            coincide = bool(
+                abs(prima_candidato - prima_optima)
+                <= configuracion.tolerancia_prima * max(abs(prima_optima), 1.0)
+                and abs(vna_candidato - vna_resultado) <= configuracion.tolerancia_vna
+            )
+            return ComparacionSombra(
+                cobertura=cobertura,
+                motor=configuracion.motor,
+                candidato=configuracion.candidato,
+                prima_motor=prima_optima,
+                prima_candidato=prima_candidato,
+                vna_motor=vna_resultado,
+                vna_candidato=vna_candidato,
+                segundos_motor=segundos_motor,
+                segundos_candidato=segundos_candidato,
+                coincide=coincide,
+            )
+
+        self._registro_sombra.enviar(comparar)
+
+    @classmethod
+    def resumen_sombra(cls) -> Dict[str, Any]:
+        """Comparaciones registradas por el modo sombra (ver RegistroSombra.resumen)"""
+        return cls._registro_sombra.resumen()
+
+    @classmethod
+    def limpiar_sombra(cls):
+        """Descarta las comparaciones del modo sombra"""
+        cls._registro_sombra.limpiar()
+
     def _deep_copy_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Realiza una copia profunda de los parámetros para no modificar los originales.
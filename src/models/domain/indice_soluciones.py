@@ -0,0 +1,157 @@
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import threading
+from src.infrastructure.repositories import supuestos_repository
+from src.helpers.clave_estable import clave_estable
+
+# Ejes en los que se buscan perfiles vecinos y su escala (una unidad de distancia)
+EJES_VECINDAD = {
+    "edad_actuarial": 1.0,
+    "periodo_vigencia": 1.0,
+    "periodo_pago_primas": 1.0,
+    "porcentaje_devolucion": 5.0,
+}
+
+# Máximo de grupos (perfiles salvo los ejes) y de soluciones por grupo
+MAX_GRUPOS = 1024
+MAX_SOLUCIONES_POR_GRUPO = 2048
+
+
+class IndiceSoluciones:
+    """
+    Índice de primas ya resueltas por el Goal Seek, agrupadas por todo lo que define
+    la proyección salvo edad, plazos y porcentaje de devolución.
+
+    Sirve para sembrar el Goal Seek de un perfil nuevo con un intervalo estrecho
+    interpolado desde los vecinos más cercanos ya resueltos. La semilla solo acorta
+    la búsqueda: el Goal Seek lleva la prima a su valor canónico, que no depende de
+    lo que haya en el índice.
+    """
+
+    def __init__(
+        self,
+        max_vecinos: int = 4,
+        distancia_maxima: float = 6.0,
+        radio_relativo_minimo: float = 0.02,
+    ):
+        self.max_vecinos = max_vecinos
+        self.distancia_maxima = distancia_maxima
+        self.radio_relativo_minimo = radio_relativo_minimo
+        self._soluciones: Dict[str, Dict[Tuple, float]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        cobertura: str,
+        prima: float,
+    ) -> None:
+        """Guarda la prima resuelta de un perfil"""
+        grupo = self._clave_grupo(parametros_entrada, parametros_almacenados, cobertura)
+        coordenadas = self._coordenadas(parametros_entrada)
+        if coordenadas is None or not math.isfinite(prima):
+            return
+
+        with self._lock:
+            if grupo not in self._soluciones and len(self._soluciones) >= MAX_GRUPOS:
+                self._soluciones.clear()
+            soluciones = self._soluciones.setdefault(grupo, {})
+            if len(soluciones) >= MAX_SOLUCIONES_POR_GRUPO:
+                soluciones.clear()
+            soluciones[coordenadas] = prima
+
+    def get_intervalo(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        cobertura: str,
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Intervalo inicial para el Goal Seek interpolado desde los vecinos resueltos
+
+        Returns:
+            Tupla (prima_low, prima_high) o None si no hay vecinos cercanos
+        """
+        grupo = self._clave_grupo(parametros_entrada, parametros_almacenados, cobertura)
+        coordenadas = self._coordenadas(parametros_entrada)
+        if coordenadas is None:
+            return None
+
+        with self._lock:
+            soluciones = list(self._soluciones.get(grupo, {}).items())
+        if not soluciones:
+            return None
+
+        vecinos = self._vecinos(coordenadas, soluciones)
+        if not vecinos:
+            return None
+
+        distancia, prima = vecinos[0]
+        if distancia == 0:
+            # Mismo perfil ya resuelto: intervalo mínimo alrededor de la solución
+            radio = 1e-3 * abs(prima) + 1e-6
+            return prima - radio, prima + radio
+
+        # Interpolación por inverso del cuadrado de la distancia
+        pesos = [1 / d**2 for d, _ in vecinos]
+        estimada = sum(w * p for w, (_, p) in zip(pesos, vecinos)) / sum(pesos)
+        radio = max(
+            self.radio_relativo_minimo * abs(estimada),
+            max(abs(p - estimada) for _, p in vecinos),
+            1e-6,
+        )
+        return max(estimada - radio, 0.0), estimada + radio
+
+    def limpiar(self) -> None:
+        """Elimina todas las soluciones guardadas"""
+        with self._lock:
+            self._soluciones.clear()
+
+    def _vecinos(
+        self, coordenadas: Tuple, soluciones: List[Tuple[Tuple, float]]
+    ) -> List[Tuple[float, float]]:
+        """Los vecinos más cercanos dentro de distancia_maxima como (distancia, prima)"""
+        vecinos = []
+        for otras, prima in soluciones:
+            distancia = math.sqrt(
+                sum(
+                    ((a - b) / escala) ** 2
+                    for a, b, escala in zip(coordenadas, otras, EJES_VECINDAD.values())
+                )
+            )
+            if distancia <= self.distancia_maxima:
+                vecinos.append((distancia, prima))
+        vecinos.sort(key=lambda vecino: vecino[0])
+        return vecinos[: self.max_vecinos]
+
+    def _coordenadas(self, parametros_entrada: Dict[str, Any]) -> Optional[Tuple]:
+        """Coordenadas numéricas del perfil en los ejes de vecindad"""
+        try:
+            return tuple(float(parametros_entrada[eje]) for eje in EJES_VECINDAD)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _clave_grupo(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        cobertura: str,
+    ) -> str:
+        """
+        Clave del grupo: el perfil sin los ejes de vecindad ni la prima, más la
+        versión de los supuestos
+        """
+        parametros_cobertura = parametros_almacenados.get("coberturas", {}).get(
+            cobertura, {}
+        )
+        return clave_estable(
+            cobertura,
+            supuestos_repository.get_version(),
+            {
+                k: v
+                for k, v in parametros_entrada.items()
+                if k not in EJES_VECINDAD and k != "coberturas"
+            },
+            {k: v for k, v in parametros_cobertura.items() if k != "prima_asignada"},
+        )
@@ -0,0 +1,198 @@
+from typing import Any, Dict, Sequence
+import numpy as np
+from src.helpers.redondeo_mensual import redondeo_mensual
+
+# Flujos de la utilidad antes de PI y MS que se suman mes a mes (afines en la prima)
+FLUJOS_UTILIDAD = (
+    "primas_recurrentes",
+    "comision",
+    "gastos_mantenimiento",
+    "siniestros",
+    "rescate_ajuste_devolucion",
+)
+
+
+class KernelEscalarDomain:
+    """
+    VNA de una sola prima en una pasada fusionada, sin listas intermedias.
+
+    Como en ProyeccionVectorizadaDomain, lo que es afín en la prima (flujo pasivo,
+    comparador de rescate y flujos de la utilidad) se precalcula por mes como
+    (constante, pendiente). El resto de la cadena (saldo de reserva con sus pisos,
+    MOCE, margen de solvencia, variaciones, IR, producto de inversión y flujo de
+    resultado) se evalúa en un único recorrido del último mes al primero: los VNA
+    de los flujos siguientes se acumulan por recurrencia, la variación del mes
+    k + 1 se cierra al conocer el mes k, y el VNA del flujo de resultado se
+    descuenta por Horner. Solo admite tasas escalares y proyecciones sin ejes de
+    variantes.
+    """
+
+    def __init__(
+        self,
+        proyeccion_base: Dict[str, Any],
+        proyeccion_unitaria: Dict[str, Any],
+        prima_unitaria: float,
+        tasa_interes_mensual: float,
+        tir_mensual: float,
+        margen_solvencia: float,
+        reserva: float,
+        tasa_inversion: float,
+        impuesto_renta: float,
+        tasa_costo_capital_mes: float,
+    ):
+        """
+        Args:
+            proyeccion_base: Estado de la proyección escalar con prima 0
+            proyeccion_unitaria: Estado de la proyección escalar con prima_unitaria
+            prima_unitaria: Prima usada para la segunda proyección
+        """
+
+        def afin(nombre: str):
+            base = np.asarray(proyeccion_base[nombre], dtype=float)
+            unitaria = np.asarray(proyeccion_unitaria[nombre], dtype=float)
+            return base, (unitaria - base) / prima_unitaria
+
+        vivos_inicio = np.asarray(proyeccion_base["vivos_inicio"], dtype=float)
+        flujo_pasivo = afin("flujo_pasivo")
+        rescate = afin("rescate")
+        utilidad = [afin(nombre) for nombre in FLUJOS_UTILIDAD]
+        utilidad_constante = utilidad[0][0].copy()
+        utilidad_pendiente = utilidad[0][1].copy()
+        for constante, pendiente in utilidad[1:]:
+            utilidad_constante += constante
+            utilidad_pendiente += pendiente
+
+        # Un registro por mes, del último al primero, con floats de Python
+        self._meses_inversos = tuple(
+            zip(
+                flujo_pasivo[0].tolist(),
+                flujo_pasivo[1].tolist(),
+                (rescate[0] * vivos_inicio).tolist(),
+                (rescate[1] * vivos_inicio).tolist(),
+                utilidad_constante.tolist(),
+                utilidad_pendiente.tolist(),
+            )
+        )[::-1]
+        self.meses = len(self._meses_inversos)
+
+        gastos_adquisicion = afin("gastos_adquisicion")
+        self._gastos_adquisicion = (
+            float(gastos_adquisicion[0]),
+            float(gastos_adquisicion[1]),
+        )
+
+        self.tasa_interes_mensual = float(tasa_interes_mensual)
+        self.tir_mensual = float(tir_mensual)
+        self.margen_solvencia = float(margen_solvencia)
+        self.reserva = float(reserva)
+        self.tasa_inversion_mensual = redondeo_mensual(float(tasa_inversion))
+        self.impuesto_renta = float(impuesto_renta)
+        self.tasa_costo_capital_mes = float(tasa_costo_capital_mes)
+
+    def calcular_vna(self, prima: float) -> float:
+        """
+        VNA del flujo de resultado para una prima_asignada
+
+        Args:
+            prima: Prima asignada
+
+        Returns:
+            VNA de la proyección (mismo valor que calcular_vna del motor
+            vectorizado, salvo el redondeo de punto flotante)
+        """
+        prima = float(prima)
+        descuento_reserva = 1 / (1 + self.tasa_interes_mensual)
+        descuento_resultado = 1 / (1 + self.tasa_costo_capital_mes)
+        tir_mensual = self.tir_mensual
+        margen_solvencia = self.margen_solvencia
+        reserva = self.reserva
+        tasa_inversion_mensual = self.tasa_inversion_mensual
+        impuesto_renta = self.impuesto_renta
+
+        # Valores del mes siguiente (k + 1) al que se está recorriendo (k)
+        flujo_pasivo_siguiente = 0.0
+        vna_pasivo_siguientes = 0.0
+        margen_reserva_siguiente = 0.0
+        vna_margen_siguientes = 0.0
+        saldo_siguiente = moce_siguiente = margen_siguiente = 0.0
+        utilidad_siguiente = producto_inversion_siguiente = 0.0
+        vna_resultado = 0.0
+        cierre = True
+
+        for (
+            pasivo_constante,
+            pasivo_pendiente,
+            comparador_constante,
+            comparador_pendiente,
+            utilidad_constante,
+            utilidad_pendiente,
+        ) in self._meses_inversos:
+            # Saldo de reserva: max(max(flujo + VNA siguientes, 0), rescate * vivos)
+            flujo_pasivo = pasivo_constante + prima * pasivo_pendiente
+            vna_pasivo_siguientes = (
+                flujo_pasivo_siguiente + vna_pasivo_siguientes
+            ) * descuento_reserva
+            saldo = flujo_pasivo + vna_pasivo_siguientes
+            if saldo < 0:
+                saldo = 0.0
+            comparador = comparador_constante + prima * comparador_pendiente
+            if comparador > saldo:
+                saldo = comparador
+
+            # MOCE, margen de solvencia y producto de inversión del mes
+            margen_reserva = saldo * margen_solvencia
+            vna_margen_siguientes = (
+                margen_reserva_siguiente + vna_margen_siguientes
+            ) * descuento_reserva
+            moce = tir_mensual * (vna_margen_siguientes + margen_reserva)
+            reserva_fin_año = saldo + moce
+            margen = reserva_fin_año * reserva
+            producto_inversion = (
+                reserva_fin_año * tasa_inversion_mensual
+                + margen * tasa_inversion_mensual
+            )
+
+            # Flujo de resultado del mes siguiente, que ya tiene su variación
+            if cierre:
+                # Mes adicional de cierre: libera el último saldo y margen
+                utilidad = abs(saldo + moce)
+                variacion_margen = margen
+                flujo_resultado = (
+                    utilidad + variacion_margen + utilidad * impuesto_renta
+                ) + (abs(variacion_margen) - variacion_margen)
+                cierre = False
+            else:
+                utilidad = (
+                    (saldo - saldo_siguiente) + (moce - moce_siguiente)
+                ) + utilidad_siguiente
+                variacion_margen = margen - margen_siguiente
+                flujo_resultado = (
+                    utilidad + variacion_margen + utilidad * impuesto_renta
+                ) + producto_inversion_siguiente
+            vna_resultado = (vna_resultado + flujo_resultado) * descuento_resultado
+
+            flujo_pasivo_siguiente = flujo_pasivo
+            margen_reserva_siguiente = margen_reserva
+            saldo_siguiente = saldo
+            moce_siguiente = moce
+            margen_siguiente = margen
+            utilidad_siguiente = utilidad_constante + prima * utilidad_pendiente
+            producto_inversion_siguiente = producto_inversion
+
+        # Primer mes: constituye la reserva y paga la adquisición
+        gastos_adquisicion = (
+            self._gastos_adquisicion[0] + prima * self._gastos_adquisicion[1]
+        )
+        utilidad = (
+            (-saldo_siguiente - moce_siguiente) + utilidad_siguiente
+        ) + gastos_adquisicion
+        flujo_resultado = (
+            utilidad - margen_siguiente + utilidad * impuesto_renta
+        ) + producto_inversion_siguiente
+        return (vna_resultado + flujo_resultado) * descuento_resultado
+
+    def calcular_vnas(self, primas: Sequence[float]) -> np.ndarray:
+        """VNA de cada prima del vector, una pasada por prima"""
+        return np.array(
+            [self.calcular_vna(prima) for prima in np.ravel(primas)], dtype=float
+        )
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from src.common.constans import TASA_MENSUALIZACION, FACTOR_AJUSTE
-from src.helpers.tasa_interes_reserva import tasa_interes_reserva
+from src.models.domain.curva_tasas_interes import CurvaTasasInteres
+from src.models.domain.tabla_devolucion import TablaDevolucion
 from src.common.frecuencia_pago import FrecuenciaPago
 from typing import Dict, Any
 from src.common.producto import Producto
@@ -56,19 +57,10 @@ class ParametrosCalculados:
                 raise ValueError(f"Tipo de producto no válido: {producto}")
 
     def calcular_tasa_interes_anual(
-        self, tasas_interes_data: dict, periodo_vigencia: int
+        self, curva_tasas_interes: CurvaTasasInteres, periodo_vigencia: int
     ) -> float:
-        """Calcula la tasa de interés anual basada en la tabla de tasas de interés"""
-        try:
-            tasa_interes_anual = tasa_interes_reserva(tasas_interes_data)[
-                str(periodo_vigencia)
-            ]
-            tasa_reserva = tasa_interes_anual["tasa_reserva"]
-            return tasa_reserva
-        except KeyError:
-            raise ValueError(
-                f"No se encontró una tasa para el periodo {periodo_vigencia}"
-            )
+        """Obtiene la tasa de reserva anual (en porcentaje) de la curva de tasas"""
+        return curva_tasas_interes.get_tasas_plazo(periodo_vigencia).tasa_reserva_anual
 
     def calcular_tasa_interes_mensual(
         self,
@@ -83,16 +75,25 @@ class ParametrosCalculados:
         else:
             return (1 + tasa_interes_anual) ** (TASA_MENSUALIZACION) - 1
 
+    def calcular_tasa_interes_mensual_curva(
+        self,
+        producto: Producto,
+        coberturas: bool,
+        curva_tasas_interes: CurvaTasasInteres,
+        periodo_vigencia: int,
+    ) -> float:
+        """Obtiene la tasa de interés mensual precalculada en la curva de tasas"""
+        tasas_plazo = curva_tasas_interes.get_tasas_plazo(periodo_vigencia)
+        if producto == Producto.ENDOSOS and coberturas:
+            return tasas_plazo.tasa_reserva_mensual
+        else:
+            return tasas_plazo.tasa_reserva_mensualizada
+
     def calcular_tasa_inversion(
-        self, tasas_interes_data: dict, periodo_pago_primas: int
+        self, curva_tasas_interes: CurvaTasasInteres, periodo_pago_primas: int
     ) -> float:
-        """Calcula la tasa de inversión"""
-        # Implementar fórmula específica según requerimiento
-        tasa_interes_anual = tasa_interes_reserva(tasas_interes_data)[
-            str(periodo_pago_primas)
-        ]
-        tasa_inversion = tasa_interes_anual["tasa_inversion"] / 100
-        return tasa_inversion
+        """Obtiene la tasa de inversión (en decimal) de la curva de tasas"""
+        return curva_tasas_interes.get_tasas_plazo(periodo_pago_primas).tasa_inversion
 
     def calcular_tasa_costo_capital_mes(self, tasa_costo_capital_tir: float) -> float:
         """Calcula la tasa de costo capital mensual"""
@@ -124,28 +125,7 @@ class ParametrosCalculados:
     def calcular_tabla_devolucion(
         self, periodo_vigencia: int, porcentaje_devolucion: float, devolucion: list
     ) -> list:
-        """Calcula la tabla de devoluciones"""
-        print(f"🔍 Debug tabla devolución:")
-        print(f"  - Periodo vigencia: {periodo_vigencia}")
-        print(f"  - Porcentaje devolución: {porcentaje_devolucion}")
-        print(f"  - Datos devolución: {len(devolucion)} elementos")
-        print(f"  - Slice a procesar: devolucion[:{periodo_vigencia - 1}]")
-        
-        if not devolucion:
-            print("⚠️ Lista de devolución vacía, devolviendo solo porcentaje")
-            return [porcentaje_devolucion]
-        
-        # Procesar elementos hasta periodo_vigencia - 1
-        elementos_procesados = []
-        for i, x in enumerate(devolucion[: periodo_vigencia - 1]):
-            plazo_pago = x.get("plazo_pago_primas", {})
-            valor_periodo = plazo_pago.get(str(periodo_vigencia), 0)
-            resultado = valor_periodo * (porcentaje_devolucion / 100)
-            elementos_procesados.append(resultado)
-            print(f"  - Elemento {i}: plazo_pago_primas[{periodo_vigencia}] = {valor_periodo}, resultado = {resultado}")
-        
-        # Agregar porcentaje_devolucion al final
-        resultado_final = elementos_procesados + [porcentaje_devolucion]
-        print(f"  - Resultado final: {resultado_final}")
-        
-        return resultado_final
+        """Calcula la tabla de devoluciones a partir de la tabla cruda"""
+        return TablaDevolucion.desde_tabla(devolucion).escalar(
+            periodo_vigencia, porcentaje_devolucion
+        )
@@ -0,0 +1,176 @@
+from typing import Any, Dict, Sequence
+import itertools
+import numpy as np
+from src.models.domain.flujo_resultado_domain import FlujoResultado
+from src.models.domain.gastos_domain import GastosDomain
+
+
+class ProyeccionVariantesDomain:
+    """
+    Flujos afines de la proyección para todas las variantes de un perfil a la vez:
+    frecuencia de pago × fumador × asistencia.
+
+    La frecuencia cambia los meses de cobro (máscaras de primas recurrentes y
+    comisión) y las cuotas cobradas sobre las que se devuelve el rescate, el
+    estado de fumador la tabla de vivos, fallecidos y caducados, y la
+    asistencia los términos de costo de comisión y gastos de mantenimiento. Cada
+    flujo se arma con la forma (frecuencia, fumador, asistencia, mes) y se aplana a
+    (variante, mes) en el orden de variantes().
+    """
+
+    def __init__(
+        self,
+        frecuencias_pago_primas: Sequence[str],
+        fumadores: Sequence[bool],
+        asistencias: Sequence[bool],
+        vivos_inicio: np.ndarray,
+        caducados: np.ndarray,
+        siniestros: np.ndarray,
+        periodo_pago_primas: float,
+        periodo_vigencia: float,
+        fraccionamiento_primas: float,
+        mantenimiento_poliza: float,
+        moneda: str,
+        valor_dolar: float,
+        valor_soles: float,
+        costo_mensual_asistencia_funeraria: float,
+        inflacion_mensual: float,
+        gasto_adquisicion: float,
+        comision: float,
+    ):
+        """
+        Args:
+            frecuencias_pago_primas: Frecuencias a proyectar (ej: ["MENSUAL", "ANUAL"])
+            fumadores: Estados de fumador a proyectar
+            asistencias: Valores de tiene_asistencia a proyectar
+            vivos_inicio: Matriz (fumador, mes) de vivos al inicio
+            caducados: Matriz (fumador, mes) de caducados
+            siniestros: Matriz (fumador, mes) de siniestros (ya con signo de flujo)
+        """
+        self.frecuencias_pago_primas = list(frecuencias_pago_primas)
+        self.fumadores = list(fumadores)
+        self.asistencias = list(asistencias)
+        self.vivos_inicio = np.asarray(vivos_inicio, dtype=float)
+        self.caducados = np.asarray(caducados, dtype=float)
+        self.siniestros = np.asarray(siniestros, dtype=float)
+        self.periodo_pago_primas = periodo_pago_primas
+        self.periodo_vigencia = periodo_vigencia
+        self.fraccionamiento_primas = fraccionamiento_primas
+        self.mantenimiento_poliza = mantenimiento_poliza
+        self.costo_mensual_asistencia_funeraria = costo_mensual_asistencia_funeraria
+        self.inflacion_mensual = inflacion_mensual
+        self.gasto_adquisicion = gasto_adquisicion
+        self.comision = comision
+
+        self.flujo_resultado = FlujoResultado()
+        self.gastos_domain = GastosDomain()
+
+        # Gasto fijo mensual por póliza para cada opción de asistencia
+        self.gastos_moneda_poliza = np.array(
+            [
+                self.gastos_domain.calcular_gastos_mantenimiento_moneda_poliza(
+                    moneda,
+                    valor_dolar,
+                    valor_soles,
+                    asistencia,
+                    costo_mensual_asistencia_funeraria,
+                )
+                for asistencia in self.asistencias
+            ],
+            dtype=float,
+        )
+
+    def variantes(self):
+        """Combinaciones (frecuencia, fumador, asistencia) en el orden de las filas"""
+        return list(
+            itertools.product(
+                self.frecuencias_pago_primas, self.fumadores, self.asistencias
+            )
+        )
+
+    def calcular_flujos_afines(
+        self, prima: float, rescate: Sequence[Sequence[float]]
+    ) -> Dict[str, Any]:
+        """
+        Flujos hasta el flujo pasivo de todas las variantes para una prima
+
+        Args:
+            prima: Prima asignada (la misma para todas las variantes)
+            rescate: Matriz (1, mes) de rescates calculados con esa prima por
+                meses transcurridos (los de la frecuencia mensual); para las demás
+                frecuencias se llevan a cuotas cobradas
+
+        Returns:
+            Diccionario de matrices (variante, mes) con las mismas claves que la
+            proyección escalar, y gastos_adquisicion como escalar
+        """
+        forma = (
+            len(self.frecuencias_pago_primas),
+            len(self.fumadores),
+            len(self.asistencias),
+            self.vivos_inicio.shape[-1],
+        )
+
+        # (frecuencia, fumador, mes)
+        primas_recurrentes = self.flujo_resultado.calcular_primas_recurrentes_variantes(
+            self.vivos_inicio,
+            self.periodo_pago_primas,
+            self.frecuencias_pago_primas,
+            prima,
+            self.fraccionamiento_primas,
+        )
+        # (frecuencia, fumador, asistencia, mes)
+        comision = self.flujo_resultado.calcular_comision_variantes(
+            primas_recurrentes,
+            self.vivos_inicio,
+            self.frecuencias_pago_primas,
+            self.asistencias,
+            self.costo_mensual_asistencia_funeraria,
+            self.comision,
+        )
+        gastos_mantenimiento_total = (
+            self.gastos_domain.calcular_gastos_mantenimiento_total_variantes(
+                (primas_recurrentes * self.mantenimiento_poliza)[:, :, None, :],
+                self.gastos_moneda_poliza[:, None] * self.vivos_inicio[:, None, :],
+                self.inflacion_mensual,
+                self.periodo_vigencia,
+            )
+        )
+        gastos_mantenimiento = -gastos_mantenimiento_total
+
+        # (frecuencia, 1, 1, mes)
+        rescate = (
+            np.asarray(rescate, dtype=float)
+            * self.flujo_resultado.calcular_factor_cuotas_rescate(
+                forma[-1], self.frecuencias_pago_primas
+            )
+        )[:, None, None, :]
+        rescate_ajuste_devolucion = -(rescate * self.caducados[None, :, None, :])
+        gastos_adquisicion = -self.gasto_adquisicion
+
+        primas_recurrentes = primas_recurrentes[:, :, None, :]
+        siniestros = self.siniestros[None, :, None, :]
+        adquisicion = np.zeros(forma[-1])
+        adquisicion[0] = gastos_adquisicion
+        flujo_pasivo = (
+            (-siniestros)
+            + (-rescate_ajuste_devolucion)
+            + (-gastos_mantenimiento)
+            + (-comision)
+            + (-adquisicion)
+        ) - primas_recurrentes
+
+        def aplanar(valores: np.ndarray) -> np.ndarray:
+            return np.broadcast_to(valores, forma).reshape(-1, forma[-1])
+
+        return {
+            "vivos_inicio": aplanar(self.vivos_inicio[None, :, None, :]),
+            "primas_recurrentes": aplanar(primas_recurrentes),
+            "siniestros": aplanar(siniestros),
+            "rescate": aplanar(rescate),
+            "rescate_ajuste_devolucion": aplanar(rescate_ajuste_devolucion),
+            "gastos_mantenimiento": aplanar(gastos_mantenimiento),
+            "gastos_adquisicion": gastos_adquisicion,
+            "comision": aplanar(comision),
+            "flujo_pasivo": aplanar(flujo_pasivo),
+        }
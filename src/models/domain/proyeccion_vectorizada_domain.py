@@ -0,0 +1,212 @@
+from typing import Any, Dict, Sequence
+import numpy as np
+from src.helpers.factores_descuento import (
+    factores_descuento,
+    factores_descuento_tasas,
+    vna_flujos_siguientes,
+)
+from src.helpers.redondeo_mensual import redondeo_mensual
+
+# Flujos de la proyección que son afines en la prima hasta el flujo pasivo
+FLUJOS_AFINES = (
+    "primas_recurrentes",
+    "siniestros",
+    "rescate",
+    "rescate_ajuste_devolucion",
+    "gastos_mantenimiento",
+    "comision",
+    "flujo_pasivo",
+)
+
+
+class ProyeccionVectorizadaDomain:
+    """
+    Proyección evaluada para muchas primas a la vez.
+
+    Hasta el flujo pasivo todo es afín en la prima (X = X0 + prima * X1), así que
+    esa parte se toma de dos proyecciones escalares. Desde el saldo de reserva (pisos,
+    MOCE, margen de solvencia y valores absolutos del último mes) se replica la
+    cadena de CalculoActuarialService con un eje inicial de primas.
+
+    Las proyecciones pueden traer ejes iniciales adicionales (una fila por variante
+    del perfil, con el mes siempre en el último eje); en ese caso cada variante se
+    evalúa con su propio vector de primas, y las tasas pueden ser escalares, un
+    arreglo con un valor por variante o una trayectoria mensual por variante.
+    """
+
+    def __init__(
+        self,
+        proyeccion_base: Dict[str, Any],
+        proyeccion_unitaria: Dict[str, Any],
+        prima_unitaria: float,
+        tasa_interes_mensual: float,
+        tir_mensual: float,
+        margen_solvencia: float,
+        reserva: float,
+        tasa_inversion: float,
+        impuesto_renta: float,
+        tasa_costo_capital_mes: float,
+    ):
+        """
+        Args:
+            proyeccion_base: Estado de la proyección escalar con prima 0
+            proyeccion_unitaria: Estado de la proyección escalar con prima_unitaria
+            prima_unitaria: Prima usada para la segunda proyección
+        """
+        self.vivos_inicio = np.asarray(proyeccion_base["vivos_inicio"], dtype=float)
+        self.ejes_variantes = self.vivos_inicio.shape[:-1]
+        self.constantes = {}
+        self.pendientes = {}
+        for nombre in FLUJOS_AFINES:
+            base = np.asarray(proyeccion_base[nombre], dtype=float)
+            unitaria = np.asarray(proyeccion_unitaria[nombre], dtype=float)
+            self.constantes[nombre] = base
+            self.pendientes[nombre] = (unitaria - base) / prima_unitaria
+        # Gasto de adquisición: escalar o uno por variante, con eje para las primas
+        base, unitaria = (
+            np.broadcast_to(
+                np.asarray(proyeccion["gastos_adquisicion"], dtype=float),
+                self.ejes_variantes,
+            ).reshape(self.ejes_variantes + (1,))
+            for proyeccion in (proyeccion_base, proyeccion_unitaria)
+        )
+        self.constantes["gastos_adquisicion"] = base
+        self.pendientes["gastos_adquisicion"] = (unitaria - base) / prima_unitaria
+
+        self.tasa_interes_mensual = self._tasa(tasa_interes_mensual)
+        self.tir_mensual = self._tasa(tir_mensual)
+        self.margen_solvencia = self._tasa(margen_solvencia)
+        self.reserva = self._tasa(reserva)
+        self.tasa_inversion_mensual = redondeo_mensual(self._tasa(tasa_inversion))
+        self.impuesto_renta = self._tasa(impuesto_renta)
+        self.tasa_costo_capital_mes = self._tasa(tasa_costo_capital_mes)
+
+    def calcular_flujos(self, primas: Sequence[float]) -> Dict[str, np.ndarray]:
+        """
+        Calcula los flujos de la proyección para cada prima
+
+        Args:
+            primas: Vector de primas asignadas (k), o matriz (variantes, k) si las
+                proyecciones tienen eje de variantes
+
+        Returns:
+            Diccionario de matrices (..., k, meses) o (..., k, meses + 1) y el
+            vna_resultado (..., k)
+        """
+        primas = np.asarray(primas, dtype=float).reshape(self.ejes_variantes + (-1, 1))
+        flujos = {
+            nombre: self.constantes[nombre][..., None, :]
+            + primas * self.pendientes[nombre][..., None, :]
+            for nombre in FLUJOS_AFINES
+        }
+        gastos_adquisicion = (
+            self.constantes["gastos_adquisicion"]
+            + primas[..., 0] * self.pendientes["gastos_adquisicion"]
+        )
+
+        # Saldo de reserva: max(max(flujo + VNA siguientes, 0), rescate * vivos)
+        flujo_pasivo = flujos["flujo_pasivo"]
+        valor = flujo_pasivo + vna_flujos_siguientes(
+            self.tasa_interes_mensual, flujo_pasivo
+        )
+        comparador = flujos["rescate"] * self.vivos_inicio[..., None, :]
+        saldo_reserva = np.maximum(np.maximum(valor, 0), comparador)
+
+        # MOCE y margen de solvencia
+        margen_reserva = saldo_reserva * self.margen_solvencia
+        moce = self.tir_mensual * (
+            vna_flujos_siguientes(self.tasa_interes_mensual, margen_reserva)
+            + margen_reserva
+        )
+        reserva_fin_año = saldo_reserva + moce
+        margen_solvencia = reserva_fin_año * self.reserva
+
+        producto_inversion = (
+            reserva_fin_año * self.tasa_inversion_mensual
+            + margen_solvencia * self.tasa_inversion_mensual
+        )
+
+        # Variaciones (un mes adicional al final)
+        varianza_reserva = self._variacion(-saldo_reserva)
+        varianza_moce = self._variacion(-moce)
+        variacion_reserva = varianza_reserva + varianza_moce
+        variacion_reserva[..., -1] = np.abs(variacion_reserva[..., -1])
+        variacion_margen_solvencia = -self._variacion(margen_solvencia)
+
+        utilidad_pre_pi_ms = variacion_reserva.copy()
+        utilidad_pre_pi_ms[..., :-1] += (
+            flujos["primas_recurrentes"]
+            + flujos["comision"]
+            + flujos["gastos_mantenimiento"]
+            + flujos["siniestros"]
+            + flujos["rescate_ajuste_devolucion"]
+        )
+        utilidad_pre_pi_ms[..., 0] += gastos_adquisicion
+
+        IR = utilidad_pre_pi_ms * self.impuesto_renta
+
+        flujo_resultado = utilidad_pre_pi_ms + variacion_margen_solvencia + IR
+        flujo_resultado[..., -1] += np.abs(variacion_margen_solvencia[..., -1]) - (
+            variacion_margen_solvencia[..., -1]
+        )
+        flujo_resultado[..., :-1] += producto_inversion
+
+        if np.ndim(self.tasa_costo_capital_mes) == 0:
+            vna_resultado = flujo_resultado @ factores_descuento(
+                self.tasa_costo_capital_mes, flujo_resultado.shape[-1]
+            )
+        else:
+            tasa_costo_capital_mes = self.tasa_costo_capital_mes
+            if tasa_costo_capital_mes.shape[-1] > 1:
+                # La trayectoria cubre los meses de la proyección: el mes de
+                # cierre se descuenta con la última tasa
+                tasa_costo_capital_mes = np.concatenate(
+                    [tasa_costo_capital_mes, tasa_costo_capital_mes[..., -1:]], axis=-1
+                )
+            vna_resultado = np.sum(
+                flujo_resultado
+                * factores_descuento_tasas(
+                    tasa_costo_capital_mes, flujo_resultado.shape[-1]
+                ),
+                axis=-1,
+            )
+
+        return {
+            **flujos,
+            "saldo_reserva": saldo_reserva,
+            "moce": moce,
+            "margen_solvencia": margen_solvencia,
+            "variacion_reserva": variacion_reserva,
+            "variacion_margen_solvencia": variacion_margen_solvencia,
+            "utilidad_pre_pi_ms": utilidad_pre_pi_ms,
+            "IR": IR,
+            "producto_inversion": producto_inversion,
+            "flujo_resultado": flujo_resultado,
+            "vna_resultado": vna_resultado,
+        }
+
+    def calcular_vna(self, primas: Sequence[float]) -> np.ndarray:
+        """VNA del flujo de resultado para cada prima del vector"""
+        return self.calcular_flujos(primas)["vna_resultado"]
+
+    def _tasa(self, valor: Any) -> Any:
+        """
+        Deja las tasas escalares como están, da a las tasas por variante la forma
+        (..., 1, 1) y a las trayectorias por variante (..., meses) la forma
+        (..., 1, meses) para propagarlas sobre los ejes de primas y meses
+        """
+        if np.ndim(valor) == 0:
+            return valor
+        valor = np.asarray(valor, dtype=float)
+        if valor.shape == self.ejes_variantes:
+            return valor.reshape(self.ejes_variantes + (1, 1))
+        return valor.reshape(self.ejes_variantes + (1, -1))
+
+    def _variacion(self, valores: np.ndarray) -> np.ndarray:
+        """
+        [v0, v1 - v0, ..., vn - vn-1, -vn]: la variación mes a mes con el cierre
+        del último saldo, como calcular_varianza_reserva y similares
+        """
+        return np.concatenate(
+            [valores[..., :1], np.diff(valores, axis=-1), -valores[..., -1:]], axis=-1
+        )
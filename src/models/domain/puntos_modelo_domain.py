@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+# Columnas de reserva que se escalan de un punto modelo a sus pólizas
+COLUMNAS_RESERVA = ("saldo_reserva", "moce", "margen_solvencia")
+
+
+class PuntosModeloDomain:
+    """
+    Compresión de pólizas en puntos modelo ponderados.
+
+    Las pólizas con el mismo perfil salvo la suma asegurada, las mismas coberturas,
+    el mes de póliza en la misma banda y, opcionalmente, la suma asegurada en la
+    misma banda relativa forman un punto modelo con la suma
+    asegurada promedio, la tasa de prima por unidad de suma asegurada del grupo y
+    el mes de póliza promedio ponderado por suma asegurada. Cada póliza es el
+    punto escalado por factor = suma_asegurada / suma_asegurada_punto; como los
+    factores suman la cantidad de pólizas, los flujos agregados del punto por esa
+    suma son exactos cuando los flujos son afines en la suma asegurada (partes
+    proporcionales más gastos fijos por póliza). Las reservas no lo son (los gastos
+    fijos pesan más en sumas aseguradas bajas y el saldo tiene piso cero), por lo
+    que su error se controla con las bandas de suma asegurada.
+    """
+
+    def __init__(
+        self,
+        amplitud_meses: int = 1,
+        banda_suma_asegurada: Optional[float] = None,
+    ):
+        """
+        Args:
+            amplitud_meses: Meses de póliza por banda (1 solo agrupa el mismo mes)
+            banda_suma_asegurada: Ancho relativo de las bandas geométricas de suma
+                asegurada (0.1 agrupa sumas dentro de un 10%); None no separa
+                por suma asegurada
+
+        Raises:
+            ValueError: Si la amplitud o la banda no son positivas
+        """
+        if amplitud_meses < 1:
+            raise ValueError("La amplitud de meses debe ser mayor a cero")
+        if banda_suma_asegurada is not None and banda_suma_asegurada <= 0:
+            raise ValueError("La banda de suma asegurada debe ser mayor a cero")
+        self.amplitud_meses = amplitud_meses
+        self.banda_suma_asegurada = banda_suma_asegurada
+
+    def agrupar(self, polizas: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Agrupa las pólizas en puntos modelo
+
+        Args:
+            polizas: Pólizas con "perfil", "mes_poliza" y "primas" por cobertura
+
+        Returns:
+            Lista de puntos modelo con "perfil", "mes_poliza", "primas" y
+            "miembros" (posición de cada póliza en polizas y su factor)
+        """
+        grupos = {}
+        for posicion, poliza in enumerate(polizas):
+            perfil = poliza["perfil"]
+            clave = (
+                tuple(sorted((k, v) for k, v in perfil.items() if k != "suma_asegurada")),
+                tuple(sorted(poliza["primas"])),
+                poliza["mes_poliza"] // self.amplitud_meses,
+                self._banda_suma_asegurada(perfil["suma_asegurada"]),
+            )
+            grupos.setdefault(clave, []).append(posicion)
+
+        puntos = []
+        for posiciones in grupos.values():
+            miembros = [polizas[p] for p in posiciones]
+            sumas = np.array([m["perfil"]["suma_asegurada"] for m in miembros])
+            meses = np.array([m["mes_poliza"] for m in miembros])
+            suma_punto = float(sumas.mean())
+            puntos.append(
+                {
+                    "perfil": {**miembros[0]["perfil"], "suma_asegurada": suma_punto},
+                    "mes_poliza": int(np.rint(np.average(meses, weights=sumas))),
+                    "primas": {
+                        cobertura: sum(m["primas"][cobertura] for m in miembros)
+                        / sumas.sum()
+                        * suma_punto
+                        for cobertura in miembros[0]["primas"]
+                    },
+                    "miembros": [
+                        (p, float(s / suma_punto)) for p, s in zip(posiciones, sumas)
+                    ],
+                }
+            )
+        return puntos
+
+    def _banda_suma_asegurada(self, suma_asegurada: float) -> Optional[int]:
+        """Índice de la banda geométrica de la suma asegurada"""
+        if self.banda_suma_asegurada is None or suma_asegurada <= 0:
+            return None
+        return int(
+            np.floor(np.log(suma_asegurada) / np.log1p(self.banda_suma_asegurada))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "amplitud_meses": self.amplitud_meses,
+            "banda_suma_asegurada": self.banda_suma_asegurada,
+        }
+
+    def conciliar(
+        self,
+        reservas_exactas: Sequence[float],
+        reservas_aproximadas: Sequence[float],
+        flujos_exactos: Dict[str, np.ndarray],
+        flujos_aproximados: Dict[str, np.ndarray],
+    ) -> Dict[str, Any]:
+        """
+        Error de la valoración comprimida contra la valoración póliza a póliza
+
+        Args:
+            reservas_exactas: Reserva total de cada póliza sin compresión
+            reservas_aproximadas: Reserva total de cada póliza escalada del punto
+            flujos_exactos: Flujos agregados (mes) sin compresión
+            flujos_aproximados: Flujos agregados (mes) de los puntos modelo
+
+        Returns:
+            Errores de la reserva total, por póliza y de cada flujo agregado
+        """
+        exactas = np.asarray(reservas_exactas, dtype=float)
+        aproximadas = np.asarray(reservas_aproximadas, dtype=float)
+        total_exacto = float(exactas.sum())
+        diferencias = np.abs(aproximadas - exactas)
+        relativas = diferencias / np.maximum(np.abs(exactas), 1.0)
+
+        errores_flujos = {}
+        for nombre in set(flujos_exactos) | set(flujos_aproximados):
+            a = flujos_exactos.get(nombre, np.zeros(0))
+            b = flujos_aproximados.get(nombre, np.zeros(0))
+            meses = max(a.size, b.size)
+            a = np.pad(a, (0, meses - a.size))
+            b = np.pad(b, (0, meses - b.size))
+            escala = max(float(np.abs(a).max(initial=0.0)), 1.0)
+            errores_flujos[nombre] = {
+                "error_total_relativo": float(
+                    abs(b.sum() - a.sum()) / max(abs(float(a.sum())), 1.0)
+                ),
+                "error_mensual_maximo_relativo": float(np.abs(b - a).max(initial=0.0))
+                / escala,
+            }
+
+        return {
+            "reserva_total_exacta": total_exacto,
+            "reserva_total_aproximada": float(aproximadas.sum()),
+            "error_reserva_total_relativo": float(
+                abs(aproximadas.sum() - total_exacto) / max(abs(total_exacto), 1.0)
+            ),
+            "error_reserva_poliza_medio_relativo": (
+                float(relativas.mean()) if relativas.size else 0.0
+            ),
+            "error_reserva_poliza_maximo_relativo": float(relativas.max(initial=0.0)),
+            "flujos": errores_flujos,
+        }
@@ -0,0 +1,156 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Discrepancias guardadas (las más recientes)
+MAX_DISCREPANCIAS = 200
+
+# Comparaciones en cola o en curso admitidas a la vez
+MAX_COMPARACIONES_PENDIENTES = 100
+
+
+@dataclass(frozen=True)
+class ComparacionSombra:
+    """Resultado de resolver una cotización con el motor activo y con el candidato"""
+
+    cobertura: str
+    motor: str
+    candidato: str
+    prima_motor: float
+    prima_candidato: float
+    vna_motor: float
+    vna_candidato: float  # VNA del candidato en la prima del motor activo
+    segundos_motor: float
+    segundos_candidato: float
+    coincide: bool
+
+    @property
+    def delta_segundos(self) -> float:
+        """Tiempo del candidato menos tiempo del motor activo"""
+        return self.segundos_candidato - self.segundos_motor
+
+
+class RegistroSombra:
+    """
+    Comparaciones del modo sombra: cuenta todas, guarda las discrepancias más
+    recientes y acumula la diferencia de tiempo entre candidato y motor activo.
+
+    Las comparaciones corren en un hilo aparte para no demorar la respuesta; si ya
+    hay MAX_COMPARACIONES_PENDIENTES en cola, la nueva muestra se descarta (solo
+    se cuenta).
+    """
+
+    def __init__(
+        self,
+        max_discrepancias: int = MAX_DISCREPANCIAS,
+        max_pendientes: int = MAX_COMPARACIONES_PENDIENTES,
+    ):
+        self.max_pendientes = max_pendientes
+        self._lock = threading.Lock()
+        self._discrepancias = deque(maxlen=max_discrepancias)
+        self._comparaciones = 0
+        self._cantidad_discrepancias = 0
+        self._errores = 0
+        self._descartadas = 0
+        self._pendientes = 0
+        self._delta_segundos = 0.0
+        self._ejecutor: Optional[ThreadPoolExecutor] = None
+
+    def enviar(self, tarea: Callable[[], Optional[ComparacionSombra]]) -> bool:
+        """
+        Ejecuta la tarea en segundo plano y registra su comparación
+
+        Args:
+            tarea: Comparación del motor activo con el candidato
+
+        Returns:
+            False si la cola estaba llena y la muestra se descartó
+        """
+        with self._lock:
+            if self._pendientes >= self.max_pendientes:
+                self._descartadas += 1
+                return False
+            self._pendientes += 1
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="sombra-motores"
+                )
+            ejecutor = self._ejecutor
+        ejecutor.submit(self._ejecutar, tarea)
+        return True
+
+    def _ejecutar(self, tarea: Callable[[], Optional[ComparacionSombra]]) -> None:
+        """Un fallo del candidato se cuenta, nunca se propaga"""
+        try:
+            comparacion = tarea()
+        except Exception as e:
+            print(f"Error en la comparación en sombra: {e}")
+            with self._lock:
+                self._errores += 1
+            return
+        finally:
+            with self._lock:
+                self._pendientes -= 1
+        if comparacion is not None:
+            self.registrar(comparacion)
+
+    def registrar(self, comparacion: ComparacionSombra) -> None:
+        """Agrega una comparación"""
+        with self._lock:
+            self._comparaciones += 1
+            self._delta_segundos += comparacion.delta_segundos
+            if not comparacion.coincide:
+                self._cantidad_discrepancias += 1
+                self._discrepancias.append(comparacion)
+        if not comparacion.coincide:
+            print(
+                f"Discrepancia en sombra {comparacion.cobertura}: "
+                f"{comparacion.motor} prima {comparacion.prima_motor} VNA "
+                f"{comparacion.vna_motor} / {comparacion.candidato} prima "
+                f"{comparacion.prima_candidato} VNA {comparacion.vna_candidato}"
+            )
+
+    def resumen(self) -> Dict[str, Any]:
+        """
+        Estado del modo sombra
+
+        Returns:
+            Diccionario con comparaciones, discrepancias, errores, muestras
+            descartadas por cola llena, delta de tiempo promedio en milisegundos y
+            las discrepancias más recientes
+        """
+        with self._lock:
+            return {
+                "comparaciones": self._comparaciones,
+                "discrepancias": self._cantidad_discrepancias,
+                "errores": self._errores,
+                "descartadas": self._descartadas,
+                "delta_ms_promedio": (
+                    self._delta_segundos / self._comparaciones * 1000
+                    if self._comparaciones
+                    else None
+                ),
+                "ultimas_discrepancias": [
+                    {**asdict(comparacion), "delta_segundos": comparacion.delta_segundos}
+                    for comparacion in self._discrepancias
+                ],
+            }
+
+    def esperar(self) -> None:
+        """Espera las comparaciones pendientes"""
+        with self._lock:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=True)
+
+    def limpiar(self) -> None:
+        """Descarta las comparaciones registradas"""
+        with self._lock:
+            self._discrepancias.clear()
+            self._comparaciones = 0
+            self._cantidad_discrepancias = 0
+            self._errores = 0
+            self._descartadas = 0
+            self._delta_segundos = 0.0
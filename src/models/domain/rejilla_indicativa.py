@@ -0,0 +1,231 @@
+from dataclasses import dataclass, field
+import bisect
+import itertools
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple
+
+# Clave de un nodo: (cobertura, sexo, edad, vigencia, pago, devolución)
+ClaveNodo = Tuple[str, str, float, float, float, float]
+
+
+@dataclass(frozen=True, eq=False)
+class RejillaIndicativa:
+    """
+    Primas exactas precalculadas en una rejilla edad × vigencia × pago × devolución,
+    para estimar la prima de un perfil sin resolver el Goal Seek.
+
+    Cada nodo guarda la prima como recta en la suma asegurada, a + SA * b, y la
+    rejilla interpola α = a / e y h = e / b, con e la estimación por unidad de
+    suma asegurada de las tablas de conmutación en el nodo. La estimación del
+    perfil es e(perfil) * (α + SA / h): la conmutación aporta la forma de la prima
+    entre nodos (incluida la devolución, que encarece igual el costo fijo y el
+    proporcional) y la rejilla corrige lo que la conmutación no modela (gastos,
+    rescates, capital).
+
+    El error estimado es la mayor distancia entre la estimación y la prima que
+    daría cada esquina de la celda, escalada por factor_error, y nunca menor que
+    error_relativo_minimo de la prima (la prima no es exactamente lineal en la suma
+    asegurada, así que ni en los nodos el error es cero). No es una cota
+    garantizada: factor_error se calibra para que el error real de una fracción
+    nivel_confianza de las primas de perfiles al azar quede dentro del estimado,
+    y el resto puede quedar fuera.
+
+    Las primas se cotizaron con los parámetros fijos de base (frecuencia, fumador,
+    asistencia...); la rejilla no sirve para perfiles con otros valores.
+    """
+
+    edades: Tuple[float, ...]
+    vigencias: Tuple[float, ...]
+    pagos: Tuple[float, ...]
+    devoluciones: Tuple[float, ...]
+    factor_error: float = 1.0
+    error_relativo_minimo: float = 0.0
+    nivel_confianza: Optional[float] = None
+    base: Mapping[str, Any] = field(default_factory=dict)
+    _nodos: Mapping[ClaveNodo, Tuple[float, float]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def __post_init__(self):
+        object.__setattr__(self, "base", MappingProxyType(dict(self.base)))
+        object.__setattr__(self, "_nodos", MappingProxyType(dict(self._nodos)))
+
+    @classmethod
+    def desde_primas(
+        cls,
+        ejes: Mapping[str, Sequence[float]],
+        sumas_aseguradas: Sequence[float],
+        nodos: Iterable[
+            Tuple[str, str, float, float, float, float, float, float, Optional[float]]
+        ],
+        factor_error: float = 1.0,
+        error_relativo_minimo: float = 0.0,
+        nivel_confianza: Optional[float] = None,
+        base: Optional[Mapping[str, Any]] = None,
+    ) -> "RejillaIndicativa":
+        """
+        Construye la rejilla a partir de las primas exactas de cada nodo
+
+        Args:
+            ejes: edad_actuarial, periodo_vigencia, periodo_pago_primas y
+                porcentaje_devolucion de la rejilla
+            sumas_aseguradas: Las dos sumas aseguradas cotizadas en cada nodo
+            nodos: (cobertura, sexo, edad, vigencia, pago, devolución, prima con la
+                primera suma asegurada, prima con la segunda, estimación unitaria
+                de conmutación del nodo)
+            factor_error: Escala del error estimado calibrada al generar la rejilla
+            error_relativo_minimo: Error estimado mínimo como fracción de la prima
+            nivel_confianza: Fracción de las primas de calibración y de
+                validación cuyo error quedó dentro del estimado (la menor de
+                ambas; None sin calibrar)
+            base: Parámetros fijos con los que se cotizaron los nodos
+
+        Returns:
+            Rejilla de solo lectura; los nodos sin estimación o con prima que no
+            crece con la suma asegurada se descartan
+        """
+        suma_1, suma_2 = sumas_aseguradas
+        coeficientes = {}
+        for (*clave, prima_1, prima_2, estimacion) in nodos:
+            pendiente = (prima_2 - prima_1) / (suma_2 - suma_1)
+            if estimacion is None or estimacion <= 0 or pendiente <= 0:
+                continue
+            coeficientes[tuple(clave)] = (
+                (prima_1 - pendiente * suma_1) / estimacion,
+                estimacion / pendiente,
+            )
+        return cls(
+            edades=tuple(sorted(ejes["edad_actuarial"])),
+            vigencias=tuple(sorted(ejes["periodo_vigencia"])),
+            pagos=tuple(sorted(ejes["periodo_pago_primas"])),
+            devoluciones=tuple(sorted(ejes["porcentaje_devolucion"])),
+            factor_error=float(factor_error),
+            error_relativo_minimo=float(error_relativo_minimo),
+            nivel_confianza=nivel_confianza,
+            base=base or {},
+            _nodos=coeficientes,
+        )
+
+    def validar_base(self, parametros_entrada: Mapping[str, Any]) -> None:
+        """
+        Verifica que el perfil use los parámetros fijos de la rejilla
+
+        Raises:
+            ValueError: Si algún parámetro difiere del de base
+        """
+        for parametro, valor in self.base.items():
+            if parametros_entrada.get(parametro, valor) != valor:
+                raise ValueError(
+                    f"La rejilla indicativa solo cubre {parametro} = {valor}"
+                )
+
+    def validar_perfil(
+        self, edad: float, vigencia: float, pago: float, devolucion: float
+    ) -> None:
+        """
+        Verifica que el perfil esté dentro de los ejes de la rejilla
+
+        Raises:
+            ValueError: Si algún valor está fuera de su eje
+        """
+        self._segmento(self.edades, edad, "edad_actuarial")
+        self._segmento(self.vigencias, vigencia, "periodo_vigencia")
+        self._segmento(self.pagos, min(pago, vigencia), "periodo_pago_primas")
+        self._segmento(self.devoluciones, devolucion, "porcentaje_devolucion")
+
+    @property
+    def total_nodos(self) -> int:
+        """Nodos utilizables de la rejilla"""
+        return len(self._nodos)
+
+    @staticmethod
+    def _segmento(
+        eje: Tuple[float, ...], valor: float, nombre: str
+    ) -> Tuple[float, float, float]:
+        """
+        Nodos que rodean el valor en un eje y peso del nodo superior
+
+        Raises:
+            ValueError: Si el valor está fuera del eje
+        """
+        if not eje or valor < eje[0] or valor > eje[-1]:
+            raise ValueError(
+                f"{nombre} {valor} fuera de la rejilla indicativa "
+                f"[{eje[0] if eje else '-'}, {eje[-1] if eje else '-'}]"
+            )
+        if len(eje) == 1:
+            return eje[0], eje[0], 0.0
+        i = max(1, min(bisect.bisect_left(eje, valor), len(eje) - 1))
+        inferior, superior = eje[i - 1], eje[i]
+        return inferior, superior, (valor - inferior) / (superior - inferior)
+
+    def estimar(
+        self,
+        cobertura: str,
+        sexo: str,
+        edad: float,
+        vigencia: float,
+        pago: float,
+        devolucion: float,
+        suma_asegurada: float,
+        estimacion_unitaria: float,
+    ) -> Tuple[float, float]:
+        """
+        Prima estimada del perfil por interpolación multilineal
+
+        Args:
+            cobertura: Cobertura
+            sexo: "M" o "F"
+            edad: Edad actuarial
+            vigencia: Periodo de vigencia en años
+            pago: Periodo de pago de primas en años (se limita a la vigencia)
+            devolucion: Porcentaje de devolución
+            suma_asegurada: Suma asegurada
+            estimacion_unitaria: Estimación de conmutación del perfil por unidad de
+                suma asegurada
+
+        Returns:
+            (prima estimada, error absoluto estimado al nivel_confianza)
+
+        Raises:
+            ValueError: Si el perfil está fuera de la rejilla o a su celda le falta
+                algún nodo (perfiles donde el Goal Seek no converge)
+        """
+        pago = min(pago, vigencia)
+        segmentos = (
+            self._segmento(self.edades, edad, "edad_actuarial"),
+            self._segmento(self.vigencias, vigencia, "periodo_vigencia"),
+            self._segmento(self.pagos, pago, "periodo_pago_primas"),
+            self._segmento(self.devoluciones, devolucion, "porcentaje_devolucion"),
+        )
+
+        alfa = h = 0.0
+        esquinas = []
+        for bits in itertools.product((0, 1), repeat=4):
+            peso = 1.0
+            nodo = []
+            for (inferior, superior, t), bit in zip(segmentos, bits):
+                peso *= t if bit else 1 - t
+                nodo.append(superior if bit else inferior)
+            if peso == 0:
+                continue
+            # El pago de cada esquina tampoco puede exceder su vigencia
+            nodo[2] = min(nodo[2], nodo[1])
+            coeficientes = self._nodos.get((cobertura, sexo, *nodo))
+            if coeficientes is None:
+                raise ValueError(
+                    f"La rejilla indicativa no tiene el nodo {cobertura} {sexo} "
+                    f"{tuple(nodo)}"
+                )
+            alfa += peso * coeficientes[0]
+            h += peso * coeficientes[1]
+            esquinas.append(coeficientes)
+
+        prima = estimacion_unitaria * (alfa + suma_asegurada / h)
+        dispersion = max(
+            abs(estimacion_unitaria * (alfa_esquina + suma_asegurada / h_esquina) - prima)
+            for alfa_esquina, h_esquina in esquinas
+        )
+        return prima, max(
+            self.factor_error * dispersion, self.error_relativo_minimo * abs(prima)
+        )
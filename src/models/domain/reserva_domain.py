@@ -1,7 +1,9 @@
 from src.utils.anios_meses import anios_meses
-from typing import List
+from typing import List, Tuple
 import numpy as np
 from src.helpers.margen_reserva import margen_reserva
+from src.helpers.factores_descuento import factores_descuento, vna, vna_flujos_siguientes
+from src.helpers import kernels
 
 
 class ReservaDomain:
@@ -29,6 +31,13 @@ class ReservaDomain:
         )
         self.porcentaje_devolucion = porcentaje_devolucion / 100
 
+    def asignar_prima(self, prima: float):
+        """Cambia la prima sin recalcular los porcentajes de devolución"""
+        self.prima = prima
+        self.primas_pagadas = self.calcular_primas_pagadas(
+            self.periodo_vigencia, self.prima, self.fraccionamiento_primas
+        )
+
     def calcular_rescate(self):
         primas_pagadas = self.primas_pagadas
         porcentaje_devolucion_mensual = self.porcentaje_devolucion_mensual
@@ -164,38 +173,50 @@ class ReservaDomain:
         Replica EXACTO la función VNA de Excel:
         - Descuenta a partir del primer flujo como (1+r)^1, no como np.npv
         """
-        return sum(cf / (1 + rate) ** (t + 1) for t, cf in enumerate(cashflows))
+        return vna(rate, cashflows)
 
-    def calcular_saldo_reserva(
+    def calcular_componentes_saldo_reserva(
         self,
         vivos_inicio: List[float],
         rescate: List[float],
         flujo_pasivo: List[float],
         tasa_interes_mensual: float,
-    ):
-        # print(vivos_inicio) # OK
-        # print(rescate) # OK -> Diferencia al 14vo decimal
-        # print(flujo_pasivo) # OK
-        # print(tasa_interes_mensual) # OK
-
-        resultados = []
-        n = len(flujo_pasivo)
-
-        for i in range(n):
-            # VNA Excel desde el flujo siguiente (i+1 en adelante)
-            vna = self.vna_excel(tasa_interes_mensual, flujo_pasivo[i + 1 :])
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Componentes del saldo de reserva antes de aplicar los pisos:
+        (flujo actual + VNA de los siguientes, rescate * vivos_inicio)
+        """
+        # VNA Excel desde el flujo siguiente (i+1 en adelante) para todos los meses
+        vna_siguientes = vna_flujos_siguientes(tasa_interes_mensual, flujo_pasivo)
 
-            # parte izquierda (flujo actual + VNA)
-            valor = flujo_pasivo[i] + vna
-            if valor < 0:
-                valor = 0
+        # parte izquierda (flujo actual + VNA)
+        valor = np.asarray(flujo_pasivo, dtype=float) + vna_siguientes
 
-            # parte derecha
-            comparador = rescate[i] * vivos_inicio[i]
+        # parte derecha
+        comparador = np.asarray(rescate, dtype=float) * np.asarray(
+            vivos_inicio, dtype=float
+        )
+        return valor, comparador
 
-            resultados.append(max(valor, comparador))
+    def calcular_saldo_reserva(
+        self,
+        vivos_inicio: List[float],
+        rescate: List[float],
+        flujo_pasivo: List[float],
+        tasa_interes_mensual: float,
+    ):
+        flujo_pasivo = np.asarray(flujo_pasivo, dtype=float)
+        comparador = np.asarray(rescate, dtype=float) * np.asarray(
+            vivos_inicio, dtype=float
+        )
 
-        return resultados
+        # flujo actual + VNA de los siguientes, sin valores negativos y acotado
+        # por el rescate
+        return kernels.saldo_reserva(
+            flujo_pasivo,
+            comparador,
+            factores_descuento(tasa_interes_mensual, flujo_pasivo.shape[0]),
+        ).tolist()
 
     def calcular_moce(
         self,
@@ -210,21 +231,12 @@ class ReservaDomain:
         if not _margen_reserva:
             return []
 
-        resultados_moce = []
-
-        for i in range(len(_margen_reserva)):
-            flujo_inicial = _margen_reserva[i]
-            flujos_futuros = _margen_reserva[i + 1 :]  # del siguiente en adelante
-
-            vna = sum(
-                flujo / ((1 + tasa_interes_mensual) ** j)
-                for j, flujo in enumerate(flujos_futuros, start=1)
-            )
-
-            moce = tasa_costo_capital_mensual * (vna + flujo_inicial)
-            resultados_moce.append(moce)
-
-        return resultados_moce
+        # tasa * (VNA de los márgenes siguientes + margen del mes) para todos los meses
+        return kernels.moce(
+            np.asarray(_margen_reserva, dtype=float),
+            tasa_costo_capital_mensual,
+            factores_descuento(tasa_interes_mensual, len(_margen_reserva)),
+        ).tolist()
 
     def calcular_moce_saldo_reserva(
         self, saldo_reserva: List[float], moce: List[float]
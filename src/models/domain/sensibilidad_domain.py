@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Optional, Sequence
+import math
+from src.models.domain.choque_supuesto import ChoqueSupuesto
+
+
+class SensibilidadDomain:
+    """
+    Dominio del análisis de sensibilidad: compara la prima de equilibrio de cada
+    escenario chocado con la del escenario base y arma la tabla tornado, con los
+    choques agrupados por supuesto y los supuestos ordenados por amplitud.
+    """
+
+    def construir_escenarios(
+        self,
+        choques: Sequence[ChoqueSupuesto],
+        prima_base: Optional[float],
+        primas: Sequence[float],
+        vnas_prima_base: Sequence[float],
+    ) -> List[Dict[str, Any]]:
+        """
+        Variación de la prima de equilibrio de cada choque respecto de la base
+
+        Args:
+            choques: Choques evaluados, en el orden de primas
+            prima_base: Prima de equilibrio del escenario base (None si no convergió)
+            primas: Prima de equilibrio de cada escenario chocado (NaN si no convergió)
+            vnas_prima_base: VNA de cada escenario chocado cobrando la prima base
+
+        Returns:
+            Lista con un diccionario por choque
+        """
+        escenarios = []
+        for choque, prima, vna in zip(choques, primas, vnas_prima_base):
+            prima = self._valor(prima)
+            variacion = None
+            variacion_pct = None
+            if prima is not None and prima_base is not None:
+                variacion = prima - prima_base
+                if prima_base != 0:
+                    variacion_pct = variacion / prima_base * 100
+            escenarios.append(
+                {
+                    **choque.to_dict(),
+                    "prima": prima,
+                    "variacion_prima": variacion,
+                    "variacion_prima_pct": variacion_pct,
+                    "vna_con_prima_base": self._valor(vna),
+                }
+            )
+        return escenarios
+
+    def construir_tornado(
+        self, escenarios: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Agrupa los escenarios por supuesto y ordena los supuestos por amplitud de la
+        variación de la prima (la base cuenta como variación cero)
+
+        Args:
+            escenarios: Escenarios de construir_escenarios
+
+        Returns:
+            Lista de barras {"supuesto", "variacion_minima", "variacion_maxima",
+            "amplitud", "escenarios"}, de mayor a menor amplitud
+        """
+        por_supuesto: Dict[str, List[Dict[str, Any]]] = {}
+        for escenario in escenarios:
+            por_supuesto.setdefault(escenario["tipo"], []).append(escenario)
+
+        barras = []
+        for supuesto, filas in por_supuesto.items():
+            variaciones = [0.0] + [
+                f["variacion_prima"] for f in filas if f["variacion_prima"] is not None
+            ]
+            barras.append(
+                {
+                    "supuesto": supuesto,
+                    "variacion_minima": min(variaciones),
+                    "variacion_maxima": max(variaciones),
+                    "amplitud": max(variaciones) - min(variaciones),
+                    "escenarios": sorted(filas, key=lambda f: f["valor"]),
+                }
+            )
+        return sorted(barras, key=lambda b: b["amplitud"], reverse=True)
+
+    def _valor(self, valor: Any) -> Optional[float]:
+        """Convierte a float, con None para los escenarios sin solución"""
+        if valor is None:
+            return None
+        valor = float(valor)
+        return None if math.isnan(valor) else valor
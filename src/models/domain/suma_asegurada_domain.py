@@ -0,0 +1,402 @@
+from typing import Dict, Any, Optional, Tuple
+import copy
+import numpy as np
+from src.models.services.calculo_actuarial_service import CalculoActuarialService
+from src.models.domain.descomposicion_suma_asegurada import (
+    DescomposicionSumaAsegurada,
+)
+from src.common.producto import Producto
+
+
+class SumaAseguradaDomain:
+    """
+    Dominio que resuelve la suma_asegurada que corresponde a una prima mensual objetivo.
+
+    La suma asegurada solo entra a la proyección por los siniestros, que son lineales en
+    ella, y las primas entran de forma lineal en el resto de flujos. Mientras las ramas
+    de la proyección (pisos de reserva y valores absolutos del último mes) no cambian,
+    el VNA de cada cobertura es afín en (prima, suma_asegurada):
+
+        VNA(p, SA) = VNA0 + cp * (p - p0) + cs * (SA - SA0)
+
+    por lo que la prima de equilibrio es prima(SA) = a + b * SA y la prima del cliente
+    es la suma de esas rectas. Se resuelve directamente con una descomposición por
+    cobertura en lugar de anidar Goal Seeks, re-linealizando si cambió alguna rama.
+    """
+
+    def __init__(self):
+        self.tolerance = 1e-6  # Tolerancia de VNA (igual que el Goal Seek)
+        self.max_iterations = 20  # Máximo de re-linealizaciones
+        self.delta_prima = 1.0  # Paso para la pendiente respecto a la prima
+        self.delta_suma_asegurada = 1000.0  # Paso para la pendiente respecto a la SA
+        self.suma_asegurada_inicial = 100000.0  # Punto de partida si no se indica
+        self.pasos_relativos_ramas = (1e-4, 1e-6, 1e-8)  # Pasos para el tramo de validez
+        self._evaluaciones = 0
+
+    def execute_suma_asegurada(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        prima_objetivo: float,
+    ) -> Dict[str, Any]:
+        """
+        Resuelve la suma asegurada cuya prima mensual total es prima_objetivo.
+
+        Args:
+            parametros_entrada: Parámetros de entrada (suma_asegurada opcional, como semilla)
+            parametros_almacenados: Parámetros almacenados
+            parametros_calculados: Parámetros calculados
+            prima_objetivo: Prima mensual objetivo del cliente (suma de coberturas)
+
+        Returns:
+            Diccionario con la suma asegurada, la prima por cobertura y el diagnóstico
+
+        Raises:
+            ValueError: Si no hay coberturas activas o la prima objetivo no es alcanzable
+        """
+        coberturas_obj = parametros_entrada.get("coberturas", {})
+        if isinstance(coberturas_obj, dict):
+            coberturas = [k for k, v in coberturas_obj.items() if v]
+        else:
+            coberturas = coberturas_obj if isinstance(coberturas_obj, list) else []
+
+        if not coberturas:
+            raise ValueError("No hay coberturas activas")
+        if prima_objetivo <= 0:
+            raise ValueError("La prima objetivo debe ser mayor que cero")
+
+        # Copia propia para no modificar los parámetros almacenados originales
+        parametros_almacenados_copy = copy.deepcopy(parametros_almacenados)
+        self._evaluaciones = 0
+
+        suma_asegurada = (
+            parametros_entrada.get("suma_asegurada") or self.suma_asegurada_inicial
+        )
+        primas = {cobertura: prima_objetivo / len(coberturas) for cobertura in coberturas}
+        vnas = {
+            cobertura: self._calcular_vna(
+                parametros_entrada,
+                parametros_almacenados_copy,
+                parametros_calculados,
+                cobertura,
+                primas[cobertura],
+                suma_asegurada,
+            )
+            for cobertura in coberturas
+        }
+
+        descomposicion = {}
+        convergio = False
+        iteraciones = 0
+
+        for i in range(self.max_iterations):
+            iteraciones = i + 1
+
+            # Descomponer cada cobertura en prima(SA) = a + b * SA alrededor del punto actual
+            for cobertura in coberturas:
+                descomposicion[cobertura] = self.descomponer(
+                    parametros_entrada,
+                    parametros_almacenados_copy,
+                    parametros_calculados,
+                    cobertura,
+                    primas[cobertura],
+                    suma_asegurada,
+                    vnas[cobertura],
+                )
+
+            suma_a = sum(d["a"] for d in descomposicion.values())
+            suma_b = sum(d["b"] for d in descomposicion.values())
+            if suma_b <= 0:
+                raise ValueError(
+                    "La prima no crece con la suma asegurada; no se puede resolver"
+                )
+
+            suma_asegurada = (prima_objetivo - suma_a) / suma_b
+            if suma_asegurada <= 0:
+                raise ValueError(
+                    f"La prima objetivo {prima_objetivo} no cubre los costos fijos "
+                    f"de la póliza (prima mínima {suma_a:.2f})"
+                )
+
+            primas = {
+                cobertura: d["a"] + d["b"] * suma_asegurada
+                for cobertura, d in descomposicion.items()
+            }
+            vnas = {
+                cobertura: self._calcular_vna(
+                    parametros_entrada,
+                    parametros_almacenados_copy,
+                    parametros_calculados,
+                    cobertura,
+                    primas[cobertura],
+                    suma_asegurada,
+                )
+                for cobertura in coberturas
+            }
+
+            print(
+                f"Iteración {iteraciones}: suma_asegurada={suma_asegurada:.6f}, "
+                f"VNA={vnas}"
+            )
+
+            # Si ninguna rama cambió la solución es exacta y el VNA es ~0
+            if all(abs(vna) < self.tolerance for vna in vnas.values()):
+                convergio = True
+                break
+
+        return {
+            "suma_asegurada": suma_asegurada,
+            "coberturas": {
+                cobertura: {
+                    "prima_asignada_optima": primas[cobertura],
+                    "vna_resultado": vnas[cobertura],
+                    "a": descomposicion[cobertura]["a"],
+                    "b": descomposicion[cobertura]["b"],
+                }
+                for cobertura in coberturas
+            },
+            "convergio": convergio,
+            "iteraciones": iteraciones,
+            "evaluaciones": self._evaluaciones,
+        }
+
+    def descomponer(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        prima: float,
+        suma_asegurada: float,
+        vna: float = None,
+    ) -> Dict[str, float]:
+        """
+        Linealiza el VNA de una cobertura alrededor de (prima, suma_asegurada) y
+        devuelve la recta de primas de equilibrio prima(SA) = a + b * SA.
+
+        Args:
+            vna: VNA ya evaluado en el punto (opcional, evita una evaluación)
+
+        Returns:
+            Diccionario con a, b y las pendientes del VNA (cp, cs)
+        """
+        if vna is None:
+            vna = self._calcular_vna(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                cobertura,
+                prima,
+                suma_asegurada,
+            )
+        vna_prima = self._calcular_vna(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            cobertura,
+            prima + self.delta_prima,
+            suma_asegurada,
+        )
+        vna_suma = self._calcular_vna(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            cobertura,
+            prima,
+            suma_asegurada + self.delta_suma_asegurada,
+        )
+
+        cp = (vna_prima - vna) / self.delta_prima
+        cs = (vna_suma - vna) / self.delta_suma_asegurada
+        if cp == 0:
+            raise ValueError(f"El VNA de {cobertura} no depende de la prima")
+
+        b = -cs / cp
+        a = prima - (vna - cs * suma_asegurada) / cp
+        return {"a": a, "b": b, "cp": cp, "cs": cs}
+
+    def construir_descomposicion(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        prima: float,
+        suma_asegurada: float,
+    ) -> Optional[DescomposicionSumaAsegurada]:
+        """
+        Construye la recta prima(SA) = a + b * SA alrededor de un punto ya resuelto
+        junto con el tramo de suma asegurada en el que ninguna rama cambia.
+
+        Los indicadores de rama (saldo de reserva antes de los pisos, rescate * vivos y
+        las variaciones del último mes antes del valor absoluto) son afines en
+        (prima, SA) dentro de la región, así que con las tres evaluaciones de la
+        linealización se obtiene su gradiente y el punto exacto donde cada uno cambia
+        de signo a lo largo de la recta.
+
+        Args:
+            prima: Prima de equilibrio ya resuelta para suma_asegurada
+            suma_asegurada: Suma asegurada de referencia
+
+        Returns:
+            Descomposición con su tramo de validez, o None si las evaluaciones no
+            comparten las mismas ramas (punto sobre un quiebre)
+        """
+        parametros_almacenados_copy = copy.deepcopy(parametros_almacenados)
+
+        vna, g0 = self._evaluar(
+            parametros_entrada,
+            parametros_almacenados_copy,
+            parametros_calculados,
+            cobertura,
+            prima,
+            suma_asegurada,
+        )
+        escala = 1e-9 * (1.0 + float(np.max(np.abs(g0))))
+        ramas = self._ramas(g0, escala)
+
+        # Pasos relativos pequeños para no cruzar un quiebre cercano; si alguna
+        # evaluación cae en otra rama se reduce el paso
+        for paso_relativo in self.pasos_relativos_ramas:
+            delta_prima = paso_relativo * max(abs(prima), 1.0)
+            delta_suma_asegurada = paso_relativo * suma_asegurada
+            vna_prima, g_prima = self._evaluar(
+                parametros_entrada,
+                parametros_almacenados_copy,
+                parametros_calculados,
+                cobertura,
+                prima + delta_prima,
+                suma_asegurada,
+            )
+            vna_suma, g_suma = self._evaluar(
+                parametros_entrada,
+                parametros_almacenados_copy,
+                parametros_calculados,
+                cobertura,
+                prima,
+                suma_asegurada + delta_suma_asegurada,
+            )
+            if np.array_equal(ramas, self._ramas(g_prima, escala)) and np.array_equal(
+                ramas, self._ramas(g_suma, escala)
+            ):
+                break
+        else:
+            return None
+
+        cp = (vna_prima - vna) / delta_prima
+        cs = (vna_suma - vna) / delta_suma_asegurada
+        if cp == 0:
+            return None
+        b = -cs / cp
+        a = prima - (vna - cs * suma_asegurada) / cp
+
+        # Indicadores a lo largo de la recta: g(SA) = c0 + m * (SA - SA0)
+        gp = (g_prima - g0) / delta_prima
+        gs = (g_suma - g0) / delta_suma_asegurada
+        c0 = g0 + gp * (a + b * suma_asegurada - prima)
+        m = gp * b + gs
+
+        suma_asegurada_min = 0.0
+        suma_asegurada_max = float("inf")
+        if b > 0:
+            # La prima debe seguir siendo positiva
+            suma_asegurada_min = max(suma_asegurada_min, -a / b)
+
+        relevantes = (np.abs(c0) > escala) | (np.abs(m) * suma_asegurada > escala)
+        c0, m = c0[relevantes], m[relevantes]
+
+        # Un indicador en cero que se mueve con la SA está justo sobre un quiebre
+        if np.any(np.abs(c0) <= escala):
+            suma_asegurada_min = suma_asegurada_max = suma_asegurada
+        else:
+            con_pendiente = m != 0
+            cortes = suma_asegurada - c0[con_pendiente] / m[con_pendiente]
+            # Si el indicador se aleja de cero al subir la SA, el corte queda por debajo
+            se_aleja = np.sign(c0[con_pendiente]) * m[con_pendiente] > 0
+            if np.any(se_aleja):
+                suma_asegurada_min = max(suma_asegurada_min, float(cortes[se_aleja].max()))
+            if np.any(~se_aleja):
+                suma_asegurada_max = min(
+                    suma_asegurada_max, float(cortes[~se_aleja].min())
+                )
+
+        return DescomposicionSumaAsegurada(
+            a=a,
+            b=b,
+            suma_asegurada_referencia=suma_asegurada,
+            suma_asegurada_min=suma_asegurada_min,
+            suma_asegurada_max=suma_asegurada_max,
+        )
+
+    def _ramas(self, indicadores: np.ndarray, escala: float) -> np.ndarray:
+        """Signo de cada indicador de rama, con los valores menores a escala como cero"""
+        return np.where(np.abs(indicadores) > escala, np.sign(indicadores), 0.0)
+
+    def _calcular_vna(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        prima_asignada: float,
+        suma_asegurada: float,
+    ) -> float:
+        """Calcula el VNA de una cobertura para una prima y suma asegurada dadas"""
+        return self._evaluar(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            cobertura,
+            prima_asignada,
+            suma_asegurada,
+            registrar_ramas=False,
+        )[0]
+
+    def _evaluar(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        prima_asignada: float,
+        suma_asegurada: float,
+        registrar_ramas: bool = True,
+    ) -> Tuple[float, Optional[np.ndarray]]:
+        """
+        Evalúa la proyección y devuelve el VNA junto con el vector de indicadores de
+        rama: [saldo sin piso, saldo sin piso - rescate * vivos, rescate * vivos,
+        variación de reserva final, variación de margen de solvencia final]
+        """
+        self._evaluaciones += 1
+        parametros_almacenados["coberturas"][cobertura]["prima_asignada"] = prima_asignada
+
+        calculo_service = CalculoActuarialService(
+            parametros_entrada={**parametros_entrada, "suma_asegurada": suma_asegurada},
+            parametros_almacenados=parametros_almacenados,
+            parametros_calculados=parametros_calculados,
+            producto=Producto.ENDOSOS,
+            sexo=parametros_entrada.get("sexo", "M"),
+            fumador=parametros_entrada.get("fumador", False),
+            cobertura=cobertura,
+            registrar_ramas=registrar_ramas,
+        )
+        vna = calculo_service.execute()
+        if not registrar_ramas:
+            return vna, None
+
+        ramas = calculo_service.indicadores_ramas
+        valor = ramas["valor_reserva"]
+        comparador = ramas["comparador_reserva"]
+        indicadores = np.concatenate(
+            [
+                valor,
+                valor - comparador,
+                comparador,
+                [
+                    ramas["variacion_reserva_final"],
+                    ramas["variacion_margen_solvencia_final"],
+                ],
+            ]
+        )
+        return vna, indicadores
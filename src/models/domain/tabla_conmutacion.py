@@ -0,0 +1,254 @@
+from dataclasses import dataclass, field
+import threading
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from src.helpers.caducidad_mensual import caducidad_mensual
+from src.models.domain.expuestos_mes_domain import ExpuestosMesDomain
+
+
+@dataclass(frozen=True, eq=False)
+class TablaConmutacion:
+    """
+    Columnas de conmutación mensuales (D, N, C, M) de un perfil de supuestos, una
+    fila por edad de emisión y una columna por mes de póliza (t = 0, 1, ...).
+
+    D[t] = v^t * l[t] y C[t] = v^(t+1) * b[t], con l los vivos al inicio del mes
+    (misma recursión de mortalidad y caducidad que ExpuestosMesService) y b los
+    beneficiarios del mes por unidad de suma asegurada. N y M son las sumas de D
+    y C desde t hasta el final, con un 0 al cierre, de modo que los valores
+    presentes de beneficios y anualidades son diferencias de dos columnas.
+    """
+
+    edades: Tuple[int, ...]
+    tasa_mensual: float
+    D: np.ndarray = field(repr=False)
+    N: np.ndarray = field(repr=False)
+    C: np.ndarray = field(repr=False)
+    M: np.ndarray = field(repr=False)
+    _filas: Mapping[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "_filas", {edad: fila for fila, edad in enumerate(self.edades)}
+        )
+
+    @classmethod
+    def desde_decrementos(
+        cls,
+        edades: Sequence[int],
+        vivos_inicio: np.ndarray,
+        beneficios: np.ndarray,
+        tasa_mensual: float,
+    ) -> "TablaConmutacion":
+        """
+        Construye las columnas a partir de los decrementos ya proyectados
+
+        Args:
+            edades: Edad de emisión de cada fila
+            vivos_inicio: Matriz (edad, mes) de vivos al inicio del mes
+            beneficios: Matriz (edad, mes) de beneficiarios del mes
+            tasa_mensual: Tasa de descuento mensual (decimal)
+
+        Returns:
+            Tabla de conmutación de solo lectura
+        """
+        meses = vivos_inicio.shape[1]
+        descuento = (1 + tasa_mensual) ** -np.arange(meses + 1, dtype=float)
+        D = vivos_inicio * descuento[:-1]
+        C = beneficios * descuento[1:]
+        columnas = {"D": D, "C": C}
+        for nombre, columna in (("N", D), ("M", C)):
+            acumulada = np.zeros((columna.shape[0], meses + 1))
+            acumulada[:, :-1] = np.cumsum(columna[:, ::-1], axis=1)[:, ::-1]
+            columnas[nombre] = acumulada
+        for columna in columnas.values():
+            columna.setflags(write=False)
+        return cls(
+            edades=tuple(int(edad) for edad in edades),
+            tasa_mensual=float(tasa_mensual),
+            **columnas,
+        )
+
+    @property
+    def meses(self) -> int:
+        """Meses de póliza cubiertos por la tabla"""
+        return self.D.shape[1]
+
+    def _fila(self, edad: int, meses: int) -> int:
+        """
+        Fila de la edad de emisión
+
+        Raises:
+            ValueError: Si la edad no está en la tabla o los meses exceden el horizonte
+        """
+        fila = self._filas.get(int(edad))
+        if fila is None:
+            raise ValueError(f"Edad {edad} fuera de la tabla de conmutación")
+        if meses > self.meses:
+            raise ValueError(
+                f"La tabla de conmutación cubre {self.meses} meses, se pidieron {meses}"
+            )
+        return fila
+
+    def seguro(self, edad: int, meses: int, desde: int = 0) -> float:
+        """
+        Valor presente de 1 pagado al final del mes del beneficio, por vivo al
+        inicio del mes desde, hasta el mes meses: (M[desde] - M[meses]) / D[desde]
+        """
+        fila = self._fila(edad, meses)
+        if self.D[fila, desde] <= 0:
+            return 0.0
+        return float(
+            (self.M[fila, desde] - self.M[fila, meses]) / self.D[fila, desde]
+        )
+
+    def anualidad(self, edad: int, meses: int, desde: int = 0) -> float:
+        """
+        Anualidad mensual anticipada de 1 por vivo al inicio del mes desde, hasta el
+        mes meses: (N[desde] - N[meses]) / D[desde]
+        """
+        fila = self._fila(edad, meses)
+        if self.D[fila, desde] <= 0 or desde >= meses:
+            return 0.0
+        return float(
+            (self.N[fila, desde] - self.N[fila, meses]) / self.D[fila, desde]
+        )
+
+    def dotal(self, edad: int, meses: int) -> float:
+        """Valor presente de 1 para cada vivo al inicio del mes meses: D[meses] / D[0]"""
+        fila = self._fila(edad, meses + 1)
+        if self.D[fila, 0] <= 0:
+            return 0.0
+        return float(self.D[fila, meses] / self.D[fila, 0])
+
+
+class TablasConmutacion:
+    """
+    Tablas de conmutación de una cobertura por (sexo, fumador, ajuste de
+    mortalidad, tasa), construidas una sola vez y compartidas entre peticiones.
+
+    Las tablas cubren el horizonte más un mes (para leer D al cierre de la última
+    vigencia) y la caducidad se toma de una vigencia un año más larga, para que la
+    caducidad total forzada en su último mes no afecte los meses que se usan.
+    """
+
+    def __init__(
+        self,
+        cobertura: str,
+        tabla_mortalidad: Mapping[str, Any],
+        caducidad_mensual_data: Mapping[str, Any],
+        caducidad_anual: Mapping[str, Any],
+        tarifas_reaseguro: Optional[Mapping[str, Any]],
+        ajuste_mortalidad: float,
+        anios_horizonte: int,
+    ):
+        """
+        Args:
+            cobertura: Cobertura (en "itp" el beneficio es la invalidez accidental
+                de tarifas_reaseguro; en las demás, el fallecimiento)
+            tabla_mortalidad: Tabla cruda de mortalidad anual por edad
+            caducidad_mensual_data: Caducidades mensuales parametrizadas
+            caducidad_anual: Caducidades anuales por año de póliza
+            tarifas_reaseguro: Tarifas por edad (solo itp)
+            ajuste_mortalidad: Ajuste de mortalidad de la cobertura en porcentaje
+                (ej: 150), el que se usa si no se pide otro
+            anios_horizonte: Años de póliza de las tablas (la vigencia máxima)
+        """
+        self.cobertura = cobertura
+        self.tabla_mortalidad = tabla_mortalidad
+        self.tarifas_reaseguro = tarifas_reaseguro or {}
+        self.ajuste_mortalidad = ajuste_mortalidad
+        self.meses = anios_horizonte * 12 + 1
+        self.edades = tuple(sorted(int(edad) for edad in tabla_mortalidad))
+        caducidad = caducidad_mensual(
+            anios_horizonte + 1, caducidad_mensual_data, caducidad_anual
+        )
+        self._caducidad = np.array(
+            [caducidad[mes] for mes in range(1, self.meses + 1)], dtype=float
+        )
+        self._domain = ExpuestosMesDomain()
+        self._cache: Dict[Tuple[str, bool, float, float], TablaConmutacion] = {}
+        self._lock = threading.Lock()
+
+    def get_tabla(
+        self,
+        sexo: str,
+        fumador: bool,
+        tasa_mensual: float,
+        ajuste_mortalidad: Optional[float] = None,
+    ) -> TablaConmutacion:
+        """
+        Obtiene (construyendo si es necesario) la tabla de un perfil
+
+        Args:
+            sexo: "M" o "F"
+            fumador: Si el asegurado fuma
+            tasa_mensual: Tasa de descuento mensual (decimal)
+            ajuste_mortalidad: Ajuste de mortalidad en porcentaje (por defecto el
+                de la cobertura)
+
+        Returns:
+            Tabla de conmutación compartida (solo lectura)
+        """
+        if ajuste_mortalidad is None:
+            ajuste_mortalidad = self.ajuste_mortalidad
+        clave = (sexo, bool(fumador), float(ajuste_mortalidad), float(tasa_mensual))
+        tabla = self._cache.get(clave)
+        if tabla is not None:
+            return tabla
+
+        with self._lock:
+            tabla = self._cache.get(clave)
+            if tabla is None:
+                tabla = self._construir(*clave)
+                self._cache[clave] = tabla
+            return tabla
+
+    def _construir(
+        self, sexo: str, fumador: bool, ajuste_mortalidad: float, tasa_mensual: float
+    ) -> TablaConmutacion:
+        """Proyecta los decrementos de todas las edades de emisión a la vez"""
+        anios = -(-self.meses // 12)
+        # Edad alcanzada de cada (edad de emisión, mes), como calcular_edad_actuarial
+        alcanzadas = (
+            np.array(self.edades)[:, None] + np.arange(self.meses)[None, :] // 12
+        )
+        primera = self.edades[0]
+        ultima = self.edades[-1] + anios
+        mortalidad = np.array(
+            [
+                self._domain.calcular_mortalidad_ajustada(
+                    self._domain.calcular_mortalidad_mensual(
+                        self._domain.calcular_mortalidad_anual(
+                            edad, sexo, fumador, self.tabla_mortalidad
+                        )
+                    ),
+                    ajuste_mortalidad / 100,
+                )
+                for edad in range(primera, ultima + 1)
+            ]
+        )[alcanzadas - primera]
+        caducidad = np.broadcast_to(self._caducidad, mortalidad.shape)
+
+        vivos_inicio, fallecidos, _ = self._domain.calcular_decrementos_escenarios(
+            mortalidad, caducidad
+        )
+        if self.cobertura == "itp":
+            invalidez = np.array(
+                [
+                    self._tasa_mensual_invalidez(edad)
+                    for edad in range(primera, ultima + 1)
+                ]
+            )[alcanzadas - primera]
+            beneficios = vivos_inicio * invalidez / 1000
+        else:
+            beneficios = fallecidos
+
+        return TablaConmutacion.desde_decrementos(
+            self.edades, vivos_inicio, beneficios, tasa_mensual
+        )
+
+    def _tasa_mensual_invalidez(self, edad: int) -> float:
+        """Tasa mensual (por mil) de invalidez accidental, como calcular_siniestros_itp"""
+        anual = self.tarifas_reaseguro.get(str(edad), {}).get("invalidez_accidental", 0)
+        return (1 - (1 - anual / 1000) ** (1 / 12)) * 1000
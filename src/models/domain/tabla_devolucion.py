@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class TablaDevolucion:
+    """
+    Tabla inmutable de devolución por periodo de vigencia.
+
+    Se construye una sola vez por snapshot de supuestos a partir de la tabla
+    devolucion.json: para cada vigencia guarda el vector de devolución de los años
+    de póliza anteriores al último, de modo que la tabla de una cotización es ese
+    vector escalado por el porcentaje de devolución.
+    """
+
+    vectores: Mapping[int, Tuple[float, ...]]
+    anios_poliza: int
+
+    @classmethod
+    def desde_tabla(cls, devolucion: Sequence[Mapping[str, Any]]) -> "TablaDevolucion":
+        """
+        Construye la tabla precalculando el vector de cada vigencia
+
+        Args:
+            devolucion: Tabla cruda [{"año_poliza", "plazo_pago_primas": {vigencia: valor}}]
+
+        Returns:
+            Tabla de devolución inmutable
+        """
+        vigencias = {int(v) for fila in devolucion for v in fila.get("plazo_pago_primas", {})}
+        vectores: Dict[int, Tuple[float, ...]] = {
+            vigencia: cls._vector(devolucion, vigencia) for vigencia in vigencias
+        }
+        return cls(vectores=MappingProxyType(vectores), anios_poliza=len(devolucion))
+
+    @staticmethod
+    def _vector(devolucion: Sequence[Mapping[str, Any]], vigencia: int) -> Tuple[float, ...]:
+        """Valores de la vigencia en los años de póliza 1 a vigencia - 1 (0 si falta)"""
+        return tuple(
+            fila.get("plazo_pago_primas", {}).get(str(vigencia), 0)
+            for fila in devolucion[: vigencia - 1]
+        )
+
+    def escalar(self, periodo_vigencia: int, porcentaje_devolucion: float) -> List[float]:
+        """
+        Tabla de devolución de una cotización
+
+        Args:
+            periodo_vigencia: Periodo de vigencia en años
+            porcentaje_devolucion: Porcentaje de devolución (0 a 100)
+
+        Returns:
+            Devolución de los años anteriores al último escalada por el porcentaje,
+            seguida del porcentaje de devolución del último año
+        """
+        vector = self.vectores.get(periodo_vigencia)
+        if vector is None:
+            # Vigencia sin columna en la tabla: los años disponibles no devuelven
+            vector = (0,) * max(min(periodo_vigencia - 1, self.anios_poliza), 0)
+        factor = porcentaje_devolucion / 100
+        return [valor * factor for valor in vector] + [porcentaje_devolucion]
@@ -0,0 +1,140 @@
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+
+# Modelos de tasa corta disponibles
+MODELOS_TASA_CORTA = ("vasicek", "hull_white")
+
+# Percentiles reportados por defecto
+PERCENTILES_POR_DEFECTO = (1, 5, 25, 50, 75, 95, 99)
+
+# Paso de simulación en años (un mes)
+PASO_MENSUAL = 1 / 12
+
+
+class TasasEstocasticasDomain:
+    """
+    Generador de trayectorias de tasa corta anual con discretización exacta mes a
+    mes, una fila por escenario.
+
+    vasicek: dr = a (b - r) dt + sigma dW, con b la tasa de largo plazo.
+    hull_white: r(t) = x(t) + alfa(t), con x un Ornstein-Uhlenbeck de media cero y
+    alfa(t) ajustado a una curva plana en la tasa inicial, de modo que el
+    precio de los bonos cero cupón de la curva inicial se reproduce.
+    """
+
+    def __init__(
+        self,
+        modelo: str = "vasicek",
+        velocidad_reversion: float = 0.1,
+        volatilidad: float = 0.01,
+        tasa_largo_plazo: Optional[float] = None,
+        semilla: Optional[int] = None,
+    ):
+        """
+        Args:
+            modelo: "vasicek" o "hull_white"
+            velocidad_reversion: Velocidad de reversión a la media (a, anual)
+            volatilidad: Volatilidad anual de la tasa corta (sigma, en decimal)
+            tasa_largo_plazo: Media de largo plazo de Vasicek (por defecto la
+                tasa inicial); se ignora en Hull-White
+            semilla: Semilla del generador aleatorio (None para no fijarla)
+
+        Raises:
+            ValueError: Si el modelo no existe o los parámetros no son válidos
+        """
+        if modelo not in MODELOS_TASA_CORTA:
+            raise ValueError(
+                f"Modelo de tasa corta no válido: {modelo}. "
+                f"Válidos: {list(MODELOS_TASA_CORTA)}"
+            )
+        if velocidad_reversion <= 0:
+            raise ValueError("La velocidad de reversión debe ser mayor a cero")
+        if volatilidad < 0:
+            raise ValueError("La volatilidad no puede ser negativa")
+        self.modelo = modelo
+        self.velocidad_reversion = velocidad_reversion
+        self.volatilidad = volatilidad
+        self.tasa_largo_plazo = tasa_largo_plazo
+        self.semilla = semilla
+
+    def generar_choques(self, escenarios: int, meses: int) -> np.ndarray:
+        """
+        Choques normales estándar (escenario, mes) de la semilla; con la misma
+        semilla todas las coberturas comparten las mismas trayectorias
+        """
+        rng = np.random.default_rng(self.semilla)
+        return rng.standard_normal((escenarios, meses))
+
+    def generar_trayectorias(
+        self, tasa_inicial: float, choques: np.ndarray
+    ) -> np.ndarray:
+        """
+        Trayectorias de tasa corta anual: la columna m es la tasa vigente durante
+        el mes m + 1 (la primera es la tasa inicial)
+
+        Args:
+            tasa_inicial: Tasa corta anual de partida (en decimal)
+            choques: Matriz (escenario, mes) de choques normales estándar
+
+        Returns:
+            Matriz (escenario, mes) de tasas anuales
+        """
+        a = self.velocidad_reversion
+        sigma = self.volatilidad
+        decaimiento = np.exp(-a * PASO_MENSUAL)
+        desviacion_paso = sigma * np.sqrt((1 - decaimiento**2) / (2 * a))
+
+        escenarios, meses = choques.shape
+        # Factor de ruido OU de media cero, exacto para el paso mensual
+        x = np.zeros((escenarios, meses))
+        for mes in range(1, meses):
+            x[:, mes] = x[:, mes - 1] * decaimiento + desviacion_paso * choques[:, mes]
+
+        t = np.arange(meses) * PASO_MENSUAL
+        if self.modelo == "vasicek":
+            media = (
+                tasa_inicial if self.tasa_largo_plazo is None else self.tasa_largo_plazo
+            )
+            deriva = media + (tasa_inicial - media) * np.exp(-a * t)
+        else:
+            deriva = tasa_inicial + sigma**2 / (2 * a**2) * (1 - np.exp(-a * t)) ** 2
+        return deriva + x
+
+    def resumir(
+        self, valores: Sequence[float], percentiles: Sequence[float]
+    ) -> Dict[str, Any]:
+        """
+        Media, desviación y percentiles de una distribución (ignora NaN)
+
+        Returns:
+            Diccionario {"media", "desviacion", "minimo", "maximo", "percentiles"}
+        """
+        valores = np.asarray(valores, dtype=float)
+        valores = valores[~np.isnan(valores)]
+        if not valores.size:
+            return {
+                "media": None,
+                "desviacion": None,
+                "minimo": None,
+                "maximo": None,
+                "percentiles": {f"p{p:g}": None for p in percentiles},
+            }
+        return {
+            "media": float(valores.mean()),
+            "desviacion": float(valores.std()),
+            "minimo": float(valores.min()),
+            "maximo": float(valores.max()),
+            "percentiles": {
+                f"p{p:g}": float(v)
+                for p, v in zip(percentiles, np.percentile(valores, percentiles))
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "modelo": self.modelo,
+            "velocidad_reversion": self.velocidad_reversion,
+            "volatilidad": self.volatilidad,
+            "tasa_largo_plazo": self.tasa_largo_plazo,
+            "semilla": self.semilla,
+        }
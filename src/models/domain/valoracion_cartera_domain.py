@@ -0,0 +1,147 @@
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+# Flujos de pasivo que se agregan mes a mes en la valoración de cartera
+FLUJOS_CARTERA = (
+    "primas_recurrentes",
+    "siniestros",
+    "rescate_ajuste_devolucion",
+    "gastos_mantenimiento",
+    "comision",
+    "flujo_pasivo",
+)
+
+
+class ValoracionCarteraDomain:
+    """
+    Dominio de la valoración de pólizas en vigor.
+
+    La proyección de un perfil está expresada para la cohorte inicial de
+    VIVOS_INICIO asegurados desde la emisión; una póliza en vigor en el mes de
+    póliza m vale lo que la proyección en el mes m dividido entre los vivos al
+    inicio de ese mes, y sus flujos remanentes son los meses m en adelante con la
+    misma normalización.
+    """
+
+    def calcular_reservas(
+        self,
+        flujos: Dict[str, np.ndarray],
+        vivos_inicio: np.ndarray,
+        meses_poliza: Sequence[int],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Reserva de cada póliza al inicio de su mes de valoración
+
+        Args:
+            flujos: Matrices (póliza, mes) de la proyección con la prima de cada póliza
+            vivos_inicio: Vector (mes) de vivos al inicio de la cohorte
+            meses_poliza: Meses transcurridos de cada póliza (0 = recién emitida)
+
+        Returns:
+            Vectores (póliza) de saldo_reserva, moce y margen_solvencia por póliza
+        """
+        meses_poliza = np.asarray(meses_poliza, dtype=int)
+        filas = np.arange(meses_poliza.size)
+        vivos = np.asarray(vivos_inicio, dtype=float)[meses_poliza]
+        return {
+            nombre: flujos[nombre][filas, meses_poliza] / vivos
+            for nombre in ("saldo_reserva", "moce", "margen_solvencia")
+        }
+
+    def alinear_flujos_remanentes(
+        self,
+        flujos: Dict[str, np.ndarray],
+        vivos_inicio: np.ndarray,
+        meses_poliza: Sequence[int],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Flujos remanentes de cada póliza alineados por mes desde la fecha de
+        valoración (la columna 0 es el mes en curso de cada póliza)
+
+        Args:
+            flujos: Matrices (póliza, mes) de la proyección con la prima de cada póliza
+            vivos_inicio: Vector (mes) de vivos al inicio de la cohorte
+            meses_poliza: Meses transcurridos de cada póliza
+
+        Returns:
+            Matrices (póliza, mes de valoración) de cada flujo de FLUJOS_CARTERA
+        """
+        meses_poliza = np.asarray(meses_poliza, dtype=int)
+        vivos_inicio = np.asarray(vivos_inicio, dtype=float)
+        meses = vivos_inicio.shape[-1]
+        horizonte = meses - int(meses_poliza.min())
+
+        # Índice del mes de póliza de cada columna; fuera de la vigencia no suma
+        indices = meses_poliza[:, None] + np.arange(horizonte)[None, :]
+        vigentes = indices < meses
+        indices = np.minimum(indices, meses - 1)
+        pesos = vigentes / vivos_inicio[meses_poliza][:, None]
+
+        return {
+            nombre: np.take_along_axis(flujos[nombre][:, :meses], indices, axis=1)
+            * pesos
+            for nombre in FLUJOS_CARTERA
+        }
+
+    def agregar_flujos_remanentes(
+        self,
+        flujos: Dict[str, np.ndarray],
+        vivos_inicio: np.ndarray,
+        meses_poliza: Sequence[int],
+        pesos: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Suma de los flujos remanentes de las pólizas, alineados por mes desde la
+        fecha de valoración
+
+        Args:
+            pesos: Pólizas que representa cada fila (por defecto una)
+
+        Returns:
+            Vectores (mes de valoración) con la suma de cada flujo de FLUJOS_CARTERA
+        """
+        alineados = self.alinear_flujos_remanentes(flujos, vivos_inicio, meses_poliza)
+        if pesos is None:
+            return {
+                nombre: np.sum(valores, axis=0) for nombre, valores in alineados.items()
+            }
+        pesos = np.asarray(pesos, dtype=float)
+        return {nombre: pesos @ valores for nombre, valores in alineados.items()}
+
+    def sumar_matrices(
+        self, matrices: Dict[str, np.ndarray], filas_por_bloque: int
+    ) -> Dict[str, np.ndarray]:
+        """
+        Suma por columnas de matrices (póliza, mes) recorriéndolas por bloques de
+        filas, de modo que las matrices en disco (memmap) no se cargan completas
+
+        Args:
+            matrices: Matrices (póliza, mes) por flujo
+            filas_por_bloque: Filas leídas por bloque
+
+        Returns:
+            Vectores (mes) con la suma de cada matriz
+        """
+        sumas = {}
+        for nombre, matriz in matrices.items():
+            suma = np.zeros(matriz.shape[1])
+            for inicio in range(0, matriz.shape[0], filas_por_bloque):
+                suma += np.sum(matriz[inicio : inicio + filas_por_bloque], axis=0)
+            sumas[nombre] = suma
+        return sumas
+
+    def acumular(
+        self, total: Dict[str, np.ndarray], parcial: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """Suma dos agregados de flujos con horizontes posiblemente distintos"""
+        if not total:
+            return {nombre: np.array(valores) for nombre, valores in parcial.items()}
+        acumulado = {}
+        for nombre in set(total) | set(parcial):
+            a = total.get(nombre, np.zeros(0))
+            b = parcial.get(nombre, np.zeros(0))
+            suma = np.zeros(max(a.size, b.size))
+            suma[: a.size] += a
+            suma[: b.size] += b
+            acumulado[nombre] = suma
+        return acumulado
@@ -6,7 +6,17 @@ from .endosos import (
     EndososOrchestrator,
     endosos_orchestrator,
     cotizar_endosos,
-    get_endosos_info
+    cotizar_indicativa_endosos,
+    get_cotizacion_exacta_endosos,
+    cotizar_suma_asegurada_endosos,
+    cotizar_variantes_endosos,
+    cotizar_matriz_endosos,
+    cotizar_sensibilidad_endosos,
+    cotizar_estocastico_endosos,
+    valorar_cartera_endosos,
+    get_endosos_info,
+    get_motores_info,
+    configurar_motores
 )
 from .core.response_building_step import (
     build_endosos_response,
@@ -19,7 +29,17 @@ __all__ = [
     "EndososOrchestrator",
     "endosos_orchestrator", 
     "cotizar_endosos",
+    "cotizar_indicativa_endosos",
+    "get_cotizacion_exacta_endosos",
+    "cotizar_suma_asegurada_endosos",
+    "cotizar_variantes_endosos",
+    "cotizar_matriz_endosos",
+    "cotizar_sensibilidad_endosos",
+    "cotizar_estocastico_endosos",
+    "valorar_cartera_endosos",
     "get_endosos_info",
+    "get_motores_info",
+    "configurar_motores",
     # Funciones de compatibilidad
     "build_endosos_response",
     "build_default_endosos_response", 
@@ -4,5 +4,6 @@ Paquete de coberturas específicas para endosos
 
 from .fallecimiento import FallecimientoCobertura
 from .itp import ItpCobertura
+from .registro import RegistroCoberturas
 
-__all__ = ['FallecimientoCobertura', 'ItpCobertura']
+__all__ = ['FallecimientoCobertura', 'ItpCobertura', 'RegistroCoberturas']
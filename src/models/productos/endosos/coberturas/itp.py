@@ -2,7 +2,7 @@
 Módulo específico para la cobertura de ITP (Incapacidad Total y Permanente)
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Mapping
 import math
 from src.infrastructure.repositories import get_repos
 from src.models.services.parametros_calculados_service import (
@@ -11,6 +11,7 @@ from src.models.services.parametros_calculados_service import (
 from src.models.services.calculo_actuarial_service import CalculoActuarialService
 from src.models.services.goal_seek_service import GoalSeekService
 from src.common.producto import Producto
+from src.models.domain.curva_tasas_interes import CurvaTasasInteres
 from src.utils.frecuencia_meses import frecuencia_meses
 
 
@@ -141,16 +142,22 @@ class ItpCobertura:
     def calcular_parametros_calculados(
         self,
         parametros_entrada: Dict[str, Any],
-        tasas_interes_data: Dict[str, Any],
+        curva_tasas_interes: CurvaTasasInteres,
         producto,
+        parametros: Optional[Dict[str, Any]] = None,
+        constantes: Optional[Mapping[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Calcula todos los parámetros calculados específicos para ITP
 
         Args:
             parametros_entrada: Parámetros de entrada del usuario
-            tasas_interes_data: Datos de tasas de interés
+            curva_tasas_interes: Curva de tasas de interés del snapshot de supuestos
             producto: Tipo de producto
+            parametros: Parámetros almacenados de la petición (por defecto los
+                cargados en la instancia); no se guardan en la instancia para
+                que pueda compartirse entre peticiones concurrentes
+            constantes: Constantes derivadas del plan de cotización (opcional)
 
         Returns:
             Diccionario con parámetros calculados de ITP
@@ -160,10 +167,11 @@ class ItpCobertura:
             parametros_calculados = (
                 self.parametros_calculados_service.get_parametros_calculados(
                     parametros_entrada,
-                    self.parametros,
-                    tasas_interes_data,
+                    parametros if parametros is not None else self.parametros,
+                    curva_tasas_interes,
                     producto,
                     "itp",
+                    constantes,
                 )
             )
 
@@ -249,6 +257,7 @@ class ItpCobertura:
         try:
             resultado_goal_seek = None
             prima_optima = None
+            proyeccion = None
 
             if ejecutar_goal_seek:
                 print(f"\n🎯 Ejecutando Goal Seek para ITP...")
@@ -265,7 +274,7 @@ class ItpCobertura:
                     parametros_calculados,
                 )
 
-                # Extraer prima óptima si el Goal Seek fue exitoso
+                # Extraer prima óptima y proyección si el Goal Seek fue exitoso
                 if (
                     resultado_goal_seek.get("coberturas_optimizadas")
                     and "itp" in resultado_goal_seek["coberturas_optimizadas"]
@@ -275,30 +284,40 @@ class ItpCobertura:
                         "itp"
                     ]
                     prima_optima = cobertura_resultado.get("prima_asignada_optima")
+                    proyeccion = cobertura_resultado.get("proyeccion")
 
                     if prima_optima is not None:
-                        # Actualizar la prima en los parámetros almacenados
-                        if "itp" in parametros_almacenados.get("coberturas", {}):
-                            parametros_almacenados["coberturas"]["itp"][
-                                "prima_asignada"
-                            ] = prima_optima
-
-                            print(f"✅ ITP optimizada:")
-                            print(f"   Prima óptima: {prima_optima:.6f}")
-                            print(
-                                f"   VNA resultante: {cobertura_resultado.get('vna_resultado', 0):.12f}"
-                            )
-                            print(
-                                f"   Convergió: {cobertura_resultado.get('convergio', False)}"
-                            )
-                            print(
-                                f"   Iteraciones: {cobertura_resultado.get('iteraciones', 0)}"
-                            )
-
-            # Ejecutar cálculo actuarial normal con la prima (optimizada o original)
-            resultados_actuariales = self.calculo_actuarial(
-                parametros_entrada, parametros_almacenados, parametros_calculados
-            )
+                        print(f"✅ ITP optimizada:")
+                        print(f"   Prima óptima: {prima_optima:.6f}")
+                        print(
+                            f"   VNA resultante: {cobertura_resultado.get('vna_resultado', 0):.12f}"
+                        )
+                        print(
+                            f"   Convergió: {cobertura_resultado.get('convergio', False)}"
+                        )
+                        print(
+                            f"   Iteraciones: {cobertura_resultado.get('iteraciones', 0)}"
+                        )
+
+            if proyeccion is not None:
+                # La última evaluación del Goal Seek ya es la proyección en la prima
+                # óptima: se usa directamente sin volver a proyectar
+                resultados_actuariales = {
+                    "vna_resultado": proyeccion["vna_resultado"],
+                    "proyeccion": proyeccion,
+                }
+            elif prima_optima is not None:
+                # Prima de la descomposición por suma asegurada: equilibrio sin
+                # proyectar
+                resultados_actuariales = {
+                    "vna_resultado": cobertura_resultado["vna_resultado"],
+                    "proyeccion": None,
+                }
+            else:
+                # Ejecutar cálculo actuarial normal con la prima original
+                resultados_actuariales = self.calculo_actuarial(
+                    parametros_entrada, parametros_almacenados, parametros_calculados
+                )
 
             # Agregar información del Goal Seek al resultado
             if resultado_goal_seek:
@@ -0,0 +1,99 @@
+"""
+Registro de las coberturas de endosos y de sus manejadores compartidos
+"""
+
+import threading
+from typing import Any, Dict, List, Tuple
+from src.infrastructure.repositories import supuestos_repository
+from .fallecimiento import FallecimientoCobertura
+from .itp import ItpCobertura
+
+
+class RegistroCoberturas:
+    """
+    Registro nombre de cobertura -> clase manejadora.
+
+    Cada manejador se construye (repositorios, factores de pago y parámetros
+    almacenados) una sola vez por versión de supuestos y se comparte entre
+    peticiones: después de construido solo se lee, así que no guarda estado de
+    ninguna cotización.
+    """
+
+    _clases: Dict[str, type] = {}
+    _cache: Dict[Tuple[str, int], Any] = {}
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def registrar(cls, cobertura: str, clase: type) -> None:
+        """
+        Registra la clase manejadora de una cobertura
+
+        Args:
+            cobertura: Nombre de la cobertura (ej: "fallecimiento")
+            clase: Clase cuyo constructor no recibe argumentos
+        """
+        with cls._cache_lock:
+            cls._clases[cobertura.lower()] = clase
+            cls._cache = {}
+
+    @classmethod
+    def esta_registrada(cls, cobertura: str) -> bool:
+        """Indica si la cobertura tiene manejador registrado"""
+        return cobertura.lower() in cls._clases
+
+    @classmethod
+    def coberturas_registradas(cls) -> List[str]:
+        """Nombres de las coberturas registradas"""
+        return list(cls._clases)
+
+    @classmethod
+    def get_handler(cls, cobertura: str) -> Any:
+        """
+        Obtiene el manejador compartido de la cobertura para la versión vigente de
+        los supuestos, construyéndolo si es necesario
+
+        Args:
+            cobertura: Nombre de la cobertura
+
+        Returns:
+            Instancia compartida de la clase de la cobertura (no modificar)
+
+        Raises:
+            ValueError: Si la cobertura no está registrada
+        """
+        cobertura = cobertura.lower()
+        clase = cls._clases.get(cobertura)
+        if clase is None:
+            raise ValueError(
+                f"Cobertura no soportada: {cobertura}. "
+                f"Registradas: {cls.coberturas_registradas()}"
+            )
+
+        cache_key = (cobertura, supuestos_repository.get_version())
+        handler = cls._cache.get(cache_key)
+        if handler is not None:
+            return handler
+
+        with cls._cache_lock:
+            handler = cls._cache.get(cache_key)
+            if handler is None:
+                handler = clase()
+                handler.cargar_parametros()
+                # Los manejadores de versiones anteriores ya no se usan
+                cls._cache = {
+                    clave: valor
+                    for clave, valor in cls._cache.items()
+                    if clave[1] == cache_key[1]
+                }
+                cls._cache[cache_key] = handler
+            return handler
+
+    @classmethod
+    def limpiar_cache(cls):
+        """Descarta los manejadores construidos"""
+        with cls._cache_lock:
+            cls._cache = {}
+
+
+RegistroCoberturas.registrar("fallecimiento", FallecimientoCobertura)
+RegistroCoberturas.registrar("itp", ItpCobertura)
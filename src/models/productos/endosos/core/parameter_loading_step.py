@@ -1,6 +1,6 @@
 from src.infrastructure.repositories import get_repos
 from typing import Dict, Any, Optional
-from src.models.productos.endosos.coberturas import FallecimientoCobertura, ItpCobertura
+from src.models.productos.endosos.coberturas import RegistroCoberturas
 
 
 class ParameterLoadingStep:
@@ -46,8 +46,8 @@ class ParameterLoadingStep:
                 print(f"Error: Cobertura '{self.cobertura}' no soportada")
                 return {}
 
-            # Cargar parámetros usando el módulo específico de la cobertura
-            parametros = cobertura_instance.cargar_parametros()
+            # Parámetros cargados por el registro al construir el handler compartido
+            parametros = cobertura_instance.parametros
 
             # Validar parámetros específicos de la cobertura
             if hasattr(cobertura_instance, f"validar_parametros_{self.cobertura}"):
@@ -70,19 +70,12 @@ class ParameterLoadingStep:
         Obtiene la instancia específica de la cobertura
 
         Returns:
-            Instancia de la clase específica de la cobertura o None si no es soportada
+            Handler compartido de la cobertura o None si no es soportada
         """
-        coberturas_soportadas = {
-            "fallecimiento": FallecimientoCobertura,
-            "itp": ItpCobertura,
-        }
-
-        cobertura_class = coberturas_soportadas.get(self.cobertura.lower())
-
-        if cobertura_class is None:
+        if not RegistroCoberturas.esta_registrada(self.cobertura):
             return None
 
-        return cobertura_class()
+        return RegistroCoberturas.get_handler(self.cobertura)
 
     def get_parametro(self, nombre_parametro: str, valor_default: Any = None) -> Any:
         """
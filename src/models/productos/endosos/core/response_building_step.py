@@ -4,7 +4,8 @@ Módulo para construir la respuesta de cotización de endosos
 
 from typing import Dict, Any, List, Optional
 from src.common.frecuencia_pago import FrecuenciaPago
-from src.models.productos.endosos.core.parameter_loading_step import ParameterLoadingStep
+from src.common.producto import Producto
+from src.models.productos.plan_cotizacion import CompiladorPlanes
 
 
 def _get_default_endosos_values() -> Dict[str, Any]:
@@ -23,54 +24,20 @@ def _get_default_endosos_values() -> Dict[str, Any]:
     }
 
 
-def _load_parametros_almacenados_por_cobertura(coberturas: List[str]) -> Dict[str, Any]:
+def _parametros_almacenados_plan(coberturas: List[str]) -> Dict[str, Any]:
     """
-    Carga los parámetros almacenados para cada cobertura especificada
-    
+    Copia de los parámetros almacenados de las coberturas desde el plan de
+    cotización compilado del producto
+
     Args:
-        coberturas: Lista de coberturas para cargar parámetros
-        
+        coberturas: Coberturas pedidas
+
     Returns:
-        Diccionario con parámetros organizados por cobertura en orden específico
+        Diccionario {"coberturas": {cobertura: parámetros}} en el orden del plan
     """
-    # Definir el orden específico de las coberturas
-    orden_coberturas = ["fallecimiento", "itp"]
-    
-    # Ordenar las coberturas según el orden especificado
-    coberturas_ordenadas = []
-    for cobertura in orden_coberturas:
-        if cobertura in coberturas:
-            coberturas_ordenadas.append(cobertura)
-    
-    # Agregar cualquier cobertura que no esté en el orden específico
-    for cobertura in coberturas:
-        if cobertura not in coberturas_ordenadas:
-            coberturas_ordenadas.append(cobertura)
-    
-    parametros_almacenados = {
-        "coberturas": {}
-    }
-    
-    for cobertura in coberturas_ordenadas:
-        try:
-            # Crear instancia del ParameterLoadingStep para esta cobertura
-            step = ParameterLoadingStep("endosos", cobertura)
-            
-            # Cargar parámetros para esta cobertura
-            parametros_cobertura = step.execute()
-            
-            if parametros_cobertura:
-                parametros_almacenados["coberturas"][cobertura] = parametros_cobertura
-                print(f"Parámetros cargados para cobertura '{cobertura}': {len(parametros_cobertura)} parámetros")
-            else:
-                print(f"Advertencia: No se pudieron cargar parámetros para la cobertura '{cobertura}'")
-                parametros_almacenados["coberturas"][cobertura] = {}
-                
-        except Exception as e:
-            print(f"Error al cargar parámetros para cobertura '{cobertura}': {e}")
-            parametros_almacenados["coberturas"][cobertura] = {}
-    
-    return parametros_almacenados
+    return CompiladorPlanes.get_plan(Producto.ENDOSOS).parametros_almacenados(
+        coberturas
+    )
 
 
 def build_endosos_response(
@@ -125,7 +92,7 @@ def build_default_endosos_response() -> Dict[str, Any]:
 
     # Cargar parámetros almacenados dinámicamente
     coberturas = parametros_entrada.get("coberturas", ["fallecimiento", "itp"])
-    parametros_almacenados = _load_parametros_almacenados_por_cobertura(coberturas)
+    parametros_almacenados = _parametros_almacenados_plan(coberturas)
 
     # Parámetros calculados de ejemplo
     parametros_calculados = {
@@ -219,7 +186,7 @@ def build_endosos_response_from_request(request_data: Dict[str, Any]) -> Dict[st
     coberturas = parametros_entrada.get("coberturas", ["fallecimiento", "itp"])
     
     # Cargar parámetros almacenados dinámicamente para cada cobertura
-    parametros_almacenados = _load_parametros_almacenados_por_cobertura(coberturas)
+    parametros_almacenados = _parametros_almacenados_plan(coberturas)
     
     # Inicializar estructuras vacías para parámetros calculados y endosos
     parametros_calculados = {
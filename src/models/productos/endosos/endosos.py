@@ -2,63 +2,89 @@
 Orquestador principal para el producto ENDOSOS
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import math
+import os
 from src.models.productos.endosos.core.parameter_loading_step import (
     ParameterLoadingStep,
 )
 from src.models.productos.endosos.core.response_building_step import (
     build_endosos_response,
     _get_default_endosos_values,
-    _load_parametros_almacenados_por_cobertura,
 )
-from src.infrastructure.repositories.repos import get_repos
-from src.models.domain.parametros_calculados import ParametrosCalculados
 from src.models.services.parametros_calculados_service import (
     ParametrosCalculadosService,
 )
-from src.models.productos.endosos.coberturas.fallecimiento import FallecimientoCobertura
-from src.models.productos.endosos.coberturas.itp import ItpCobertura
+from src.models.productos.endosos.coberturas.registro import RegistroCoberturas
+from src.models.productos.plan_cotizacion import CompiladorPlanes, PlanCotizacion
 from src.common.producto import Producto
 from src.models.services.calculo_actuarial_service import CalculoActuarialService
+from src.models.services.suma_asegurada_service import SumaAseguradaService
+from src.models.services.goal_seek_service import GoalSeekService
+from src.models.services.registro_motores import RegistroMotores
+from src.models.services.proyeccion_variantes_service import FRECUENCIAS_PAGO_PRIMAS
+from src.models.services.sensibilidad_service import SensibilidadService
+from src.models.services.cotizacion_indicativa_service import (
+    CotizacionIndicativaService,
+)
+from src.models.domain.cotizaciones_asincronas import (
+    CotizacionesAsincronas,
+    clave_cotizacion,
+)
+from src.models.domain.choque_supuesto import ChoqueSupuesto, CHOQUES_POR_DEFECTO
+from src.models.domain.contexto_cotizacion import ContextoCotizacion
+from src.models.services.tasas_estocasticas_service import TasasEstocasticasService
+from src.models.domain.tasas_estocasticas_domain import (
+    TasasEstocasticasDomain,
+    PERCENTILES_POR_DEFECTO,
+)
+from src.models.domain.puntos_modelo_domain import PuntosModeloDomain
+from src.models.productos.endosos.valoracion_cartera import (
+    ValoracionCarteraEndosos,
+    PRESUPUESTO_MEMORIA_CARTERA_MB,
+)
+
+# Máximo de celdas por matriz de cotización
+MAX_CELDAS_MATRIZ = 1000
+
+# Trayectorias de tasa por defecto y máximas de la valoración estocástica
+ESCENARIOS_ESTOCASTICOS = 1000
+MAX_ESCENARIOS_ESTOCASTICOS = 100000
 
 
 class EndososOrchestrator:
     """
     Orquestador principal para el producto ENDOSOS.
     Coordina la carga de parámetros y construcción de respuestas.
+
+    Una sola instancia atiende peticiones concurrentes: el estado de cada petición
+    (parámetros de entrada, almacenados y calculados) viaja en su
+    ContextoCotizacion y los servicios con estado por cálculo se crean por petición. Los atributos de
+    la instancia no cambian después de construidos; las coberturas, sus handlers y
+    sus supuestos vienen del plan de cotización compilado del producto.
     """
 
     def __init__(self):
         self.producto = "endosos"
-        self._coberturas_disponibles = None
-        self._parametros_calculados = ParametrosCalculados()
         self._parametros_calculados_service = ParametrosCalculadosService()
-        self._cobertura_fallecimiento = FallecimientoCobertura()
-        self._cobertura_itp = ItpCobertura()
+        # Cotizaciones exactas en segundo plano de las peticiones indicativas
+        self._cotizaciones_asincronas = CotizacionesAsincronas()
+
+    def _plan(self) -> PlanCotizacion:
+        """Plan de cotización compilado del producto (compartido, no modificar)"""
+        return CompiladorPlanes.get_plan(Producto.ENDOSOS)
 
     def _cargar_coberturas_disponibles(self) -> List[str]:
         """
-        Carga las coberturas disponibles desde el repositorio
+        Obtiene las coberturas disponibles del plan de cotización
 
         Returns:
             Lista de coberturas disponibles para el producto
         """
-        if self._coberturas_disponibles is None:
-            try:
-                repos = get_repos(self.producto)
-                coberturas_repo = repos["coberturas"]
-                self._coberturas_disponibles = (
-                    coberturas_repo.get_coberturas_by_producto(self.producto)
-                )
-                print(
-                    f"Coberturas cargadas para {self.producto}: {self._coberturas_disponibles}"
-                )
-            except Exception as e:
-                print(f"Error al cargar coberturas: {e}")
-                # Fallback a coberturas por defecto
-                self._coberturas_disponibles = ["fallecimiento", "itp"]
-
-        return self._coberturas_disponibles
+        return list(self._plan().coberturas_disponibles)
 
     def cotizar(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -71,18 +97,11 @@ class EndososOrchestrator:
             Diccionario con la respuesta completa de cotización
         """
         try:
-            # 1. Preparar parámetros de entrada
-            parametros_entrada = self._preparar_parametros_entrada(request_data)
-
-            # 2. Cargar parámetros almacenados por cobertura
-            parametros_almacenados = self._cargar_parametros_almacenados(
-                parametros_entrada
-            )
-
-            # 3. Calcular parámetros específicos
-            parametros_calculados = self._calcular_parametros_calculados(
-                parametros_entrada, parametros_almacenados
-            )
+            # 1-3. Parámetros de entrada, almacenados y calculados de la petición
+            contexto = self._preparar_contexto(request_data)
+            parametros_entrada = contexto.parametros_entrada
+            parametros_almacenados = contexto.parametros_almacenados
+            parametros_calculados = contexto.parametros_calculados
 
             # 4. Calcular datos específicos de endosos (mantener para pruebas)
             """calcular_endosos = self._calcular_endosos(
@@ -106,7 +125,9 @@ class EndososOrchestrator:
             # 6. Construir respuesta final
             response = build_endosos_response(
                 parametros_entrada=parametros_entrada,
-                parametros_almacenados=parametros_almacenados,
+                parametros_almacenados=self._parametros_almacenados_con_primas_optimas(
+                    parametros_almacenados, calcular_goalseek
+                ),
                 parametros_calculados=parametros_calculados,
                 endosos=endosos,
             )
@@ -118,6 +139,494 @@ class EndososOrchestrator:
             print(f"Tipo de error: {type(e).__name__}")
             raise
 
+    def cotizar_indicativa(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cotización indicativa: primas interpoladas de la rejilla precalculada con
+        las tablas de conmutación, sin proyectar flujos ni resolver el Goal Seek,
+        con el error estimado de cada prima al nivel de confianza calibrado de la
+        rejilla. La cotización exacta de la misma petición se resuelve en segundo
+        plano y se consulta con la clave devuelta.
+
+        Args:
+            request_data: Datos de la petición de cotización
+
+        Returns:
+            Diccionario con la clave, el estado de la cotización exacta, el nivel
+            de confianza y las primas indicativas con su error estimado por
+            cobertura y del cliente. Las coberturas sin prima indicativa (nodo
+            faltante en la rejilla o error estimado mayor que el admitido) quedan
+            en coberturas_sin_indicativa con el motivo, y entonces primas_cliente
+            es None
+
+        Raises:
+            ValueError: Si no hay rejilla vigente o el perfil queda fuera de ella
+        """
+        try:
+            parametros_entrada = self._preparar_parametros_entrada(request_data)
+            coberturas_obj = parametros_entrada.get("coberturas", {})
+            coberturas = [k for k, v in coberturas_obj.items() if v]
+
+            plan = self._plan()
+            indicativa_service = CotizacionIndicativaService(Producto.ENDOSOS)
+            rejilla = indicativa_service.validar(parametros_entrada)
+            primas_coberturas = {}
+            errores_relativos = {}
+            coberturas_sin_indicativa = {}
+            for cobertura in plan.seleccionar(coberturas):
+                try:
+                    estimacion = indicativa_service.estimar(
+                        parametros_entrada, cobertura
+                    )
+                except ValueError as e:
+                    coberturas_sin_indicativa[cobertura] = str(e)
+                    continue
+                handler = plan.get_handler(cobertura)
+                # Las primas por frecuencia son proporcionales a la mensual: el
+                # error se traslada con los mismos factores
+                primas_coberturas[cobertura] = {
+                    "primas_frecuencializadas": handler.calcular_primas_frecuencializadas(
+                        estimacion["prima"]
+                    ),
+                    "error_estimado": handler.calcular_primas_frecuencializadas(
+                        estimacion["error_estimado"]
+                    ),
+                }
+                errores_relativos[cobertura] = estimacion["error_relativo"]
+
+            clave = clave_cotizacion(parametros_entrada)
+            estado = self._cotizaciones_asincronas.enviar(
+                clave, lambda: self.cotizar(request_data)
+            )
+
+            return {
+                "producto": "ENDOSOS",
+                "modo": "indicativo",
+                "clave": clave,
+                "estado_exacta": estado,
+                "parametros_entrada": parametros_entrada,
+                "nivel_confianza": rejilla.nivel_confianza,
+                "coberturas": {
+                    cobertura: {
+                        **primas,
+                        "error_relativo": errores_relativos[cobertura],
+                    }
+                    for cobertura, primas in primas_coberturas.items()
+                },
+                "coberturas_sin_indicativa": coberturas_sin_indicativa,
+                # El error estimado del total suma los de las coberturas (sin
+                # compensaciones); sin alguna cobertura el total no sería la
+                # prima del cliente
+                "primas_cliente": (
+                    None
+                    if coberturas_sin_indicativa
+                    else self._calcular_primas_cliente(primas_coberturas)
+                ),
+            }
+
+        except Exception as e:
+            print(f"Error en cotización indicativa de endosos: {e}")
+            print(f"Tipo de error: {type(e).__name__}")
+            raise
+
+    def get_cotizacion_exacta(self, clave: str) -> Dict[str, Any]:
+        """
+        Cotización exacta en segundo plano de una petición indicativa
+
+        Args:
+            clave: Clave devuelta por cotizar_indicativa
+
+        Returns:
+            Diccionario con clave, estado (pendiente, completada, error o
+            descartada) y data con la cotización completa si ya terminó
+
+        Raises:
+            KeyError: Si la clave no existe o ya se descartó
+        """
+        registro = self._cotizaciones_asincronas.get(clave)
+        if registro is None:
+            raise KeyError(f"No hay cotización para la clave {clave}")
+        return registro
+
+    def cotizar_suma_asegurada(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resuelve la suma asegurada que corresponde a una prima mensual objetivo
+
+        Args:
+            request_data: Datos de la petición con prima_mensual_objetivo
+                (suma_asegurada es opcional y solo se usa como semilla)
+
+        Returns:
+            Diccionario con la suma asegurada, las primas implícitas y el diagnóstico
+        """
+        try:
+            prima_objetivo = request_data["prima_mensual_objetivo"]
+
+            contexto = self._preparar_contexto(request_data)
+
+            # Servicio por petición: el dominio lleva el conteo de evaluaciones
+            resultado = SumaAseguradaService().execute(
+                contexto.parametros_entrada,
+                contexto.parametros_almacenados,
+                contexto.parametros_calculados,
+                prima_objetivo,
+            )
+
+            primas_coberturas = {}
+            for cobertura, resultado_cobertura in resultado["coberturas"].items():
+                primas_coberturas[cobertura] = {
+                    "primas_frecuencializadas": self._plan().get_handler(
+                        cobertura
+                    ).calcular_primas_frecuencializadas(
+                        resultado_cobertura["prima_asignada_optima"]
+                    )
+                }
+
+            return {
+                "producto": "ENDOSOS",
+                "suma_asegurada": resultado["suma_asegurada"],
+                "prima_mensual_objetivo": prima_objetivo,
+                "coberturas": primas_coberturas,
+                "primas_cliente": self._calcular_primas_cliente(primas_coberturas),
+                "diagnostico": {
+                    "convergio": resultado["convergio"],
+                    "iteraciones": resultado["iteraciones"],
+                    "evaluaciones": resultado["evaluaciones"],
+                    "coberturas": {
+                        cobertura: {
+                            "prima_asignada_optima": r["prima_asignada_optima"],
+                            "vna_resultado": r["vna_resultado"],
+                            "a": r["a"],
+                            "b": r["b"],
+                        }
+                        for cobertura, r in resultado["coberturas"].items()
+                    },
+                },
+            }
+
+        except Exception as e:
+            print(f"Error en resolución de suma asegurada de endosos: {e}")
+            print(f"Tipo de error: {type(e).__name__}")
+            raise
+
+    def cotizar_variantes(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cotiza todas las variantes frecuencia de pago × fumador × asistencia de un
+        perfil en una sola pasada del motor de variantes
+
+        A diferencia de calcular_primas_frecuencializadas, que escala la prima
+        mensual con factores_pago, cada frecuencia se proyecta con sus meses de
+        cobro reales y el rescate sobre sus cuotas cobradas, y tiene su propia
+        prima (por cuota) de equilibrio. Una variante sin raíz queda con prima
+        None, fuera de primas_cliente, y se lista en el diagnóstico.
+
+        Args:
+            request_data: Datos de la petición; frecuencias_pago_primas, fumadores
+                y asistencias son listas (por defecto las cuatro frecuencias, el
+                fumador de la petición y la asistencia almacenada de cada cobertura)
+
+        Returns:
+            Diccionario con una cotización por combinación de fumador y asistencia,
+            cada una con las primas por frecuencia
+
+        Raises:
+            ValueError: Si algún eje está vacío o trae una frecuencia desconocida
+        """
+        try:
+            parametros_entrada = self._preparar_parametros_entrada(request_data)
+
+            frecuencias = list(
+                request_data.get("frecuencias_pago_primas") or FRECUENCIAS_PAGO_PRIMAS
+            )
+            fumadores = list(
+                request_data.get("fumadores") or [parametros_entrada.get("fumador", False)]
+            )
+            asistencias = list(request_data.get("asistencias") or [None])
+            desconocidas = [f for f in frecuencias if f not in FRECUENCIAS_PAGO_PRIMAS]
+            if desconocidas:
+                raise ValueError(f"Frecuencias de pago no válidas: {desconocidas}")
+
+            contexto = self._contexto(parametros_entrada)
+
+            resultado = GoalSeekService(modo="vectorizado").execute_variantes(
+                contexto.parametros_entrada,
+                contexto.parametros_almacenados,
+                contexto.parametros_calculados,
+                frecuencias,
+                fumadores,
+                asistencias,
+            )
+            if "error" in resultado:
+                raise ValueError(resultado["error"])
+
+            # Agrupar las variantes por (fumador, asistencia): una cotización con
+            # la prima de cada frecuencia
+            cotizaciones = {}
+            for fila, variante in enumerate(resultado["variantes"]):
+                clave = (variante["fumador"], variante["asistencia"])
+                primas_coberturas = cotizaciones.setdefault(clave, {})
+                for cobertura, r in resultado["coberturas_optimizadas"].items():
+                    primas_coberturas.setdefault(
+                        cobertura, {"primas_frecuencializadas": {}}
+                    )["primas_frecuencializadas"][
+                        variante["frecuencia_pago_primas"].lower()
+                    ] = r["variantes"][fila]["prima_asignada_optima"]
+
+            return {
+                "producto": "ENDOSOS",
+                "suma_asegurada": parametros_entrada.get("suma_asegurada"),
+                "frecuencias_pago_primas": frecuencias,
+                "cotizaciones": [
+                    {
+                        "fumador": fumador,
+                        "asistencia": asistencia,
+                        "coberturas": primas_coberturas,
+                        "primas_cliente": self._calcular_primas_cliente(
+                            primas_coberturas
+                        ),
+                    }
+                    for (fumador, asistencia), primas_coberturas in cotizaciones.items()
+                ],
+                "diagnostico": {
+                    cobertura: {
+                        "barridos": r["iteraciones"],
+                        "convergio": all(v["convergio"] for v in r["variantes"]),
+                        "origenes": sorted({v["origen"] for v in r["variantes"]}),
+                        "variantes_sin_prima": [
+                            variante
+                            for variante, solucion in zip(
+                                resultado["variantes"], r["variantes"]
+                            )
+                            if solucion["prima_asignada_optima"] is None
+                        ],
+                    }
+                    for cobertura, r in resultado["coberturas_optimizadas"].items()
+                },
+            }
+
+        except Exception as e:
+            print(f"Error en cotización de variantes de endosos: {e}")
+            print(f"Tipo de error: {type(e).__name__}")
+            raise
+
+    def cotizar_matriz(
+        self, request_data: Dict[str, Any], procesos: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Cotiza la grilla completa edad × vigencia × pago × porcentaje_devolucion
+
+        Los parámetros calculados se obtienen una vez por combinación de plazos y las
+        celdas comparten las cachés de decrementos, descuentos y supuestos; cada celda
+        se resuelve con el Goal Seek vectorizado. Las celdas se reparten entre
+        procesos, como los bloques de la valoración de cartera: el Goal Seek es código Python
+        y con hilos quedaría serializado por el GIL.
+
+        Args:
+            request_data: Datos de la petición; edad_actuarial, periodo_vigencia,
+                periodo_pago_primas y porcentaje_devolucion son listas (si no se
+                indica periodo_pago_primas se usa el mismo plazo de la vigencia)
+            procesos: Procesos para evaluar las celdas (por defecto según CPUs; 1
+                las evalúa en este proceso)
+
+        Returns:
+            Diccionario con los ejes y las primas de cada celda (o su error)
+
+        Raises:
+            ValueError: Si algún eje está vacío o la grilla excede MAX_CELDAS_MATRIZ
+        """
+        try:
+            ejes = {
+                "edad_actuarial": list(request_data["edad_actuarial"]),
+                "periodo_vigencia": list(request_data["periodo_vigencia"]),
+                "periodo_pago_primas": (
+                    list(request_data["periodo_pago_primas"])
+                    if request_data.get("periodo_pago_primas")
+                    else None
+                ),
+                "porcentaje_devolucion": list(request_data["porcentaje_devolucion"]),
+            }
+            if not all(v for k, v in ejes.items() if k != "periodo_pago_primas"):
+                raise ValueError("Los ejes de la matriz no pueden estar vacíos")
+
+            celdas = []
+            for edad, vigencia, porcentaje in itertools.product(
+                ejes["edad_actuarial"],
+                ejes["periodo_vigencia"],
+                ejes["porcentaje_devolucion"],
+            ):
+                pagos = ejes["periodo_pago_primas"] or [vigencia]
+                for pago in pagos:
+                    if pago <= vigencia:
+                        celdas.append(
+                            {
+                                "edad_actuarial": edad,
+                                "periodo_vigencia": vigencia,
+                                "periodo_pago_primas": pago,
+                                "porcentaje_devolucion": porcentaje,
+                            }
+                        )
+
+            if not celdas:
+                raise ValueError("La matriz no tiene celdas válidas")
+            if len(celdas) > MAX_CELDAS_MATRIZ:
+                raise ValueError(
+                    f"La matriz tiene {len(celdas)} celdas, el máximo es {MAX_CELDAS_MATRIZ}"
+                )
+
+            # Preparación secuencial: parámetros almacenados una sola vez y
+            # parámetros calculados una vez por combinación de plazos. Si los de
+            # unos plazos fallan (por ejemplo, un periodo de pago sin tasa), el
+            # error queda en sus celdas como los del Goal Seek
+            base = {k: v for k, v in request_data.items() if k not in ejes}
+            parametros_almacenados = None
+            parametros_calculados_por_plazo = {}
+            errores_por_plazo = {}
+            tareas = []
+            for celda in celdas:
+                parametros_entrada = self._preparar_parametros_entrada({**base, **celda})
+                if parametros_almacenados is None:
+                    parametros_almacenados = self._cargar_parametros_almacenados(
+                        parametros_entrada
+                    )
+                plazos = (celda["periodo_vigencia"], celda["periodo_pago_primas"])
+                if (
+                    plazos not in parametros_calculados_por_plazo
+                    and plazos not in errores_por_plazo
+                ):
+                    try:
+                        parametros_calculados_por_plazo[plazos] = (
+                            self._calcular_parametros_calculados(
+                                parametros_entrada, parametros_almacenados
+                            )
+                        )
+                    except Exception as e:
+                        print(f"Error en los parámetros de los plazos {plazos}: {e}")
+                        errores_por_plazo[plazos] = {"error": str(e)}
+                tareas.append(
+                    (parametros_entrada, parametros_calculados_por_plazo.get(plazos))
+                )
+
+            validas = [
+                (parametros_entrada, parametros_calculados)
+                for parametros_entrada, parametros_calculados in tareas
+                if parametros_calculados is not None
+            ]
+            if procesos is None:
+                procesos = min(8, os.cpu_count() or 1)
+            procesos = min(procesos, len(validas))
+
+            if procesos <= 1:
+                resultados_validas = [
+                    self._cotizar_celda(
+                        parametros_entrada, parametros_almacenados, parametros_calculados
+                    )
+                    for parametros_entrada, parametros_calculados in validas
+                ]
+            else:
+                with ProcessPoolExecutor(max_workers=procesos) as executor:
+                    resultados_validas = list(
+                        executor.map(
+                            _cotizar_celda_matriz,
+                            [parametros_entrada for parametros_entrada, _ in validas],
+                            [parametros_almacenados] * len(validas),
+                            [parametros_calculados for _, parametros_calculados in validas],
+                            chunksize=math.ceil(len(validas) / (4 * procesos)),
+                        )
+                    )
+
+            resultados_validas = iter(resultados_validas)
+            resultados = [
+                next(resultados_validas)
+                if parametros_calculados is not None
+                else errores_por_plazo[
+                    (celda["periodo_vigencia"], celda["periodo_pago_primas"])
+                ]
+                for celda, (_, parametros_calculados) in zip(celdas, tareas)
+            ]
+
+            return {
+                "producto": "ENDOSOS",
+                "ejes": ejes,
+                "suma_asegurada": tareas[0][0].get("suma_asegurada"),
+                "total_celdas": len(resultados),
+                "celdas": [
+                    {**celda, **resultado}
+                    for celda, resultado in zip(celdas, resultados)
+                ],
+            }
+
+        except Exception as e:
+            print(f"Error en matriz de cotización de endosos: {e}")
+            print(f"Tipo de error: {type(e).__name__}")
+            raise
+
+    def _cotizar_celda(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Resuelve las primas de una celda de la matriz. Los errores quedan en la
+        celda para no invalidar el resto de la grilla.
+        """
+        try:
+            coberturas_obj = parametros_entrada.get("coberturas", {})
+            coberturas = [k for k, v in coberturas_obj.items() if v]
+
+            primas_coberturas = {}
+            convergencia = {}
+            for cobertura in coberturas:
+                goal_seek_service = GoalSeekService(modo="vectorizado")
+                # La grilla no recorre sumas aseguradas: no se construye la descomposición
+                goal_seek_service.goal_seek_domain.usar_descomposicion = False
+                resultado = goal_seek_service.execute(
+                    {**parametros_entrada, "coberturas": {cobertura: True}},
+                    parametros_almacenados,
+                    parametros_calculados,
+                )
+                if "error" in resultado:
+                    raise ValueError(resultado["error"])
+                optimizada = resultado["coberturas_optimizadas"][cobertura]
+                prima_optima = optimizada["prima_asignada_optima"]
+                convergencia[cobertura] = optimizada.get("convergio", True)
+                primas_coberturas[cobertura] = {
+                    "primas_frecuencializadas": self._plan().get_handler(
+                        cobertura
+                    ).calcular_primas_frecuencializadas(prima_optima)
+                }
+
+            return {
+                "coberturas": primas_coberturas,
+                "primas_cliente": self._calcular_primas_cliente(primas_coberturas),
+                "convergencia": convergencia,
+            }
+        except Exception as e:
+            print(f"Error en celda de la matriz {parametros_entrada}: {e}")
+            return {"error": str(e)}
+
+    def _preparar_contexto(self, request_data: Dict[str, Any]) -> ContextoCotizacion:
+        """
+        Prepara el estado completo de una petición
+
+        Args:
+            request_data: Datos de la petición
+
+        Returns:
+            Contexto con los parámetros de entrada, almacenados y calculados
+        """
+        return self._contexto(self._preparar_parametros_entrada(request_data))
+
+    def _contexto(self, parametros_entrada: Dict[str, Any]) -> ContextoCotizacion:
+        """Contexto de la petición a partir de los parámetros de entrada ya preparados"""
+        parametros_almacenados = self._cargar_parametros_almacenados(parametros_entrada)
+        return ContextoCotizacion(
+            parametros_entrada=parametros_entrada,
+            parametros_almacenados=parametros_almacenados,
+            parametros_calculados=self._calcular_parametros_calculados(
+                parametros_entrada, parametros_almacenados
+            ),
+        )
+
     def _preparar_parametros_entrada(
         self, request_data: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -201,7 +710,132 @@ class EndososOrchestrator:
                 else self._cargar_coberturas_disponibles()
             )
 
-        return _load_parametros_almacenados_por_cobertura(coberturas)
+        return self._plan().parametros_almacenados(coberturas)
+
+    def cotizar_sensibilidad(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Análisis de sensibilidad de la prima de equilibrio ante choques de
+        mortalidad, caducidad, tasa de interés y gastos
+
+        Todos los escenarios de una cobertura se evalúan apilados en el motor
+        vectorizado, con la prima de equilibrio de cada uno resuelta en los mismos
+        barridos.
+
+        Args:
+            request_data: Datos de la petición; choques es una lista de
+                {"tipo", "valor"} (por defecto ±10% mortalidad, caducidad y gastos
+                y ±50pb de tasa de interés)
+
+        Returns:
+            Diccionario con la prima base, los escenarios y la tabla tornado del
+            total y de cada cobertura
+
+        Raises:
+            ValueError: Si algún choque no es válido
+        """
+        try:
+            parametros_entrada = self._preparar_parametros_entrada(request_data)
+
+            choques_request = request_data.get("choques")
+            choques = (
+                [ChoqueSupuesto.desde_dict(c) for c in choques_request]
+                if choques_request
+                else list(CHOQUES_POR_DEFECTO)
+            )
+
+            contexto = self._contexto(parametros_entrada)
+            curva_tasas_interes = self._plan().curva_tasas_interes(
+                list(contexto.parametros_almacenados["coberturas"])
+            )
+
+            resultado = SensibilidadService(Producto.ENDOSOS).execute(
+                contexto.parametros_entrada,
+                contexto.parametros_almacenados,
+                contexto.parametros_calculados,
+                curva_tasas_interes,
+                choques,
+            )
+
+            return {
+                "producto": "ENDOSOS",
+                "suma_asegurada": parametros_entrada.get("suma_asegurada"),
+                "frecuencia_pago_primas": parametros_entrada.get(
+                    "frecuencia_pago_primas", "MENSUAL"
+                ),
+                **resultado,
+            }
+
+        except Exception as e:
+            print(f"Error en análisis de sensibilidad de endosos: {e}")
+            print(f"Tipo de error: {type(e).__name__}")
+            raise
+
+    def cotizar_estocastico(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Valoración Monte Carlo con trayectorias de tasa corta (Vasicek o
+        Hull-White) aplicadas al producto de inversión, al descuento de reservas y
+        al descuento del VNA
+
+        Args:
+            request_data: Datos de la petición; escenarios, modelo,
+                velocidad_reversion, volatilidad, tasa_largo_plazo, semilla,
+                percentiles y calcular_prima_equilibrio son opcionales
+
+        Returns:
+            Percentiles del VNA con la prima determinística y de la prima de
+            equilibrio, por cobertura y del total
+
+        Raises:
+            ValueError: Si el modelo o la cantidad de escenarios no son válidos
+        """
+        try:
+            parametros_entrada = self._preparar_parametros_entrada(request_data)
+
+            escenarios = int(request_data.get("escenarios") or ESCENARIOS_ESTOCASTICOS)
+            if not 1 <= escenarios <= MAX_ESCENARIOS_ESTOCASTICOS:
+                raise ValueError(
+                    f"La cantidad de escenarios debe estar entre 1 y "
+                    f"{MAX_ESCENARIOS_ESTOCASTICOS}"
+                )
+            percentiles = list(request_data.get("percentiles") or PERCENTILES_POR_DEFECTO)
+            if any(not 0 <= p <= 100 for p in percentiles):
+                raise ValueError("Los percentiles deben estar entre 0 y 100")
+
+            tasas_estocasticas = TasasEstocasticasDomain(
+                modelo=(request_data.get("modelo") or "vasicek").lower(),
+                velocidad_reversion=request_data.get("velocidad_reversion", 0.1),
+                volatilidad=request_data.get("volatilidad", 0.01),
+                tasa_largo_plazo=request_data.get("tasa_largo_plazo"),
+                semilla=request_data.get("semilla"),
+            )
+
+            contexto = self._contexto(parametros_entrada)
+
+            resultado = TasasEstocasticasService(
+                tasas_estocasticas,
+                escenarios,
+                percentiles=percentiles,
+                calcular_prima_equilibrio=request_data.get(
+                    "calcular_prima_equilibrio", True
+                ),
+            ).execute(
+                contexto.parametros_entrada,
+                contexto.parametros_almacenados,
+                contexto.parametros_calculados,
+            )
+
+            return {
+                "producto": "ENDOSOS",
+                "suma_asegurada": parametros_entrada.get("suma_asegurada"),
+                "escenarios": escenarios,
+                "modelo_tasas": tasas_estocasticas.to_dict(),
+                **resultado,
+            }
+
+        except Exception as e:
+            print(f"Error en valoración estocástica de endosos: {e}")
+            print(f"Tipo de error: {type(e).__name__}")
+            raise
 
     def _calcular_parametros_calculados(
         self, parametros_entrada: Dict[str, Any], parametros_almacenados: Dict[str, Any]
@@ -216,34 +850,26 @@ class EndososOrchestrator:
         Returns:
             Parámetros calculados
         """
-        # Cargar datos necesarios para los cálculos (solo los específicos de endosos)
-        tasas_interes_data = self._cargar_tasas_interes_por_cobertura(
-            parametros_almacenados
-        )
-
-        # Obtener coberturas del nuevo formato
-        coberturas_obj = parametros_entrada.get("coberturas", {})
+        plan = self._plan()
+        coberturas = list(parametros_almacenados["coberturas"])
+        curva_tasas_interes = plan.curva_tasas_interes(coberturas)
 
         # Calcular parámetros calculados por cobertura usando el servicio centralizado
         parametros_calculados_por_cobertura = {}
 
-        for cobertura, parametros in parametros_almacenados["coberturas"].items():
+        for cobertura in plan.seleccionar(coberturas):
             try:
-                if cobertura == "fallecimiento":
-                    self._cobertura_fallecimiento.parametros = parametros
-                    parametros_calculados_por_cobertura[cobertura] = (
-                        self._cobertura_fallecimiento.calcular_parametros_calculados(
-                            parametros_entrada, tasas_interes_data, Producto.ENDOSOS
-                        )
-                    )
-
-                elif cobertura == "itp":
-                    self._cobertura_itp.parametros = parametros
-                    parametros_calculados_por_cobertura[cobertura] = (
-                        self._cobertura_itp.calcular_parametros_calculados(
-                            parametros_entrada, tasas_interes_data, Producto.ENDOSOS
-                        )
-                    )
+                # Los handlers se comparten entre peticiones: los parámetros de
+                # esta petición se pasan como argumento, no se asignan al handler
+                parametros_calculados_por_cobertura[cobertura] = plan.get_handler(
+                    cobertura
+                ).calcular_parametros_calculados(
+                    parametros_entrada,
+                    curva_tasas_interes,
+                    Producto.ENDOSOS,
+                    parametros_almacenados["coberturas"][cobertura],
+                    plan.constantes(cobertura),
+                )
                 print("\n")
             except Exception as e:
                 print(f"Error en cobertura '{cobertura}': {e}")
@@ -254,58 +880,6 @@ class EndososOrchestrator:
 
         return parametros_calculados
 
-    def _cargar_tasas_interes_por_cobertura(
-        self, parametros_almacenados: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Carga las tasas de interés desde la primera cobertura disponible"""
-        try:
-            # Obtener la primera cobertura disponible
-            coberturas = parametros_almacenados.get("coberturas", {})
-            if not coberturas:
-                print("DEBUG - No hay coberturas disponibles")
-                return {}
-
-            primera_cobertura = list(coberturas.keys())[0]
-            # Cargar tasas de interés desde la cobertura específica
-            repos = get_repos(self.producto, primera_cobertura)
-            tasa_interes_repo = repos.get("tasa_interes")
-            if tasa_interes_repo:
-                tasas_interes_raw = tasa_interes_repo.get_tasas_interes()
-                # Procesar las tasas con el helper para agregar tasa_reserva
-                from src.helpers.tasa_interes_reserva import tasa_interes_reserva
-
-                tasas_procesadas = tasa_interes_reserva(tasas_interes_raw)
-                return tasas_procesadas
-            else:
-                print(
-                    f"DEBUG - No se encontró repositorio de tasas de interés para {primera_cobertura}"
-                )
-                return {}
-        except Exception as e:
-            print(f"Error al cargar tasas de interés por cobertura: {e}")
-            return {}
-
-    def _cargar_tasas_interes(self) -> Dict[str, Any]:
-        """Carga las tasas de interés desde el repositorio y las procesa"""
-        try:
-            repos = get_repos(self.producto)
-            tasa_interes_repo = repos.get("tasa_interes")
-            if tasa_interes_repo:
-                tasas_interes_raw = tasa_interes_repo.get_tasas_interes()
-                print(f"DEBUG - Tasas de interés RAW: {tasas_interes_raw}")
-
-                # Procesar las tasas con el helper para agregar tasa_reserva
-                from src.helpers.tasa_interes_reserva import tasa_interes_reserva
-
-                tasas_procesadas = tasa_interes_reserva(tasas_interes_raw)
-                return tasas_procesadas
-            else:
-                print("DEBUG - No se encontró repositorio de tasas de interés")
-                return {}
-        except Exception as e:
-            print(f"Error al cargar tasas de interés: {e}")
-            return {}
-
     def _calcular_endosos(
         self,
         parametros_entrada: Dict[str, Any],
@@ -338,22 +912,16 @@ class EndososOrchestrator:
                 else self._cargar_coberturas_disponibles()
             )
 
-        # Ejecutar cálculos actuariales usando instancias independientes de cada cobertura
+        # Ejecutar cálculos actuariales con el handler compartido de cada cobertura
         resultados_actuariales = {}
 
-        if "fallecimiento" in coberturas:
-            fallecimiento_cobertura = FallecimientoCobertura()
-            resultados_fallecimiento = fallecimiento_cobertura.calculo_actuarial(
+        plan = self._plan()
+        for cobertura in plan.seleccionar(coberturas):
+            resultados_actuariales[cobertura] = plan.get_handler(
+                cobertura
+            ).calculo_actuarial(
                 parametros_entrada, parametros_almacenados, parametros_calculados
             )
-            # print(f"Resultados actuariales FALLECIMIENTO: {resultados_fallecimiento}")
-
-        if "itp" in coberturas:
-            itp_cobertura = ItpCobertura()
-            resultados_itp = itp_cobertura.calculo_actuarial(
-                parametros_entrada, parametros_almacenados, parametros_calculados
-            )
-            # print(f"Resultados actuariales ITP: {resultados_itp}")
 
         endosos_data = {
             "coberturas": {},
@@ -428,25 +996,17 @@ class EndososOrchestrator:
             # Ejecutar cálculos actuariales con Goal Seek para cada cobertura
             resultados_por_cobertura = {}
 
-            if "fallecimiento" in coberturas:
-                print(f"\n🎯 Procesando FALLECIMIENTO con Goal Seek...")
-                fallecimiento_cobertura = FallecimientoCobertura()
-                resultados_fallecimiento = (
-                    fallecimiento_cobertura.calculo_actuarial_con_goal_seek(
-                        parametros_entrada,
-                        parametros_almacenados,
-                        parametros_calculados,
-                    )
-                )
-                resultados_por_cobertura["fallecimiento"] = resultados_fallecimiento
-
-            if "itp" in coberturas:
-                print(f"\n🎯 Procesando ITP con Goal Seek...")
-                itp_cobertura = ItpCobertura()
-                resultados_itp = itp_cobertura.calculo_actuarial_con_goal_seek(
-                    parametros_entrada, parametros_almacenados, parametros_calculados
+            # En el orden de cálculo del plan (fallecimiento antes que ITP)
+            plan = self._plan()
+            for cobertura in plan.seleccionar(coberturas):
+                print(f"\n🎯 Procesando {cobertura.upper()} con Goal Seek...")
+                resultados_por_cobertura[cobertura] = plan.get_handler(
+                    cobertura
+                ).calculo_actuarial_con_goal_seek(
+                    parametros_entrada,
+                    parametros_almacenados,
+                    parametros_calculados,
                 )
-                resultados_por_cobertura["itp"] = resultados_itp
 
             print(
                 f"\n✅ Total de coberturas procesadas: {len(resultados_por_cobertura)}"
@@ -458,6 +1018,29 @@ class EndososOrchestrator:
             print(f"Error en cálculo de Goal Seek: {e}")
             return {}
 
+    def _parametros_almacenados_con_primas_optimas(
+        self,
+        parametros_almacenados: Dict[str, Any],
+        calcular_goalseek: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Copia de los parámetros almacenados con la prima_asignada óptima de cada
+        cobertura, para la respuesta (el Goal Seek ya no modifica el original)
+        """
+        coberturas = {}
+        for cobertura, parametros in parametros_almacenados.get("coberturas", {}).items():
+            prima_optima = (
+                calcular_goalseek.get(cobertura, {})
+                .get("goal_seek", {})
+                .get("prima_optima")
+            )
+            coberturas[cobertura] = (
+                {**parametros, "prima_asignada": prima_optima}
+                if prima_optima is not None
+                else parametros
+            )
+        return {**parametros_almacenados, "coberturas": coberturas}
+
     def _preparar_respuesta(
         self,
         calcular_goalseek: Dict[str, Any],
@@ -472,29 +1055,22 @@ class EndososOrchestrator:
             print(f"Coberturas a procesar: {list(calcular_goalseek.keys())}")
 
             primas_coberturas = {}
+            plan = self._plan()
 
             # Procesar cada cobertura que fue calculada
             for cobertura, resultados in calcular_goalseek.items():
                 print(f"Procesando cobertura: {cobertura}")
 
-                if cobertura == "fallecimiento":
-                    fallecimiento_cobertura = FallecimientoCobertura()
-                    respuesta_estructurada = fallecimiento_cobertura.preparar_respuesta(
-                        resultados, parametros_entrada
-                    )
+                if cobertura in plan.coberturas:
+                    respuesta_estructurada = plan.get_handler(
+                        cobertura
+                    ).preparar_respuesta(resultados, parametros_entrada)
                     primas_coberturas[cobertura] = respuesta_estructurada
                     print(
-                        f"✅ Fallecimiento estructurado: {list(respuesta_estructurada.keys())}"
+                        f"✅ {cobertura.upper()} estructurado: "
+                        f"{list(respuesta_estructurada.keys())}"
                     )
 
-                elif cobertura == "itp":
-                    itp_cobertura = ItpCobertura()
-                    respuesta_estructurada = itp_cobertura.preparar_respuesta(
-                        resultados, parametros_entrada
-                    )
-                    primas_coberturas[cobertura] = respuesta_estructurada
-                    print(f"✅ ITP estructurado: {list(respuesta_estructurada.keys())}")
-
                 else:
                     # Para primas_coberturas no reconocidas, usar la respuesta tal como viene
                     primas_coberturas[cobertura] = resultados
@@ -549,11 +1125,15 @@ class EndososOrchestrator:
 
                 # Procesar cada subclave (mensual, trimestral, etc.)
                 for subclave in estructura_referencia.keys():
-                    suma_total = sum(
+                    valores = [
                         cobertura_datos[clave][subclave]
                         for cobertura_datos in primas_coberturas.values()
                         if clave in cobertura_datos
                         and subclave in cobertura_datos[clave]
+                    ]
+                    # Una cobertura sin prima (variante sin raíz) deja el total sin prima
+                    suma_total = (
+                        None if any(valor is None for valor in valores) else sum(valores)
                     )
 
                     primas_cliente[clave][subclave] = suma_total
@@ -604,6 +1184,9 @@ class EndososOrchestrator:
         return self._cargar_coberturas_disponibles().copy()
 
 
+# Plan de cotización del producto (se compila al iniciar la aplicación)
+CompiladorPlanes.registrar_producto(Producto.ENDOSOS, RegistroCoberturas)
+
 # Instancia global del orquestador
 endosos_orchestrator = EndososOrchestrator()
 
@@ -622,6 +1205,152 @@ def cotizar_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
     return endosos_orchestrator.cotizar(request_data)
 
 
+def cotizar_indicativa_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Función de conveniencia para la cotización indicativa (la exacta queda en
+    segundo plano)
+
+    Args:
+        request_data: Datos de la petición
+
+    Returns:
+        Primas indicativas con su error estimado y la clave de la cotización exacta
+    """
+    return endosos_orchestrator.cotizar_indicativa(request_data)
+
+
+def get_cotizacion_exacta_endosos(clave: str) -> Dict[str, Any]:
+    """
+    Función de conveniencia para consultar la cotización exacta de una petición
+    indicativa
+
+    Args:
+        clave: Clave devuelta por la cotización indicativa
+
+    Returns:
+        Estado y, si ya terminó, la cotización completa
+    """
+    return endosos_orchestrator.get_cotizacion_exacta(clave)
+
+
+def cotizar_suma_asegurada_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Función de conveniencia para resolver la suma asegurada de una prima objetivo
+
+    Args:
+        request_data: Datos de la petición
+
+    Returns:
+        Suma asegurada, primas implícitas y diagnóstico del solver
+    """
+    return endosos_orchestrator.cotizar_suma_asegurada(request_data)
+
+
+def cotizar_variantes_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Función de conveniencia para cotizar todas las frecuencias de pago, estados de
+    fumador y opciones de asistencia de un perfil
+
+    Args:
+        request_data: Datos de la petición con los ejes de variantes como listas
+
+    Returns:
+        Primas por frecuencia para cada combinación de fumador y asistencia
+    """
+    return endosos_orchestrator.cotizar_variantes(request_data)
+
+
+def cotizar_matriz_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Función de conveniencia para cotizar una matriz de plazos, edades y devoluciones
+
+    Args:
+        request_data: Datos de la petición con los ejes como listas
+
+    Returns:
+        Ejes y primas por celda
+    """
+    return endosos_orchestrator.cotizar_matriz(request_data)
+
+
+def cotizar_sensibilidad_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Función de conveniencia para el análisis de sensibilidad ante choques de supuestos
+
+    Args:
+        request_data: Datos de la petición con la lista opcional de choques
+
+    Returns:
+        Prima base, escenarios y tabla tornado
+    """
+    return endosos_orchestrator.cotizar_sensibilidad(request_data)
+
+
+def cotizar_estocastico_endosos(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Función de conveniencia para la valoración con tasas de interés estocásticas
+
+    Args:
+        request_data: Datos de la petición con los parámetros del modelo de tasas
+
+    Returns:
+        Percentiles del VNA y de la prima de equilibrio
+    """
+    return endosos_orchestrator.cotizar_estocastico(request_data)
+
+
+def valorar_cartera_endosos(
+    ruta_polizas: str,
+    ruta_reservas: str,
+    ruta_flujos: str,
+    tamano_bloque: Optional[int] = None,
+    procesos: Optional[int] = None,
+    presupuesto_memoria_mb: float = PRESUPUESTO_MEMORIA_CARTERA_MB,
+    directorio_matrices: Optional[str] = None,
+    puntos_modelo: Optional[PuntosModeloDomain] = None,
+    conciliar: bool = False,
+) -> Dict[str, Any]:
+    """
+    Función de conveniencia para valorar una cartera de pólizas en vigor
+
+    Args:
+        ruta_polizas: Archivo de pólizas (.csv o .parquet)
+        ruta_reservas: Archivo de salida con las reservas por póliza
+        ruta_flujos: Archivo de salida con los flujos agregados por mes
+        tamano_bloque: Pólizas por bloque (por defecto según el presupuesto)
+        procesos: Procesos de valoración
+        presupuesto_memoria_mb: Memoria total para la valoración
+        directorio_matrices: Directorio de las matrices de flujos por póliza
+        puntos_modelo: Bandas de los puntos modelo (sin compresión si es None)
+        conciliar: Si se mide el error de la compresión
+
+    Returns:
+        Resumen de la valoración
+    """
+    return ValoracionCarteraEndosos(endosos_orchestrator).valorar_cartera(
+        ruta_polizas,
+        ruta_reservas,
+        ruta_flujos,
+        tamano_bloque,
+        procesos,
+        presupuesto_memoria_mb,
+        directorio_matrices,
+        puntos_modelo,
+        conciliar,
+    )
+
+
+def _cotizar_celda_matriz(
+    parametros_entrada: Dict[str, Any],
+    parametros_almacenados: Dict[str, Any],
+    parametros_calculados: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Punto de entrada de los procesos de la matriz de cotización"""
+    return endosos_orchestrator._cotizar_celda(
+        parametros_entrada, parametros_almacenados, parametros_calculados
+    )
+
+
 def get_endosos_info() -> Dict[str, Any]:
     """
     Obtiene información general del producto endosos
@@ -635,3 +1364,33 @@ def get_endosos_info() -> Dict[str, Any]:
         "descripcion": "Producto de seguros de endosos",
         "version": "1.0.0",
     }
+
+
+def get_motores_info() -> Dict[str, Any]:
+    """
+    Obtiene los motores de VNA registrados, la configuración vigente y el
+    resumen del modo sombra
+
+    Returns:
+        Información de los motores
+    """
+    return {
+        "motores_registrados": RegistroMotores.motores_registrados(),
+        "configuracion": asdict(RegistroMotores.get_configuracion()),
+        "sombra": GoalSeekService.resumen_sombra(),
+    }
+
+
+def configurar_motores(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cambia el motor activo o el modo sombra
+
+    Args:
+        request_data: Campos de ConfiguracionMotores a cambiar (motor, candidato,
+            muestra_sombra, tolerancia_prima, tolerancia_vna)
+
+    Returns:
+        Información de los motores con la configuración nueva
+    """
+    RegistroMotores.configurar(**request_data)
+    return get_motores_info()
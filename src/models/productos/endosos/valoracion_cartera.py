@@ -0,0 +1,592 @@
+"""
+Valoración de la cartera en vigor del producto ENDOSOS
+"""
+
+from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+from src.infrastructure.repositories.cartera_repository import cartera_repository
+from src.common.producto import Producto
+from src.models.services.proyeccion_variantes_service import FRECUENCIAS_PAGO_PRIMAS
+from src.models.services.valoracion_cartera_service import ValoracionCarteraService
+from src.models.domain.valoracion_cartera_domain import (
+    ValoracionCarteraDomain,
+    FLUJOS_CARTERA,
+)
+from src.models.domain.puntos_modelo_domain import PuntosModeloDomain
+from src.utils.anios_meses import anios_meses
+from src.utils.presupuesto_memoria import filas_por_presupuesto
+
+# Memoria total por defecto de la valoración de cartera
+PRESUPUESTO_MEMORIA_CARTERA_MB = 4096
+
+# Pólizas por bloque al dimensionar la cartera (solo se leen dos columnas)
+TAMANO_BLOQUE_DIMENSIONAR = 50000
+
+
+class ValoracionCarteraEndosos:
+    """
+    Valoración batch de la cartera en vigor de ENDOSOS: lectura por bloques,
+    reparto en procesos, compresión en puntos modelo y escritura de reservas y
+    flujos. El contexto de cada perfil de emisión lo prepara el orquestador del
+    producto, igual que en una cotización.
+    """
+
+    def __init__(self, orquestador):
+        """
+        Args:
+            orquestador: EndososOrchestrator que prepara el contexto de los perfiles
+        """
+        self.orquestador = orquestador
+
+    def valorar_cartera(
+        self,
+        ruta_polizas: str,
+        ruta_reservas: str,
+        ruta_flujos: str,
+        tamano_bloque: Optional[int] = None,
+        procesos: Optional[int] = None,
+        presupuesto_memoria_mb: float = PRESUPUESTO_MEMORIA_CARTERA_MB,
+        directorio_matrices: Optional[str] = None,
+        puntos_modelo: Optional[PuntosModeloDomain] = None,
+        conciliar: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Valora una cartera de pólizas en vigor leída de CSV o Parquet
+
+        Cada fila trae los parámetros de emisión (edad_actuarial, periodo_vigencia,
+        periodo_pago_primas, suma_asegurada, sexo, porcentaje_devolucion y
+        opcionalmente moneda, fumador, asistencia y frecuencia_pago_primas), el
+        mes_poliza transcurrido y la prima asignada pactada de cada cobertura en
+        prima_<cobertura>. Las pólizas se leen por bloques, los bloques se valoran
+        en procesos separados (a lo más 2 por proceso en curso) y dentro de cada
+        bloque las pólizas de un mismo perfil son filas del mismo motor vectorizado.
+
+        Una primera lectura de la cartera obtiene la cantidad de pólizas y el
+        horizonte máximo; con ellos el presupuesto de memoria se reparte entre los
+        procesos y fija las pólizas por bloque y por llamada al motor. Con
+        directorio_matrices los flujos remanentes de cada póliza se escriben en
+        matrices (póliza, mes) en disco (memmap, una por flujo de FLUJOS_CARTERA,
+        fila i = póliza i del archivo) y el archivo de flujos se agrega
+        recorriéndolas por bloques.
+
+        Con puntos_modelo las pólizas de cada bloque se comprimen en puntos
+        modelo (ver PuntosModeloDomain): el motor corre una vez por punto y las
+        reservas de cada póliza son las del punto escaladas por su suma
+        asegurada. Con conciliar cada bloque se valora además póliza a póliza y
+        el resumen incluye el error de la compresión.
+
+        Args:
+            ruta_polizas: Archivo de pólizas (.csv o .parquet)
+            ruta_reservas: Archivo de salida con la reserva de cada póliza
+            ruta_flujos: Archivo de salida con los flujos de pasivo agregados por
+                mes desde la valoración
+            tamano_bloque: Pólizas por bloque (por defecto según el presupuesto)
+            procesos: Procesos de valoración (por defecto según CPUs; 1 valora en
+                el proceso actual)
+            presupuesto_memoria_mb: Memoria total para la valoración
+            directorio_matrices: Directorio de las matrices de flujos por póliza
+            puntos_modelo: Bandas de los puntos modelo (sin compresión si es None)
+            conciliar: Si se mide el error de la compresión contra la
+                valoración póliza a póliza
+
+        Returns:
+            Resumen con la cantidad de pólizas, errores y reservas totales, y la
+            compresión y su conciliación si se pidieron
+        """
+        if tamano_bloque is not None and tamano_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser mayor a cero")
+        if puntos_modelo is not None and directorio_matrices is not None:
+            raise ValueError(
+                "La compresión en puntos modelo no genera matrices de flujos por póliza"
+            )
+        if puntos_modelo is None and conciliar:
+            raise ValueError("La conciliación requiere compresión en puntos modelo")
+        if presupuesto_memoria_mb <= 0:
+            raise ValueError("El presupuesto de memoria debe ser mayor a cero")
+        if procesos is None:
+            procesos = min(8, os.cpu_count() or 1)
+
+        dimensiones = self._dimensionar_cartera(ruta_polizas)
+        # El proceso principal también reserva memoria para la ventana de bloques
+        # y la agregación de las matrices
+        presupuesto_proceso = presupuesto_memoria_mb / (procesos + 1)
+        if tamano_bloque is None:
+            tamano_bloque = filas_por_presupuesto(
+                presupuesto_proceso, dimensiones["meses"]
+            )
+        print(
+            f"Cartera de {dimensiones['polizas']} pólizas y {dimensiones['meses']} "
+            f"meses: bloques de {tamano_bloque} pólizas en {procesos} procesos"
+        )
+
+        coberturas = self.orquestador._cargar_coberturas_disponibles()
+        columnas_reservas = {"id_poliza": str, "mes_poliza": int}
+        for cobertura in coberturas:
+            for nombre in ("saldo_reserva", "moce", "margen_solvencia"):
+                columnas_reservas[f"{nombre}_{cobertura}"] = float
+        columnas_reservas["reserva_total"] = float
+        columnas_reservas["error"] = str
+
+        if directorio_matrices is not None:
+            cartera_repository.crear_matrices(
+                directorio_matrices,
+                FLUJOS_CARTERA,
+                dimensiones["polizas"],
+                dimensiones["meses"],
+            )
+
+        valoracion_cartera_domain = ValoracionCarteraDomain()
+        resumen = {"polizas": 0, "polizas_con_error": 0, "reserva_total": 0.0}
+        flujos_totales = {}
+        compresion = {"polizas": 0, "puntos": 0}
+        conciliacion = {
+            "reservas_exactas": [],
+            "reservas_aproximadas": [],
+            "flujos_exactos": {},
+        }
+
+        def filas_reservas():
+            nonlocal flujos_totales
+            bloques = cartera_repository.leer_polizas(ruta_polizas, tamano_bloque)
+            for resultado in self._mapear_bloques_cartera(
+                bloques,
+                procesos,
+                presupuesto_proceso,
+                directorio_matrices,
+                puntos_modelo,
+                conciliar,
+            ):
+                flujos_totales = valoracion_cartera_domain.acumular(
+                    flujos_totales, resultado["flujos"]
+                )
+                if resultado["puntos_modelo"] is not None:
+                    for clave in compresion:
+                        compresion[clave] += resultado["puntos_modelo"][clave]
+                if resultado["conciliacion"] is not None:
+                    bloque_conciliacion = resultado["conciliacion"]
+                    conciliacion["reservas_exactas"] += bloque_conciliacion[
+                        "reservas_exactas"
+                    ]
+                    conciliacion["reservas_aproximadas"] += bloque_conciliacion[
+                        "reservas_aproximadas"
+                    ]
+                    conciliacion["flujos_exactos"] = valoracion_cartera_domain.acumular(
+                        conciliacion["flujos_exactos"],
+                        bloque_conciliacion["flujos_exactos"],
+                    )
+                for fila in resultado["filas"]:
+                    resumen["polizas"] += 1
+                    if fila.get("error"):
+                        resumen["polizas_con_error"] += 1
+                    else:
+                        resumen["reserva_total"] += fila["reserva_total"]
+                print(f"Pólizas valoradas: {resumen['polizas']}")
+                yield resultado["filas"]
+
+        cartera_repository.escribir_filas(
+            ruta_reservas, columnas_reservas, filas_reservas()
+        )
+
+        if directorio_matrices is not None:
+            flujos_totales = valoracion_cartera_domain.sumar_matrices(
+                cartera_repository.abrir_matrices(directorio_matrices, FLUJOS_CARTERA),
+                filas_por_presupuesto(
+                    presupuesto_proceso,
+                    dimensiones["meses"] * len(FLUJOS_CARTERA),
+                    bytes_por_poliza_mes=8,
+                ),
+            )
+
+        horizonte = max((v.size for v in flujos_totales.values()), default=0)
+        cartera_repository.escribir_filas(
+            ruta_flujos,
+            {"mes": int, **{nombre: float for nombre in FLUJOS_CARTERA}},
+            iter(
+                [
+                    [
+                        {
+                            "mes": mes + 1,
+                            **{
+                                nombre: float(flujos_totales[nombre][mes])
+                                for nombre in FLUJOS_CARTERA
+                            },
+                        }
+                        for mes in range(horizonte)
+                    ]
+                ]
+            ),
+        )
+
+        resultado = {
+            **resumen,
+            "meses_flujos": horizonte,
+            "tamano_bloque": tamano_bloque,
+            "ruta_reservas": ruta_reservas,
+            "ruta_flujos": ruta_flujos,
+            "directorio_matrices": directorio_matrices,
+        }
+        if puntos_modelo is not None:
+            resultado["compresion"] = {
+                **puntos_modelo.to_dict(),
+                "polizas": compresion["polizas"],
+                "puntos_modelo": compresion["puntos"],
+                "ratio": (
+                    compresion["polizas"] / compresion["puntos"]
+                    if compresion["puntos"]
+                    else None
+                ),
+            }
+        if conciliar:
+            resultado["conciliacion"] = puntos_modelo.conciliar(
+                conciliacion["reservas_exactas"],
+                conciliacion["reservas_aproximadas"],
+                conciliacion["flujos_exactos"],
+                flujos_totales,
+            )
+        return resultado
+
+    def _dimensionar_cartera(self, ruta_polizas: str) -> Dict[str, int]:
+        """
+        Cuenta las pólizas y obtiene el mayor horizonte remanente (meses desde la
+        valoración) leyendo solo las columnas de vigencia
+
+        Returns:
+            Diccionario con "polizas" y "meses"
+        """
+        polizas = 0
+        meses = 1
+        for bloque in cartera_repository.leer_polizas(
+            ruta_polizas,
+            TAMANO_BLOQUE_DIMENSIONAR,
+            columnas=["periodo_vigencia", "mes_poliza"],
+        ):
+            polizas += len(bloque)
+            for poliza in bloque:
+                try:
+                    remanente = anios_meses(
+                        int(float(poliza["periodo_vigencia"]))
+                    ) - int(float(poliza["mes_poliza"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                meses = max(meses, remanente)
+        return {"polizas": polizas, "meses": meses}
+
+    def _mapear_bloques_cartera(
+        self,
+        bloques,
+        procesos: int,
+        presupuesto_memoria_mb: float,
+        directorio_matrices: Optional[str],
+        puntos_modelo: Optional[PuntosModeloDomain],
+        conciliar: bool,
+    ):
+        """
+        Valora los bloques en orden; con varios procesos mantiene a lo más dos
+        bloques por proceso en vuelo para acotar la memoria
+        """
+        inicio = 0
+        if procesos <= 1:
+            for bloque in bloques:
+                yield self._valorar_bloque_cartera(
+                    bloque,
+                    inicio,
+                    presupuesto_memoria_mb,
+                    directorio_matrices,
+                    puntos_modelo,
+                    conciliar,
+                )
+                inicio += len(bloque)
+            return
+
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            pendientes = deque()
+            for bloque in bloques:
+                pendientes.append(
+                    executor.submit(
+                        _valorar_bloque_cartera,
+                        bloque,
+                        inicio,
+                        presupuesto_memoria_mb,
+                        directorio_matrices,
+                        puntos_modelo,
+                        conciliar,
+                    )
+                )
+                inicio += len(bloque)
+                if len(pendientes) >= 2 * procesos:
+                    yield pendientes.popleft().result()
+            while pendientes:
+                yield pendientes.popleft().result()
+
+    def _valorar_bloque_cartera(
+        self,
+        polizas: List[Dict[str, Any]],
+        inicio: int = 0,
+        presupuesto_memoria_mb: float = PRESUPUESTO_MEMORIA_CARTERA_MB,
+        directorio_matrices: Optional[str] = None,
+        puntos_modelo: Optional[PuntosModeloDomain] = None,
+        conciliar: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Valora un bloque de pólizas agrupándolas por perfil de emisión. Los errores
+        quedan en la fila de la póliza (o de todas las pólizas del perfil).
+
+        Args:
+            polizas: Filas del bloque
+            inicio: Posición de la primera póliza del bloque en la cartera
+            presupuesto_memoria_mb: Memoria para las matrices del motor
+            directorio_matrices: Directorio de las matrices de flujos por póliza
+            puntos_modelo: Si se indica, las pólizas se comprimen en puntos
+                modelo con sus bandas
+            conciliar: Si además se valora póliza a póliza para medir el error
+                de la compresión
+
+        Returns:
+            Diccionario con las filas de reserva, los flujos agregados del bloque
+            (vacíos si se escribieron en las matrices), los puntos modelo y los
+            datos de conciliación
+        """
+        valoracion_cartera_service = ValoracionCarteraService(
+            Producto.ENDOSOS, presupuesto_memoria_mb
+        )
+        coberturas = self.orquestador._cargar_coberturas_disponibles()
+        matrices = (
+            cartera_repository.abrir_matrices(directorio_matrices, FLUJOS_CARTERA, "r+")
+            if directorio_matrices is not None
+            else None
+        )
+
+        filas = []
+        validas = []
+        for indice, poliza in enumerate(polizas, start=inicio):
+            fila = {"id_poliza": str(poliza.get("id_poliza", ""))}
+            filas.append(fila)
+            try:
+                perfil, mes_poliza, primas = self._leer_poliza_cartera(poliza, coberturas)
+            except (KeyError, TypeError, ValueError) as e:
+                fila["error"] = f"Póliza no válida: {e}"
+                continue
+            fila["mes_poliza"] = mes_poliza
+            validas.append(
+                {
+                    "fila": fila,
+                    "perfil": perfil,
+                    "mes_poliza": mes_poliza,
+                    "primas": primas,
+                    "indice": indice,
+                }
+            )
+
+        resultado = {"filas": filas, "puntos_modelo": None, "conciliacion": None}
+        if puntos_modelo is None:
+            resultados, resultado["flujos"] = self._valorar_polizas_cartera(
+                validas, valoracion_cartera_service, coberturas, matrices
+            )
+            for poliza, columnas in zip(validas, resultados):
+                poliza["fila"].update(columnas)
+        else:
+            puntos = puntos_modelo.agrupar(validas)
+            resultados, resultado["flujos"] = self._valorar_polizas_cartera(
+                [{**punto, "peso": len(punto["miembros"])} for punto in puntos],
+                valoracion_cartera_service,
+                coberturas,
+            )
+            for punto, columnas in zip(puntos, resultados):
+                for posicion, factor in punto["miembros"]:
+                    validas[posicion]["fila"].update(
+                        {
+                            columna: valor if columna == "error" else valor * factor
+                            for columna, valor in columnas.items()
+                        }
+                    )
+            resultado["puntos_modelo"] = {"polizas": len(validas), "puntos": len(puntos)}
+
+            if conciliar:
+                exactos, flujos_exactos = self._valorar_polizas_cartera(
+                    validas, valoracion_cartera_service, coberturas
+                )
+                conciliadas = [
+                    (columnas["reserva_total"], poliza["fila"]["reserva_total"])
+                    for poliza, columnas in zip(validas, exactos)
+                    if "reserva_total" in columnas and "reserva_total" in poliza["fila"]
+                ]
+                resultado["conciliacion"] = {
+                    "reservas_exactas": [exacta for exacta, _ in conciliadas],
+                    "reservas_aproximadas": [aproximada for _, aproximada in conciliadas],
+                    "flujos_exactos": flujos_exactos,
+                }
+
+        if matrices is not None:
+            for matriz in matrices.values():
+                matriz.flush()
+        return resultado
+
+    def _valorar_polizas_cartera(
+        self,
+        polizas: List[Dict[str, Any]],
+        valoracion_cartera_service: ValoracionCarteraService,
+        coberturas: List[str],
+        matrices: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Valora pólizas (o puntos modelo con "peso") agrupándolas por perfil
+
+        Args:
+            polizas: Pólizas con "perfil", "mes_poliza", "primas" y opcionalmente
+                "indice" (fila en las matrices) y "peso"
+            valoracion_cartera_service: Servicio de valoración
+            coberturas: Coberturas del producto
+            matrices: Matrices de flujos por póliza en disco
+
+        Returns:
+            Tupla con las columnas de reserva (o "error") de cada póliza y los
+            flujos agregados
+        """
+        valoracion_cartera_domain = valoracion_cartera_service.valoracion_cartera_domain
+        resultados = [{} for _ in polizas]
+        perfiles = {}
+        for posicion, poliza in enumerate(polizas):
+            perfiles.setdefault(tuple(sorted(poliza["perfil"].items())), []).append(
+                posicion
+            )
+
+        flujos = {}
+        for clave, posiciones in perfiles.items():
+            try:
+                contexto = self.orquestador._preparar_contexto(dict(clave))
+                parametros_entrada = contexto.parametros_entrada
+                parametros_almacenados = contexto.parametros_almacenados
+                parametros_calculados = contexto.parametros_calculados
+                meses_vigencia = anios_meses(parametros_entrada["periodo_vigencia"])
+                vigentes = []
+                for posicion in posiciones:
+                    if not 0 <= polizas[posicion]["mes_poliza"] < meses_vigencia:
+                        resultados[posicion]["error"] = (
+                            f"mes_poliza fuera de la vigencia (0 a {meses_vigencia - 1})"
+                        )
+                    else:
+                        resultados[posicion]["reserva_total"] = 0.0
+                        vigentes.append(posicion)
+
+                for cobertura in coberturas:
+                    con_cobertura = [
+                        p for p in vigentes if polizas[p]["primas"].get(cobertura) is not None
+                    ]
+                    if not con_cobertura:
+                        continue
+                    valoracion = valoracion_cartera_service.valorar_perfil(
+                        parametros_entrada,
+                        parametros_almacenados,
+                        parametros_calculados,
+                        cobertura,
+                        [polizas[p]["primas"][cobertura] for p in con_cobertura],
+                        [polizas[p]["mes_poliza"] for p in con_cobertura],
+                        matrices,
+                        (
+                            [polizas[p]["indice"] for p in con_cobertura]
+                            if matrices is not None
+                            else None
+                        ),
+                        [polizas[p].get("peso", 1) for p in con_cobertura],
+                    )
+                    reservas = valoracion["reservas"]
+                    for i, posicion in enumerate(con_cobertura):
+                        for nombre, valores in reservas.items():
+                            resultados[posicion][f"{nombre}_{cobertura}"] = float(
+                                valores[i]
+                            )
+                        resultados[posicion]["reserva_total"] += float(
+                            reservas["saldo_reserva"][i] + reservas["moce"][i]
+                        )
+                    flujos = valoracion_cartera_domain.acumular(
+                        flujos, valoracion["flujos"]
+                    )
+            except Exception as e:
+                print(f"Error valorando el perfil {dict(clave)}: {e}")
+                for posicion in posiciones:
+                    resultados[posicion] = {"error": str(e)}
+                    if matrices is not None:
+                        # Descarta los flujos que alcanzaron a escribirse
+                        for matriz in matrices.values():
+                            matriz[polizas[posicion]["indice"]] = 0.0
+
+        return resultados, flujos
+
+    def _leer_poliza_cartera(self, poliza: Dict[str, Any], coberturas: List[str]):
+        """
+        Convierte una fila de la cartera (texto en CSV) a perfil de emisión, mes de
+        póliza y primas pactadas por cobertura
+
+        Raises:
+            ValueError: Si falta un dato o no es válido
+        """
+
+        def texto(valor):
+            return None if valor is None or str(valor).strip() == "" else str(valor).strip()
+
+        def requerido(columna):
+            valor = texto(poliza.get(columna))
+            if valor is None:
+                raise ValueError(f"Falta el dato {columna}")
+            return valor
+
+        def entero(columna):
+            return int(float(requerido(columna)))
+
+        def booleano(valor):
+            valor = texto(valor)
+            return valor is not None and valor.lower() in ("1", "true", "si", "sí", "s")
+
+        sexo = requerido("sexo").upper()
+        if sexo not in ("M", "F"):
+            raise ValueError("El sexo debe ser 'M' o 'F'")
+
+        perfil = {
+            "edad_actuarial": entero("edad_actuarial"),
+            "periodo_vigencia": entero("periodo_vigencia"),
+            "periodo_pago_primas": entero("periodo_pago_primas"),
+            "suma_asegurada": float(requerido("suma_asegurada")),
+            "sexo": sexo,
+            "porcentaje_devolucion": float(requerido("porcentaje_devolucion")),
+            "moneda": (texto(poliza.get("moneda")) or "SOLES").upper(),
+            "fumador": booleano(poliza.get("fumador")),
+            "asistencia": booleano(poliza.get("asistencia")),
+            "frecuencia_pago_primas": (
+                texto(poliza.get("frecuencia_pago_primas")) or "MENSUAL"
+            ).upper(),
+        }
+        if perfil["frecuencia_pago_primas"] not in FRECUENCIAS_PAGO_PRIMAS:
+            raise ValueError(
+                f"Frecuencia de pago no válida: {perfil['frecuencia_pago_primas']}"
+            )
+        primas = {
+            cobertura: float(texto(poliza.get(f"prima_{cobertura}")))
+            for cobertura in coberturas
+            if texto(poliza.get(f"prima_{cobertura}")) is not None
+        }
+        if not primas:
+            raise ValueError("La póliza no tiene primas pactadas (prima_<cobertura>)")
+        return perfil, entero("mes_poliza"), primas
+
+
+def _valorar_bloque_cartera(
+    polizas: List[Dict[str, Any]],
+    inicio: int,
+    presupuesto_memoria_mb: float,
+    directorio_matrices: Optional[str],
+    puntos_modelo: Optional[PuntosModeloDomain],
+    conciliar: bool,
+) -> Dict[str, Any]:
+    """Punto de entrada de los procesos de valoración de cartera"""
+    from src.models.productos.endosos.endosos import endosos_orchestrator
+
+    return ValoracionCarteraEndosos(endosos_orchestrator)._valorar_bloque_cartera(
+        polizas,
+        inicio,
+        presupuesto_memoria_mb,
+        directorio_matrices,
+        puntos_modelo,
+        conciliar,
+    )
@@ -0,0 +1,236 @@
+"""
+Plan de cotización compilado por producto
+"""
+
+import copy
+from dataclasses import dataclass
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from src.infrastructure.repositories import get_repos, supuestos_repository
+from src.infrastructure.repositories.supuestos_repository import SupuestosSnapshot
+from src.common.producto import Producto
+from src.models.domain.curva_tasas_interes import CurvaTasasInteres
+from src.models.services.parametros_calculados_service import (
+    ParametrosCalculadosService,
+)
+from src.helpers.kernels import JIT_DISPONIBLE, calentar_kernels
+
+
+@dataclass(frozen=True)
+class PlanCobertura:
+    """Lo que una cotización necesita de una cobertura, resuelto de antemano"""
+
+    cobertura: str
+    handler: Any
+    snapshot: SupuestosSnapshot
+    parametros_almacenados: Mapping[str, Any]
+    # Parámetros calculados que no dependen del perfil (gastos, tasas mensuales,
+    # reserva y factores de pago por frecuencia)
+    constantes: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class PlanCotizacion:
+    """
+    Plan inmutable de un producto para una versión de supuestos: coberturas
+    disponibles, su orden de cálculo, el handler de cada una, su snapshot de
+    supuestos, sus parámetros almacenados y las constantes derivadas de ellos. Una
+    cotización solo selecciona las coberturas activas y ejecuta el plan.
+    """
+
+    producto: Producto
+    version: int
+    coberturas_disponibles: Tuple[str, ...]
+    coberturas: Mapping[str, PlanCobertura]
+
+    def seleccionar(self, coberturas: Sequence[str]) -> List[str]:
+        """
+        Coberturas activas en el orden de cálculo del plan
+
+        Args:
+            coberturas: Nombres de las coberturas pedidas
+
+        Returns:
+            Lista de coberturas del plan que están en coberturas
+
+        Raises:
+            ValueError: Si alguna cobertura no está en el plan
+        """
+        no_soportadas = [c for c in coberturas if c not in self.coberturas]
+        if no_soportadas:
+            raise ValueError(
+                f"Coberturas no soportadas para {self.producto.value}: {no_soportadas}"
+            )
+        return [c for c in self.coberturas if c in coberturas]
+
+    def get_handler(self, cobertura: str) -> Any:
+        """Handler compartido de una cobertura del plan"""
+        return self.coberturas[cobertura].handler
+
+    def parametros_almacenados(self, coberturas: Sequence[str]) -> Dict[str, Any]:
+        """
+        Copia por petición de los parámetros almacenados de las coberturas
+
+        Returns:
+            Diccionario {"coberturas": {cobertura: parámetros}} en el orden del plan
+        """
+        return {
+            "coberturas": {
+                cobertura: copy.deepcopy(
+                    dict(self.coberturas[cobertura].parametros_almacenados)
+                )
+                for cobertura in self.seleccionar(coberturas)
+            }
+        }
+
+    def constantes(self, cobertura: str) -> Mapping[str, Any]:
+        """Constantes derivadas de una cobertura del plan (compartidas, no modificar)"""
+        return self.coberturas[cobertura].constantes
+
+    def curva_tasas_interes(
+        self, coberturas: Sequence[str]
+    ) -> Optional[CurvaTasasInteres]:
+        """Curva de tasas del snapshot de la primera cobertura seleccionada"""
+        seleccionadas = self.seleccionar(coberturas)
+        if not seleccionadas:
+            return None
+        return self.coberturas[seleccionadas[0]].snapshot.curva_tasas_interes
+
+
+class CompiladorPlanes:
+    """
+    Compila y guarda un plan de cotización por producto y versión de supuestos.
+
+    Cada producto registra el registro de coberturas que resuelve sus handlers;
+    compilar() arma los planes de todos los productos registrados al iniciar la
+    aplicación (y compila los kernels de Numba si está instalado), y get_plan()
+    los compila bajo demanda si aún no existen (por ejemplo en un proceso de
+    trabajo o después de limpiar los supuestos).
+    """
+
+    _registros: Dict[Producto, Any] = {}
+    _cache: Dict[Tuple[Producto, int], PlanCotizacion] = {}
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def registrar_producto(cls, producto: Producto, registro_coberturas: Any) -> None:
+        """
+        Registra un producto cotizable
+
+        Args:
+            producto: Producto
+            registro_coberturas: Registro con coberturas_registradas() y
+                get_handler(cobertura); el orden de registro es el orden de cálculo
+        """
+        with cls._cache_lock:
+            cls._registros[producto] = registro_coberturas
+            cls._cache = {}
+
+    @classmethod
+    def productos_registrados(cls) -> List[Producto]:
+        """Productos con plan de cotización"""
+        return list(cls._registros)
+
+    @classmethod
+    def get_plan(cls, producto: Producto) -> PlanCotizacion:
+        """
+        Obtiene el plan vigente del producto, compilándolo si es necesario
+
+        Raises:
+            ValueError: Si el producto no está registrado
+        """
+        registro = cls._registros.get(producto)
+        if registro is None:
+            raise ValueError(
+                f"Producto sin plan de cotización: {producto.value}. "
+                f"Registrados: {[p.value for p in cls._registros]}"
+            )
+
+        cache_key = (producto, supuestos_repository.get_version())
+        plan = cls._cache.get(cache_key)
+        if plan is not None:
+            return plan
+
+        with cls._cache_lock:
+            plan = cls._cache.get(cache_key)
+            if plan is None:
+                plan = cls._compilar_plan(producto, registro, cache_key[1])
+                # Los planes de versiones anteriores ya no se usan
+                cls._cache = {
+                    clave: valor
+                    for clave, valor in cls._cache.items()
+                    if clave[1] == cache_key[1]
+                }
+                cls._cache[cache_key] = plan
+            return plan
+
+    @classmethod
+    def compilar(
+        cls, productos: Optional[Sequence[Producto]] = None
+    ) -> Dict[Producto, PlanCotizacion]:
+        """
+        Compila los planes de los productos (por defecto todos los registrados)
+
+        Returns:
+            Diccionario producto -> plan
+        """
+        planes = {}
+        for producto in productos or cls.productos_registrados():
+            planes[producto] = cls.get_plan(producto)
+            print(
+                f"Plan de cotización {producto.value} compilado: "
+                f"{list(planes[producto].coberturas)}"
+            )
+
+        # La primera cotización no debe pagar la compilación de los kernels
+        if JIT_DISPONIBLE:
+            print(f"Kernels compilados en {calentar_kernels():.2f} s")
+        return planes
+
+    @classmethod
+    def _compilar_plan(
+        cls, producto: Producto, registro: Any, version: int
+    ) -> PlanCotizacion:
+        """Resuelve coberturas, handlers, snapshots y parámetros de un producto"""
+        nombre = producto.value.lower()
+        registradas = registro.coberturas_registradas()
+        try:
+            disponibles = get_repos(nombre)["coberturas"].get_coberturas_by_producto(
+                nombre
+            )
+        except Exception as e:
+            print(f"Error al cargar coberturas de {nombre}: {e}")
+            disponibles = registradas
+
+        parametros_calculados_service = ParametrosCalculadosService()
+        coberturas = {}
+        for cobertura in registradas:
+            handler = registro.get_handler(cobertura)
+            validar = getattr(handler, f"validar_parametros_{cobertura}", None)
+            if validar is not None and not validar():
+                print(f"Advertencia: Parámetros de {cobertura} no son válidos")
+            coberturas[cobertura] = PlanCobertura(
+                cobertura=cobertura,
+                handler=handler,
+                snapshot=supuestos_repository.get_snapshot(nombre, cobertura),
+                parametros_almacenados=MappingProxyType(handler.parametros),
+                constantes=MappingProxyType(
+                    parametros_calculados_service.calcular_constantes(
+                        handler.parametros, producto, cobertura
+                    )
+                ),
+            )
+
+        return PlanCotizacion(
+            producto=producto,
+            version=version,
+            coberturas_disponibles=tuple(disponibles),
+            coberturas=MappingProxyType(coberturas),
+        )
+
+    @classmethod
+    def limpiar_cache(cls):
+        """Descarta los planes compilados"""
+        with cls._cache_lock:
+            cls._cache = {}
@@ -19,6 +19,7 @@ class CalculoActuarialService:
         sexo: str,
         fumador: bool,
         cobertura: str,
+        registrar_ramas: bool = False,
     ):
         """
         Inicializa el servicio de cálculo actuarial
@@ -29,6 +30,8 @@ class CalculoActuarialService:
             parametros_calculados: Parámetros calculados
             producto: Tipo de producto
             cobertura: Cobertura específica (ej: "fallecimiento", "itp")
+            registrar_ramas: Si guardar en indicadores_ramas los valores que deciden
+                los pisos y valores absolutos de la proyección
         """
         self.parametros_entrada = parametros_entrada
         self.parametros_almacenados = parametros_almacenados
@@ -37,6 +40,11 @@ class CalculoActuarialService:
         self.cobertura = cobertura
         self.sexo = sexo
         self.fumador = fumador
+        self.registrar_ramas = registrar_ramas
+        self.indicadores_ramas = None
+        self.proyeccion = None
+        # Flujos que no dependen de la prima, calculados en la primera evaluación
+        self._flujos_sin_prima = None
 
         # Procesar fallecimiento e ITP
         if cobertura in ["fallecimiento", "itp"]:
@@ -108,36 +116,80 @@ class CalculoActuarialService:
                 inflacion_mensual=inflacion_mensual,
                 periodo_vigencia=periodo_vigencia,
             )
-            self.flujo_resultado_service = FlujoResultadoService(
+            self.reserva_service = ReservaService(
                 producto=producto,
                 cobertura=cobertura,
-                suma_asegurada=suma_asegurada,
-                edad_actuarial=edad_actuarial,
                 periodo_vigencia=periodo_vigencia,
                 prima=self.prima,
                 fraccionamiento_primas=self.fraccionamiento_primas,
                 porcentaje_devolucion=porcentaje_devolucion,
             )
-            self.reserva_service = ReservaService(
+            self.flujo_resultado_service = FlujoResultadoService(
                 producto=producto,
                 cobertura=cobertura,
+                suma_asegurada=suma_asegurada,
+                edad_actuarial=edad_actuarial,
                 periodo_vigencia=periodo_vigencia,
                 prima=self.prima,
                 fraccionamiento_primas=self.fraccionamiento_primas,
                 porcentaje_devolucion=porcentaje_devolucion,
+                reserva_service=self.reserva_service,
             )
             self.margen_solvencia_service = MargenSolvenciaService()
         else:
             self.expuestos_mes_service = None
             self.gastos_service = None
 
-    def execute(self):
-        """Ejecuta todos los cálculos actuariales"""
+    def vna(self, prima: float) -> float:
+        """
+        Evalúa la proyección con otra prima_asignada reutilizando los servicios ya
+        construidos y los flujos que no dependen de la prima. Pensado para el
+        Goal Seek: el servicio se construye una vez por cotización y cobertura.
+
+        Args:
+            prima: Prima asignada a evaluar
+
+        Returns:
+            VNA de la proyección (el estado queda en self.proyeccion)
+        """
+        self.asignar_prima(prima)
+        return self.execute()
+
+    def asignar_prima(self, prima: float):
+        """Cambia la prima_asignada de las evaluaciones siguientes"""
+        self.prima = prima
         if self.expuestos_mes_service is not None:
+            self.gastos_service.prima = prima
+            self.reserva_service.asignar_prima(prima)
+
+    def _calcular_flujos_sin_prima(self) -> Dict[str, Any]:
+        """Expuestos, siniestros y gastos de adquisición (compartidos, no modificar)"""
+        if self._flujos_sin_prima is None:
             expuestos_mes = self.expuestos_mes_service.calcular_expuestos_mes()
             vivos_inicio = [expuestos_mes[mes]["vivos_inicio"] for mes in expuestos_mes]
             fallecidos = [expuestos_mes[mes]["fallecidos"] for mes in expuestos_mes]
-            caducados = [expuestos_mes[mes]["caducados"] for mes in expuestos_mes]
+            self._flujos_sin_prima = {
+                "vivos_inicio": vivos_inicio,
+                "fallecidos": fallecidos,
+                "caducados": [expuestos_mes[mes]["caducados"] for mes in expuestos_mes],
+                "siniestros": self.flujo_resultado_service.calcular_siniestros(
+                    fallecidos, vivos_inicio
+                ),
+                "gastos_adquisicion": (
+                    self.flujo_resultado_service.calcular_gastos_adquisicion(
+                        self.gasto_adquisicion
+                    )
+                ),
+            }
+        return self._flujos_sin_prima
+
+    def execute(self):
+        """Ejecuta todos los cálculos actuariales"""
+        if self.expuestos_mes_service is not None:
+            flujos_sin_prima = self._calcular_flujos_sin_prima()
+            vivos_inicio = flujos_sin_prima["vivos_inicio"]
+            fallecidos = flujos_sin_prima["fallecidos"]
+            caducados = flujos_sin_prima["caducados"]
             primas_recurrentes = (
                 self.flujo_resultado_service.calcular_primas_recurrentes(
                     vivos_inicio,
@@ -151,9 +203,7 @@ class CalculoActuarialService:
                 vivos_inicio, primas_recurrentes
             )
             gastos_mantenimiento_total = gastos["gastos_mantenimiento_total"]
-            siniestros = self.flujo_resultado_service.calcular_siniestros(
-                fallecidos, vivos_inicio
-            )
+            siniestros = flujos_sin_prima["siniestros"]
             rescate = self.reserva_service.calcular_rescate()
             rescate_ajuste_devolucion = self.flujo_resultado_service.calcular_rescate(
                 caducados, rescate
@@ -163,11 +213,7 @@ class CalculoActuarialService:
                     gastos_mantenimiento_total
                 )
             )
-            gastos_adquisicion = (
-                self.flujo_resultado_service.calcular_gastos_adquisicion(
-                    self.gasto_adquisicion
-                )
-            )
+            gastos_adquisicion = flujos_sin_prima["gastos_adquisicion"]
 
             comision = self.flujo_resultado_service.calcular_comision(
                 primas_recurrentes,
@@ -284,6 +330,47 @@ class CalculoActuarialService:
                 flujo_resultado, self.tasa_costo_capital_mes
             )
 
+            # Estado completo de la proyección para no tener que recalcularla
+            self.proyeccion = {
+                "vivos_inicio": vivos_inicio,
+                "fallecidos": fallecidos,
+                "caducados": caducados,
+                "primas_recurrentes": primas_recurrentes,
+                "siniestros": siniestros,
+                "rescate": rescate,
+                "rescate_ajuste_devolucion": rescate_ajuste_devolucion,
+                "gastos_mantenimiento": gastos_mantenimiento,
+                "gastos_adquisicion": gastos_adquisicion,
+                "comision": comision,
+                "flujo_pasivo": flujo_pasivo,
+                "saldo_reserva": saldo_reserva,
+                "moce": moce,
+                "margen_solvencia": margen_solvencia,
+                "variacion_reserva": variacion_reserva,
+                "variacion_margen_solvencia": variacion_margen_solvencia,
+                "utilidad_pre_pi_ms": utilidad_pre_pi_ms,
+                "IR": IR,
+                "producto_inversion": producto_inversion,
+                "flujo_resultado": flujo_resultado,
+                "vna_resultado": vna_resultado,
+            }
+
+            if self.registrar_ramas:
+                valor_reserva, comparador_reserva = (
+                    self.reserva_service.calcular_componentes_saldo_reserva(
+                        vivos_inicio,
+                        rescate,
+                        flujo_pasivo,
+                        self.tasa_interes_mensual,
+                    )
+                )
+                self.indicadores_ramas = {
+                    "valor_reserva": valor_reserva,
+                    "comparador_reserva": comparador_reserva,
+                    "variacion_reserva_final": varianza_reserva[-1] + varianza_moce[-1],
+                    "variacion_margen_solvencia_final": variacion_margen_solvencia[-1],
+                }
+
             print(vna_resultado)
 
             return vna_resultado
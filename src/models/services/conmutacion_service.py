@@ -0,0 +1,101 @@
+from typing import Any, Dict, Optional
+from src.common.producto import Producto
+from src.infrastructure.repositories import supuestos_repository
+from src.models.domain.tabla_conmutacion import TablaConmutacion
+from src.utils.anios_meses import anios_meses
+from src.utils.frecuencia_meses import frecuencia_meses
+
+
+class ConmutacionService:
+    """
+    Estimaciones con las tablas de conmutación del almacén de supuestos: valores
+    presentes de beneficios y anualidades leídos en O(1) por perfil, sin proyectar
+    la cohorte.
+    """
+
+    def __init__(self, producto: Producto = Producto.ENDOSOS):
+        self.producto = producto.value.lower()
+
+    def get_tabla(
+        self,
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        periodo_vigencia: int,
+        ajuste_mortalidad: Optional[float] = None,
+    ) -> TablaConmutacion:
+        """
+        Tabla de conmutación del perfil, descontada a la tasa de reserva mensual
+        del plazo (la misma tasa_interes_mensual de la proyección)
+
+        Raises:
+            ValueError: Si el plazo no existe en la curva de tasas
+        """
+        snapshot = supuestos_repository.get_snapshot(self.producto, cobertura)
+        tasa_mensual = snapshot.curva_tasas_interes.get_tasas_plazo(
+            periodo_vigencia
+        ).tasa_reserva_mensual
+        return snapshot.tablas_conmutacion.get_tabla(
+            sexo, fumador, tasa_mensual, ajuste_mortalidad
+        )
+
+    def estimar_prima(
+        self,
+        parametros_entrada: Dict[str, Any],
+        cobertura: str,
+        sexo: str,
+        fumador: bool,
+        fraccionamiento_primas: float = 1,
+    ) -> Optional[float]:
+        """
+        Prima por cuota (en las unidades de prima_asignada) que iguala el valor
+        presente de las primas con el de los beneficios y la devolución al
+        vencimiento. No incluye gastos, comisiones, rescates por caducidad ni
+        costo de capital, así que queda por debajo de la prima del Goal Seek.
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            cobertura: Cobertura a estimar
+            sexo: Sexo del asegurado
+            fumador: Si el asegurado fuma
+            fraccionamiento_primas: Fraccionamiento de la cobertura
+
+        Returns:
+            Prima estimada, o None si el perfil no está en la tabla o la devolución
+            absorbe todas las primas
+        """
+        periodo_vigencia = parametros_entrada.get("periodo_vigencia", 1)
+        edad = parametros_entrada.get("edad_actuarial", 1)
+        suma_asegurada = parametros_entrada.get("suma_asegurada", 1)
+        porcentaje_devolucion = parametros_entrada.get("porcentaje_devolucion") or 0
+        meses_cobertura = anios_meses(periodo_vigencia)
+        meses_pago = min(
+            anios_meses(parametros_entrada.get("periodo_pago_primas", 1)),
+            meses_cobertura,
+        )
+        meses_frecuencia = frecuencia_meses(
+            parametros_entrada.get("frecuencia_pago_primas", "MENSUAL")
+        )
+
+        try:
+            tabla = self.get_tabla(cobertura, sexo, fumador, periodo_vigencia)
+            beneficios = suma_asegurada * tabla.seguro(edad, meses_cobertura)
+            # Cuotas cobradas: la anualidad mensual repartida en la frecuencia
+            primas = (
+                fraccionamiento_primas
+                * tabla.anualidad(edad, meses_pago)
+                / meses_frecuencia
+            )
+            # Devolución al vencimiento: porcentaje de las cuotas a los vigentes
+            devolucion = (
+                porcentaje_devolucion
+                / 100
+                * -(-meses_cobertura // meses_frecuencia)
+                * tabla.dotal(edad, meses_cobertura)
+            )
+        except ValueError:
+            return None
+
+        if primas - devolucion <= 0:
+            return None
+        return beneficios / (primas - devolucion)
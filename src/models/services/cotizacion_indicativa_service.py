@@ -0,0 +1,205 @@
+import threading
+from typing import Any, Dict, Tuple
+from src.common.producto import Producto
+from src.infrastructure.repositories import (
+    rejilla_indicativa_repository,
+    supuestos_repository,
+)
+from src.models.domain.rejilla_indicativa import RejillaIndicativa
+from src.models.services.conmutacion_service import ConmutacionService
+
+# Error estimado admitido como fracción de la prima; con un error mayor la prima
+# indicativa no se entrega y hay que esperar la cotización exacta
+ERROR_RELATIVO_MAXIMO = 0.25
+
+
+class CotizacionIndicativaService:
+    """
+    Prima indicativa de un perfil: interpolación de la rejilla de primas exactas
+    precalculada (src/interfaces/batch/rejilla_indicativa.py) guiada por las tablas
+    de conmutación. No proyecta flujos ni resuelve el Goal Seek.
+
+    La rejilla se construye una vez por producto y versión de supuestos y se
+    comparte entre peticiones. Solo se usa si se generó con los supuestos
+    vigentes (misma huella de supuestos_repository).
+    """
+
+    _cache: Dict[Tuple[str, int], RejillaIndicativa] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        producto: Producto = Producto.ENDOSOS,
+        error_relativo_maximo: float = ERROR_RELATIVO_MAXIMO,
+    ):
+        self.producto = producto.value.lower()
+        self.error_relativo_maximo = error_relativo_maximo
+        self.conmutacion_service = ConmutacionService(producto)
+
+    def get_rejilla(self) -> RejillaIndicativa:
+        """
+        Obtiene (construyendo si es necesario) la rejilla del producto
+
+        Raises:
+            ValueError: Si el producto no tiene rejilla generada o se generó con
+                otros supuestos
+        """
+        clave = (self.producto, supuestos_repository.get_version())
+        rejilla = self._cache.get(clave)
+        if rejilla is not None:
+            return rejilla
+
+        with self._lock:
+            rejilla = self._cache.get(clave)
+            if rejilla is None:
+                rejilla = self._construir()
+                self._cache[clave] = rejilla
+            return rejilla
+
+    def _construir(self) -> RejillaIndicativa:
+        """Lee los nodos y les agrega la estimación unitaria de conmutación"""
+        datos = rejilla_indicativa_repository.get_rejilla(self.producto)
+        if not datos.get("nodos"):
+            raise ValueError(
+                f"El producto {self.producto} no tiene rejilla indicativa; generarla "
+                "con python -m src.interfaces.batch.rejilla_indicativa"
+            )
+        huella = supuestos_repository.get_huella(self.producto)
+        if datos.get("huella_supuestos") != huella:
+            raise ValueError(
+                f"La rejilla indicativa de {self.producto} se generó con otros "
+                f"supuestos ({datos.get('huella_supuestos')}, vigentes {huella}); "
+                "regenerarla con python -m src.interfaces.batch.rejilla_indicativa"
+            )
+        base = datos.get("base", {})
+
+        nodos = []
+        for nodo in datos["nodos"]:
+            parametros = {
+                **base,
+                "edad_actuarial": nodo["edad_actuarial"],
+                "periodo_vigencia": nodo["periodo_vigencia"],
+                "periodo_pago_primas": nodo["periodo_pago_primas"],
+                "porcentaje_devolucion": nodo["porcentaje_devolucion"],
+                "suma_asegurada": 1,
+            }
+            for cobertura, primas in nodo["primas"].items():
+                if primas is None:
+                    continue
+                nodos.append(
+                    (
+                        cobertura,
+                        nodo["sexo"],
+                        nodo["edad_actuarial"],
+                        nodo["periodo_vigencia"],
+                        nodo["periodo_pago_primas"],
+                        nodo["porcentaje_devolucion"],
+                        *primas,
+                        self.conmutacion_service.estimar_prima(
+                            parametros, cobertura, nodo["sexo"], base.get("fumador", False)
+                        ),
+                    )
+                )
+
+        rejilla = RejillaIndicativa.desde_primas(
+            datos["ejes"],
+            datos["sumas_aseguradas"],
+            nodos,
+            datos.get("factor_error", 1.0),
+            datos.get("error_relativo_minimo", 0.0),
+            datos.get("nivel_confianza"),
+            base,
+        )
+        print(
+            f"Rejilla indicativa de {self.producto}: {rejilla.total_nodos} nodos "
+            f"(factor de error {rejilla.factor_error}, error mínimo "
+            f"{rejilla.error_relativo_minimo:.2%}, nivel de confianza "
+            f"{rejilla.nivel_confianza})"
+        )
+        return rejilla
+
+    def validar(self, parametros_entrada: Dict[str, Any]) -> RejillaIndicativa:
+        """
+        Verifica que la rejilla esté vigente y cubra el perfil (parámetros fijos y
+        ejes), independientemente de la cobertura
+
+        Returns:
+            Rejilla del producto
+
+        Raises:
+            ValueError: Si no hay rejilla vigente o el perfil queda fuera de ella
+        """
+        rejilla = self.get_rejilla()
+        rejilla.validar_base(parametros_entrada)
+        rejilla.validar_perfil(
+            parametros_entrada.get("edad_actuarial", 1),
+            parametros_entrada.get("periodo_vigencia", 1),
+            parametros_entrada.get("periodo_pago_primas", 1),
+            parametros_entrada.get("porcentaje_devolucion") or 0,
+        )
+        return rejilla
+
+    def estimar(
+        self, parametros_entrada: Dict[str, Any], cobertura: str
+    ) -> Dict[str, float]:
+        """
+        Prima indicativa por cuota (en las unidades de prima_asignada) y su error
+        estimado
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            cobertura: Cobertura a estimar
+
+        Returns:
+            Diccionario con prima, error_estimado (error absoluto que no supera
+            una fracción nivel_confianza de los perfiles de validación; no es un
+            máximo garantizado), error_relativo (error_estimado / prima) y
+            nivel_confianza
+
+        Raises:
+            ValueError: Si el perfil no está cubierto por la rejilla, a su celda le
+                falta algún nodo de la cobertura o el error relativo supera
+                error_relativo_maximo
+        """
+        rejilla = self.validar(parametros_entrada)
+
+        sexo = str(parametros_entrada.get("sexo", "M")).upper()
+        estimacion_unitaria = self.conmutacion_service.estimar_prima(
+            {**parametros_entrada, "suma_asegurada": 1},
+            cobertura,
+            sexo,
+            parametros_entrada.get("fumador", False),
+        )
+        if estimacion_unitaria is None or estimacion_unitaria <= 0:
+            raise ValueError(
+                f"Perfil sin estimación de conmutación para {cobertura}"
+            )
+
+        prima, error = rejilla.estimar(
+            cobertura,
+            sexo,
+            parametros_entrada.get("edad_actuarial", 1),
+            parametros_entrada.get("periodo_vigencia", 1),
+            parametros_entrada.get("periodo_pago_primas", 1),
+            parametros_entrada.get("porcentaje_devolucion") or 0,
+            parametros_entrada.get("suma_asegurada", 1),
+            estimacion_unitaria,
+        )
+        error_relativo = error / prima if prima > 0 else float("inf")
+        if error_relativo > self.error_relativo_maximo:
+            raise ValueError(
+                f"El error estimado de {cobertura} ({error_relativo:.0%} de la prima) "
+                f"supera el admitido ({self.error_relativo_maximo:.0%})"
+            )
+        return {
+            "prima": prima,
+            "error_estimado": error,
+            "error_relativo": error_relativo,
+            "nivel_confianza": rejilla.nivel_confianza,
+        }
+
+    @classmethod
+    def limpiar_cache(cls):
+        """Descarta las rejillas construidas (se releen en la próxima estimación)"""
+        with cls._lock:
+            cls._cache.clear()
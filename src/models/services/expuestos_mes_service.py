@@ -1,15 +1,27 @@
 from src.common.constans import VIVOS_INICIO
-from src.infrastructure.repositories import get_repos
+from src.infrastructure.repositories import get_repos, supuestos_repository
 from src.common.producto import Producto
 from src.models.domain.expuestos_mes_domain import ExpuestosMesDomain
-from typing import Dict, Any, Optional
+from src.helpers.kernels import proyectar_supervivencia
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from src.utils.anios_meses import anios_meses
 import math
+import threading
+
+# Máximo de tablas de expuestos en caché antes de reiniciarla
+MAX_EXPUESTOS_CACHE = 2048
 
 
 class ExpuestosMesService:
     """Servicio para calcular expuestos al mes en seguros de vida"""
 
+    # Decrementos compartidos entre cotizaciones: solo dependen del perfil de
+    # mortalidad y caducidad, no de la prima, la suma asegurada ni la devolución.
+    # Se guardan de solo lectura porque varios hilos reciben el mismo objeto
+    _cache: Dict[Tuple, Mapping[int, Mapping[str, Any]]] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(
         self,
         producto: Producto,
@@ -48,7 +60,42 @@ class ExpuestosMesService:
         # Inicializar el dominio
         self.domain = ExpuestosMesDomain()
 
-    def calcular_expuestos_mes(self) -> Dict[int, Dict[str, Any]]:
+    def calcular_expuestos_mes(self) -> Mapping[int, Mapping[str, Any]]:
+        """
+        Obtiene los expuestos al mes desde la caché o los calcula una sola vez por
+        (cobertura, vigencia, edad, sexo, fumador) y versión de supuestos
+
+        Returns:
+            Resultados mes a mes, de solo lectura (el mismo objeto se comparte
+            entre cotizaciones concurrentes)
+        """
+        cache_key = (
+            self.producto,
+            self.cobertura,
+            self.periodo_vigencia,
+            self.edad_actuarial,
+            self.sexo,
+            self.fumador,
+            self.parametros_data.get("ajuste_mortalidad", 0),
+            supuestos_repository.get_version(),
+        )
+
+        expuestos_mes = self._cache.get(cache_key)
+        if expuestos_mes is None:
+            expuestos_mes = MappingProxyType(
+                {
+                    mes: MappingProxyType(valores)
+                    for mes, valores in self._calcular_expuestos_mes().items()
+                }
+            )
+            with self._cache_lock:
+                if len(self._cache) >= MAX_EXPUESTOS_CACHE:
+                    self._cache.clear()
+                self._cache[cache_key] = expuestos_mes
+
+        return expuestos_mes
+
+    def _calcular_expuestos_mes(self) -> Dict[int, Dict[str, Any]]:
         """
         Orquesta el cálculo de expuestos al mes usando el dominio
 
@@ -59,7 +106,6 @@ class ExpuestosMesService:
         tabla_mortalidad = self.tabla_mortalidad.get_tabla_mortalidad()
         mortalidad_ajuste = self.parametros_data.get("ajuste_mortalidad", 0) / 100
         meses_proyeccion = anios_meses(self.periodo_vigencia)
-        vivos_inicio = VIVOS_INICIO
         # Obtener datos de caducidad desde repositorios
         caducidad_parametrizado_mensual = self.caducidad.get_caducidad_mensual_data()
         caducidad_por_año = self.caducidad.get_caducidad_data()
@@ -69,7 +115,9 @@ class ExpuestosMesService:
             self.periodo_vigencia, caducidad_parametrizado_mensual, caducidad_por_año
         )
 
-        for mes in range(1, meses_proyeccion + 1):
+        meses = range(1, meses_proyeccion + 1)
+        mortalidades = {}
+        for mes in meses:
             # Calcular edad actuarial usando el dominio
             edad = self.domain.calcular_edad_actuarial(self.edad_actuarial, mes)
 
@@ -83,23 +131,23 @@ class ExpuestosMesService:
             mortalidad_ajustada = self.domain.calcular_mortalidad_ajustada(
                 mortalidad_mensual, mortalidad_ajuste
             )
+            mortalidades[mes] = (mortalidad_anual, mortalidad_mensual, mortalidad_ajustada)
+
+        # Fallecidos, caducados y supervivientes con el kernel de supervivencia
+        (
+            vivos_inicio,
+            fallecidos,
+            vivos_despues_fallecidos,
+            caducados,
+            vivos_final,
+        ) = proyectar_supervivencia(
+            [mortalidades[mes][2] for mes in meses],
+            [caducidad_mensual[mes] for mes in meses],
+            VIVOS_INICIO,
+        )
 
-            # Calcular fallecidos y supervivientes usando el dominio
-            fallecidos = self.domain.calcular_fallecidos(
-                vivos_inicio, mortalidad_ajustada
-            )
-            vivos_despues_fallecidos = self.domain.calcular_vivos_despues_fallecidos(
-                vivos_inicio, fallecidos
-            )
-
-            # Calcular caducados usando el dominio
-            caducados = self.domain.calcular_caducados(
-                vivos_despues_fallecidos, caducidad_mensual[mes]
-            )
-            vivos_final = self.domain.calcular_vivos_finales(
-                vivos_despues_fallecidos, caducados
-            )
-
+        for i, mes in enumerate(meses):
+            mortalidad_anual, mortalidad_mensual, mortalidad_ajustada = mortalidades[mes]
             # Estructurar resultado
             expuestos_mes[mes] = {
                 "caducidad_mensual": caducidad_mensual[mes],
@@ -107,14 +155,17 @@ class ExpuestosMesService:
                 "mortalidad_mensual": mortalidad_mensual,
                 "mortalidad_ajustada": mortalidad_ajustada,
                 "mortalidad_ajuste": mortalidad_ajuste,
-                "vivos_inicio": vivos_inicio,
-                "fallecidos": fallecidos,
-                "vivos_despues_fallecidos": vivos_despues_fallecidos,
-                "caducados": caducados,
-                "vivos_final": vivos_final,
+                "vivos_inicio": vivos_inicio[i],
+                "fallecidos": fallecidos[i],
+                "vivos_despues_fallecidos": vivos_despues_fallecidos[i],
+                "caducados": caducados[i],
+                "vivos_final": vivos_final[i],
             }
 
-            # Actualizar vivos para el siguiente mes
-            vivos_inicio = vivos_final
-
         return expuestos_mes
+
+    @classmethod
+    def limpiar_cache(cls):
+        """Limpia los expuestos cacheados"""
+        with cls._cache_lock:
+            cls._cache.clear()
@@ -1,7 +1,7 @@
 from src.models.domain.flujo_resultado_domain import FlujoResultado
 from src.common.producto import Producto
 from src.infrastructure.repositories import get_repos
-from typing import List
+from typing import List, Optional
 from src.models.services.reserva_service import ReservaService
 
 
@@ -17,9 +17,12 @@ class FlujoResultadoService:
         prima: float,
         fraccionamiento_primas: float,
         porcentaje_devolucion: float,
+        reserva_service: Optional[ReservaService] = None,
     ):
         self.flujo_resultado = FlujoResultado()
-        self.reserva_service = ReservaService(
+        # Solo se usa para el rescate ajustado, que no depende de la frecuencia:
+        # se puede compartir el ReservaService del cálculo actuarial
+        self.reserva_service = reserva_service or ReservaService(
             producto=producto,
             cobertura=cobertura,
             periodo_vigencia=periodo_vigencia,
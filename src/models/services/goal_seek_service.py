@@ -1,4 +1,5 @@
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional, Sequence
+import numpy as np
 from src.models.domain.goal_seek_domain import GoalSeekDomain
 
 
@@ -8,9 +9,18 @@ class GoalSeekService:
     que hace que el VNA se acerque más a cero.
     """
     
-    def __init__(self):
-        self.goal_seek_domain = GoalSeekDomain()
+    def __init__(self, modo: str = "biseccion"):
+        """
+        Args:
+            modo: Modo de búsqueda del Goal Seek ("biseccion" o "vectorizado")
+        """
+        self.goal_seek_domain = GoalSeekDomain(modo=modo)
     
+    @staticmethod
+    def resumen_sombra() -> Dict[str, Any]:
+        """Comparaciones del modo sombra entre el motor activo y el candidato"""
+        return GoalSeekDomain.resumen_sombra()
+
     def execute(
         self, 
         parametros_entrada: Dict[str, Any], 
@@ -33,3 +43,45 @@ class GoalSeekService:
             parametros_almacenados,
             parametros_calculados
         )
+
+    def execute_variantes(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        frecuencias_pago_primas: Sequence[str],
+        fumadores: Sequence[bool],
+        asistencias: Sequence[Optional[bool]]
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta el Goal Seek de todas las variantes (frecuencia × fumador × asistencia)
+        del perfil en una sola pasada del motor de variantes.
+
+        Returns:
+            Diccionario con las variantes y una solución por variante y cobertura
+        """
+        return self.goal_seek_domain.execute_goal_seek_variantes(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            frecuencias_pago_primas,
+            fumadores,
+            asistencias
+        )
+
+    def execute_filas(
+        self,
+        calcular_vna: Callable[[np.ndarray], np.ndarray],
+        filas: int,
+        primas_iniciales: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """
+        Resuelve la prima de equilibrio de varias filas del motor vectorizado con
+        los mismos barridos (o con la secante si se dan primas iniciales).
+
+        Returns:
+            Diccionario con los vectores primas y vnas por fila y los barridos usados
+        """
+        return self.goal_seek_domain.execute_goal_seek_filas(
+            calcular_vna, filas, primas_iniciales
+        )
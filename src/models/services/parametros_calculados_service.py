@@ -1,12 +1,36 @@
 from src.models.domain.parametros_calculados import ParametrosCalculados
 from src.common.producto import Producto
 from src.common.frecuencia_pago import FrecuenciaPago
-from src.infrastructure.repositories import get_repos
-from typing import Dict, Any
+from src.models.domain.curva_tasas_interes import CurvaTasasInteres
+from src.infrastructure.repositories import get_repos, supuestos_repository
+from typing import Dict, Any, Mapping, Optional, Tuple
+import threading
+
+# Parámetros almacenados de los que dependen los parámetros calculados
+PARAMETROS_ALMACENADOS_DERIVADOS = (
+    "prima_asignada",
+    "gasto_adquisicion",
+    "gasto_mantenimiento",
+    "moce",
+    "inflacion_anual",
+    "tasa_costo_capital_tir",
+    "margen_solvencia",
+    "fondo_garantia",
+    "factor_ajuste",
+    "reserva_endosos",
+)
+
+# Máximo de combinaciones en caché antes de reiniciarla
+MAX_ENTRADAS_CACHE = 4096
 
 
 class ParametrosCalculadosService:
 
+    # Caché compartida entre instancias: los parámetros calculados solo dependen de
+    # la cobertura, los plazos, la frecuencia y la versión de los supuestos
+    _cache: Dict[Tuple, Dict[str, Any]] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self):
         self.parametros_calculados = ParametrosCalculados()
         self._factores_pago = None
@@ -31,44 +55,105 @@ class ParametrosCalculadosService:
         self,
         parametros_entrada: Dict[str, Any],
         parametros_almacenados: Dict[str, Any],
-        tasas_interes_data: Dict[str, Any],
+        curva_tasas_interes: CurvaTasasInteres,
         producto: Producto,
         cobertura: str = None,
+        constantes: Optional[Mapping[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
-        Calcula todos los parámetros calculados de una vez
+        Obtiene los parámetros calculados desde la caché o los calcula una sola vez
+        por (cobertura, vigencia, pago, frecuencia) y versión de supuestos
 
         Args:
             parametros_entrada: Parámetros de entrada del usuario
             parametros_almacenados: Parámetros almacenados de la cobertura
-            tasas_interes_data: Datos de tasas de interés (cargados externamente)
+            curva_tasas_interes: Curva de tasas de interés del snapshot de supuestos
             producto: Tipo de producto (Producto.ENDOSOS, etc.)
             cobertura: Nombre de la cobertura (opcional)
+            constantes: Constantes derivadas ya calculadas por el plan de
+                cotización (ver calcular_constantes); si no se indican se calculan
 
         Returns:
-            Diccionario con todos los parámetros calculados
+            Copia del diccionario con todos los parámetros calculados
         """
-        parametros_calculados = {}
+        cache_key = self._clave_cache(
+            parametros_entrada,
+            parametros_almacenados,
+            curva_tasas_interes,
+            producto,
+            cobertura,
+        )
 
-        # Obtener parámetros básicos
-        prima = parametros_almacenados.get("prima_asignada")
-        gasto_adquisicion = parametros_almacenados.get("gasto_adquisicion")
-        gasto_mantenimiento = parametros_almacenados.get("gasto_mantenimiento")
-        moce = parametros_almacenados.get("moce")
-        inflacion_anual = parametros_almacenados.get("inflacion_anual")
-        tasa_costo_capital_tir = parametros_almacenados.get("tasa_costo_capital_tir")
-        margen_solvencia = parametros_almacenados.get("margen_solvencia")
-        fondo_garantia = parametros_almacenados.get("fondo_garantia")
-        factor_ajuste = parametros_almacenados.get("factor_ajuste")
-        reserva_endosos = parametros_almacenados.get("reserva_endosos")
+        parametros_calculados = self._cache.get(cache_key)
+        if parametros_calculados is None:
+            parametros_calculados = self._calcular_parametros_calculados(
+                parametros_entrada,
+                parametros_almacenados,
+                curva_tasas_interes,
+                producto,
+                cobertura,
+                constantes,
+            )
+            with self._cache_lock:
+                if len(self._cache) >= MAX_ENTRADAS_CACHE:
+                    self._cache.clear()
+                self._cache[cache_key] = parametros_calculados
 
-        # Obtener parámetros de entrada
-        periodo_vigencia = parametros_entrada.get("periodo_vigencia")
-        periodo_pago_primas = parametros_entrada.get("periodo_pago_primas")
-        frecuencia_pago_str = parametros_entrada.get(
-            "frecuencia_pago_primas", "MENSUAL"
+        return dict(parametros_calculados)
+
+    def _clave_cache(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        curva_tasas_interes: CurvaTasasInteres,
+        producto: Producto,
+        cobertura: str = None,
+    ) -> Tuple:
+        """Construye la clave de caché con todo aquello de lo que dependen los cálculos"""
+        return (
+            producto,
+            cobertura,
+            parametros_entrada.get("periodo_vigencia"),
+            parametros_entrada.get("periodo_pago_primas"),
+            parametros_entrada.get("frecuencia_pago_primas", "MENSUAL"),
+            supuestos_repository.get_version(),
+            curva_tasas_interes.clave,
+            tuple(
+                parametros_almacenados.get(nombre)
+                for nombre in PARAMETROS_ALMACENADOS_DERIVADOS
+            ),
         )
 
+    @classmethod
+    def limpiar_cache(cls):
+        """Limpia la caché de parámetros calculados"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def calcular_constantes(
+        self,
+        parametros_almacenados: Mapping[str, Any],
+        producto: Producto,
+        cobertura: str = None,
+    ) -> Dict[str, Any]:
+        """
+        Parámetros calculados que no dependen del perfil (plazos ni frecuencia):
+        gastos, tasas mensuales de costo de capital e inflación, reserva y el
+        factor de pago de cada frecuencia. El plan de cotización los calcula una
+        vez al compilarse.
+
+        Args:
+            parametros_almacenados: Parámetros almacenados de la cobertura
+            producto: Tipo de producto (Producto.ENDOSOS, etc.)
+            cobertura: Nombre de la cobertura (opcional)
+
+        Returns:
+            Diccionario con las constantes y factores_pago {frecuencia: factor}
+        """
+        constantes = {}
+
+        prima = parametros_almacenados.get("prima_asignada")
+
         # Determinar si es cobertura adicional
         # Para endosos: fallecimiento = principal (False), itp = adicional (True)
         if producto == Producto.ENDOSOS:
@@ -78,54 +163,130 @@ class ParametrosCalculadosService:
 
         # 1. Gastos
         if prima > 0:
-            parametros_calculados["adquisicion_fijo_poliza"] = (
-                self.calcular_adquisicion_fijo_poliza(gasto_adquisicion, prima)
+            constantes["adquisicion_fijo_poliza"] = (
+                self.calcular_adquisicion_fijo_poliza(
+                    parametros_almacenados.get("gasto_adquisicion"), prima
+                )
             )
         else:
-            parametros_calculados["adquisicion_fijo_poliza"] = 0
+            constantes["adquisicion_fijo_poliza"] = 0
 
-        parametros_calculados["calcular_mantenimiento_poliza"] = (
-            self.calcular_mantenimiento_poliza(gasto_mantenimiento, prima)
+        constantes["calcular_mantenimiento_poliza"] = (
+            self.calcular_mantenimiento_poliza(
+                parametros_almacenados.get("gasto_mantenimiento"), prima
+            )
         )
 
-        # 2. Tasas
-        parametros_calculados["tir_mensual"] = self.calcular_tir_mensual(
-            producto, cobertura_adicional, moce
+        # 2. Tasas que no dependen de la curva
+        constantes["tir_mensual"] = self.calcular_tir_mensual(
+            producto, cobertura_adicional, parametros_almacenados.get("moce")
+        )
+        constantes["inflacion_mensual"] = self.calcular_inflacion_mensual(
+            parametros_almacenados.get("inflacion_anual")
+        )
+        constantes["tasa_costo_capital_mes"] = self.calcular_tasa_costo_capital_mes(
+            parametros_almacenados.get("tasa_costo_capital_tir")
+        )
+
+        # 3. Reservas
+        constantes["reserva"] = self.calcular_reserva(
+            producto,
+            cobertura_adicional,
+            parametros_almacenados.get("margen_solvencia"),
+            parametros_almacenados.get("fondo_garantia"),
+            parametros_almacenados.get("factor_ajuste"),
+            parametros_almacenados.get("reserva_endosos"),
         )
 
-        parametros_calculados["inflacion_mensual"] = self.calcular_inflacion_mensual(
-            inflacion_anual
+        # 4. Factores de pago de todas las frecuencias (cross)
+        factores_pago = self._cargar_factores_pago()
+        constantes["factores_pago"] = {
+            frecuencia_pago.value: self.calcular_factor_pago(
+                frecuencia_pago, factores_pago
+            )
+            for frecuencia_pago in FrecuenciaPago
+        }
+
+        return constantes
+
+    def _calcular_parametros_calculados(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        curva_tasas_interes: CurvaTasasInteres,
+        producto: Producto,
+        cobertura: str = None,
+        constantes: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calcula todos los parámetros calculados de una vez
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            parametros_almacenados: Parámetros almacenados de la cobertura
+            curva_tasas_interes: Curva de tasas de interés del snapshot de supuestos
+            producto: Tipo de producto (Producto.ENDOSOS, etc.)
+            cobertura: Nombre de la cobertura (opcional)
+            constantes: Constantes derivadas precalculadas (ver calcular_constantes)
+
+        Returns:
+            Diccionario con todos los parámetros calculados
+        """
+        if constantes is None:
+            constantes = self.calcular_constantes(
+                parametros_almacenados, producto, cobertura
+            )
+
+        # Obtener parámetros de entrada
+        periodo_vigencia = parametros_entrada.get("periodo_vigencia")
+        periodo_pago_primas = parametros_entrada.get("periodo_pago_primas")
+        frecuencia_pago_str = parametros_entrada.get(
+            "frecuencia_pago_primas", "MENSUAL"
         )
 
+        # Determinar si es cobertura adicional
+        # Para endosos: fallecimiento = principal (False), itp = adicional (True)
+        if producto == Producto.ENDOSOS:
+            cobertura_adicional = cobertura == "itp"  # Solo ITP es adicional
+        else:
+            cobertura_adicional = cobertura is not None
+
+        # 1. Gastos
+        parametros_calculados = {
+            "adquisicion_fijo_poliza": constantes["adquisicion_fijo_poliza"],
+            "calcular_mantenimiento_poliza": constantes[
+                "calcular_mantenimiento_poliza"
+            ],
+        }
+
+        # 2. Tasas
+        parametros_calculados["tir_mensual"] = constantes["tir_mensual"]
+
+        parametros_calculados["inflacion_mensual"] = constantes["inflacion_mensual"]
+
         parametros_calculados["tasa_interes_anual"] = self.calcular_tasa_interes_anual(
-            tasas_interes_data, periodo_vigencia
+            curva_tasas_interes, periodo_vigencia
         )
 
         parametros_calculados["tasa_interes_mensual"] = (
-            self.calcular_tasa_interes_mensual(
+            self.calcular_tasa_interes_mensual_curva(
                 producto,
                 cobertura_adicional,
-                parametros_calculados["tasa_interes_anual"],
+                curva_tasas_interes,
+                periodo_vigencia,
             )
         )
 
         parametros_calculados["tasa_inversion"] = self.calcular_tasa_inversion(
-            tasas_interes_data, periodo_pago_primas
+            curva_tasas_interes, periodo_pago_primas
         )
 
-        parametros_calculados["tasa_costo_capital_mes"] = (
-            self.calcular_tasa_costo_capital_mes(tasa_costo_capital_tir)
-        )
+        parametros_calculados["tasa_costo_capital_mes"] = constantes[
+            "tasa_costo_capital_mes"
+        ]
 
         # 3. Reservas
-        parametros_calculados["reserva"] = self.calcular_reserva(
-            producto,
-            cobertura_adicional,
-            margen_solvencia,
-            fondo_garantia,
-            factor_ajuste,
-            reserva_endosos,
-        )
+        parametros_calculados["reserva"] = constantes["reserva"]
 
         # 4. Factores de pago (cross - cargados internamente)
         try:
@@ -133,11 +294,9 @@ class ParametrosCalculadosService:
         except ValueError:
             frecuencia_pago = FrecuenciaPago.MENSUAL
 
-        factores_pago = self._cargar_factores_pago()
-
-        parametros_calculados["factor_pago"] = self.calcular_factor_pago(
-            frecuencia_pago, factores_pago
-        )
+        parametros_calculados["factor_pago"] = constantes["factores_pago"][
+            frecuencia_pago.value
+        ]
 
         return parametros_calculados
 
@@ -167,10 +326,10 @@ class ParametrosCalculadosService:
         return self.parametros_calculados.calcular_inflacion_mensual(inflacion_anual)
 
     def calcular_tasa_interes_anual(
-        self, tasas_interes_data: dict, periodo_vigencia: int
+        self, curva_tasas_interes: CurvaTasasInteres, periodo_vigencia: int
     ) -> float:
         return self.parametros_calculados.calcular_tasa_interes_anual(
-            tasas_interes_data, periodo_vigencia
+            curva_tasas_interes, periodo_vigencia
         )
 
     def calcular_tasa_interes_mensual(
@@ -180,11 +339,22 @@ class ParametrosCalculadosService:
             producto, coberturas, tasa_interes_anual
         )
 
+    def calcular_tasa_interes_mensual_curva(
+        self,
+        producto: Producto,
+        coberturas: bool,
+        curva_tasas_interes: CurvaTasasInteres,
+        periodo_vigencia: int,
+    ) -> float:
+        return self.parametros_calculados.calcular_tasa_interes_mensual_curva(
+            producto, coberturas, curva_tasas_interes, periodo_vigencia
+        )
+
     def calcular_tasa_inversion(
-        self, tasas_interes_data: dict, periodo_pago_primas: int
+        self, curva_tasas_interes: CurvaTasasInteres, periodo_pago_primas: int
     ) -> float:
         return self.parametros_calculados.calcular_tasa_inversion(
-            tasas_interes_data, periodo_pago_primas
+            curva_tasas_interes, periodo_pago_primas
         )
 
     def calcular_tasa_costo_capital_mes(self, tasa_costo_capital_tir: float) -> float:
@@ -242,41 +412,18 @@ class ParametrosCalculadosService:
     def calcular_tabla_devolucion_completa(
         self, periodo_vigencia: int, porcentaje_devolucion: float, producto: str, cobertura: str
     ) -> list:
-        """Calcula la tabla de devolución cargando los datos y aplicando la fórmula"""
-        print(f"\n🔍 Calculando tabla de devolución...")
-        print(f"Periodo vigencia: {periodo_vigencia}")
-        print(f"Porcentaje devolución: {porcentaje_devolucion}")
-        
-        # Cargar datos de devolución
-        devolucion_data = self._cargar_datos_devolucion(producto, cobertura)
-        
-        if not devolucion_data:
-            print("⚠️ No se pudieron cargar los datos de devolución")
-            return [porcentaje_devolucion]
-        
-        print(f"✅ Datos de devolución cargados: {len(devolucion_data)} elementos")
-        
-        # Calcular tabla usando el método del dominio
-        resultado = self.calcular_tabla_devolucion(periodo_vigencia, porcentaje_devolucion, devolucion_data)
-        
-        print(f"📊 Resultado tabla devolución: {resultado}")
-        return resultado
-    
-    def _cargar_datos_devolucion(self, producto: str, cobertura: str) -> list:
-        """Carga los datos de devolución directamente desde el archivo"""
-        try:
-            import json
-            from pathlib import Path
-            
-            # Ruta directa al archivo de devolución
-            devolucion_path = Path(f"assets/productos/{producto}/coberturas/{cobertura}/devolucion.json")
-            
-            if devolucion_path.exists():
-                with open(devolucion_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                print(f"⚠️ Archivo de devolución no encontrado: {devolucion_path}")
-                return []
-        except Exception as e:
-            print(f"❌ Error cargando datos de devolución: {e}")
-            return []
+        """
+        Tabla de devolución de la cobertura desde el almacén de supuestos: el vector
+        de la vigencia se precalcula con el snapshot y aquí solo se escala
+
+        Args:
+            periodo_vigencia: Periodo de vigencia en años
+            porcentaje_devolucion: Porcentaje de devolución (0 a 100)
+            producto: Nombre del producto (ej: "endosos")
+            cobertura: Cobertura cuya tabla de devolución se usa
+
+        Returns:
+            Lista con la devolución por año de póliza
+        """
+        snapshot = supuestos_repository.get_snapshot(producto, cobertura)
+        return snapshot.tabla_devolucion.escalar(periodo_vigencia, porcentaje_devolucion)
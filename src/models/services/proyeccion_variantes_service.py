@@ -0,0 +1,175 @@
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+from src.models.services.expuestos_mes_service import ExpuestosMesService
+from src.models.services.flujo_resultado_service import FlujoResultadoService
+from src.models.services.reserva_service import ReservaService
+from src.models.services.proyeccion_vectorizada_service import PRIMA_UNITARIA
+from src.models.domain.proyeccion_variantes_domain import ProyeccionVariantesDomain
+from src.models.domain.proyeccion_vectorizada_domain import ProyeccionVectorizadaDomain
+from src.common.producto import Producto
+
+FRECUENCIAS_PAGO_PRIMAS = ("MENSUAL", "TRIMESTRAL", "SEMESTRAL", "ANUAL")
+
+
+class ProyeccionVariantesService:
+    """
+    Motor vectorizado para todas las variantes de un perfil a la vez
+    (frecuencia de pago × fumador × asistencia) de una cobertura.
+
+    Los decrementos se obtienen una vez por estado de fumador y el rescate una vez
+    por prima; el resto de la proyección se evalúa en una sola pasada con una fila
+    por variante.
+    """
+
+    def __init__(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        producto: Producto,
+        sexo: str,
+        cobertura: str,
+        frecuencias_pago_primas: Sequence[str] = FRECUENCIAS_PAGO_PRIMAS,
+        fumadores: Sequence[bool] = (False,),
+        asistencias: Sequence[Optional[bool]] = (None,),
+    ):
+        """
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario (su frecuencia,
+                fumador y asistencia se ignoran: los dan las variantes)
+            parametros_almacenados: Parámetros almacenados (no se modifican)
+            parametros_calculados: Parámetros calculados
+            producto: Tipo de producto
+            cobertura: Cobertura específica (ej: "fallecimiento", "itp")
+            frecuencias_pago_primas: Frecuencias a proyectar
+            fumadores: Estados de fumador a proyectar
+            asistencias: Valores de tiene_asistencia a proyectar (None usa el
+                almacenado de la cobertura)
+        """
+        periodo_vigencia = parametros_entrada.get("periodo_vigencia", 1)
+        edad_actuarial = parametros_entrada.get("edad_actuarial", 1)
+        suma_asegurada = parametros_entrada.get("suma_asegurada", 1)
+        porcentaje_devolucion = parametros_entrada.get("porcentaje_devolucion")
+        periodo_pago_primas = parametros_entrada.get("periodo_pago_primas", 1)
+
+        cobertura_params = parametros_almacenados.get("coberturas", {}).get(
+            cobertura, {}
+        )
+        cobertura_calculados = parametros_calculados.get("coberturas", {}).get(
+            cobertura, {}
+        )
+        fraccionamiento_primas = cobertura_params.get("fraccionamiento_primas")
+        asistencias = [
+            bool(cobertura_params.get("tiene_asistencia")) if asistencia is None
+            else asistencia
+            for asistencia in asistencias
+        ]
+
+        # Decrementos y siniestros por estado de fumador (no dependen de la prima)
+        flujo_resultado_service = FlujoResultadoService(
+            producto=producto,
+            cobertura=cobertura,
+            suma_asegurada=suma_asegurada,
+            edad_actuarial=edad_actuarial,
+            periodo_vigencia=periodo_vigencia,
+            prima=0.0,
+            fraccionamiento_primas=fraccionamiento_primas,
+            porcentaje_devolucion=porcentaje_devolucion,
+        )
+        vivos_inicio, caducados, siniestros = [], [], []
+        for fumador in fumadores:
+            expuestos_mes = ExpuestosMesService(
+                producto=producto,
+                periodo_vigencia=periodo_vigencia,
+                edad_actuarial=edad_actuarial,
+                sexo=sexo,
+                fumador=fumador,
+                cobertura=cobertura,
+            ).calcular_expuestos_mes()
+            vivos = [expuestos_mes[mes]["vivos_inicio"] for mes in expuestos_mes]
+            fallecidos = [expuestos_mes[mes]["fallecidos"] for mes in expuestos_mes]
+            vivos_inicio.append(vivos)
+            caducados.append(
+                [expuestos_mes[mes]["caducados"] for mes in expuestos_mes]
+            )
+            siniestros.append(
+                flujo_resultado_service.calcular_siniestros(fallecidos, vivos)
+            )
+
+        self.variantes_domain = ProyeccionVariantesDomain(
+            frecuencias_pago_primas=frecuencias_pago_primas,
+            fumadores=fumadores,
+            asistencias=asistencias,
+            vivos_inicio=np.array(vivos_inicio, dtype=float),
+            caducados=np.array(caducados, dtype=float),
+            siniestros=np.array(siniestros, dtype=float),
+            periodo_pago_primas=periodo_pago_primas,
+            periodo_vigencia=periodo_vigencia,
+            fraccionamiento_primas=fraccionamiento_primas,
+            mantenimiento_poliza=cobertura_calculados.get(
+                "calcular_mantenimiento_poliza", 0
+            ),
+            moneda=cobertura_params.get("moneda"),
+            valor_dolar=cobertura_params.get("valor_dolar"),
+            valor_soles=cobertura_params.get("valor_soles"),
+            costo_mensual_asistencia_funeraria=cobertura_params.get(
+                "costo_mensual_asistencia_funeraria"
+            ),
+            inflacion_mensual=cobertura_calculados.get("inflacion_mensual"),
+            gasto_adquisicion=cobertura_params.get("gasto_adquisicion"),
+            comision=cobertura_params.get("comision"),
+        )
+
+        # Dos evaluaciones de los flujos afines para todas las variantes (una
+        # fila de rescate por meses; el dominio la lleva a las cuotas de cada
+        # frecuencia)
+        proyecciones = []
+        for prima in (0.0, PRIMA_UNITARIA):
+            rescate = [
+                ReservaService(
+                    producto=producto,
+                    cobertura=cobertura,
+                    periodo_vigencia=periodo_vigencia,
+                    prima=prima,
+                    fraccionamiento_primas=fraccionamiento_primas,
+                    porcentaje_devolucion=porcentaje_devolucion,
+                ).calcular_rescate()
+            ]
+            proyecciones.append(
+                self.variantes_domain.calcular_flujos_afines(prima, rescate)
+            )
+
+        # Flujos afines (variante, mes) de las dos primas, reutilizables con otras tasas
+        self.proyeccion_base, self.proyeccion_unitaria = proyecciones
+        self.proyeccion_vectorizada = ProyeccionVectorizadaDomain(
+            proyeccion_base=self.proyeccion_base,
+            proyeccion_unitaria=self.proyeccion_unitaria,
+            prima_unitaria=PRIMA_UNITARIA,
+            tasa_interes_mensual=cobertura_calculados.get("tasa_interes_mensual"),
+            tir_mensual=cobertura_calculados.get("tir_mensual"),
+            margen_solvencia=cobertura_params.get("margen_solvencia"),
+            reserva=cobertura_calculados.get("reserva"),
+            tasa_inversion=cobertura_calculados.get("tasa_inversion"),
+            impuesto_renta=cobertura_params.get("impuesto_renta"),
+            tasa_costo_capital_mes=cobertura_calculados.get("tasa_costo_capital_mes"),
+        )
+
+    def variantes(self) -> List[Tuple[str, bool, bool]]:
+        """Variantes (frecuencia, fumador, asistencia) en el orden de las filas"""
+        return self.variantes_domain.variantes()
+
+    def calcular_vna(self, primas: np.ndarray) -> np.ndarray:
+        """
+        Calcula el VNA de cada variante para su fila de primas
+
+        Args:
+            primas: Matriz (variantes, k) de primas asignadas
+
+        Returns:
+            Matriz (variantes, k) de VNAs
+        """
+        return self.proyeccion_vectorizada.calcular_vna(primas)
+
+    def calcular_flujos(self, primas: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calcula todos los flujos de la proyección (variante, prima, mes)"""
+        return self.proyeccion_vectorizada.calcular_flujos(primas)
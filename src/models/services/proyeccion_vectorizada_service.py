@@ -0,0 +1,156 @@
+from typing import Dict, Any, Optional, Sequence
+import numpy as np
+from src.models.services.calculo_actuarial_service import CalculoActuarialService
+from src.models.domain.proyeccion_vectorizada_domain import ProyeccionVectorizadaDomain
+from src.models.domain.kernel_escalar_domain import KernelEscalarDomain
+from src.common.producto import Producto
+
+# Prima de la segunda proyección escalar (la primera es con prima 0)
+PRIMA_UNITARIA = 100.0
+
+# Primas x meses hasta los que una pasada escalar por prima es más rápida que una
+# llamada al motor vectorizado (el costo fijo de NumPy domina en lotes chicos)
+CELDAS_MAX_KERNEL_ESCALAR = 240
+
+# Cómo se elige el motor de cada evaluación
+SELECCIONES_KERNEL = ("automatico", "escalar", "vectorizado")
+
+
+class ProyeccionVectorizadaService:
+    """
+    Punto de entrada del motor vectorizado: recibe un vector de prima_asignada y
+    devuelve el vector de VNAs de la cobertura.
+
+    Construirlo cuesta dos proyecciones escalares; cada evaluación posterior
+    elige el motor según el lote: pocas primas con horizontes cortos van al kernel
+    escalar fusionado (una pasada por prima), el resto a una sola pasada con NumPy.
+    """
+
+    def __init__(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        producto: Producto,
+        sexo: str,
+        fumador: bool,
+        cobertura: str,
+        motor: Optional[CalculoActuarialService] = None,
+        seleccion_kernel: str = "automatico",
+    ):
+        """
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            parametros_almacenados: Parámetros almacenados (no se modifican)
+            parametros_calculados: Parámetros calculados
+            producto: Tipo de producto
+            cobertura: Cobertura específica (ej: "fallecimiento", "itp")
+            motor: Motor escalar ya construido con estos mismos parámetros (se
+                reutiliza y queda con la prima unitaria); por defecto se construye
+            seleccion_kernel: "automatico" (según primas y meses), "escalar" (siempre
+                el kernel fusionado) o "vectorizado" (siempre NumPy)
+        """
+        if seleccion_kernel not in SELECCIONES_KERNEL:
+            raise ValueError(
+                f"Selección de kernel no soportada: {seleccion_kernel}. "
+                f"Opciones: {list(SELECCIONES_KERNEL)}"
+            )
+        self.seleccion_kernel = seleccion_kernel
+
+        # Un solo motor escalar para las dos proyecciones: solo cambia la prima
+        if motor is None:
+            motor = self._crear_motor(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                producto,
+                sexo,
+                fumador,
+                cobertura,
+                0.0,
+            )
+        motor.vna(0.0)
+        proyeccion_base = motor.proyeccion
+        motor.vna(PRIMA_UNITARIA)
+        proyeccion_unitaria = motor.proyeccion
+
+        self.proyeccion_vectorizada = ProyeccionVectorizadaDomain(
+            proyeccion_base=proyeccion_base,
+            proyeccion_unitaria=proyeccion_unitaria,
+            prima_unitaria=PRIMA_UNITARIA,
+            tasa_interes_mensual=motor.tasa_interes_mensual,
+            tir_mensual=motor.tir_mensual,
+            margen_solvencia=motor.margen_solvencia,
+            reserva=motor.reserva,
+            tasa_inversion=motor.tasa_inversion,
+            impuesto_renta=motor.impuesto_renta,
+            tasa_costo_capital_mes=motor.tasa_costo_capital_mes,
+        )
+        self.kernel_escalar = KernelEscalarDomain(
+            proyeccion_base=proyeccion_base,
+            proyeccion_unitaria=proyeccion_unitaria,
+            prima_unitaria=PRIMA_UNITARIA,
+            tasa_interes_mensual=motor.tasa_interes_mensual,
+            tir_mensual=motor.tir_mensual,
+            margen_solvencia=motor.margen_solvencia,
+            reserva=motor.reserva,
+            tasa_inversion=motor.tasa_inversion,
+            impuesto_renta=motor.impuesto_renta,
+            tasa_costo_capital_mes=motor.tasa_costo_capital_mes,
+        )
+
+    def calcular_vna(self, primas: Sequence[float]) -> np.ndarray:
+        """
+        Calcula el VNA para cada prima_asignada del vector
+
+        Args:
+            primas: Vector de primas asignadas
+
+        Returns:
+            Vector de VNAs en el mismo orden
+        """
+        primas = np.asarray(primas, dtype=float)
+        if self.usar_kernel_escalar(primas.size):
+            return self.kernel_escalar.calcular_vnas(primas)
+        return self.proyeccion_vectorizada.calcular_vna(primas)
+
+    def usar_kernel_escalar(self, cantidad_primas: int) -> bool:
+        """Indica si un lote de cantidad_primas se evalúa con el kernel escalar"""
+        if self.seleccion_kernel != "automatico":
+            return self.seleccion_kernel == "escalar"
+        return cantidad_primas * self.kernel_escalar.meses <= CELDAS_MAX_KERNEL_ESCALAR
+
+    def calcular_flujos(self, primas: Sequence[float]) -> Dict[str, np.ndarray]:
+        """Calcula todos los flujos de la proyección (una fila por prima)"""
+        return self.proyeccion_vectorizada.calcular_flujos(primas)
+
+    def _crear_motor(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        producto: Producto,
+        sexo: str,
+        fumador: bool,
+        cobertura: str,
+        prima_asignada: float,
+    ) -> CalculoActuarialService:
+        """Construye el motor escalar de la cobertura con la prima inicial indicada"""
+        coberturas = parametros_almacenados.get("coberturas", {})
+        parametros_almacenados_prima = {
+            **parametros_almacenados,
+            "coberturas": {
+                **coberturas,
+                cobertura: {**coberturas.get(cobertura, {}), "prima_asignada": prima_asignada},
+            },
+        }
+        calculo_service = CalculoActuarialService(
+            parametros_entrada=parametros_entrada,
+            parametros_almacenados=parametros_almacenados_prima,
+            parametros_calculados=parametros_calculados,
+            producto=producto,
+            sexo=sexo,
+            fumador=fumador,
+            cobertura=cobertura,
+        )
+        return calculo_service
@@ -0,0 +1,229 @@
+"""
+Registro de motores de VNA y su configuración (motor activo y modo sombra)
+"""
+
+from dataclasses import dataclass, replace
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+import numpy as np
+from src.models.services.calculo_actuarial_service import CalculoActuarialService
+from src.models.services.proyeccion_vectorizada_service import (
+    ProyeccionVectorizadaService,
+)
+
+# Motor de las cotizaciones si no se configura otro; los demás se activan por
+# configuración
+MOTOR_POR_DEFECTO = "referencia"
+
+# Variable de entorno de cada campo de ConfiguracionMotores
+VARIABLES_ENTORNO = {
+    "motor": "COTIZADOR_MOTOR",
+    "candidato": "COTIZADOR_MOTOR_CANDIDATO",
+    "muestra_sombra": "COTIZADOR_MUESTRA_SOMBRA",
+    "tolerancia_prima": "COTIZADOR_TOLERANCIA_PRIMA",
+    "tolerancia_vna": "COTIZADOR_TOLERANCIA_VNA",
+}
+
+
+@dataclass(frozen=True)
+class ConfiguracionMotores:
+    """
+    Motor activo y modo sombra.
+
+    En modo sombra, una fracción muestra_sombra de las cotizaciones vuelve a
+    resolver el Goal Seek con el motor candidato fuera de la respuesta y compara
+    prima y VNA contra el motor activo.
+    """
+
+    motor: str = MOTOR_POR_DEFECTO
+    candidato: Optional[str] = None
+    muestra_sombra: float = 0.0
+    tolerancia_prima: float = 1e-6  # Diferencia relativa de prima admitida
+    tolerancia_vna: float = 1e-6  # Diferencia absoluta de VNA admitida
+
+
+class MotorReferencia:
+    """La cadena escalar de CalculoActuarialService, una proyección por prima"""
+
+    def __init__(self, calculo_service: CalculoActuarialService):
+        self.calculo_service = calculo_service
+
+    def calcular_vna(self, primas: Sequence[float]) -> np.ndarray:
+        """VNA de cada prima del vector"""
+        return np.array(
+            [self.calculo_service.vna(float(prima)) for prima in np.ravel(primas)],
+            dtype=float,
+        )
+
+
+def _motor_proyeccion_vectorizada(seleccion_kernel: str) -> Callable[[Any], Any]:
+    """Fábrica de ProyeccionVectorizadaService sobre un motor escalar ya construido"""
+
+    def crear(calculo_service: CalculoActuarialService) -> ProyeccionVectorizadaService:
+        return ProyeccionVectorizadaService(
+            calculo_service.parametros_entrada,
+            calculo_service.parametros_almacenados,
+            calculo_service.parametros_calculados,
+            calculo_service.producto,
+            calculo_service.sexo,
+            calculo_service.fumador,
+            calculo_service.cobertura,
+            motor=calculo_service,
+            seleccion_kernel=seleccion_kernel,
+        )
+
+    return crear
+
+
+class RegistroMotores:
+    """
+    Registro nombre -> fábrica de motores de VNA.
+
+    Un motor se construye sobre el CalculoActuarialService de una cotización y
+    cobertura y expone calcular_vna(primas) -> vector de VNAs. El Goal Seek usa el
+    motor configurado; cambiar de motor es cambiar la configuración.
+    """
+
+    _fabricas: Dict[str, Callable[[CalculoActuarialService], Any]] = {}
+    _configuracion = ConfiguracionMotores()
+    _lock = threading.Lock()
+    _aleatorio = random.Random()
+
+    @classmethod
+    def registrar(
+        cls, nombre: str, fabrica: Callable[[CalculoActuarialService], Any]
+    ) -> None:
+        """
+        Registra un motor
+
+        Args:
+            nombre: Nombre del motor en la configuración
+            fabrica: Recibe el CalculoActuarialService y devuelve el motor
+        """
+        with cls._lock:
+            cls._fabricas[nombre] = fabrica
+
+    @classmethod
+    def motores_registrados(cls) -> List[str]:
+        """Nombres de los motores registrados"""
+        return list(cls._fabricas)
+
+    @classmethod
+    def crear(cls, nombre: str, calculo_service: CalculoActuarialService) -> Any:
+        """
+        Construye un motor sobre el servicio de cálculo de una cotización
+
+        Raises:
+            ValueError: Si el motor no está registrado
+        """
+        fabrica = cls._fabricas.get(nombre)
+        if fabrica is None:
+            raise ValueError(
+                f"Motor no soportado: {nombre}. Registrados: {cls.motores_registrados()}"
+            )
+        return fabrica(calculo_service)
+
+    @classmethod
+    def configurar(cls, **cambios) -> ConfiguracionMotores:
+        """
+        Cambia la configuración (los campos no indicados se mantienen)
+
+        Args:
+            **cambios: Campos de ConfiguracionMotores
+
+        Returns:
+            Configuración vigente
+
+        Raises:
+            ValueError: Si algún motor no está registrado, la muestra no está en
+                [0, 1] o alguna tolerancia es negativa
+        """
+        with cls._lock:
+            configuracion = replace(cls._configuracion, **cambios)
+            if configuracion.motor is None:
+                raise ValueError("El motor activo es obligatorio")
+            for nombre in (configuracion.motor, configuracion.candidato):
+                if nombre is not None and nombre not in cls._fabricas:
+                    raise ValueError(
+                        f"Motor no soportado: {nombre}. "
+                        f"Registrados: {list(cls._fabricas)}"
+                    )
+            if configuracion.muestra_sombra is None or not (
+                0.0 <= configuracion.muestra_sombra <= 1.0
+            ):
+                raise ValueError("muestra_sombra debe estar entre 0 y 1")
+            if any(
+                tolerancia is None or tolerancia < 0
+                for tolerancia in (
+                    configuracion.tolerancia_prima,
+                    configuracion.tolerancia_vna,
+                )
+            ):
+                raise ValueError("Las tolerancias deben ser no negativas")
+            cls._configuracion = configuracion
+            return configuracion
+
+    @classmethod
+    def configurar_desde_entorno(
+        cls, entorno: Optional[Mapping[str, str]] = None
+    ) -> ConfiguracionMotores:
+        """
+        Aplica la configuración de las variables de entorno (VARIABLES_ENTORNO);
+        los campos sin variable mantienen su valor
+
+        Args:
+            entorno: Variables a leer (por defecto os.environ)
+
+        Returns:
+            Configuración vigente
+
+        Raises:
+            ValueError: Si alguna variable no es válida
+        """
+        entorno = os.environ if entorno is None else entorno
+        por_defecto = ConfiguracionMotores()
+        cambios = {}
+        for campo, variable in VARIABLES_ENTORNO.items():
+            valor = entorno.get(variable, "").strip()
+            if not valor:
+                continue
+            if isinstance(getattr(por_defecto, campo), float):
+                try:
+                    cambios[campo] = float(valor)
+                except ValueError:
+                    raise ValueError(f"{variable} debe ser numérico: {valor}")
+            else:
+                cambios[campo] = valor
+        return cls.configurar(**cambios)
+
+    @classmethod
+    def get_configuracion(cls) -> ConfiguracionMotores:
+        """Configuración vigente"""
+        return cls._configuracion
+
+    @classmethod
+    def muestrear_sombra(cls) -> Optional[ConfiguracionMotores]:
+        """
+        Decide si una cotización entra en la muestra del modo sombra
+
+        Returns:
+            La configuración vigente si hay que comparar, None si no
+        """
+        configuracion = cls._configuracion
+        if (
+            configuracion.candidato is None
+            or configuracion.candidato == configuracion.motor
+            or configuracion.muestra_sombra <= 0.0
+        ):
+            return None
+        if cls._aleatorio.random() >= configuracion.muestra_sombra:
+            return None
+        return configuracion
+
+
+RegistroMotores.registrar("referencia", MotorReferencia)
+RegistroMotores.registrar("automatico", _motor_proyeccion_vectorizada("automatico"))
+RegistroMotores.registrar("fusionado", _motor_proyeccion_vectorizada("escalar"))
+RegistroMotores.registrar("vectorizado", _motor_proyeccion_vectorizada("vectorizado"))
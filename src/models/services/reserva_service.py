@@ -37,6 +37,10 @@ class ReservaService:
             porcentaje_devolucion=porcentaje_devolucion,
         )
 
+    def asignar_prima(self, prima: float):
+        self.prima = prima
+        self.reserva.asignar_prima(prima)
+
     def calcular_rescate(self):
         return self.reserva.calcular_rescate()
 
@@ -74,6 +78,17 @@ class ReservaService:
             vivos_inicio, rescate, flujo_pasivo, tasa_interes_mensual
         )
 
+    def calcular_componentes_saldo_reserva(
+        self,
+        vivos_inicio: List[float],
+        rescate: List[float],
+        flujo_pasivo: List[float],
+        tasa_interes_mensual: float,
+    ):
+        return self.reserva.calcular_componentes_saldo_reserva(
+            vivos_inicio, rescate, flujo_pasivo, tasa_interes_mensual
+        )
+
     def calcular_moce(
         self,
         tasa_costo_capital_mensual: float,
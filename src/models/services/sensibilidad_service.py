@@ -0,0 +1,314 @@
+from typing import Any, Dict, List, Sequence
+import numpy as np
+from src.models.services.expuestos_mes_service import ExpuestosMesService
+from src.models.services.flujo_resultado_service import FlujoResultadoService
+from src.models.services.reserva_service import ReservaService
+from src.models.services.parametros_calculados_service import (
+    ParametrosCalculadosService,
+)
+from src.models.services.proyeccion_vectorizada_service import PRIMA_UNITARIA
+from src.models.services.goal_seek_service import GoalSeekService
+from src.models.domain.choque_supuesto import ChoqueSupuesto
+from src.models.domain.curva_tasas_interes import CurvaTasasInteres
+from src.models.domain.expuestos_mes_domain import ExpuestosMesDomain
+from src.models.domain.proyeccion_variantes_domain import ProyeccionVariantesDomain
+from src.models.domain.proyeccion_vectorizada_domain import ProyeccionVectorizadaDomain
+from src.models.domain.sensibilidad_domain import SensibilidadDomain
+from src.common.producto import Producto
+
+# Tasas de los parámetros calculados que cambian con la curva de interés
+TASAS_ESCENARIO = (
+    "tasa_interes_mensual",
+    "tir_mensual",
+    "reserva",
+    "tasa_inversion",
+    "tasa_costo_capital_mes",
+)
+
+
+class SensibilidadService:
+    """
+    Análisis de sensibilidad de la prima de equilibrio ante choques de supuestos
+    (mortalidad, caducidad, tasa de interés y gastos).
+
+    Por cobertura, el escenario base y todos los escenarios chocados se apilan como
+    filas del motor vectorizado: los decrementos se recorren una sola vez para todas
+    las filas y la prima de equilibrio de cada escenario sale de los mismos barridos.
+    """
+
+    def __init__(self, producto: Producto = Producto.ENDOSOS):
+        self.producto = producto
+        self.expuestos_mes_domain = ExpuestosMesDomain()
+        self.sensibilidad_domain = SensibilidadDomain()
+        self.parametros_calculados_service = ParametrosCalculadosService()
+
+    def execute(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        curva_tasas_interes: CurvaTasasInteres,
+        choques: Sequence[ChoqueSupuesto],
+    ) -> Dict[str, Any]:
+        """
+        Evalúa todos los choques y arma la tabla tornado por cobertura y del total
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            parametros_almacenados: Parámetros almacenados
+            parametros_calculados: Parámetros calculados del escenario base
+            curva_tasas_interes: Curva base (los choques de tasa la desplazan)
+            choques: Choques a evaluar
+
+        Returns:
+            Diccionario con la prima base, los escenarios y el tornado de cada
+            cobertura y de la suma de coberturas
+        """
+        choques = list(choques)
+        coberturas = {}
+        for cobertura in parametros_almacenados.get("coberturas", {}):
+            print(f"\n📊 Sensibilidad de {cobertura.upper()}: {len(choques)} choques")
+            motor = self._motor_escenarios(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                curva_tasas_interes,
+                cobertura,
+                choques,
+            )
+            filas = len(choques) + 1
+            solucion = GoalSeekService(modo="vectorizado").execute_filas(
+                motor.calcular_vna, filas
+            )
+            primas = solucion["primas"]
+            prima_base = None if np.isnan(primas[0]) else float(primas[0])
+
+            # VNA de cada escenario cobrando la prima de equilibrio base
+            vnas_prima_base = np.full(filas, np.nan)
+            if prima_base is not None:
+                vnas_prima_base = motor.calcular_vna(np.full((filas, 1), prima_base))[
+                    :, 0
+                ]
+
+            coberturas[cobertura] = {
+                "prima_base": prima_base,
+                "vna_base": float(solucion["vnas"][0]),
+                "primas": primas[1:],
+                "vnas_prima_base": vnas_prima_base[1:],
+                "barridos": solucion["iteraciones"],
+                "convergio": bool(np.all(~np.isnan(primas))),
+            }
+
+        return {
+            "coberturas": {
+                cobertura: self._resultado(
+                    choques, r["prima_base"], r["primas"], r["vnas_prima_base"]
+                )
+                for cobertura, r in coberturas.items()
+            },
+            "total": self._resultado(
+                choques,
+                None
+                if any(r["prima_base"] is None for r in coberturas.values())
+                else sum(r["prima_base"] for r in coberturas.values()),
+                np.sum([r["primas"] for r in coberturas.values()], axis=0),
+                np.sum([r["vnas_prima_base"] for r in coberturas.values()], axis=0),
+            ),
+            "diagnostico": {
+                cobertura: {
+                    "barridos": r["barridos"],
+                    "convergio": r["convergio"],
+                    "vna_base": r["vna_base"],
+                }
+                for cobertura, r in coberturas.items()
+            },
+        }
+
+    def _resultado(
+        self,
+        choques: Sequence[ChoqueSupuesto],
+        prima_base: Any,
+        primas: np.ndarray,
+        vnas_prima_base: np.ndarray,
+    ) -> Dict[str, Any]:
+        """Escenarios y tornado de una cobertura (o del total)"""
+        escenarios = self.sensibilidad_domain.construir_escenarios(
+            choques, prima_base, primas, vnas_prima_base
+        )
+        return {
+            "prima_base": prima_base,
+            "escenarios": escenarios,
+            "tornado": self.sensibilidad_domain.construir_tornado(escenarios),
+        }
+
+    def _motor_escenarios(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        curva_tasas_interes: CurvaTasasInteres,
+        cobertura: str,
+        choques: List[ChoqueSupuesto],
+    ) -> ProyeccionVectorizadaDomain:
+        """
+        Motor vectorizado con una fila por escenario: la base en la fila 0 y luego
+        cada choque en orden
+
+        Returns:
+            Motor cuyo calcular_vna recibe una matriz (escenario, k) de primas
+        """
+        periodo_vigencia = parametros_entrada.get("periodo_vigencia", 1)
+        edad_actuarial = parametros_entrada.get("edad_actuarial", 1)
+        suma_asegurada = parametros_entrada.get("suma_asegurada", 1)
+        porcentaje_devolucion = parametros_entrada.get("porcentaje_devolucion")
+        periodo_pago_primas = parametros_entrada.get("periodo_pago_primas", 1)
+        frecuencia_pago_primas = parametros_entrada.get(
+            "frecuencia_pago_primas", "MENSUAL"
+        )
+        sexo = parametros_entrada.get("sexo", "M")
+        fumador = parametros_entrada.get("fumador", False)
+
+        cobertura_params = parametros_almacenados["coberturas"][cobertura]
+        fraccionamiento_primas = cobertura_params.get("fraccionamiento_primas")
+
+        factores_mortalidad = np.array(
+            [1.0] + [choque.factor_mortalidad for choque in choques]
+        )[:, None]
+        factores_caducidad = np.array(
+            [1.0] + [choque.factor_caducidad for choque in choques]
+        )[:, None]
+        factores_gastos = [1.0] + [choque.factor_gastos for choque in choques]
+        puntos_basicos = [0.0] + [choque.puntos_basicos for choque in choques]
+
+        # Decrementos de todos los escenarios en una sola recursión
+        expuestos_mes = ExpuestosMesService(
+            producto=self.producto,
+            periodo_vigencia=periodo_vigencia,
+            edad_actuarial=edad_actuarial,
+            sexo=sexo,
+            fumador=fumador,
+            cobertura=cobertura,
+        ).calcular_expuestos_mes()
+        mortalidad_ajustada = np.array(
+            [expuestos_mes[mes]["mortalidad_ajustada"] for mes in expuestos_mes]
+        )
+        caducidad_mensual = np.array(
+            [expuestos_mes[mes]["caducidad_mensual"] for mes in expuestos_mes]
+        )
+        vivos_inicio, fallecidos, caducados = (
+            self.expuestos_mes_domain.calcular_decrementos_escenarios(
+                mortalidad_ajustada * factores_mortalidad,
+                np.clip(caducidad_mensual * factores_caducidad, 0.0, 1.0),
+            )
+        )
+
+        flujo_resultado_service = FlujoResultadoService(
+            producto=self.producto,
+            cobertura=cobertura,
+            suma_asegurada=suma_asegurada,
+            edad_actuarial=edad_actuarial,
+            periodo_vigencia=periodo_vigencia,
+            prima=0.0,
+            fraccionamiento_primas=fraccionamiento_primas,
+            porcentaje_devolucion=porcentaje_devolucion,
+        )
+        # El rescate no depende de los supuestos chocados: una fila por meses por
+        # prima, como en el motor de variantes (el dominio la lleva a las cuotas
+        # de la frecuencia)
+        rescates = {
+            prima: ReservaService(
+                producto=self.producto,
+                cobertura=cobertura,
+                periodo_vigencia=periodo_vigencia,
+                prima=prima,
+                fraccionamiento_primas=fraccionamiento_primas,
+                porcentaje_devolucion=porcentaje_devolucion,
+            ).calcular_rescate()
+            for prima in (0.0, PRIMA_UNITARIA)
+        }
+
+        # Parámetros calculados por desplazamiento de la curva
+        calculados_por_desplazamiento = {
+            0.0: parametros_calculados["coberturas"][cobertura]
+        }
+        for desplazamiento in set(puntos_basicos) - {0.0}:
+            calculados_por_desplazamiento[desplazamiento] = (
+                self.parametros_calculados_service.get_parametros_calculados(
+                    parametros_entrada,
+                    cobertura_params,
+                    curva_tasas_interes.desplazar(desplazamiento),
+                    self.producto,
+                    cobertura,
+                )
+            )
+
+        proyecciones = ([], [])
+        for fila, (factor_gastos, desplazamiento) in enumerate(
+            zip(factores_gastos, puntos_basicos)
+        ):
+            cobertura_calculados = calculados_por_desplazamiento[desplazamiento]
+            escenario = ProyeccionVariantesDomain(
+                frecuencias_pago_primas=[frecuencia_pago_primas],
+                fumadores=[fumador],
+                asistencias=[bool(cobertura_params.get("tiene_asistencia"))],
+                vivos_inicio=vivos_inicio[fila : fila + 1],
+                caducados=caducados[fila : fila + 1],
+                siniestros=np.array(
+                    [
+                        flujo_resultado_service.calcular_siniestros(
+                            fallecidos[fila].tolist(), vivos_inicio[fila].tolist()
+                        )
+                    ],
+                    dtype=float,
+                ),
+                periodo_pago_primas=periodo_pago_primas,
+                periodo_vigencia=periodo_vigencia,
+                fraccionamiento_primas=fraccionamiento_primas,
+                mantenimiento_poliza=cobertura_calculados.get(
+                    "calcular_mantenimiento_poliza", 0
+                )
+                * factor_gastos,
+                moneda=cobertura_params.get("moneda"),
+                valor_dolar=cobertura_params.get("valor_dolar") * factor_gastos,
+                valor_soles=cobertura_params.get("valor_soles") * factor_gastos,
+                costo_mensual_asistencia_funeraria=cobertura_params.get(
+                    "costo_mensual_asistencia_funeraria"
+                )
+                * factor_gastos,
+                inflacion_mensual=cobertura_calculados.get("inflacion_mensual"),
+                gasto_adquisicion=cobertura_params.get("gasto_adquisicion")
+                * factor_gastos,
+                comision=cobertura_params.get("comision"),
+            )
+            for proyeccion, prima in zip(proyecciones, (0.0, PRIMA_UNITARIA)):
+                proyeccion.append(
+                    escenario.calcular_flujos_afines(prima, [rescates[prima]])
+                )
+
+        def apilar(filas: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+            apiladas = {
+                nombre: np.concatenate([f[nombre] for f in filas])
+                for nombre in filas[0]
+                if nombre != "gastos_adquisicion"
+            }
+            apiladas["gastos_adquisicion"] = np.array(
+                [f["gastos_adquisicion"] for f in filas]
+            )
+            return apiladas
+
+        calculados_filas = [
+            calculados_por_desplazamiento[desplazamiento]
+            for desplazamiento in puntos_basicos
+        ]
+        tasas = {
+            nombre: np.array([c.get(nombre) for c in calculados_filas], dtype=float)
+            for nombre in TASAS_ESCENARIO
+        }
+        return ProyeccionVectorizadaDomain(
+            proyeccion_base=apilar(proyecciones[0]),
+            proyeccion_unitaria=apilar(proyecciones[1]),
+            prima_unitaria=PRIMA_UNITARIA,
+            margen_solvencia=cobertura_params.get("margen_solvencia"),
+            impuesto_renta=cobertura_params.get("impuesto_renta"),
+            **tasas,
+        )
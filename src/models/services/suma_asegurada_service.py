@@ -0,0 +1,168 @@
+from typing import Dict, Any, List, Optional, Set
+import threading
+from src.models.domain.suma_asegurada_domain import SumaAseguradaDomain
+from src.models.domain.descomposicion_suma_asegurada import (
+    DescomposicionSumaAsegurada,
+)
+from src.infrastructure.repositories import supuestos_repository
+from src.helpers.clave_estable import clave_estable
+
+# Máximo de perfiles con descomposición en caché antes de reiniciarla
+MAX_PERFILES_CACHE = 4096
+# Tramos guardados por perfil (cada tramo cubre un rango de SA sin cambio de ramas)
+MAX_TRAMOS_POR_PERFIL = 8
+
+
+class SumaAseguradaService:
+    """
+    Servicio que orquesta la resolución inversa: la suma_asegurada que corresponde
+    a una prima mensual objetivo del cliente.
+
+    Guarda además, por perfil y cobertura, la descomposición prima(SA) = a + b * SA
+    para responder cambios de suma asegurada sin volver a proyectar. La
+    descomposición cuesta varias proyecciones, así que solo se construye desde la
+    segunda cotización del perfil: una cotización aislada no la paga.
+    """
+
+    # Caché compartida entre instancias: {perfil: [tramos]}
+    _descomposiciones: Dict[str, List[DescomposicionSumaAsegurada]] = {}
+    # Perfiles cotizados una vez, aún sin descomposición
+    _perfiles_cotizados: Set[str] = set()
+    _cache_lock = threading.Lock()
+
+    def __init__(self):
+        self.suma_asegurada_domain = SumaAseguradaDomain()
+
+    def execute(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        prima_objetivo: float,
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la resolución de la suma asegurada.
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            parametros_almacenados: Parámetros almacenados
+            parametros_calculados: Parámetros calculados
+            prima_objetivo: Prima mensual objetivo (primas_cliente.mensual)
+
+        Returns:
+            Diccionario con la suma asegurada, primas por cobertura y diagnóstico
+        """
+        return self.suma_asegurada_domain.execute_suma_asegurada(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            prima_objetivo,
+        )
+
+    def get_prima_descomposicion(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        cobertura: str,
+    ) -> Optional[float]:
+        """
+        Obtiene la prima de equilibrio desde la descomposición cacheada del perfil,
+        solo si la suma asegurada cae dentro de un tramo sin cambio de ramas.
+
+        Returns:
+            Prima de equilibrio o None si no hay un tramo válido
+        """
+        clave = self._clave_perfil(parametros_entrada, parametros_almacenados, cobertura)
+        suma_asegurada = parametros_entrada.get("suma_asegurada")
+        if suma_asegurada is None:
+            return None
+
+        for descomposicion in self._descomposiciones.get(clave, ()):
+            if descomposicion.contiene(suma_asegurada):
+                return descomposicion.prima(suma_asegurada)
+        return None
+
+    def registrar_descomposicion(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        prima: float,
+    ) -> Optional[DescomposicionSumaAsegurada]:
+        """
+        Construye y guarda la descomposición del perfil alrededor de una prima ya
+        resuelta para la suma asegurada de parametros_entrada. La primera
+        cotización del perfil solo queda anotada; la descomposición se construye
+        en la siguiente.
+
+        Returns:
+            La descomposición guardada, o None si es la primera cotización del
+            perfil o el punto está sobre un quiebre
+        """
+        clave = self._clave_perfil(parametros_entrada, parametros_almacenados, cobertura)
+        suma_asegurada = parametros_entrada.get("suma_asegurada")
+        if not suma_asegurada:
+            return None
+
+        with self._cache_lock:
+            if clave not in self._perfiles_cotizados:
+                if len(self._perfiles_cotizados) >= MAX_PERFILES_CACHE:
+                    self._perfiles_cotizados.clear()
+                self._perfiles_cotizados.add(clave)
+                return None
+
+        descomposicion = self.suma_asegurada_domain.construir_descomposicion(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            cobertura,
+            prima,
+            suma_asegurada,
+        )
+        if descomposicion is None:
+            return None
+
+        with self._cache_lock:
+            if clave not in self._descomposiciones and (
+                len(self._descomposiciones) >= MAX_PERFILES_CACHE
+            ):
+                self._descomposiciones.clear()
+            tramos = self._descomposiciones.get(clave, [])
+            # Lista nueva para no alterar la que pueda estar leyendo otro hilo
+            self._descomposiciones[clave] = (tramos + [descomposicion])[
+                -MAX_TRAMOS_POR_PERFIL:
+            ]
+
+        return descomposicion
+
+    def _clave_perfil(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        cobertura: str,
+    ) -> str:
+        """
+        Clave del perfil: todo lo que define la proyección salvo la suma asegurada
+        y la prima, más la versión de los supuestos
+        """
+        parametros_cobertura = parametros_almacenados.get("coberturas", {}).get(
+            cobertura, {}
+        )
+        return clave_estable(
+            cobertura,
+            supuestos_repository.get_version(),
+            {
+                k: v
+                for k, v in parametros_entrada.items()
+                if k not in ("suma_asegurada", "coberturas")
+            },
+            {k: v for k, v in parametros_cobertura.items() if k != "prima_asignada"},
+        )
+
+    @classmethod
+    def limpiar_cache(cls):
+        """Limpia las descomposiciones cacheadas"""
+        with cls._cache_lock:
+            cls._descomposiciones.clear()
+            cls._perfiles_cotizados.clear()
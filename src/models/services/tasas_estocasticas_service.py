@@ -0,0 +1,235 @@
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+from src.models.services.proyeccion_variantes_service import ProyeccionVariantesService
+from src.models.services.proyeccion_vectorizada_service import PRIMA_UNITARIA
+from src.models.services.goal_seek_service import GoalSeekService
+from src.models.domain.proyeccion_vectorizada_domain import ProyeccionVectorizadaDomain
+from src.models.domain.tasas_estocasticas_domain import (
+    TasasEstocasticasDomain,
+    PERCENTILES_POR_DEFECTO,
+)
+from src.common.producto import Producto
+
+# Escenarios evaluados por llamada al motor vectorizado (acota la memoria)
+ESCENARIOS_POR_BLOQUE = 500
+
+
+class TasasEstocasticasService:
+    """
+    Valoración Monte Carlo con tasas de interés estocásticas.
+
+    Cada escenario es una trayectoria mensual de la tasa corta que reemplaza a la
+    tasa de inversión determinística; la tasa de descuento de reservas y la de
+    costo de capital del VNA se mueven con el mismo exceso de retorno mensual
+    ((1 + r(t)) / (1 + r0)) ** (1 / 12). Los flujos afines no dependen de la tasa y
+    se proyectan una sola vez; los escenarios son filas (escenario, mes) del motor
+    vectorizado, evaluadas por bloques.
+    """
+
+    def __init__(
+        self,
+        tasas_estocasticas_domain: TasasEstocasticasDomain,
+        escenarios: int,
+        percentiles: Sequence[float] = PERCENTILES_POR_DEFECTO,
+        calcular_prima_equilibrio: bool = True,
+        escenarios_por_bloque: int = ESCENARIOS_POR_BLOQUE,
+        producto: Producto = Producto.ENDOSOS,
+    ):
+        """
+        Args:
+            tasas_estocasticas_domain: Modelo de tasa corta con su semilla
+            escenarios: Cantidad de trayectorias
+            percentiles: Percentiles a reportar (0 a 100)
+            calcular_prima_equilibrio: Si además del VNA con la prima
+                determinística se resuelve la prima de equilibrio por escenario
+            escenarios_por_bloque: Filas por llamada al motor vectorizado
+        """
+        self.tasas_estocasticas_domain = tasas_estocasticas_domain
+        self.escenarios = escenarios
+        self.percentiles = list(percentiles)
+        self.calcular_prima_equilibrio = calcular_prima_equilibrio
+        self.escenarios_por_bloque = escenarios_por_bloque
+        self.producto = producto
+
+    def execute(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Simula las trayectorias y resume el VNA y la prima de equilibrio
+
+        Args:
+            parametros_entrada: Parámetros de entrada del usuario
+            parametros_almacenados: Parámetros almacenados
+            parametros_calculados: Parámetros calculados determinísticos
+
+        Returns:
+            Diccionario con la distribución por cobertura y la del total
+        """
+        coberturas = {}
+        for cobertura in parametros_almacenados.get("coberturas", {}):
+            print(
+                f"\n🎲 Escenarios estocásticos de {cobertura.upper()}: "
+                f"{self.escenarios} trayectorias"
+            )
+            coberturas[cobertura] = self._simular_cobertura(
+                parametros_entrada,
+                parametros_almacenados,
+                parametros_calculados,
+                cobertura,
+            )
+
+        resumir = self.tasas_estocasticas_domain.resumir
+        resultado = {
+            "coberturas": {
+                cobertura: {
+                    "prima_deterministica": r["prima_deterministica"],
+                    "tasa_inversion_inicial": r["tasa_inicial"],
+                    "vna_prima_deterministica": resumir(
+                        r["vnas"], self.percentiles
+                    ),
+                    "prima_equilibrio": (
+                        resumir(r["primas"], self.percentiles)
+                        if r["primas"] is not None
+                        else None
+                    ),
+                    "escenarios_sin_solucion": (
+                        int(np.isnan(r["primas"]).sum())
+                        if r["primas"] is not None
+                        else None
+                    ),
+                }
+                for cobertura, r in coberturas.items()
+            },
+        }
+
+        # Las coberturas comparten los choques, así que el total se arma por escenario
+        resultado["total"] = {
+            "prima_deterministica": sum(
+                r["prima_deterministica"] for r in coberturas.values()
+            ),
+            "vna_prima_deterministica": resumir(
+                np.sum([r["vnas"] for r in coberturas.values()], axis=0),
+                self.percentiles,
+            ),
+            "prima_equilibrio": (
+                resumir(
+                    np.sum([r["primas"] for r in coberturas.values()], axis=0),
+                    self.percentiles,
+                )
+                if self.calcular_prima_equilibrio
+                else None
+            ),
+        }
+        return resultado
+
+    def _simular_cobertura(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+    ) -> Dict[str, Any]:
+        """VNAs y primas de equilibrio (escenario,) de una cobertura"""
+        cobertura_params = parametros_almacenados["coberturas"][cobertura]
+        cobertura_calculados = parametros_calculados["coberturas"][cobertura]
+
+        variantes = ProyeccionVariantesService(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            self.producto,
+            parametros_entrada.get("sexo", "M"),
+            cobertura,
+            frecuencias_pago_primas=[
+                parametros_entrada.get("frecuencia_pago_primas", "MENSUAL")
+            ],
+            fumadores=[parametros_entrada.get("fumador", False)],
+        )
+
+        # Prima de equilibrio determinística como referencia del VNA
+        prima_deterministica = self._resolver(variantes.calcular_vna, 1)[0]
+        if np.isnan(prima_deterministica):
+            raise ValueError(
+                f"La cobertura {cobertura} no tiene prima de equilibrio determinística"
+            )
+        prima_deterministica = float(prima_deterministica)
+
+        meses = variantes.proyeccion_base["vivos_inicio"].shape[-1]
+        tasa_inicial = cobertura_calculados.get("tasa_inversion")
+        choques = self.tasas_estocasticas_domain.generar_choques(self.escenarios, meses)
+        trayectorias = self.tasas_estocasticas_domain.generar_trayectorias(
+            tasa_inicial, choques
+        )
+        exceso_mensual = ((1 + trayectorias) / (1 + tasa_inicial)) ** (1 / 12)
+        tasa_interes_mensual = (
+            1 + cobertura_calculados.get("tasa_interes_mensual")
+        ) * exceso_mensual - 1
+        tasa_costo_capital_mes = (
+            1 + cobertura_calculados.get("tasa_costo_capital_mes")
+        ) * exceso_mensual - 1
+
+        vnas = np.empty(self.escenarios)
+        primas = (
+            np.empty(self.escenarios) if self.calcular_prima_equilibrio else None
+        )
+        for inicio in range(0, self.escenarios, self.escenarios_por_bloque):
+            bloque = slice(inicio, min(inicio + self.escenarios_por_bloque, self.escenarios))
+            filas = bloque.stop - bloque.start
+            motor = ProyeccionVectorizadaDomain(
+                proyeccion_base=self._replicar(variantes.proyeccion_base, filas),
+                proyeccion_unitaria=self._replicar(
+                    variantes.proyeccion_unitaria, filas
+                ),
+                prima_unitaria=PRIMA_UNITARIA,
+                tasa_interes_mensual=tasa_interes_mensual[bloque],
+                tir_mensual=cobertura_calculados.get("tir_mensual"),
+                margen_solvencia=cobertura_params.get("margen_solvencia"),
+                reserva=cobertura_calculados.get("reserva"),
+                tasa_inversion=trayectorias[bloque],
+                impuesto_renta=cobertura_params.get("impuesto_renta"),
+                tasa_costo_capital_mes=tasa_costo_capital_mes[bloque],
+            )
+            vnas[bloque] = motor.calcular_vna(
+                np.full((filas, 1), prima_deterministica)
+            )[:, 0]
+            if primas is not None:
+                primas[bloque] = self._resolver(
+                    motor.calcular_vna, filas, np.full(filas, prima_deterministica)
+                )
+
+        return {
+            "prima_deterministica": prima_deterministica,
+            "tasa_inicial": tasa_inicial,
+            "vnas": vnas,
+            "primas": primas,
+        }
+
+    def _resolver(
+        self,
+        calcular_vna,
+        filas: int,
+        primas_iniciales: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Prima de equilibrio por fila con el Goal Seek; desde la prima determinística
+        la secante converge en pocas llamadas porque el VNA es casi lineal en la prima
+        """
+        return GoalSeekService(modo="vectorizado").execute_filas(
+            calcular_vna, filas, primas_iniciales
+        )["primas"]
+
+    def _replicar(
+        self, proyeccion: Dict[str, Any], filas: int
+    ) -> Dict[str, Any]:
+        """Repite la única variante de la proyección en una fila por escenario"""
+        return {
+            nombre: (
+                np.broadcast_to(valores, (filas, valores.shape[-1]))
+                if np.ndim(valores)
+                else valores
+            )
+            for nombre, valores in proyeccion.items()
+        }
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+from src.models.services.proyeccion_variantes_service import ProyeccionVariantesService
+from src.models.domain.valoracion_cartera_domain import ValoracionCarteraDomain
+from src.common.producto import Producto
+from src.utils.presupuesto_memoria import filas_por_presupuesto
+
+# Memoria por defecto para las matrices de una llamada al motor vectorizado
+PRESUPUESTO_MEMORIA_MB = 512
+
+
+class ValoracionCarteraService:
+    """
+    Valoración de pólizas en vigor de un mismo perfil de emisión y cobertura.
+
+    Los flujos afines del perfil se proyectan una sola vez; cada póliza es una fila
+    (póliza, mes) del motor vectorizado con su prima pactada, de la que se toman la
+    reserva en su mes de póliza y los flujos remanentes. Las pólizas por llamada
+    se derivan del presupuesto de memoria y de los meses del perfil.
+    """
+
+    def __init__(
+        self,
+        producto: Producto = Producto.ENDOSOS,
+        presupuesto_memoria_mb: float = PRESUPUESTO_MEMORIA_MB,
+        polizas_por_llamada: Optional[int] = None,
+    ):
+        """
+        Args:
+            producto: Producto valorado
+            presupuesto_memoria_mb: Memoria para las matrices de una llamada
+            polizas_por_llamada: Pólizas por llamada (por defecto según el
+                presupuesto de memoria)
+        """
+        self.producto = producto
+        self.presupuesto_memoria_mb = presupuesto_memoria_mb
+        self.polizas_por_llamada = polizas_por_llamada
+        self.valoracion_cartera_domain = ValoracionCarteraDomain()
+
+    def valorar_perfil(
+        self,
+        parametros_entrada: Dict[str, Any],
+        parametros_almacenados: Dict[str, Any],
+        parametros_calculados: Dict[str, Any],
+        cobertura: str,
+        primas: Sequence[float],
+        meses_poliza: Sequence[int],
+        matrices_flujos: Optional[Dict[str, np.ndarray]] = None,
+        filas_matrices: Optional[Sequence[int]] = None,
+        pesos: Optional[Sequence[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Reservas por póliza y flujos remanentes agregados de una cobertura
+
+        Args:
+            parametros_entrada: Parámetros de emisión del perfil
+            parametros_almacenados: Parámetros almacenados
+            parametros_calculados: Parámetros calculados del perfil
+            cobertura: Cobertura a valorar
+            primas: Prima asignada pactada de cada póliza
+            meses_poliza: Meses transcurridos de cada póliza
+            matrices_flujos: Matrices (póliza, mes de valoración) por flujo, por
+                ejemplo en disco, donde se suman los flujos remanentes de cada
+                póliza en lugar de agregarlos en memoria
+            filas_matrices: Fila de cada póliza en matrices_flujos
+            pesos: Pólizas que representa cada fila en los flujos agregados (por
+                ejemplo un punto modelo); por defecto una
+
+        Returns:
+            Diccionario con "meses_vigencia", "reservas" (vectores por póliza) y
+            "flujos" (vectores por mes de valoración; vacío si se escribieron
+            en matrices_flujos)
+        """
+        primas = np.asarray(primas, dtype=float)
+        meses_poliza = np.asarray(meses_poliza, dtype=int)
+        if matrices_flujos is not None:
+            filas_matrices = np.asarray(filas_matrices, dtype=int)
+        if pesos is not None:
+            pesos = np.asarray(pesos, dtype=float)
+
+        motor = ProyeccionVariantesService(
+            parametros_entrada,
+            parametros_almacenados,
+            parametros_calculados,
+            self.producto,
+            parametros_entrada.get("sexo", "M"),
+            cobertura,
+            frecuencias_pago_primas=[
+                parametros_entrada.get("frecuencia_pago_primas", "MENSUAL")
+            ],
+            fumadores=[parametros_entrada.get("fumador", False)],
+        )
+        vivos_inicio = motor.proyeccion_base["vivos_inicio"][0]
+        polizas_por_llamada = self.polizas_por_llamada or filas_por_presupuesto(
+            self.presupuesto_memoria_mb, vivos_inicio.shape[-1]
+        )
+
+        reservas = {}
+        flujos_agregados = {}
+        for inicio in range(0, primas.size, polizas_por_llamada):
+            tramo = slice(inicio, inicio + polizas_por_llamada)
+            # (1, póliza, mes) -> (póliza, mes)
+            flujos = {
+                nombre: valores[0]
+                for nombre, valores in motor.calcular_flujos(primas[None, tramo]).items()
+                if np.ndim(valores) == 3
+            }
+            for nombre, valores in self.valoracion_cartera_domain.calcular_reservas(
+                flujos, vivos_inicio, meses_poliza[tramo]
+            ).items():
+                reservas.setdefault(nombre, []).append(valores)
+            if matrices_flujos is not None:
+                alineados = self.valoracion_cartera_domain.alinear_flujos_remanentes(
+                    flujos, vivos_inicio, meses_poliza[tramo]
+                )
+                filas = filas_matrices[tramo]
+                for nombre, valores in alineados.items():
+                    # Las coberturas de una póliza se suman en la misma fila
+                    matrices_flujos[nombre][filas, : valores.shape[1]] += valores
+            else:
+                flujos_agregados = self.valoracion_cartera_domain.acumular(
+                    flujos_agregados,
+                    self.valoracion_cartera_domain.agregar_flujos_remanentes(
+                        flujos,
+                        vivos_inicio,
+                        meses_poliza[tramo],
+                        pesos[tramo] if pesos is not None else None,
+                    ),
+                )
+
+        return {
+            "meses_vigencia": vivos_inicio.shape[-1],
+            "reservas": {
+                nombre: np.concatenate(valores) for nombre, valores in reservas.items()
+            },
+            "flujos": flujos_agregados,
+        }
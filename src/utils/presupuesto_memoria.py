@@ -0,0 +1,11 @@
+# Bytes de memoria por póliza y mes en la proyección vectorizada de una cobertura
+# (unas 24 matrices float64 vivas a la vez, medido en el pico de calcular_flujos)
+BYTES_POR_POLIZA_MES = 192
+
+
+def filas_por_presupuesto(
+    presupuesto_mb: float, meses: int, bytes_por_poliza_mes: int = BYTES_POR_POLIZA_MES
+) -> int:
+    """Obtiene cuántas pólizas de meses meses caben en el presupuesto de memoria"""
+    bytes_por_poliza = max(1, meses) * bytes_por_poliza_mes
+    return max(1, int(presupuesto_mb * 1024 * 1024 // bytes_por_poliza))
@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+URL_MATRIZ = "/api/v1/productos/cotizar/matriz"
+
+
+def test_plazo_sin_tasa_solo_invalida_sus_celdas():
+    parametros = {
+        "edad_actuarial": [30],
+        "periodo_vigencia": [10],
+        # El periodo de pago 5 no tiene tasa
+        "periodo_pago_primas": [5, 10],
+        "porcentaje_devolucion": [0],
+        "suma_asegurada": 50000,
+        "sexo": "M",
+    }
+    with TestClient(app) as cliente:
+        respuesta = cliente.post(
+            URL_MATRIZ, json={"producto": "endosos", "parametros": parametros}
+        )
+
+    assert respuesta.status_code == 200
+    celdas = {
+        celda["periodo_pago_primas"]: celda
+        for celda in respuesta.json()["data"]["celdas"]
+    }
+    assert "error" in celdas[5]
+    assert "error" not in celdas[10]
+    assert celdas[10]["primas_cliente"]["primas_frecuencializadas"]["mensual"] > 0
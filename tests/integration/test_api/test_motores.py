@@ -0,0 +1,80 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.interfaces.api.routes.cotizacion_router import VARIABLE_TOKEN_ADMIN
+from src.models.services.registro_motores import (
+    MOTOR_POR_DEFECTO,
+    ConfiguracionMotores,
+    RegistroMotores,
+    VARIABLES_ENTORNO,
+)
+
+URL_MOTORES = "/api/v1/productos/motores"
+
+
+@pytest.fixture(autouse=True)
+def configuracion_por_defecto(monkeypatch):
+    """Cada test arranca y termina con la configuración por defecto"""
+    for variable in [*VARIABLES_ENTORNO.values(), VARIABLE_TOKEN_ADMIN]:
+        monkeypatch.delenv(variable, raising=False)
+    RegistroMotores._configuracion = ConfiguracionMotores()
+    yield
+    RegistroMotores._configuracion = ConfiguracionMotores()
+
+
+def test_motor_por_defecto_es_referencia():
+    assert MOTOR_POR_DEFECTO == "referencia"
+    with TestClient(app) as cliente:
+        data = cliente.get(URL_MOTORES).json()["data"]
+    assert data["configuracion"]["motor"] == "referencia"
+    assert data["configuracion"]["candidato"] is None
+
+
+def test_configuracion_desde_entorno_al_arrancar(monkeypatch):
+    monkeypatch.setenv("COTIZADOR_MOTOR", "vectorizado")
+    monkeypatch.setenv("COTIZADOR_MOTOR_CANDIDATO", "referencia")
+    monkeypatch.setenv("COTIZADOR_MUESTRA_SOMBRA", "0.25")
+    with TestClient(app):
+        configuracion = RegistroMotores.get_configuracion()
+    assert configuracion.motor == "vectorizado"
+    assert configuracion.candidato == "referencia"
+    assert configuracion.muestra_sombra == 0.25
+
+
+def test_configuracion_desde_entorno_invalida():
+    with pytest.raises(ValueError):
+        RegistroMotores.configurar_desde_entorno({"COTIZADOR_MOTOR": "inexistente"})
+    with pytest.raises(ValueError):
+        RegistroMotores.configurar_desde_entorno({"COTIZADOR_MUESTRA_SOMBRA": "mucho"})
+    assert RegistroMotores.get_configuracion() == ConfiguracionMotores()
+
+
+def test_put_motores_deshabilitado_sin_token_configurado():
+    with TestClient(app) as cliente:
+        respuesta = cliente.put(
+            URL_MOTORES, json={"motor": "vectorizado"}, headers={"X-Admin-Token": "x"}
+        )
+    assert respuesta.status_code == 403
+    assert RegistroMotores.get_configuracion().motor == "referencia"
+
+
+def test_put_motores_exige_token(monkeypatch):
+    monkeypatch.setenv(VARIABLE_TOKEN_ADMIN, "secreto")
+    with TestClient(app) as cliente:
+        sin_token = cliente.put(URL_MOTORES, json={"motor": "vectorizado"})
+        token_invalido = cliente.put(
+            URL_MOTORES,
+            json={"motor": "vectorizado"},
+            headers={"X-Admin-Token": "otro"},
+        )
+        assert RegistroMotores.get_configuracion().motor == "referencia"
+        valido = cliente.put(
+            URL_MOTORES,
+            json={"motor": "vectorizado"},
+            headers={"X-Admin-Token": "secreto"},
+        )
+    assert sin_token.status_code == 401
+    assert token_invalido.status_code == 401
+    assert valido.status_code == 200
+    assert valido.json()["data"]["configuracion"]["motor"] == "vectorizado"
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.productos.endosos import cotizar_endosos
+
+URL_SENSIBILIDAD = "/api/v1/productos/cotizar/sensibilidad"
+
+PERFIL = {
+    "edad_actuarial": 40,
+    "periodo_vigencia": 15,
+    "periodo_pago_primas": 12,
+    "suma_asegurada": 100000,
+    "sexo": "M",
+    "porcentaje_devolucion": 100,
+}
+
+
+def test_sensibilidad_parte_de_la_prima_cotizada():
+    choques = [
+        {"tipo": "mortalidad", "valor": 0.1},
+        {"tipo": "mortalidad", "valor": -0.1},
+    ]
+    with TestClient(app) as cliente:
+        respuesta = cliente.post(
+            URL_SENSIBILIDAD,
+            json={"producto": "endosos", "parametros": {**PERFIL, "choques": choques}},
+        )
+
+    assert respuesta.status_code == 200
+    coberturas = respuesta.json()["data"]["coberturas"]
+    cotizacion = cotizar_endosos(
+        {**PERFIL, "coberturas": ["fallecimiento", "itp"]}
+    )["endosos"]["coberturas"]
+    for cobertura, resultado in coberturas.items():
+        assert resultado["prima_base"] == pytest.approx(
+            cotizacion[cobertura]["primas_frecuencializadas"]["mensual"], abs=1e-5
+        )
+
+    # Más mortalidad encarece el fallecimiento y menos lo abarata
+    (barra,) = coberturas["fallecimiento"]["tornado"]
+    assert barra["supuesto"] == "mortalidad"
+    assert barra["variacion_minima"] < 0 < barra["variacion_maxima"]
@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.productos.endosos import cotizar_endosos
+
+URL_VARIANTES = "/api/v1/productos/cotizar/variantes"
+
+PERFIL = {
+    "edad_actuarial": 35,
+    "periodo_vigencia": 15,
+    "periodo_pago_primas": 15,
+    "porcentaje_devolucion": 100,
+    "suma_asegurada": 100000,
+    "sexo": "M",
+}
+
+
+def _variantes(parametros):
+    with TestClient(app) as cliente:
+        respuesta = cliente.post(
+            URL_VARIANTES, json={"producto": "endosos", "parametros": parametros}
+        )
+    assert respuesta.status_code == 200
+    return respuesta.json()["data"]
+
+
+def test_cada_frecuencia_tiene_su_prima_de_equilibrio():
+    data = _variantes(PERFIL)
+
+    (cotizacion,) = data["cotizaciones"]
+    for cobertura, diagnostico in data["diagnostico"].items():
+        assert diagnostico["convergio"], cobertura
+        assert diagnostico["variantes_sin_prima"] == []
+        primas = cotizacion["coberturas"][cobertura]["primas_frecuencializadas"]
+        # Prima por cuota: más meses por cuota, cuota mayor
+        assert primas["mensual"] < primas["trimestral"] < primas["semestral"] < primas["anual"]
+        assert primas["anual"] < 12 * primas["mensual"]
+
+    # La variante mensual es la cotización estándar
+    exacta = cotizar_endosos(dict(PERFIL))["endosos"]["coberturas"]
+    for cobertura, primas in exacta.items():
+        assert cotizacion["coberturas"][cobertura]["primas_frecuencializadas"][
+            "mensual"
+        ] == pytest.approx(primas["primas_frecuencializadas"]["mensual"], abs=1e-5)
+
+
+def test_variante_sin_raiz_queda_fuera_de_los_totales():
+    # Devolución del 150% con diez años de pago: fallecimiento no tiene equilibrio
+    data = _variantes(
+        {**PERFIL, "periodo_pago_primas": 10, "porcentaje_devolucion": 150}
+    )
+
+    (cotizacion,) = data["cotizaciones"]
+    diagnostico = data["diagnostico"]["fallecimiento"]
+    assert not diagnostico["convergio"]
+    assert {v["frecuencia_pago_primas"] for v in diagnostico["variantes_sin_prima"]} == {
+        "MENSUAL", "TRIMESTRAL", "SEMESTRAL", "ANUAL"
+    }
+    primas = cotizacion["coberturas"]["fallecimiento"]["primas_frecuencializadas"]
+    assert set(primas.values()) == {None}
+    assert set(cotizacion["primas_cliente"]["primas_frecuencializadas"].values()) == {None}
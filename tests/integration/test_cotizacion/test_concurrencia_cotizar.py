@@ -0,0 +1,104 @@
+import itertools
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.models.domain.goal_seek_domain import GoalSeekDomain
+from src.models.productos.endosos import cotizar_endosos
+from src.models.services.suma_asegurada_service import SumaAseguradaService
+
+PETICIONES_CONCURRENTES = 300
+HILOS = 16
+
+# Tolerancia de la prima frente a la ejecución secuencial (la del Goal Seek)
+TOLERANCIA_PRIMA = 1e-6
+
+
+def _perfiles():
+    """Perfiles variados: sexo, edad, plazos, devolución, suma asegurada y coberturas"""
+    combinaciones = itertools.product(
+        ["M", "F"],
+        [25, 40, 55],
+        [(10, 10), (15, 12), (20, 20)],
+        [0, 100, 125],
+    )
+    aleatorio = random.Random(7)
+    perfiles = []
+    for sexo, edad, (vigencia, pago), devolucion in combinaciones:
+        perfiles.append(
+            {
+                "edad_actuarial": edad,
+                "periodo_vigencia": vigencia,
+                "periodo_pago_primas": pago,
+                "porcentaje_devolucion": devolucion,
+                "sexo": sexo,
+                "suma_asegurada": aleatorio.choice([50000, 100000, 250000]),
+                "coberturas": aleatorio.choice(
+                    [["fallecimiento", "itp"], ["fallecimiento"], ["itp"]]
+                ),
+            }
+        )
+    return perfiles
+
+
+def _primas(request_data):
+    """Primas por cobertura de una cotización (o el error si falla)"""
+    try:
+        respuesta = cotizar_endosos(dict(request_data))
+    except Exception as e:
+        return {"error": type(e).__name__}
+    return {
+        cobertura: datos["primas_frecuencializadas"]
+        for cobertura, datos in respuesta["endosos"]["coberturas"].items()
+    }
+
+
+def _limpiar_caches():
+    GoalSeekDomain.limpiar_indice_soluciones()
+    SumaAseguradaService.limpiar_cache()
+
+
+def _comparar(obtenido, esperado):
+    assert obtenido.keys() == esperado.keys()
+    for cobertura, primas in esperado.items():
+        if cobertura == "error":
+            assert obtenido[cobertura] == primas
+            continue
+        assert obtenido[cobertura].keys() == primas.keys()
+        for frecuencia, prima in primas.items():
+            assert obtenido[cobertura][frecuencia] == pytest.approx(
+                prima, abs=TOLERANCIA_PRIMA
+            ), (cobertura, frecuencia)
+
+
+def test_cotizar_concurrente_igual_a_secuencial():
+    perfiles = _perfiles()
+
+    _limpiar_caches()
+    esperados = [_primas(perfil) for perfil in perfiles]
+
+    # Cachés frías: los hilos se disputan también su construcción
+    _limpiar_caches()
+    aleatorio = random.Random(11)
+    indices = [
+        aleatorio.randrange(len(perfiles)) for _ in range(PETICIONES_CONCURRENTES)
+    ]
+    with ThreadPoolExecutor(max_workers=HILOS) as executor:
+        obtenidos = list(executor.map(lambda i: _primas(perfiles[i]), indices))
+
+    for indice, obtenido in zip(indices, obtenidos):
+        _comparar(obtenido, esperados[indice])
+
+
+def test_cotizar_no_depende_del_orden():
+    """La misma petición da la misma prima con el índice de soluciones frío o lleno"""
+    perfil = _perfiles()[10]
+
+    _limpiar_caches()
+    en_frio = _primas(perfil)
+
+    _limpiar_caches()
+    for vecino in _perfiles():
+        _primas(vecino)
+    assert _primas(perfil) == en_frio
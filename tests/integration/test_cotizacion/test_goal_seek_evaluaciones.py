@@ -0,0 +1,71 @@
+import pytest
+
+from src.models.domain.goal_seek_domain import GoalSeekDomain
+from src.models.productos.endosos import cotizar_endosos
+from src.models.services.calculo_actuarial_service import CalculoActuarialService
+from src.models.services.suma_asegurada_service import SumaAseguradaService
+
+PERFIL = {
+    "edad_actuarial": 40,
+    "periodo_vigencia": 15,
+    "periodo_pago_primas": 12,
+    "porcentaje_devolucion": 100,
+    "sexo": "M",
+    "suma_asegurada": 100000,
+    "coberturas": ["itp"],
+}
+
+
+@pytest.fixture
+def contador(monkeypatch):
+    """Cuenta las proyecciones escalares y las evaluaciones de VNA del Goal Seek"""
+    conteo = {"proyecciones": 0, "evaluaciones": 0}
+    execute = CalculoActuarialService.execute
+    calcular_vna_con_prima = GoalSeekDomain._calcular_vna_con_prima
+
+    def contar_proyeccion(self):
+        conteo["proyecciones"] += 1
+        return execute(self)
+
+    def contar_evaluacion(self, *args):
+        conteo["evaluaciones"] += 1
+        return calcular_vna_con_prima(self, *args)
+
+    monkeypatch.setattr(CalculoActuarialService, "execute", contar_proyeccion)
+    monkeypatch.setattr(GoalSeekDomain, "_calcular_vna_con_prima", contar_evaluacion)
+    GoalSeekDomain.limpiar_indice_soluciones()
+    SumaAseguradaService.limpiar_cache()
+    yield conteo
+    GoalSeekDomain.limpiar_indice_soluciones()
+    SumaAseguradaService.limpiar_cache()
+
+
+def _prima(request_data):
+    respuesta = cotizar_endosos(dict(request_data))
+    return respuesta["endosos"]["coberturas"]["itp"]["primas_frecuencializadas"][
+        "mensual"
+    ]
+
+
+def test_goal_seek_no_vuelve_a_proyectar_la_prima_optima(contador):
+    _prima(PERFIL)
+
+    assert contador["evaluaciones"] > 0
+    # La proyección de la respuesta es la de una evaluación del solver
+    assert contador["proyecciones"] == contador["evaluaciones"]
+
+
+def test_descomposicion_responde_sin_proyectar(contador):
+    # La segunda cotización del perfil construye la descomposición
+    _prima(PERFIL)
+    _prima(PERFIL)
+    otra_suma = {**PERFIL, "suma_asegurada": 110000}
+
+    contador.update(proyecciones=0, evaluaciones=0)
+    prima = _prima(otra_suma)
+
+    assert contador == {"proyecciones": 0, "evaluaciones": 0}
+
+    GoalSeekDomain.limpiar_indice_soluciones()
+    SumaAseguradaService.limpiar_cache()
+    assert prima == pytest.approx(_prima(otra_suma), abs=1e-6)
@@ -0,0 +1,119 @@
+import pytest
+
+from src.interfaces.batch.rejilla_indicativa import calibrar_error
+from src.infrastructure.repositories import (
+    rejilla_indicativa_repository,
+    supuestos_repository,
+)
+from src.models.productos.endosos import cotizar_endosos, cotizar_indicativa_endosos
+from src.models.productos.endosos.endosos import endosos_orchestrator
+from src.models.services.cotizacion_indicativa_service import (
+    ERROR_RELATIVO_MAXIMO,
+    CotizacionIndicativaService,
+)
+
+PERFIL = {
+    "edad_actuarial": 33,
+    "periodo_vigencia": 17,
+    "periodo_pago_primas": 12,
+    "porcentaje_devolucion": 110,
+    "suma_asegurada": 75000,
+    "sexo": "F",
+    "coberturas": ["fallecimiento", "itp"],
+}
+
+
+@pytest.fixture(autouse=True)
+def rejilla_limpia():
+    """Cada test lee la rejilla del repositorio y espera las cotizaciones exactas"""
+    CotizacionIndicativaService.limpiar_cache()
+    yield
+    endosos_orchestrator._cotizaciones_asincronas.esperar()
+    CotizacionIndicativaService.limpiar_cache()
+
+
+def test_rejilla_generada_con_los_supuestos_vigentes():
+    """La rejilla del repositorio debe regenerarse cuando cambian los supuestos"""
+    datos = rejilla_indicativa_repository.get_rejilla("endosos")
+    assert datos.get("huella_supuestos") == supuestos_repository.get_huella(
+        "endosos"
+    ), "Regenerar con python -m src.interfaces.batch.rejilla_indicativa"
+
+
+def test_rejilla_validada_al_nivel_de_confianza():
+    """Fuera de la calibración la rejilla entrega y acierta lo que informa"""
+    datos = rejilla_indicativa_repository.get_rejilla("endosos")
+    validacion = datos["validacion"]
+
+    assert validacion["entregadas"] >= 0.9
+    assert datos["nivel_confianza"] >= 0.9
+    assert datos["nivel_confianza"] <= validacion["dentro_del_error_estimado"]
+
+
+def test_rejilla_con_otros_supuestos_se_rechaza(monkeypatch):
+    datos = rejilla_indicativa_repository.get_rejilla("endosos")
+    monkeypatch.setattr(
+        rejilla_indicativa_repository,
+        "get_rejilla",
+        lambda producto: {**datos, "huella_supuestos": "0000000000000000"},
+    )
+    with pytest.raises(ValueError, match="otros supuestos"):
+        cotizar_indicativa_endosos(dict(PERFIL))
+
+
+def test_nodo_faltante_solo_omite_su_cobertura(monkeypatch):
+    datos = rejilla_indicativa_repository.get_rejilla("endosos")
+    # Sin la prima de itp en el nodo del perfil (está sobre los ejes)
+    nodos = [
+        {**nodo, "primas": {**nodo["primas"], "itp": None}}
+        if (
+            nodo["sexo"] == "F"
+            and nodo["edad_actuarial"] == 33
+            and nodo["periodo_vigencia"] == 17
+            and nodo["periodo_pago_primas"] == 12
+            and nodo["porcentaje_devolucion"] == 110
+        )
+        else nodo
+        for nodo in datos["nodos"]
+    ]
+    monkeypatch.setattr(
+        rejilla_indicativa_repository,
+        "get_rejilla",
+        lambda producto: {**datos, "nodos": nodos},
+    )
+
+    resultado = cotizar_indicativa_endosos(dict(PERFIL))
+
+    assert "itp" not in resultado["coberturas"]
+    assert "no tiene el nodo itp" in resultado["coberturas_sin_indicativa"]["itp"]
+    assert "fallecimiento" in resultado["coberturas"]
+    assert resultado["primas_cliente"] is None
+
+
+def test_prima_indicativa_dentro_de_su_error_estimado():
+    indicativa = cotizar_indicativa_endosos(dict(PERFIL))
+    exacta = cotizar_endosos(dict(PERFIL))["endosos"]["coberturas"]
+
+    assert indicativa["nivel_confianza"] is not None
+    assert indicativa["coberturas"]
+    for cobertura, primas in indicativa["coberturas"].items():
+        prima = primas["primas_frecuencializadas"]["mensual"]
+        error = primas["error_estimado"]["mensual"]
+        assert primas["error_relativo"] <= ERROR_RELATIVO_MAXIMO
+        assert abs(prima - exacta[cobertura]["primas_frecuencializadas"]["mensual"]) <= error
+    if not indicativa["coberturas_sin_indicativa"]:
+        assert indicativa["primas_cliente"] is not None
+
+
+def test_calibracion_cubre_el_nivel_de_confianza():
+    # (error, dispersión, prima): el error mínimo del 1% cubre la primera prima
+    comparaciones = [(0.5, 0.0, 100.0)] + [
+        (float(i), 1.0, 1000.0) for i in range(11, 30)
+    ]
+
+    factor_error, nivel = calibrar_error(comparaciones, 0.9, 0.01)
+
+    assert nivel >= 0.9
+    # Con un factor menor la última prima cubierta queda fuera
+    assert factor_error == 27.0
+    assert calibrar_error(comparaciones, 1.0, 0.01) == (29.0, 1.0)
@@ -0,0 +1,143 @@
+import csv
+
+import pytest
+
+from src.models.domain.puntos_modelo_domain import PuntosModeloDomain
+from src.models.productos.endosos import valorar_cartera_endosos
+
+COLUMNAS = [
+    "id_poliza",
+    "edad_actuarial",
+    "periodo_vigencia",
+    "periodo_pago_primas",
+    "suma_asegurada",
+    "sexo",
+    "porcentaje_devolucion",
+    "mes_poliza",
+    "prima_fallecimiento",
+    "prima_itp",
+]
+
+PERFIL = {
+    "edad_actuarial": 40,
+    "periodo_vigencia": 15,
+    "periodo_pago_primas": 12,
+    "sexo": "M",
+    "porcentaje_devolucion": 100,
+}
+
+# Primas mensuales por unidad de suma asegurada del perfil
+TASAS = {"fallecimiento": 118.0458e-5, "itp": 5.9242e-5}
+
+
+def _poliza(id_poliza, suma_asegurada, mes_poliza, **cambios):
+    return {
+        **PERFIL,
+        "id_poliza": id_poliza,
+        "suma_asegurada": suma_asegurada,
+        "mes_poliza": mes_poliza,
+        **{f"prima_{c}": tasa * suma_asegurada for c, tasa in TASAS.items()},
+        **cambios,
+    }
+
+
+def _escribir(ruta, polizas):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS)
+        escritor.writeheader()
+        escritor.writerows(polizas)
+
+
+def _leer(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _valorar(directorio, polizas, nombre, **opciones):
+    ruta_polizas = directorio / f"{nombre}_polizas.csv"
+    _escribir(ruta_polizas, polizas)
+    resumen = valorar_cartera_endosos(
+        str(ruta_polizas),
+        str(directorio / f"{nombre}_reservas.csv"),
+        str(directorio / f"{nombre}_flujos.csv"),
+        procesos=1,
+        **opciones,
+    )
+    return (
+        resumen,
+        _leer(directorio / f"{nombre}_reservas.csv"),
+        _leer(directorio / f"{nombre}_flujos.csv"),
+    )
+
+
+def test_cartera_csv_con_polizas_no_validas(tmp_path):
+    polizas = [
+        _poliza("P1", 100000, 24),
+        _poliza("P2", 90000, 60),
+        _poliza("SIN_SEXO", 100000, 24, sexo=""),
+        _poliza("SIN_MES", 100000, ""),
+        _poliza("FUERA_VIGENCIA", 100000, 500),
+    ]
+    # Bloques de dos pólizas: los errores no afectan al resto del bloque
+    resumen, reservas, flujos = _valorar(tmp_path, polizas, "cartera", tamano_bloque=2)
+
+    assert [fila["id_poliza"] for fila in reservas] == [p["id_poliza"] for p in polizas]
+    filas = {fila["id_poliza"]: fila for fila in reservas}
+    assert "sexo" in filas["SIN_SEXO"]["error"]
+    assert "mes_poliza" in filas["SIN_MES"]["error"]
+    assert "vigencia" in filas["FUERA_VIGENCIA"]["error"]
+    for id_poliza in ("P1", "P2"):
+        fila = filas[id_poliza]
+        assert fila["error"] == ""
+        assert float(fila["reserva_total"]) == pytest.approx(
+            sum(
+                float(fila[f"{nombre}_{cobertura}"])
+                for nombre in ("saldo_reserva", "moce")
+                for cobertura in TASAS
+            )
+        )
+
+    assert resumen["polizas"] == 5
+    assert resumen["polizas_con_error"] == 3
+    assert resumen["reserva_total"] == pytest.approx(
+        sum(float(filas[p]["reserva_total"]) for p in ("P1", "P2"))
+    )
+    # Horizonte de la póliza más nueva; el primer mes cobra la prima de ambas
+    assert len(flujos) == resumen["meses_flujos"] == 180 - 24
+    assert float(flujos[0]["primas_recurrentes"]) == pytest.approx(
+        sum(TASAS.values()) * (100000 + 90000)
+    )
+
+
+def test_puntos_modelo_concilian_con_la_valoracion_poliza_a_poliza(tmp_path):
+    # Mismo perfil y mes de póliza: un punto modelo por banda de suma asegurada
+    polizas = [
+        _poliza(f"P{i}", suma_asegurada, 24)
+        for i, suma_asegurada in enumerate((90000, 95000, 100000, 105000, 110000))
+    ]
+    exacto, reservas_exactas, flujos_exactos = _valorar(tmp_path, polizas, "exacta")
+    comprimido, reservas_comprimidas, flujos_comprimidos = _valorar(
+        tmp_path,
+        polizas,
+        "comprimida",
+        puntos_modelo=PuntosModeloDomain(1, 0.5),
+        conciliar=True,
+    )
+
+    assert comprimido["compresion"]["puntos_modelo"] == 1
+    conciliacion = comprimido["conciliacion"]
+    assert conciliacion["reserva_total_exacta"] == pytest.approx(
+        exacto["reserva_total"], rel=1e-12
+    )
+    assert conciliacion["reserva_total_aproximada"] == pytest.approx(
+        comprimido["reserva_total"], rel=1e-12
+    )
+    assert conciliacion["error_reserva_total_relativo"] < 1e-2
+    # Los flujos son afines en la suma asegurada: el punto los reproduce
+    for nombre, errores in conciliacion["flujos"].items():
+        assert errores["error_total_relativo"] < 1e-9, nombre
+    for exacta, comprimida in zip(flujos_exactos, flujos_comprimidos):
+        assert float(comprimida["flujo_pasivo"]) == pytest.approx(
+            float(exacta["flujo_pasivo"]), rel=1e-9, abs=1e-9
+        )
+    assert len(reservas_comprimidas) == len(reservas_exactas)
@@ -0,0 +1,47 @@
+import pytest
+
+from src.models.domain.goal_seek_domain import GoalSeekDomain
+
+
+class _VnaLineal:
+    """VNA lineal en la prima que cuenta las evaluaciones"""
+
+    def __init__(self, raiz, pendiente=17.9):
+        self.raiz = raiz
+        self.pendiente = pendiente
+        self.evaluaciones = 0
+
+    def __call__(self, *args):
+        self.evaluaciones += 1
+        return self.pendiente * (args[-1] - self.raiz)
+
+
+@pytest.mark.parametrize(
+    "semilla, raiz",
+    [
+        # Estimación de conmutación muy por debajo de la prima (devolución alta)
+        ((4.06, 8.12), 89.98),
+        ((20.3, 40.6), 109.85),
+        # Semilla de vecinos por encima de la prima
+        ((120.0, 130.0), 35.0),
+    ],
+)
+def test_semilla_lejana_se_amplia_por_la_secante(semilla, raiz):
+    goal_seek = GoalSeekDomain()
+    vna = _VnaLineal(raiz)
+    goal_seek._calcular_vna_con_prima = vna
+
+    resultado = goal_seek._goal_seek_semilla({}, {}, {}, "fallecimiento", "M", False, semilla)
+
+    assert resultado is not None
+    assert resultado[0] == pytest.approx(raiz, abs=1e-6)
+    # Dos extremos, una ampliación y pocas iteraciones de regula falsi
+    assert vna.evaluaciones <= 6
+
+
+def test_paso_expansion_sin_secante_usa_el_doble_del_ancho():
+    goal_seek = GoalSeekDomain()
+    # El VNA se aleja de cero al acercarse: la secante no apunta a la raíz
+    assert goal_seek._paso_expansion(4.0, -10.0, -5.0) == 8.0
+    # Raíz extrapolada a 4 * 10 / (15 - 10) = 8 del extremo, con 25% de holgura
+    assert goal_seek._paso_expansion(4.0, -10.0, -15.0) == pytest.approx(10.0)
@@ -0,0 +1,55 @@
+import pytest
+
+from src.models.domain.goal_seek_domain import GoalSeekDomain
+
+
+class _VnaConQuiebre:
+    """VNA lineal por tramos con un quiebre justo antes de la raíz"""
+
+    def __init__(self, raiz, quiebre, pendiente_baja=1.0, pendiente_alta=400.0):
+        self.raiz = raiz
+        self.quiebre = quiebre
+        self.pendiente_baja = pendiente_baja
+        self.pendiente_alta = pendiente_alta
+
+    def __call__(self, *args):
+        prima = args[-1]
+        if prima <= self.quiebre:
+            return self.pendiente_baja * (prima - self.quiebre) + self.pendiente_alta * (
+                self.quiebre - self.raiz
+            )
+        return self.pendiente_alta * (prima - self.raiz)
+
+
+def _goal_seek(vna):
+    goal_seek = GoalSeekDomain()
+    goal_seek._calcular_vna_con_prima = vna
+    goal_seek._deep_copy_params = lambda parametros: parametros
+    return goal_seek
+
+
+def test_prima_canonica_alcanza_la_tolerancia_con_quiebre_en_la_celda():
+    goal_seek = _goal_seek(None)
+    paso = goal_seek.max_prima / 2 ** goal_seek.profundidad_canonica
+    # Quiebre y raíz dentro de la misma celda de la malla canónica
+    celda = (0.51 // paso) * paso
+    vna = _VnaConQuiebre(raiz=celda + 0.9 * paso, quiebre=celda + 0.2 * paso)
+    goal_seek._calcular_vna_con_prima = vna
+
+    prima = goal_seek._prima_canonica({}, {}, {}, "itp", "M", False, vna.raiz)
+
+    assert abs(vna(prima)) < goal_seek.tolerance
+
+
+@pytest.mark.parametrize("desvio", [-1e-7, 0.0, 3e-7])
+def test_prima_canonica_no_depende_de_la_prima_recibida(desvio):
+    goal_seek = _goal_seek(None)
+    paso = goal_seek.max_prima / 2 ** goal_seek.profundidad_canonica
+    celda = (0.51 // paso) * paso
+    vna = _VnaConQuiebre(raiz=celda + 0.9 * paso, quiebre=celda + 0.2 * paso)
+    goal_seek._calcular_vna_con_prima = vna
+
+    referencia = goal_seek._prima_canonica({}, {}, {}, "itp", "M", False, vna.raiz)
+    prima = goal_seek._prima_canonica({}, {}, {}, "itp", "M", False, vna.raiz + desvio)
+
+    assert prima == referencia
@@ -0,0 +1,44 @@
+import threading
+
+from src.models.domain.registro_sombra import ComparacionSombra, RegistroSombra
+
+
+def _comparacion(coincide=True):
+    return ComparacionSombra(
+        cobertura="itp",
+        motor="referencia",
+        candidato="vectorizado",
+        prima_motor=1.0,
+        prima_candidato=1.0,
+        vna_motor=0.0,
+        vna_candidato=0.0,
+        segundos_motor=0.2,
+        segundos_candidato=0.1,
+        coincide=coincide,
+    )
+
+
+def test_cola_llena_descarta_las_muestras():
+    registro = RegistroSombra(max_pendientes=2)
+    liberar = threading.Event()
+
+    def comparar():
+        liberar.wait()
+        return _comparacion()
+
+    enviadas = [registro.enviar(comparar) for _ in range(5)]
+    liberar.set()
+    registro.esperar()
+
+    assert enviadas == [True, True, False, False, False]
+    resumen = registro.resumen()
+    assert resumen["comparaciones"] == 2
+    assert resumen["descartadas"] == 3
+
+    # La cola vuelve a admitir muestras al vaciarse, también tras un error
+    assert registro.enviar(lambda: 1 / 0)
+    assert registro.enviar(lambda: _comparacion(coincide=False))
+    registro.esperar()
+    resumen = registro.resumen()
+    assert resumen["errores"] == 1
+    assert resumen["discrepancias"] == 1
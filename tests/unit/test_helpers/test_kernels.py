@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from src.common.constans import VIVOS_INICIO
+from src.helpers import kernels
+from src.helpers.factores_descuento import factores_descuento
+from src.models.domain.expuestos_mes_domain import ExpuestosMesDomain
+
+HORIZONTES = [1, 12, 120, 480]
+
+
+def _casos(meses):
+    """Argumentos sintéticos de los kernels para un horizonte"""
+    generador = np.random.default_rng(meses)
+    return {
+        "flujo_pasivo": generador.normal(0.0, 1.0, meses),
+        "comparador": np.abs(generador.normal(0.0, 0.5, meses)),
+        "factores": np.array(factores_descuento(0.004, meses)),
+        "mortalidad": generador.uniform(0.01, 1.0, meses),
+        "caducidad": generador.uniform(0.0, 0.02, meses),
+    }
+
+
+@pytest.mark.parametrize("meses", HORIZONTES)
+def test_bucles_igualan_respaldo_numpy(meses):
+    """El código que compila Numba da lo mismo que el respaldo con NumPy"""
+    caso = _casos(meses)
+    np.testing.assert_allclose(
+        kernels._saldo_reserva_bucle(
+            caso["flujo_pasivo"], caso["comparador"], caso["factores"]
+        ),
+        kernels._saldo_reserva_numpy(
+            caso["flujo_pasivo"], caso["comparador"], caso["factores"]
+        ),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+    margen = caso["comparador"] * 0.05
+    np.testing.assert_allclose(
+        kernels._moce_bucle(margen, 0.01, caso["factores"]),
+        kernels._moce_numpy(margen, 0.01, caso["factores"]),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+    assert kernels._vna_bucle(caso["flujo_pasivo"], caso["factores"]) == pytest.approx(
+        kernels._vna_numpy(caso["flujo_pasivo"], caso["factores"]),
+        rel=1e-12,
+        abs=1e-12,
+    )
+
+
+@pytest.mark.parametrize("meses", HORIZONTES)
+def test_supervivencia_iguala_decrementos_escenarios(meses):
+    """La recursión del kernel coincide con la de los escenarios de sensibilidad"""
+    caso = _casos(meses)
+    vivos, fallecidos, _, caducados, _ = kernels.proyectar_supervivencia(
+        caso["mortalidad"].tolist(), caso["caducidad"].tolist(), float(VIVOS_INICIO)
+    )
+    esperados = ExpuestosMesDomain().calcular_decrementos_escenarios(
+        caso["mortalidad"][np.newaxis, :], caso["caducidad"][np.newaxis, :]
+    )
+    for obtenido, esperado in zip((vivos, fallecidos, caducados), esperados):
+        np.testing.assert_allclose(obtenido, esperado[0], rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("meses", HORIZONTES)
+def test_jit_iguala_respaldo(meses):
+    """Con Numba instalado, cada kernel compilado da lo mismo que su respaldo"""
+    pytest.importorskip("numba")
+    kernels.calentar_kernels()
+    caso = _casos(meses)
+
+    compilados = kernels.proyectar_supervivencia(
+        caso["mortalidad"], caso["caducidad"], 1.0
+    )
+    salidas = tuple([0.0] * meses for _ in range(5))
+    kernels._supervivencia_bucle(
+        caso["mortalidad"].tolist(), caso["caducidad"].tolist(), 1.0, *salidas
+    )
+    for compilado, respaldo in zip(compilados, salidas):
+        np.testing.assert_allclose(compilado, respaldo, rtol=1e-12, atol=1e-15)
+
+    np.testing.assert_allclose(
+        kernels._saldo_reserva_jit(
+            caso["flujo_pasivo"], caso["comparador"], caso["factores"]
+        ),
+        kernels._saldo_reserva_numpy(
+            caso["flujo_pasivo"], caso["comparador"], caso["factores"]
+        ),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+    margen = caso["comparador"] * 0.05
+    np.testing.assert_allclose(
+        kernels._moce_jit(margen, 0.01, caso["factores"]),
+        kernels._moce_numpy(margen, 0.01, caso["factores"]),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+    assert kernels._vna_jit(caso["flujo_pasivo"], caso["factores"]) == pytest.approx(
+        kernels._vna_numpy(caso["flujo_pasivo"], caso["factores"]),
+        rel=1e-12,
+        abs=1e-12,
+    )